@@ -0,0 +1,61 @@
+# app/core/cache.py
+"""
+Cache de resultados en memoria, por proceso (worker).
+
+Cada worker de gunicorn tiene su propia copia: una entrada vence a los `ttl`
+segundos o cuando el servicio que la usa la invalida, y los demás workers la
+siguen sirviendo hasta su propio vencimiento. Sirve para lecturas caras cuyo
+resultado puede estar unos segundos desactualizado (dashboards, analítica).
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Optional, Tuple
+import time
+
+
+class CacheTTL:
+    """Entradas que vencen a los `ttl` segundos; al superar `maximo` se descartan las menos usadas"""
+
+    def __init__(self, ttl: float, maximo: int = 256):
+        self.ttl = ttl
+        self.maximo = maximo
+        self._lock = Lock()
+        self._entradas: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        # Cuenta las invalidaciones: un valor calculado antes de la última no se guarda
+        self.generacion = 0
+        # time.monotonic() de la última invalidación
+        self.invalidado_en = 0.0
+
+    def obtener(self, clave: Hashable) -> Optional[Any]:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            vence, valor = entrada
+            if time.monotonic() >= vence:
+                del self._entradas[clave]
+                return None
+            self._entradas.move_to_end(clave)
+            return valor
+
+    def guardar(self, clave: Hashable, valor: Any, generacion: Optional[int] = None):
+        """`generacion`: la leída antes de calcular `valor`; si hubo una invalidación en el medio, se descarta"""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if generacion is not None and generacion != self.generacion:
+                return
+            self._entradas[clave] = (time.monotonic() + self.ttl, valor)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.maximo:
+                self._entradas.popitem(last=False)
+
+    def invalidar(self):
+        with self._lock:
+            self._entradas.clear()
+            self.generacion += 1
+            self.invalidado_en = time.monotonic()
+
+    def invalidado_hace_menos_de(self, segundos: float) -> bool:
+        return self.generacion > 0 and time.monotonic() - self.invalidado_en < segundos
@@ -0,0 +1,169 @@
+# app/core/coalescencia.py
+"""
+Coalescencia (single-flight) de lecturas caras idénticas y concurrentes.
+
+Con `@coalescer("nombre")` las llamadas simultáneas con los mismos argumentos
+comparten una sola ejecución: la primera calcula y las demás esperan y reciben
+el mismo resultado (o la misma excepción). No es un cache: quien llega después
+de que terminó el cálculo vuelve a calcular, así que nunca se sirve un
+resultado terminado antes de que llegara el request.
+
+- La clave es el nombre más los argumentos, sin la sesión (`db`/`session`).
+- Por defecto coalesce dentro del worker (threads del threadpool de FastAPI).
+- Con `entre_workers=True` y COALESCENCIA_ENTRE_WORKERS activo, además
+  serializa a los workers con un advisory lock de PostgreSQL por clave: quien
+  calcula deja el resultado (pickle) en resultado_compartido y los que esperaban
+  el lock lo leen de ahí. Si la espera supera COALESCENCIA_ESPERA_SECONDS se
+  calcula sin coalescer.
+
+El resultado se comparte tal cual entre requests: las funciones coalescidas
+deben devolver objetos que no se modifiquen después (schemas, Response con el
+contenido ya generado), nunca objetos ORM de la sesión del que calculó.
+"""
+
+from functools import wraps
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Hashable
+import inspect
+import json
+import logging
+import pickle
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.db.database import engine
+
+logger = logging.getLogger(__name__)
+
+# Primer entero de los advisory locks de coalescencia; el segundo es hashtext(clave)
+ADVISORY_LOCK_COALESCENCIA = 7_045_001
+
+_SQL_LEER = text("""
+    SELECT valor FROM resultado_compartido
+    WHERE clave = :clave AND creado >= :llegada AND vence > clock_timestamp()
+""")
+
+_SQL_GUARDAR = text("""
+    INSERT INTO resultado_compartido (clave, valor, creado, vence)
+    VALUES (:clave, :valor, clock_timestamp(), clock_timestamp() + make_interval(secs => :ttl))
+    ON CONFLICT (clave) DO UPDATE
+        SET valor = EXCLUDED.valor, creado = EXCLUDED.creado, vence = EXCLUDED.vence
+""")
+
+_SQL_PURGAR = text("DELETE FROM resultado_compartido WHERE vence < clock_timestamp()")
+
+
+class _Vuelo:
+    __slots__ = ("listo", "resultado", "error", "esperando")
+
+    def __init__(self):
+        self.listo = Event()
+        self.resultado = None
+        self.error = None
+        self.esperando = 0
+
+
+class SingleFlight:
+    """Ejecuciones en curso por clave dentro del proceso"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._vuelos: Dict[Hashable, _Vuelo] = {}
+
+    def ejecutar(self, clave: Hashable, funcion: Callable[[], Any]) -> Any:
+        with self._lock:
+            vuelo = self._vuelos.get(clave)
+            lider = vuelo is None
+            if lider:
+                vuelo = self._vuelos[clave] = _Vuelo()
+            else:
+                vuelo.esperando += 1
+
+        if not lider:
+            vuelo.listo.wait()
+            if vuelo.error is not None:
+                raise vuelo.error
+            return vuelo.resultado
+
+        try:
+            vuelo.resultado = funcion()
+            return vuelo.resultado
+        except BaseException as e:
+            vuelo.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._vuelos[clave]
+            vuelo.listo.set()
+            if vuelo.esperando:
+                logger.debug(f"🔗 {clave}: {vuelo.esperando} requests compartieron la ejecución")
+
+
+single_flight = SingleFlight()
+
+
+def _ejecutar_entre_workers(clave: str, funcion: Callable[[], Any]) -> Any:
+    """Serializa la clave entre workers con un advisory lock y comparte el resultado por la base"""
+    conexion = engine.connect()
+    try:
+        transaccion = conexion.begin()
+        try:
+            conexion.execute(text(f"SET LOCAL lock_timeout = '{int(settings.COALESCENCIA_ESPERA_SECONDS * 1000)}ms'"))
+            llegada = conexion.execute(text("SELECT clock_timestamp()")).scalar()
+            conexion.execute(
+                text("SELECT pg_advisory_xact_lock(:espacio, hashtext(:clave))"),
+                {"espacio": ADVISORY_LOCK_COALESCENCIA, "clave": clave}
+            )
+        except OperationalError as e:
+            # Lock no obtenido a tiempo o base no disponible para coordinar: calcular sin coalescer
+            logger.warning(f"⚠️  Sin coalescencia entre workers para {clave}: {e.orig.__class__.__name__}")
+            transaccion.rollback()
+            conexion.close()
+            return funcion()
+
+        valor = conexion.execute(_SQL_LEER, {"clave": clave, "llegada": llegada}).scalar()
+        if valor is not None:
+            transaccion.commit()
+            logger.debug(f"🔗 {clave}: resultado calculado por otro worker")
+            return pickle.loads(valor)
+
+        # El lock se libera al terminar la transacción, después de guardar el resultado
+        resultado = funcion()
+        conexion.execute(_SQL_PURGAR)
+        conexion.execute(_SQL_GUARDAR, {
+            "clave": clave,
+            "valor": pickle.dumps(resultado, protocol=pickle.HIGHEST_PROTOCOL),
+            "ttl": settings.COALESCENCIA_RESULTADO_SECONDS
+        })
+        transaccion.commit()
+        return resultado
+    finally:
+        conexion.close()
+
+
+def coalescer(nombre: str, entre_workers: bool = False):
+    """
+    Decorador: las llamadas concurrentes con los mismos argumentos (sin contar
+    la sesión `db`/`session`) comparten una sola ejecución.
+    """
+    def decorador(funcion):
+        firma = inspect.signature(funcion)
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            argumentos = firma.bind(*args, **kwargs)
+            argumentos.apply_defaults()
+            clave_args = {k: v for k, v in argumentos.arguments.items() if k not in ("db", "session")}
+            clave = f"{nombre}:{json.dumps(clave_args, sort_keys=True, default=str)}"
+
+            def calcular():
+                if entre_workers and settings.COALESCENCIA_ENTRE_WORKERS:
+                    return _ejecutar_entre_workers(clave, lambda: funcion(*args, **kwargs))
+                return funcion(*args, **kwargs)
+
+            return single_flight.ejecutar(clave, calcular)
+
+        return envoltura
+    return decorador
@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -12,6 +13,61 @@ class Settings(BaseSettings):
     JWT_EXPIRE_MINUTES: int = 60
     EXTERNAL_SHARED_SECRET: str
 
+    # Instrumentación de requests y SQL
+    METRICS_ENABLED: bool = True
+    SLOW_REQUEST_MS: float = 1000.0  # Requests más lentos se loguean como warning
+    N_PLUS_ONE_THRESHOLD: int = 10  # Ejecuciones del mismo SQL en un request para marcar N+1
+
+    # Pipeline de middlewares ASGI, de afuera hacia adentro (CORS siempre va por fuera)
+    # Disponibles: request_id, timing, gzip, errors
+    MIDDLEWARE_STACK: str = "request_id,timing,gzip,errors"
+    GZIP_MINIMUM_SIZE: int = 1024  # Bytes a partir de los cuales se comprime una respuesta JSON
+    GZIP_COMPRESSLEVEL: int = 6
+
+    # Migraciones versionadas (python migrate.py)
+    MIGRATE_ON_START: bool = True  # Aplicar pendientes en el master de gunicorn antes de levantar workers
+    SCHEMA_CHECK_STRICT: bool = False  # Si el esquema está desactualizado, los workers no arrancan
+
+    # Réplica de lectura (opcional) para resúmenes, reportes de proyectos y APIs de consulta
+    DATABASE_REPLICA_URL: Optional[str] = None
+    REPLICA_MAX_LAG_SECONDS: float = 10.0  # Con más retraso las lecturas vuelven al primario
+    REPLICA_LAG_CHECK_SECONDS: float = 5.0  # Cada cuánto se vuelve a medir el retraso
+    REPLICA_CONNECT_TIMEOUT: int = 3
+
+    # Archivo frío de proyectos cerrados (python archivo_frio.py)
+    ARCHIVO_FRIO_DIR: str = "archivo_frio"  # Directorio de los Parquet; compartido entre workers
+
+    # Facturación por lote (POST /cuenta-corriente/facturacion-lote)
+    FACTURACION_MAX_WORKERS: int = 4  # Reportes generados en paralelo; acotado por el pool de conexiones
+
+    # Catálogo de precios de áridos y máquinas (copia en memoria por worker)
+    PRECIOS_CATALOGO_CHECK_SECONDS: float = 5.0  # Cada cuánto se consulta la versión del catálogo
+
+    # Cubo analítico (POST /analitica/consulta), cache de resultados por worker
+    ANALITICA_CACHE_TTL_SECONDS: float = 60.0  # 0 desactiva el cache
+    ANALITICA_CACHE_MAX_ENTRADAS: int = 256
+
+    # Resumen del dashboard (GET /dashboard/resumen), cache por worker
+    DASHBOARD_CACHE_TTL_SECONDS: float = 15.0  # 0 desactiva el cache
+
+    # Coalescencia de lecturas caras idénticas (resumen, detalle y exportaciones de cuenta corriente)
+    COALESCENCIA_ENTRE_WORKERS: bool = False  # Además del worker, coordinar con advisory locks de PostgreSQL
+    COALESCENCIA_ESPERA_SECONDS: float = 30.0  # Espera máxima por el lock; después se calcula sin coalescer
+    COALESCENCIA_RESULTADO_SECONDS: float = 60.0  # Vida de un resultado en resultado_compartido
+
+    # Archivos de contrato (POST/PUT /proyectos y subidas por partes)
+    CONTRATO_MAX_BYTES: int = 50 * 1024 * 1024  # Se controla con los bytes recibidos, no con el tamaño declarado
+    SUBIDA_PARTE_MAX_BYTES: int = 8 * 1024 * 1024  # Máximo por cada PATCH de una subida reanudable
+    SUBIDA_VENCE_HORAS: float = 24.0  # Subidas sin partes nuevas en este tiempo se descartan
+
+    # Descargas de archivos (contratos) y estáticos: "python" (FileResponse), "x-accel" (nginx) o "x-sendfile"
+    DESCARGAS_MODO: Literal["python", "x-accel", "x-sendfile"] = "python"
+    DESCARGAS_X_ACCEL_PREFIJO: str = "/_archivos/"  # location internal de nginx con alias al directorio de la app
+
+    # Derivados WebP de imágenes de productos y gastos (requiere Pillow)
+    IMAGENES_CALIDAD_WEBP: int = 80
+    IMAGENES_MAX_PIXELES: int = 50_000_000  # Imágenes más grandes se sirven sin derivados
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,107 @@
+# app/core/descargas.py
+"""
+Descarga de archivos sin que los workers hagan de servidor de archivos.
+
+Con DESCARGAS_MODO:
+- "python" (por defecto): FileResponse desde el worker, con ETag, Last-Modified
+  y Range (Starlette). Sirve para desarrollo y despliegues sin proxy.
+- "x-accel": el endpoint solo autoriza y responde vacío con X-Accel-Redirect;
+  nginx envía el archivo con sendfile desde una location `internal`
+  (ver docker/nginx/archivos.conf). El prefijo es DESCARGAS_X_ACCEL_PREFIJO.
+- "x-sendfile": igual, con X-Sendfile y la ruta absoluta (Apache, lighttpd).
+
+Los archivos estáticos (/static, /uploads) se montan con ArchivosEstaticos, que
+agrega Cache-Control: los nombres con hash de contenido son inmutables y el
+resto se revalida con ETag. En producción nginx los sirve directamente.
+"""
+
+from typing import Iterable, Optional
+from urllib.parse import quote
+import logging
+import os
+import re
+
+from fastapi.responses import FileResponse, Response
+from fastapi.staticfiles import StaticFiles
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Directorios que pueden entregarse por el proxy (relativos al directorio de trabajo)
+DIRECTORIOS_SERVIBLES = ("uploads", "static")
+
+CACHE_INMUTABLE = "max-age=31536000, immutable"
+CACHE_REVALIDAR = "max-age=0, must-revalidate"
+
+# Nombres con un hash de contenido (al menos 12 hex con alguna letra, para no
+# confundir fechas o timestamps): contrato_4_50e3ba627ace840b.pdf, logo.3f2a9c1d7e4b.png
+_NOMBRE_CON_HASH = re.compile(r"(?:^|[._-])(?=[0-9]*[a-f])[0-9a-f]{12,64}(?:[._-][a-z0-9]+)*\.[A-Za-z0-9]+$")
+
+
+def es_nombre_con_hash(ruta: str) -> bool:
+    return bool(_NOMBRE_CON_HASH.search(os.path.basename(ruta)))
+
+
+def _content_disposition(nombre: str) -> str:
+    ascii_ = nombre.encode("ascii", "ignore").decode().replace('"', "") or "archivo"
+    return f"attachment; filename=\"{ascii_}\"; filename*=utf-8''{quote(nombre)}"
+
+
+def _ruta_relativa(ruta: str) -> Optional[str]:
+    """Ruta relativa al directorio de trabajo, o None si está fuera de los directorios servibles"""
+    relativa = os.path.relpath(os.path.realpath(ruta), os.path.realpath("."))
+    if relativa.split(os.sep)[0] not in DIRECTORIOS_SERVIBLES:
+        return None
+    return relativa.replace(os.sep, "/")
+
+
+def respuesta_archivo(ruta: str, media_type: str, nombre: str) -> Response:
+    """
+    Respuesta de descarga para un archivo ya autorizado. Los archivos con hash
+    en el nombre se marcan inmutables; el resto se revalida con ETag.
+    """
+    cache = CACHE_INMUTABLE if es_nombre_con_hash(ruta) else CACHE_REVALIDAR
+    headers = {"Cache-Control": f"private, {cache}"}
+    modo = settings.DESCARGAS_MODO
+    relativa = _ruta_relativa(ruta) if modo != "python" else None
+
+    if relativa is None:
+        if modo != "python":
+            logger.warning(f"⚠️  {ruta} está fuera de {DIRECTORIOS_SERVIBLES}; se envía desde el worker")
+        return FileResponse(ruta, media_type=media_type, filename=nombre, headers=headers)
+
+    headers["Content-Disposition"] = _content_disposition(nombre)
+    if modo == "x-accel":
+        headers["X-Accel-Redirect"] = quote(settings.DESCARGAS_X_ACCEL_PREFIJO.rstrip("/") + "/" + relativa)
+    else:
+        headers["X-Sendfile"] = os.path.realpath(ruta)
+    # El proxy reemplaza el cuerpo por el archivo y calcula Content-Length, ETag y Range
+    return Response(status_code=200, media_type=media_type, headers=headers)
+
+
+class ArchivosEstaticos(StaticFiles):
+    """
+    StaticFiles con Cache-Control según el nombre del archivo. `excluir` son
+    subdirectorios que no se publican (p. ej. contratos, que pasan por un
+    endpoint con autorización).
+    """
+
+    def __init__(self, *args, excluir: Iterable[str] = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.excluir = tuple(e.strip("/") for e in excluir)
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        respuesta = super().file_response(full_path, stat_result, scope, status_code)
+        cache = CACHE_INMUTABLE if es_nombre_con_hash(full_path) else CACHE_REVALIDAR
+        respuesta.headers["Cache-Control"] = f"public, {cache}"
+        return respuesta
+
+    def get_path(self, scope) -> str:
+        ruta = super().get_path(scope)
+        primero = ruta.replace(os.sep, "/").lstrip("/").split("/", 1)[0]
+        if primero in self.excluir:
+            # Mismo resultado que un archivo inexistente
+            return os.path.join("__excluido__", ruta)
+        return ruta
+
@@ -0,0 +1,186 @@
+# app/core/imagenes.py
+"""
+Derivados de imágenes (miniaturas WebP) de productos y comprobantes de gastos.
+
+Las imágenes se suben a resolución completa; las listas y las vistas chicas
+usan derivados WebP de ancho acotado (ANCHOS), así que cargan kilobytes:
+
+- Se generan después de responder la subida (BackgroundTasks, en el threadpool)
+  y, si faltan (imágenes anteriores, Pillow recién instalado), al pedirlos.
+- Se guardan en disco por SHA-256 del original: {sha[:2]}/{sha}_w{ancho}.webp.
+  El mismo contenido no se procesa dos veces y el nombre con hash hace que
+  ArchivosEstaticos y nginx los sirvan como inmutables.
+- Los de productos van a static/derivados (públicos, como static/productos);
+  los de gastos a uploads/derivados, que no se publica: se sirven por la API.
+
+Pillow es opcional: sin Pillow no se generan derivados y se sirve el original.
+"""
+
+from io import BytesIO
+from typing import Optional
+import hashlib
+import logging
+import os
+import uuid
+
+from app.core.config import settings
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - Pillow es opcional
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+DIRECTORIO_PUBLICO = os.path.join("static", "derivados")
+DIRECTORIO_PRIVADO = os.path.join("uploads", "derivados")
+
+# Anchos generados, de menor a mayor; el alto se acota a 4 veces el ancho (tickets largos)
+ANCHOS = (160, 320, 640, 1280)
+ANCHO_MINIATURA = ANCHOS[0]
+MEDIA_TYPE = "image/webp"
+
+
+def sha256_bytes(datos: bytes) -> str:
+    return hashlib.sha256(datos).hexdigest()
+
+
+def sha256_archivo(ruta: str) -> Optional[str]:
+    try:
+        with open(ruta, "rb") as archivo:
+            return hashlib.file_digest(archivo, "sha256").hexdigest()
+    except OSError:
+        return None
+
+
+def ancho_para(pedido: Optional[int]) -> int:
+    """El menor ancho generado que cubre el pedido (o el mayor si no alcanza ninguno)"""
+    if pedido is None:
+        return ANCHOS[-1]
+    return next((a for a in ANCHOS if a >= pedido), ANCHOS[-1])
+
+
+def ruta_derivado(directorio: str, sha256: str, ancho: int) -> str:
+    return os.path.join(directorio, sha256[:2], f"{sha256}_w{ancho}.webp")
+
+
+def url_publica(sha256: str, ancho: int) -> str:
+    """URL en /static de un derivado de DIRECTORIO_PUBLICO"""
+    return "/" + ruta_derivado(DIRECTORIO_PUBLICO, sha256, ancho).replace(os.sep, "/")
+
+
+def srcset(sha256: str) -> str:
+    """Atributo srcset con todos los anchos, para que el navegador elija"""
+    return ", ".join(f"{url_publica(sha256, a)} {a}w" for a in ANCHOS)
+
+
+def _ruta_sin_derivados(directorio: str, sha256: str) -> str:
+    # Marca de contenido que no se pudo procesar (no es imagen o es muy grande): no se reintenta
+    return os.path.join(directorio, sha256[:2], f"{sha256}.sin-derivados")
+
+
+def listos(directorio: str, sha256: Optional[str]) -> bool:
+    # Se escriben de mayor a menor: si está el más chico están todos
+    return bool(sha256) and os.path.isfile(ruta_derivado(directorio, sha256, ANCHOS[0]))
+
+
+def faltan(directorio: str, sha256: Optional[str]) -> bool:
+    """Hay derivados por generar: Pillow disponible, todavía no están y el contenido no se descartó"""
+    return (
+        Image is not None
+        and bool(sha256)
+        and not listos(directorio, sha256)
+        and not os.path.isfile(_ruta_sin_derivados(directorio, sha256))
+    )
+
+
+def _guardar_webp(imagen, ruta: str) -> None:
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.{uuid.uuid4().hex}.tmp"
+    try:
+        imagen.save(temporal, "WEBP", quality=settings.IMAGENES_CALIDAD_WEBP, method=4)
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+def _marcar_sin_derivados(directorio: str, sha256: str) -> None:
+    ruta = _ruta_sin_derivados(directorio, sha256)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    open(ruta, "wb").close()
+
+
+def generar_derivados(directorio: str, datos: bytes, sha256: Optional[str] = None) -> Optional[str]:
+    """
+    Genera los derivados que falten de la imagen `datos` y devuelve su sha256,
+    o None si no se pudo (sin Pillow, no es una imagen o es demasiado grande).
+    Bloqueante: se ejecuta en BackgroundTasks o en endpoints `def`.
+    """
+    if Image is None:
+        return None
+    sha256 = sha256 or sha256_bytes(datos)
+    if os.path.isfile(_ruta_sin_derivados(directorio, sha256)):
+        return None
+    pendientes = [a for a in reversed(ANCHOS) if not os.path.isfile(ruta_derivado(directorio, sha256, a))]
+    if not pendientes:
+        return sha256
+
+    try:
+        with Image.open(BytesIO(datos)) as original:
+            if original.width * original.height > settings.IMAGENES_MAX_PIXELES:
+                logger.warning(f"⚠️  Imagen {sha256[:12]} de {original.width}x{original.height}: no se generan derivados")
+                _marcar_sin_derivados(directorio, sha256)
+                return None
+            # JPEG: decodificar ya reducido al tamaño más grande que hace falta
+            original.draft("RGB", (pendientes[0], pendientes[0] * 4))
+            imagen = ImageOps.exif_transpose(original)
+            transparente = imagen.mode in ("RGBA", "LA", "PA") or "transparency" in imagen.info
+            imagen = imagen.convert("RGBA" if transparente else "RGB")
+            # De mayor a menor, cada uno a partir del anterior
+            for ancho in pendientes:
+                imagen.thumbnail((ancho, ancho * 4), Image.LANCZOS)
+                _guardar_webp(imagen, ruta_derivado(directorio, sha256, ancho))
+    except (Image.UnidentifiedImageError, Image.DecompressionBombError) as e:
+        logger.warning(f"⚠️  {sha256[:12]} no es una imagen procesable: {e}")
+        _marcar_sin_derivados(directorio, sha256)
+        return None
+    except (OSError, ValueError) as e:
+        # Imagen truncada o error de disco: se reintenta la próxima vez
+        logger.warning(f"⚠️  No se generaron derivados de {sha256[:12]}: {e}")
+        return None
+
+    logger.info(f"🖼️  Derivados de {sha256[:12]} generados: {', '.join(str(a) for a in sorted(pendientes))}")
+    return sha256
+
+
+def generar_derivados_archivo(directorio: str, ruta: str, sha256: Optional[str] = None) -> Optional[str]:
+    try:
+        with open(ruta, "rb") as archivo:
+            datos = archivo.read()
+    except OSError:
+        return None
+    return generar_derivados(directorio, datos, sha256)
+
+
+_FIRMAS = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF8", "image/gif"),
+    (b"%PDF", "application/pdf"),
+)
+
+
+def media_type_de(datos: bytes) -> str:
+    """Media type de un original guardado sin él (comprobantes en la base)"""
+    if datos[:4] == b"RIFF" and datos[8:12] == b"WEBP":
+        return MEDIA_TYPE
+    return next((tipo for firma, tipo in _FIRMAS if datos.startswith(firma)), "application/octet-stream")
+
+
+def leer_derivado(directorio: str, sha256: str, ancho: int) -> Optional[bytes]:
+    try:
+        with open(ruta_derivado(directorio, sha256, ancho), "rb") as archivo:
+            return archivo.read()
+    except OSError:
+        return None
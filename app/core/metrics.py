@@ -0,0 +1,163 @@
+# app/core/metrics.py
+"""
+Métricas de requests y de SQL por proceso (worker).
+
+- Cada request abre un RequestStats en una ContextVar; los hooks de SQLAlchemy
+  registrados en app/db/database.py suman cantidad de queries y tiempo de DB.
+- Los endpoints síncronos corren en el threadpool de AnyIO, que copia el contexto,
+  así que las queries ejecutadas ahí también se atribuyen al request.
+- Un mismo SQL ejecutado N veces en un request se informa como posible N+1.
+- Los agregados por ruta se exponen en GET /metrics (solo desde localhost).
+"""
+
+from contextvars import ContextVar
+from collections import Counter, deque
+from threading import Lock
+from typing import Dict, List, Optional
+import json
+import logging
+import time
+
+from app.core.config import settings
+from app.middlewares.request_id import request_id_actual
+
+logger = logging.getLogger("kedikian.metrics")
+
+# Cantidad de latencias recientes por ruta usadas para estimar percentiles
+MUESTRAS_POR_RUTA = 500
+
+
+class RequestStats:
+    """Acumulador de un request en curso"""
+
+    __slots__ = ("inicio", "queries", "db_ms", "sentencias")
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.queries = 0
+        self.db_ms = 0.0
+        self.sentencias: Counter = Counter()
+
+    def registrar_query(self, sentencia: str, duracion_ms: float):
+        self.queries += 1
+        self.db_ms += duracion_ms
+        self.sentencias[sentencia] += 1
+
+    def posibles_n_mas_uno(self, umbral: int) -> List[Dict]:
+        return [
+            {"sql": sentencia[:200], "ejecuciones": cantidad}
+            for sentencia, cantidad in self.sentencias.most_common()
+            if cantidad >= umbral
+        ]
+
+
+_request_actual: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def iniciar_request() -> RequestStats:
+    stats = RequestStats()
+    _request_actual.set(stats)
+    return stats
+
+
+def registrar_query(sentencia: str, duracion_ms: float):
+    """Llamado por los hooks del engine después de cada ejecución"""
+    stats = _request_actual.get()
+    if stats is not None:
+        stats.registrar_query(sentencia, duracion_ms)
+
+
+class _AgregadoRuta:
+    __slots__ = ("requests", "errores", "total_ms", "max_ms", "queries", "db_ms", "n_mas_uno", "latencias")
+
+    def __init__(self):
+        self.requests = 0
+        self.errores = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.queries = 0
+        self.db_ms = 0.0
+        self.n_mas_uno = 0
+        self.latencias = deque(maxlen=MUESTRAS_POR_RUTA)
+
+    def a_dict(self) -> Dict:
+        ordenadas = sorted(self.latencias)
+
+        def percentil(p: float) -> float:
+            if not ordenadas:
+                return 0.0
+            return round(ordenadas[min(len(ordenadas) - 1, int(p * len(ordenadas)))], 2)
+
+        return {
+            "requests": self.requests,
+            "errores": self.errores,
+            "latencia_media_ms": round(self.total_ms / self.requests, 2) if self.requests else 0.0,
+            "latencia_p50_ms": percentil(0.50),
+            "latencia_p95_ms": percentil(0.95),
+            "latencia_max_ms": round(self.max_ms, 2),
+            "queries_por_request": round(self.queries / self.requests, 2) if self.requests else 0.0,
+            "db_ms_por_request": round(self.db_ms / self.requests, 2) if self.requests else 0.0,
+            "requests_con_n_mas_uno": self.n_mas_uno
+        }
+
+
+class RegistroMetricas:
+    """Agregados por (método, ruta) del worker actual"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._rutas: Dict[str, _AgregadoRuta] = {}
+        self._desde = time.time()
+
+    def cerrar_request(self, metodo: str, ruta: str, status: int, stats: RequestStats) -> Dict:
+        duracion_ms = (time.perf_counter() - stats.inicio) * 1000
+        n_mas_uno = stats.posibles_n_mas_uno(settings.N_PLUS_ONE_THRESHOLD)
+        clave = f"{metodo} {ruta}"
+
+        with self._lock:
+            agregado = self._rutas.get(clave)
+            if agregado is None:
+                agregado = self._rutas[clave] = _AgregadoRuta()
+            agregado.requests += 1
+            agregado.errores += 1 if status >= 500 else 0
+            agregado.total_ms += duracion_ms
+            agregado.max_ms = max(agregado.max_ms, duracion_ms)
+            agregado.queries += stats.queries
+            agregado.db_ms += stats.db_ms
+            agregado.n_mas_uno += 1 if n_mas_uno else 0
+            agregado.latencias.append(duracion_ms)
+
+        evento = {
+            "evento": "request",
+            "request_id": request_id_actual.get(),
+            "metodo": metodo,
+            "ruta": ruta,
+            "status": status,
+            "duracion_ms": round(duracion_ms, 2),
+            "queries": stats.queries,
+            "db_ms": round(stats.db_ms, 2)
+        }
+        if n_mas_uno:
+            evento["n_mas_uno"] = n_mas_uno
+
+        if n_mas_uno or duracion_ms >= settings.SLOW_REQUEST_MS:
+            logger.warning(json.dumps(evento, ensure_ascii=False))
+        else:
+            logger.info(json.dumps(evento, ensure_ascii=False))
+        return evento
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            rutas = {clave: agregado.a_dict() for clave, agregado in self._rutas.items()}
+        return {
+            "desde": self._desde,
+            "rutas": dict(sorted(rutas.items(), key=lambda r: r[1]["latencia_p95_ms"], reverse=True))
+        }
+
+    def reset(self):
+        with self._lock:
+            self._rutas.clear()
+            self._desde = time.time()
+
+
+registro_metricas = RegistroMetricas()
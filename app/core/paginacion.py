@@ -0,0 +1,173 @@
+# app/core/paginacion.py
+"""
+Paginación por keyset para los endpoints /paginado.
+
+En lugar de OFFSET (que recorre y descarta todas las filas anteriores) cada
+página se pide con el cursor que devolvió la anterior: la consulta filtra
+(columna de orden, id) después del último registro visto y usa el índice con
+ese mismo orden, así que la página 1000 cuesta lo mismo que la primera.
+
+- El cursor es opaco para el cliente (base64 de los valores del último registro);
+  uno inválido lanza CursorInvalido, que los routers devuelven como 400.
+- Las columnas de orden pueden tener NULL: van al final, ordenadas por id.
+- No se cuenta la tabla en cada página; con ?contar=true se informa un total
+  estimado a partir de las estadísticas del planner (pg_class.reltuples).
+
+Los servicios arman la consulta base y llaman a `paginar`; los routers reciben
+los parámetros con `Depends(parametros_pagina)`.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, List, Optional
+import base64
+import binascii
+import json
+
+from fastapi import Query as QueryParam
+from sqlalchemy import Date, DateTime, text, tuple_
+from sqlalchemy.orm import Query, Session
+
+from app.schemas.schemas import PaginaOut
+
+LIMITE_POR_DEFECTO = 15
+LIMITE_MAXIMO = 100
+
+_SQL_TOTAL_ESTIMADO = text("""
+    SELECT COALESCE(SUM(GREATEST(c.reltuples, 0)), 0)::bigint
+    FROM pg_class c
+    WHERE c.relkind <> 'p'
+      AND (c.oid = to_regclass(:tabla)
+           OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:tabla)))
+""")
+
+
+class CursorInvalido(ValueError):
+    """El cursor no se puede decodificar o no corresponde al orden de la consulta"""
+
+
+@dataclass
+class ParametrosPagina:
+    cursor: Optional[str] = None
+    limit: int = LIMITE_POR_DEFECTO
+    contar: bool = False
+
+
+def parametros_pagina(
+    cursor: Optional[str] = QueryParam(None, description="Cursor devuelto por la página anterior"),
+    limit: int = QueryParam(LIMITE_POR_DEFECTO, ge=1, le=LIMITE_MAXIMO),
+    contar: bool = QueryParam(False, description="Incluir un total estimado (estadísticas del planner)")
+) -> ParametrosPagina:
+    return ParametrosPagina(cursor=cursor, limit=limit, contar=contar)
+
+
+# ============= Cursores =============
+
+def _a_json(valor: Any):
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    return valor
+
+
+def _de_json(valor: Any, columna):
+    if valor is None:
+        return None
+    tipo = columna.type
+    if isinstance(tipo, DateTime):
+        return datetime.fromisoformat(valor)
+    if isinstance(tipo, Date):
+        return date.fromisoformat(valor)
+    return valor
+
+
+def codificar_cursor(valores: List[Any]) -> str:
+    datos = json.dumps([_a_json(v) for v in valores], separators=(",", ":"))
+    return base64.urlsafe_b64encode(datos.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, columnas: List) -> List[Any]:
+    """Valores del último registro de la página anterior; CursorInvalido si no es de esta consulta"""
+    try:
+        datos = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(datos, list) or len(datos) != len(columnas) or datos[-1] is None:
+            raise ValueError
+        return [_de_json(v, c) for v, c in zip(datos, columnas)]
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        raise CursorInvalido("Cursor de paginación inválido")
+
+
+def total_estimado(db: Session, tabla: str) -> int:
+    """Filas de la tabla (y sus particiones) según el último ANALYZE"""
+    return int(db.execute(_SQL_TOTAL_ESTIMADO, {"tabla": tabla}).scalar() or 0)
+
+
+# ============= Paginación =============
+
+def paginar(
+    db: Session,
+    query: Query,
+    columna_id,
+    convertir: Callable[[Any], Any],
+    pagina: ParametrosPagina,
+    columna_orden=None,
+    descendente: bool = False
+) -> PaginaOut:
+    """
+    Una página de `query` ordenada por (columna_orden, id), o solo por id.
+    `convertir` arma el item de salida a partir de cada fila.
+    """
+    limit = pagina.limit
+    columnas = [columna_orden, columna_id] if columna_orden is not None else [columna_id]
+    id_despues = (lambda v: columna_id < v) if descendente else (lambda v: columna_id > v)
+    orden_id = columna_id.desc() if descendente else columna_id.asc()
+
+    if columna_orden is None:
+        if pagina.cursor:
+            (ultimo_id,) = decodificar_cursor(pagina.cursor, columnas)
+            query = query.filter(id_despues(ultimo_id))
+        filas = query.order_by(orden_id).limit(limit + 1).all()
+    else:
+        nulos_al_final = (columna_orden.desc() if descendente else columna_orden.asc()).nulls_last()
+        nullable = getattr(columna_orden.expression, "nullable", True)
+        sin_valor = query.filter(columna_orden.is_(None))
+        if not pagina.cursor:
+            filas = query.order_by(nulos_al_final, orden_id).limit(limit + 1).all()
+        else:
+            ultimo_valor, ultimo_id = decodificar_cursor(pagina.cursor, columnas)
+            if ultimo_valor is None:
+                # Ya se recorrieron los valores no nulos: seguir con los NULL por id
+                filas = sin_valor.filter(id_despues(ultimo_id)).order_by(orden_id).limit(limit + 1).all()
+            else:
+                clave = tuple_(columna_orden, columna_id)
+                despues = clave < tuple_(ultimo_valor, ultimo_id) if descendente else clave > tuple_(ultimo_valor, ultimo_id)
+                filas = query.filter(despues).order_by(nulos_al_final, orden_id).limit(limit + 1).all()
+                if len(filas) <= limit and nullable:
+                    # La comparación por fila excluye los NULL, que van al final
+                    filas += sin_valor.order_by(orden_id).limit(limit + 1 - len(filas)).all()
+
+    hay_mas = len(filas) > limit
+    filas = filas[:limit]
+    siguiente_cursor = None
+    if hay_mas:
+        ultima = filas[-1]
+        siguiente_cursor = codificar_cursor([_valor(ultima, c) for c in columnas])
+
+    return PaginaOut(
+        items=[convertir(f) for f in filas],
+        limit=limit,
+        siguiente_cursor=siguiente_cursor,
+        hay_mas=hay_mas,
+        total_estimado=total_estimado(db, _tabla(columna_id)) if pagina.contar else None
+    )
+
+
+def _valor(fila, columna):
+    """Valor de una columna de orden en una fila (objeto ORM o Row)"""
+    nombre = columna.key
+    if hasattr(fila, "_mapping"):
+        return fila._mapping[columna]
+    return getattr(fila, nombre)
+
+
+def _tabla(columna) -> str:
+    return columna.expression.table.name
@@ -0,0 +1,156 @@
+# app/core/serializacion.py
+"""
+Serialización rápida para listados grandes.
+
+El camino habitual de un listado construye un modelo Pydantic por fila en el
+servicio (model_validate) y FastAPI lo vuelve a validar contra response_model
+antes de serializar: dos validaciones por fila. Para los listados calientes los
+servicios pueden consultar solo las columnas necesarias (tuplas, sin instanciar
+objetos ORM) y el endpoint devuelve FilasJSONResponse, que FastAPI envía tal cual.
+
+Se usa orjson cuando está instalado; si no, json de la librería estándar con el
+mismo formato de fechas que Pydantic.
+
+Formato columnar (opcional, para la app de campo y clientes masivos): con
+`Accept: application/vnd.kedikian.columnar+json` o `?format=columnar` los
+listados que lo soportan devuelven cada columna como un array, con un esquema
+compartido en lugar de repetir los nombres de campo en cada objeto:
+
+    {"esquema": [{"nombre": "id", "tipo": "integer"}, ...],
+     "filas": 2,
+     "columnas": [[1, 2], ...]}
+
+La columna i de "columnas" corresponde al campo i de "esquema". El middleware
+gzip comprime también este content-type si el cliente envía Accept-Encoding.
+"""
+
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Type, Union, get_args, get_origin
+import json
+
+from fastapi import Query, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+MEDIA_TYPE_COLUMNAR = "application/vnd.kedikian.columnar+json"
+
+# Tipo del esquema columnar para cada tipo de Python de las columnas
+_TIPOS_COLUMNAR = {
+    bool: "boolean",
+    int: "integer",
+    float: "number",
+    Decimal: "number",
+    str: "string",
+    datetime: "datetime",
+    date: "date",
+    time: "time",
+}
+
+
+def _default(valor: Any):
+    if isinstance(valor, datetime):
+        texto = valor.isoformat()
+        return texto[:-6] + "Z" if texto.endswith("+00:00") else texto
+    if isinstance(valor, (date, time)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return float(valor)
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+
+def dumps(contenido: Any) -> bytes:
+    """Serializa a JSON (bytes) con fechas en ISO 8601, igual que Pydantic"""
+    if orjson is not None:
+        return orjson.dumps(contenido, default=_default, option=orjson.OPT_UTC_Z)
+    return json.dumps(contenido, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FilasJSONResponse(JSONResponse):
+    """
+    Respuesta JSON para listas de dicts armadas desde filas de columnas.
+    Los endpoints la devuelven directamente, así FastAPI no revalida el contenido
+    contra response_model (que se mantiene solo para la documentación OpenAPI).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def filas_como_dicts(query) -> List[Dict[str, Any]]:
+    """
+    Ejecuta una query de columnas (db.query(Modelo.a, Modelo.b, ...)) y devuelve
+    un dict por fila con los nombres de las columnas como claves, en el mismo orden.
+    """
+    claves = [columna["name"] for columna in query.column_descriptions]
+    return [dict(zip(claves, fila)) for fila in query.all()]
+
+
+
+# ============= Formato columnar =============
+
+def formato_columnar(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(json|columnar)$", description="'columnar' para columnas con esquema compartido")
+) -> bool:
+    """Dependencia: True si el cliente pidió el formato columnar (parámetro o header Accept)"""
+    if format is not None:
+        return format == "columnar"
+    return MEDIA_TYPE_COLUMNAR in request.headers.get("accept", "")
+
+
+def _tipo_python(tipo_sql) -> str:
+    try:
+        return _TIPOS_COLUMNAR.get(tipo_sql.python_type, "json")
+    except NotImplementedError:
+        return "json"
+
+
+def _tipo_anotacion(anotacion) -> str:
+    # Optional[X] -> X
+    if get_origin(anotacion) is Union:
+        argumentos = [a for a in get_args(anotacion) if a is not type(None)]
+        anotacion = argumentos[0] if len(argumentos) == 1 else None
+    return _TIPOS_COLUMNAR.get(anotacion, "json")
+
+
+def _columnar(esquema: List[Dict[str, str]], filas: Sequence[Sequence[Any]]) -> Dict[str, Any]:
+    columnas = [list(c) for c in zip(*filas)] if filas else [[] for _ in esquema]
+    return {"esquema": esquema, "filas": len(filas), "columnas": columnas}
+
+
+def filas_como_columnas(query) -> Dict[str, Any]:
+    """
+    Como filas_como_dicts pero en formato columnar: el esquema sale de las
+    columnas de la query y cada columna es un array con los valores de todas las filas.
+    """
+    esquema = [
+        {"nombre": columna["name"], "tipo": _tipo_python(columna["type"])}
+        for columna in query.column_descriptions
+    ]
+    return _columnar(esquema, query.all())
+
+
+def modelos_como_columnas(modelos: List[BaseModel], modelo: Type[BaseModel]) -> Dict[str, Any]:
+    """Formato columnar para listados que ya arman un schema Pydantic por fila"""
+    campos = modelo.model_fields
+    esquema = [{"nombre": nombre, "tipo": _tipo_anotacion(campo.annotation)} for nombre, campo in campos.items()]
+    return _columnar(esquema, [tuple(getattr(m, nombre) for nombre in campos) for m in modelos])
+
+
+class ColumnarJSONResponse(FilasJSONResponse):
+    media_type = MEDIA_TYPE_COLUMNAR
+
+
+def respuesta_filas(contenido: Any, columnar: bool) -> JSONResponse:
+    """
+    Respuesta de un listado con formato negociable. Vary: Accept para que un
+    cache intermedio no sirva un formato al cliente que pidió el otro.
+    """
+    clase = ColumnarJSONResponse if columnar else FilasJSONResponse
+    return clase(contenido, headers={"Vary": "Accept"})
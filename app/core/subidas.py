@@ -0,0 +1,268 @@
+# app/core/subidas.py
+"""
+Escritura de archivos subidos sin bloquear el event loop.
+
+Los endpoints `async def` no deben hacer I/O de disco en el loop: cada escritura,
+hash de archivo, rename o borrado se ejecuta en el threadpool de Starlette
+mientras el worker sigue atendiendo otros requests.
+
+- El contenido se escribe por bloques en un temporal de uploads/.tmp (mismo
+  filesystem que los destinos) y el SHA-256 se calcula mientras llega.
+- El límite de tamaño se controla con los bytes recibidos, no con el tamaño
+  que declara el cliente: al superarlo se corta la escritura.
+- Los formularios multipart con un archivo se leen directo de request.stream()
+  (recibir_formulario): el archivo no pasa por el temporal sin límite que arma
+  Starlette al parsear el formulario antes de llamar al endpoint.
+- El archivo definitivo aparece con un rename atómico, así que nunca queda a
+  medio escribir en su ruta final.
+"""
+
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import parse_qsl
+import hashlib
+import os
+import shutil
+import uuid
+
+from fastapi import Request
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+DIRECTORIO_TEMPORAL = os.path.join("uploads", ".tmp")
+TAMAÑO_BLOQUE = 1024 * 1024
+# Máximo de cada campo de texto de un formulario multipart
+MAXIMO_CAMPO = 64 * 1024
+
+
+class ArchivoDemasiadoGrande(ValueError):
+    """Se recibieron más bytes que el máximo permitido"""
+
+
+def ruta_temporal(nombre: Optional[str] = None) -> str:
+    os.makedirs(DIRECTORIO_TEMPORAL, exist_ok=True)
+    return os.path.join(DIRECTORIO_TEMPORAL, f"{nombre or uuid.uuid4().hex}.part")
+
+
+def _escribir(archivo, bloque: bytes, hash_) -> None:
+    archivo.write(bloque)
+    if hash_ is not None:
+        hash_.update(bloque)
+
+
+async def escribir_bloques(
+    bloques: AsyncIterator[bytes],
+    ruta: str,
+    maximo: int,
+    modo: str = "wb",
+    hash_=None
+) -> int:
+    """
+    Escribe los bloques en `ruta` (agrupados de a TAMAÑO_BLOQUE) y devuelve los
+    bytes escritos. Si se supera `maximo` lanza ArchivoDemasiadoGrande: lo ya
+    escrito queda en el archivo y el bloque que excede no se escribe.
+    """
+    archivo = await run_in_threadpool(open, ruta, modo)
+    escritos = 0
+    pendiente = bytearray()
+    try:
+        async for bloque in bloques:
+            if escritos + len(pendiente) + len(bloque) > maximo:
+                raise ArchivoDemasiadoGrande(f"El archivo supera el máximo de {maximo} bytes")
+            pendiente += bloque
+            if len(pendiente) >= TAMAÑO_BLOQUE:
+                await run_in_threadpool(_escribir, archivo, bytes(pendiente), hash_)
+                escritos += len(pendiente)
+                pendiente.clear()
+    finally:
+        if pendiente:
+            await run_in_threadpool(_escribir, archivo, bytes(pendiente), hash_)
+            escritos += len(pendiente)
+        await run_in_threadpool(archivo.close)
+    return escritos
+
+
+@dataclass
+class ArchivoRecibido:
+    """Archivo de un formulario multipart, ya escrito en un temporal de uploads/.tmp"""
+    nombre: str
+    tipo: Optional[str]
+    temporal: str
+    sha256: str
+    tamaño: int
+
+
+class _LectorFormulario:
+    """Callbacks de python-multipart: junta los campos de texto y separa los bytes del archivo"""
+
+    def __init__(self, campo_archivo: str):
+        self.campo_archivo = campo_archivo
+        self.campos: Dict[str, str] = {}
+        self.archivo: Optional[Tuple[str, Optional[str]]] = None  # (nombre, content type)
+        self.datos_archivo = []
+        self._encabezados: Dict[bytes, bytes] = {}
+        self._nombre_encabezado = b""
+        self._valor_encabezado = b""
+        self._campo: Optional[str] = None
+        self._es_archivo = False
+        self._datos = bytearray()
+
+    def on_part_begin(self):
+        self._encabezados = {}
+        self._campo = None
+        self._es_archivo = False
+        self._datos = bytearray()
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._nombre_encabezado += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._valor_encabezado += data[start:end]
+
+    def on_header_end(self):
+        self._encabezados[self._nombre_encabezado.lower()] = self._valor_encabezado
+        self._nombre_encabezado = b""
+        self._valor_encabezado = b""
+
+    def on_headers_finished(self):
+        _, opciones = parse_options_header(self._encabezados.get(b"content-disposition", b""))
+        if b"name" not in opciones:
+            raise ValueError("Formulario inválido: una parte no tiene nombre")
+        self._campo = opciones[b"name"].decode("utf-8", errors="replace")
+        if b"filename" not in opciones:
+            return
+        nombre = opciones[b"filename"].decode("utf-8", errors="replace")
+        if self._campo != self.campo_archivo or self.archivo is not None:
+            raise ValueError(f"Solo se acepta un archivo, en el campo '{self.campo_archivo}'")
+        tipo = self._encabezados.get(b"content-type")
+        self.archivo = (nombre, tipo.decode("latin-1") if tipo else None)
+        self._es_archivo = True
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if self._es_archivo:
+            self.datos_archivo.append(data[start:end])
+            return
+        if len(self._datos) + end - start > MAXIMO_CAMPO:
+            raise ValueError(f"El campo '{self._campo}' supera los {MAXIMO_CAMPO} bytes")
+        self._datos += data[start:end]
+
+    def on_part_end(self):
+        if not self._es_archivo:
+            self.campos[self._campo] = self._datos.decode("utf-8", errors="replace")
+
+    def callbacks(self) -> dict:
+        return {
+            nombre: getattr(self, nombre) for nombre in (
+                "on_part_begin", "on_header_field", "on_header_value", "on_header_end",
+                "on_headers_finished", "on_part_data", "on_part_end"
+            )
+        }
+
+
+async def recibir_formulario(
+    request: Request,
+    campo_archivo: str,
+    maximo: int
+) -> Tuple[Dict[str, str], Optional[ArchivoRecibido]]:
+    """
+    Lee un multipart/form-data (o urlencoded, sin archivo) de request.stream():
+    devuelve los campos de texto y el archivo de `campo_archivo` (None si no
+    vino o vino vacío), escrito a un temporal a medida que llega. Si supera `maximo` bytes se corta la lectura
+    con ArchivoDemasiadoGrande. El temporal lo descarta quien llama.
+    """
+    tipo, opciones = parse_options_header(request.headers.get("content-type", ""))
+    if tipo == b"application/x-www-form-urlencoded":
+        # Sin archivo los clientes pueden mandar el formulario sin multipart
+        cuerpo = bytearray()
+        async for bloque in request.stream():
+            cuerpo += bloque
+            if len(cuerpo) > MAXIMO_CAMPO:
+                raise ValueError(f"El formulario supera los {MAXIMO_CAMPO} bytes")
+        return dict(parse_qsl(cuerpo.decode("utf-8", errors="replace"), keep_blank_values=True)), None
+    if tipo != b"multipart/form-data" or b"boundary" not in opciones:
+        raise ValueError("Se esperaba un formulario multipart/form-data")
+    lector = _LectorFormulario(campo_archivo)
+    parser = MultipartParser(opciones[b"boundary"], lector.callbacks())
+
+    async def bloques_archivo() -> AsyncIterator[bytes]:
+        async for bloque in request.stream():
+            parser.write(bloque)
+            if lector.datos_archivo:
+                datos = b"".join(lector.datos_archivo)
+                lector.datos_archivo.clear()
+                yield datos
+        parser.finalize()
+
+    ruta = ruta_temporal()
+    hash_ = hashlib.sha256()
+    try:
+        tamaño = await escribir_bloques(bloques_archivo(), ruta, maximo, hash_=hash_)
+    except BaseException:
+        await descartar(ruta)
+        raise
+    # Sin archivo elegido los navegadores mandan la parte con filename="" y sin contenido
+    if lector.archivo is None or (not lector.archivo[0] and tamaño == 0):
+        await descartar(ruta)
+        return lector.campos, None
+    nombre, tipo_archivo = lector.archivo
+    return lector.campos, ArchivoRecibido(nombre, tipo_archivo, ruta, hash_.hexdigest(), tamaño)
+
+
+def _sha256(ruta: str) -> str:
+    with open(ruta, "rb") as archivo:
+        return hashlib.file_digest(archivo, "sha256").hexdigest()
+
+
+async def sha256_archivo(ruta: str) -> str:
+    return await run_in_threadpool(_sha256, ruta)
+
+
+async def tamaño_archivo(ruta: str) -> int:
+    try:
+        return await run_in_threadpool(os.path.getsize, ruta)
+    except FileNotFoundError:
+        return 0
+
+
+async def existe(ruta: str) -> bool:
+    return await run_in_threadpool(os.path.isfile, ruta)
+
+
+def _agregar(origen: str, destino: str) -> int:
+    with open(origen, "rb") as entrada, open(destino, "ab") as salida:
+        shutil.copyfileobj(entrada, salida, TAMAÑO_BLOQUE)
+        return entrada.tell()
+
+
+async def agregar_archivo(origen: str, destino: str) -> int:
+    """Agrega el contenido de `origen` al final de `destino`; devuelve los bytes agregados"""
+    return await run_in_threadpool(_agregar, origen, destino)
+
+
+def _crear_vacio(ruta: str) -> None:
+    open(ruta, "wb").close()
+
+
+async def crear_vacio(ruta: str) -> None:
+    await run_in_threadpool(_crear_vacio, ruta)
+
+
+def _mover(origen: str, destino: str) -> None:
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    os.replace(origen, destino)
+
+
+async def mover_atomico(origen: str, destino: str) -> None:
+    """Rename atómico del temporal a su ruta definitiva (mismo filesystem)"""
+    await run_in_threadpool(_mover, origen, destino)
+
+
+def _borrar(ruta: str) -> None:
+    try:
+        os.remove(ruta)
+    except FileNotFoundError:
+        pass
+
+
+async def descartar(ruta: str) -> None:
+    await run_in_threadpool(_borrar, ruta)
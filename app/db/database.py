@@ -1,8 +1,50 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import registrar_query
+import time
 
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+
+# Réplica de lectura opcional para reportes y exportaciones (ver app/db/replica.py).
+# Las sesiones se abren en modo solo lectura, así que apuntar DATABASE_REPLICA_URL
+# al mismo DSN que DATABASE_URL sirve para probar el ruteo localmente.
+replica_engine = create_engine(
+    settings.DATABASE_REPLICA_URL,
+    pool_pre_ping=True,
+    connect_args={
+        "connect_timeout": settings.REPLICA_CONNECT_TIMEOUT,
+        "options": "-c default_transaction_read_only=on"
+    }
+) if settings.DATABASE_REPLICA_URL else None
+ReplicaSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=replica_engine, info={"replica": True}
+) if replica_engine is not None else None
+
+
+def instrumentar_engine(engine):
+    """Registra cantidad y duración de cada query en las métricas del request en curso"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_inicio", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _despues(conn, cursor, statement, parameters, context, executemany):
+        inicio = conn.info["query_inicio"].pop()
+        registrar_query(statement, (time.perf_counter() - inicio) * 1000)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_inicio"):
+            conn.info["query_inicio"].pop()
+
+
+if settings.METRICS_ENABLED:
+    instrumentar_engine(engine)
+    if replica_engine is not None:
+        instrumentar_engine(replica_engine)
@@ -1,8 +1,17 @@
 from app.db.database import SessionLocal
+from app.db.replica import nueva_sesion_lectura
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_db_lectura():
+    """Sesión para endpoints de solo lectura: réplica si está al día, si no el primario"""
+    db = nueva_sesion_lectura()
+    try:
+        yield db
+    finally:
+        db.close()
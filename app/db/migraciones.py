@@ -0,0 +1,268 @@
+# app/db/migraciones.py
+"""
+Runner de migraciones versionadas.
+
+Las migraciones viven en migrations/ con nombre NNNN_descripcion.sql o
+NNNN_descripcion.py (esta última con una función upgrade(connection)) y se
+registran en la tabla schema_version al aplicarse.
+
+- Se aplican con `python migrate.py` o una única vez en el master de gunicorn
+  (MIGRATE_ON_START), nunca desde los workers: cada worker solo compara la
+  versión de la base con la última disponible (una consulta).
+- Un advisory lock de PostgreSQL serializa runners concurrentes.
+- Cada migración corre en su propia transacción con lock_timeout, para no
+  quedar encolada detrás de transacciones largas bloqueando el tráfico. Las que
+  no pueden ir en transacción (CREATE INDEX CONCURRENTLY) lo declaran con la
+  primera línea `-- sin transaccion` (SQL) o TRANSACCIONAL = False (Python);
+  en ese caso el SQL se ejecuta sentencia por sentencia (sin bloques $$).
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import importlib.util
+import logging
+import re
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+
+logger = logging.getLogger(__name__)
+
+MIGRACIONES_DIR = Path(__file__).resolve().parents[2] / "migrations"
+
+# Clave del advisory lock que serializa la aplicación de migraciones
+ADVISORY_LOCK_MIGRACIONES = 7_031_001
+
+# Tiempo máximo de espera por un lock de tabla antes de abortar la migración
+LOCK_TIMEOUT = "15s"
+
+_PATRON_ARCHIVO = re.compile(r"^(\d{4})_(\w+)\.(sql|py)$")
+_MARCA_SIN_TRANSACCION = "-- sin transaccion"
+
+
+class Migracion:
+    """Una migración versionada en disco"""
+
+    __slots__ = ("version", "nombre", "ruta", "_cargado")
+
+    def __init__(self, version: int, nombre: str, ruta: Path):
+        self.version = version
+        self.nombre = nombre
+        self.ruta = ruta
+        self._cargado = None
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.ruta.read_bytes()).hexdigest()
+
+    @property
+    def transaccional(self) -> bool:
+        if self.ruta.suffix == ".sql":
+            primera_linea = self.ruta.read_text(encoding="utf-8").lstrip().split("\n", 1)[0]
+            return primera_linea.strip().lower() != _MARCA_SIN_TRANSACCION
+        return getattr(self._modulo(), "TRANSACCIONAL", True)
+
+    def _modulo(self):
+        if self._cargado is None:
+            spec = importlib.util.spec_from_file_location(f"migracion_{self.version:04d}", self.ruta)
+            self._cargado = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(self._cargado)
+        return self._cargado
+
+    def ejecutar(self, connection):
+        if self.ruta.suffix == ".sql":
+            contenido = self.ruta.read_text(encoding="utf-8")
+            if self.transaccional:
+                connection.exec_driver_sql(contenido)
+            else:
+                # Varias sentencias en un solo envío forman un bloque de transacción implícito
+                for sentencia in _sentencias(contenido):
+                    connection.exec_driver_sql(sentencia)
+        else:
+            self._modulo().upgrade(connection)
+
+    def __repr__(self) -> str:
+        return f"{self.version:04d}_{self.nombre}"
+
+
+def _sentencias(contenido: str) -> List[str]:
+    """Separa un script SQL en sentencias terminadas en ';' al final de línea"""
+    sentencias = []
+    for bloque in re.split(r";[ \t]*(?:\n|$)", contenido):
+        lineas = [l for l in bloque.splitlines() if l.strip() and not l.strip().startswith("--")]
+        if lineas:
+            sentencias.append("\n".join(lineas))
+    return sentencias
+
+
+def descubrir_migraciones(directorio: Path = MIGRACIONES_DIR) -> List[Migracion]:
+    """Lista las migraciones del directorio ordenadas por versión (sin leer su contenido)"""
+    if not directorio.is_dir():
+        raise FileNotFoundError(
+            f"No se encontró el directorio de migraciones {directorio}: "
+            "la imagen o el despliegue tiene que incluir migrations/ junto al paquete app"
+        )
+    migraciones: Dict[int, Migracion] = {}
+    for ruta in directorio.iterdir():
+        coincidencia = _PATRON_ARCHIVO.match(ruta.name)
+        if not coincidencia:
+            continue
+        version = int(coincidencia.group(1))
+        if version in migraciones:
+            raise ValueError(f"Versión de migración duplicada: {ruta.name} y {migraciones[version].ruta.name}")
+        migraciones[version] = Migracion(version, coincidencia.group(2), ruta)
+    return [migraciones[v] for v in sorted(migraciones)]
+
+
+def ultima_version(directorio: Path = MIGRACIONES_DIR) -> int:
+    migraciones = descubrir_migraciones(directorio)
+    return migraciones[-1].version if migraciones else 0
+
+
+def _crear_tabla_version(connection):
+    connection.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            nombre VARCHAR(200) NOT NULL,
+            checksum VARCHAR(64) NOT NULL,
+            aplicada_en TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+            duracion_ms INTEGER
+        )
+    """))
+
+
+def versiones_aplicadas(connection) -> Dict[int, Dict]:
+    filas = connection.execute(text(
+        "SELECT version, nombre, checksum, aplicada_en, duracion_ms FROM schema_version ORDER BY version"
+    )).mappings().all()
+    return {fila["version"]: dict(fila) for fila in filas}
+
+
+def version_actual(connection) -> int:
+    """Versión aplicada más alta; 0 si la base todavía no tiene schema_version"""
+    try:
+        return connection.execute(text("SELECT COALESCE(MAX(version), 0) FROM schema_version")).scalar()
+    except ProgrammingError:
+        connection.rollback()
+        return 0
+
+
+def verificar_esquema(engine, directorio: Path = MIGRACIONES_DIR) -> Dict:
+    """Chequeo barato para el arranque de los workers: no ejecuta DDL ni toma locks"""
+    with engine.connect() as connection:
+        actual = version_actual(connection)
+    ultima = ultima_version(directorio)
+    return {
+        "version_actual": actual,
+        "ultima_version": ultima,
+        "pendientes": max(ultima - actual, 0)
+    }
+
+
+def _con_lock(engine, funcion):
+    with engine.connect() as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:clave)"), {"clave": ADVISORY_LOCK_MIGRACIONES})
+        connection.commit()
+        try:
+            with connection.begin():
+                _crear_tabla_version(connection)
+            return funcion(connection)
+        finally:
+            if connection.in_transaction():
+                connection.rollback()
+            connection.execute(text("SELECT pg_advisory_unlock(:clave)"), {"clave": ADVISORY_LOCK_MIGRACIONES})
+            connection.commit()
+
+
+def _registrar(connection, migracion: Migracion, duracion_ms: Optional[int]):
+    connection.execute(text("""
+        INSERT INTO schema_version (version, nombre, checksum, duracion_ms)
+        VALUES (:version, :nombre, :checksum, :duracion_ms)
+    """), {
+        "version": migracion.version,
+        "nombre": migracion.nombre,
+        "checksum": migracion.checksum,
+        "duracion_ms": duracion_ms
+    })
+
+
+def aplicar_migraciones(engine, hasta: Optional[int] = None, directorio: Path = MIGRACIONES_DIR) -> List[Migracion]:
+    """
+    Aplica en orden las migraciones pendientes (hasta la versión indicada, inclusive).
+    Devuelve las migraciones aplicadas. Si una falla se revierte y se detiene.
+    """
+    def aplicar(connection) -> List[Migracion]:
+        aplicadas = versiones_aplicadas(connection)
+        connection.commit()
+        pendientes = [
+            m for m in descubrir_migraciones(directorio)
+            if m.version not in aplicadas and (hasta is None or m.version <= hasta)
+        ]
+        ejecutadas = []
+        for migracion in pendientes:
+            logger.info(f"🔄 Aplicando migración {migracion!r}...")
+            inicio = time.perf_counter()
+            if migracion.transaccional:
+                with connection.begin():
+                    connection.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+                    migracion.ejecutar(connection)
+                    _registrar(connection, migracion, int((time.perf_counter() - inicio) * 1000))
+            else:
+                nivel = connection.get_isolation_level()
+                connection.execution_options(isolation_level="AUTOCOMMIT")
+                try:
+                    migracion.ejecutar(connection)
+                    connection.commit()
+                finally:
+                    if connection.in_transaction():
+                        connection.rollback()
+                    connection.execution_options(isolation_level=nivel)
+                with connection.begin():
+                    _registrar(connection, migracion, int((time.perf_counter() - inicio) * 1000))
+            logger.info(f"✅ Migración {migracion!r} aplicada ({(time.perf_counter() - inicio) * 1000:.0f} ms)")
+            ejecutadas.append(migracion)
+        return ejecutadas
+
+    return _con_lock(engine, aplicar)
+
+
+def marcar_aplicadas(engine, hasta: int, directorio: Path = MIGRACIONES_DIR) -> List[Migracion]:
+    """
+    Registra como aplicadas, sin ejecutarlas, las migraciones hasta la versión dada.
+    Para bases que ya recibieron esos cambios con los scripts sueltos anteriores.
+    """
+    def marcar(connection) -> List[Migracion]:
+        aplicadas = versiones_aplicadas(connection)
+        connection.commit()
+        marcadas = [
+            m for m in descubrir_migraciones(directorio)
+            if m.version not in aplicadas and m.version <= hasta
+        ]
+        with connection.begin():
+            for migracion in marcadas:
+                _registrar(connection, migracion, None)
+        return marcadas
+
+    return _con_lock(engine, marcar)
+
+
+def estado_migraciones(engine, directorio: Path = MIGRACIONES_DIR) -> List[Dict]:
+    """Estado de cada migración en disco y aviso si un archivo aplicado cambió"""
+    with engine.connect() as connection:
+        try:
+            aplicadas = versiones_aplicadas(connection)
+        except ProgrammingError:
+            connection.rollback()
+            aplicadas = {}
+    estado = []
+    for migracion in descubrir_migraciones(directorio):
+        registro = aplicadas.get(migracion.version)
+        estado.append({
+            "version": migracion.version,
+            "nombre": migracion.nombre,
+            "aplicada_en": registro["aplicada_en"] if registro else None,
+            "modificada": bool(registro) and registro["checksum"] != migracion.checksum
+        })
+    return estado
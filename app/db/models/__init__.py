@@ -1,7 +1,7 @@
 from .usuario import Usuario
 from .maquina import Maquina
 from .proyecto import Proyecto
-from .contrato import Contrato, ContratoArchivo
+from .contrato import Contrato, ContratoArchivo, SubidaContrato
 from .gasto import Gasto
 from .pago import Pago
 from .producto import Producto
@@ -17,7 +17,14 @@ from .jornada_laboral import JornadaLaboral
 from .horometro_historial import HorometroHistorial
 from .nota_maquina import NotaMaquina
 from .reporte_cuenta_corriente import ReporteCuentaCorriente
-from .reporte_items import ReporteItemArido, ReporteItemHora
+from .reporte_items import ReporteItemArido, ReporteItemHora, ReporteLinea
 from .pago_reporte import PagoReporte
 from .cliente import Cliente
-from .cotizacion import Cotizacion, CotizacionItem
\ No newline at end of file
+from .cotizacion import Cotizacion, CotizacionItem
+from .uso_maquina import UsoMaquinaDiario, UsoMaquinaSemanal
+from .registro_stock import RegistroStock
+from .proyecto_version import ProyectoVersion
+from .proyecto_archivo import ProyectoArchivo, ReporteArchivado, HorasArchivadas
+from .lote_facturacion import LoteFacturacion
+from .precio_catalogo import PrecioCatalogo, PrecioCatalogoVersion
+from .rentabilidad_maquina import RentabilidadMaquinaMensual
@@ -30,6 +30,7 @@ class ContratoArchivo(Base):
     ruta_archivo = Column(String(500), nullable=False)
     tipo_archivo = Column(String(100), nullable=False)  # ✅ CAMBIADO: de 50 a 100
     tamaño_archivo = Column(BigInteger, nullable=False)
+    sha256 = Column(String(64), nullable=True)  # Contenido del archivo; filas con el mismo hash comparten ruta_archivo
     fecha_subida = Column(DateTime(timezone=True), server_default=func.now())  # ✅ CAMBIADO
     
     # Relación con proyecto
@@ -37,4 +38,25 @@ class ContratoArchivo(Base):
     
     # Timestamps
     created = Column(DateTime(timezone=True), server_default=func.now())
-    updated = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class SubidaContrato(Base):
+    """
+    Subida reanudable de un archivo de contrato en curso (ver
+    app/services/subida_contrato_service.py). Los bytes recibidos están en
+    uploads/.tmp/{id}.part; la fila se borra al completarse o cancelarse.
+    """
+    __tablename__ = "subida_contrato"
+
+    id = Column(String(32), primary_key=True)
+    proyecto_id = Column(Integer, ForeignKey("proyecto.id", ondelete="CASCADE"), nullable=False)
+    nombre_archivo = Column(String(255), nullable=False)
+    tipo_archivo = Column(String(100), nullable=False)
+    tamaño_total = Column(BigInteger, nullable=False)
+    recibido = Column(BigInteger, nullable=False, default=0)
+    sha256_esperado = Column(String(64), nullable=True)  # Opcional: se verifica al completar
+
+    # Timestamps
+    creado = Column(DateTime(timezone=True), server_default=func.now())
+    actualizado = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -5,6 +5,7 @@ from app.db.database import Base
 
 class EntregaArido(Base):
     __tablename__ = "entrega_arido"
+    # Particionada por mes de fecha_entrega (migración 0018, ver app/db/particiones.py)
     id = Column(Integer, primary_key=True, autoincrement=True)
     proyecto_id = Column(Integer, ForeignKey("proyecto.id"))
     usuario_id = Column(Integer, ForeignKey("usuario.id"))
@@ -13,6 +13,7 @@ class Gasto(Base):
     fecha = Column(DateTime)
     descripcion = Column(String(200))
     imagen = Column(LargeBinary)
+    imagen_sha256 = Column(String(64), nullable=True)  # Derivados WebP en disco (app/core/imagenes.py)
 
     # Relaciones
     usuario = relationship("Usuario", back_populates="gastos")
@@ -34,6 +34,7 @@ def _get_limites_dia(fecha: DateType) -> tuple[float, float]:
 
 class JornadaLaboral(Base):
     __tablename__ = "jornada_laboral"
+    # Particionada por mes de fecha (migración 0018, ver app/db/particiones.py)
     
     # Campos principales
     id = Column(Integer, primary_key=True, autoincrement=True)
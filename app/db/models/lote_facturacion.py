@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Numeric, Text, Index, text
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class LoteFacturacion(Base):
+    """
+    Corrida de facturación por lote: genera los reportes de cuenta corriente de
+    un período para todos los proyectos activos (ver app/services/facturacion_lote_service.py).
+    El progreso se guarda en la base para consultarlo desde cualquier worker.
+    """
+    __tablename__ = "lote_facturacion"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    periodo_inicio = Column(Date, nullable=False)
+    periodo_fin = Column(Date, nullable=False)
+    estado = Column(String(20), nullable=False, default="en_curso")  # "en_curso", "completado", "con_errores", "fallido" o "interrumpido"
+    total_proyectos = Column(Integer, nullable=False, default=0)
+    procesados = Column(Integer, nullable=False, default=0)
+    reportes_creados = Column(Integer, nullable=False, default=0)
+    omitidos = Column(Integer, nullable=False, default=0)
+    errores = Column(Integer, nullable=False, default=0)
+    importe_total = Column(Numeric(14, 2), nullable=False, default=0)
+    resultados = Column(Text, nullable=True)  # JSON: un resultado por proyecto
+
+    # Timestamps
+    iniciado = Column(DateTime(timezone=True), server_default=func.now())
+    actualizado = Column(DateTime(timezone=True), server_default=func.now())
+    finalizado = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Una sola corrida en curso por período
+        Index(
+            "uq_lote_facturacion_en_curso", "periodo_inicio", "periodo_fin",
+            unique=True, postgresql_where=text("estado = 'en_curso'")
+        ),
+    )
@@ -0,0 +1,42 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Date, DateTime, Numeric, UniqueConstraint, CheckConstraint
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class PrecioCatalogo(Base):
+    """
+    Precio de lista con vigencia: por m³ para un tipo de árido o por hora para
+    una máquina (por nombre; "default" para las que no tienen precio propio).
+    El intervalo es [vigente_desde, vigente_hasta); vigente_hasta NULL es el
+    precio actual. Se usa cuando el registro no tiene precio_unitario/tarifa_hora.
+    """
+    __tablename__ = "precio_catalogo"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    categoria = Column(String(20), nullable=False)  # "arido" o "maquina"
+    clave = Column(String(255), nullable=False)  # Tipo de árido o nombre exacto de la máquina
+    precio = Column(Numeric(14, 2), nullable=False)
+    vigente_desde = Column(Date, nullable=False)
+    vigente_hasta = Column(Date, nullable=True)
+
+    # Timestamps
+    created = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("categoria", "clave", "vigente_desde", name="uq_precio_catalogo_vigencia"),
+        CheckConstraint("vigente_hasta IS NULL OR vigente_hasta > vigente_desde", name="ck_precio_catalogo_intervalo"),
+    )
+
+
+class PrecioCatalogoVersion(Base):
+    """
+    Versión del catálogo de precios (una sola fila). La incrementa un trigger
+    ante cualquier cambio en precio_catalogo (migración 0022), así cada worker
+    sabe cuándo recargar su copia en memoria.
+    """
+    __tablename__ = "precio_catalogo_version"
+
+    id = Column(Integer, primary_key=True, default=1)
+    version = Column(BigInteger, nullable=False, default=0)
+
+    # Timestamps
+    updated = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -10,6 +10,7 @@ class Producto(Base):
     codigo_producto = Column(String(50))
     inventario = Column(Integer)
     url_imagen = Column(String(50), nullable=True)
+    imagen_sha256 = Column(String(64), nullable=True)  # Derivados WebP en disco (app/core/imagenes.py)
 
     # Relaciones
     movimientos_inventario = relationship("MovimientoInventario", back_populates="producto")
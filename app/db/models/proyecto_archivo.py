@@ -0,0 +1,53 @@
+from sqlalchemy import Column, Integer, String, DateTime, Date, Float, Numeric, ForeignKey, Text, Index
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class ProyectoArchivo(Base):
+    """
+    Proyecto cerrado cuyas horas, áridos, reportes de cuenta corriente y
+    archivos de contrato se movieron a archivos Parquet en disco
+    (ver app/services/archivo_frio_service.py).
+    """
+    __tablename__ = "proyecto_archivo"
+
+    proyecto_id = Column(Integer, ForeignKey("proyecto.id", ondelete="CASCADE"), primary_key=True)
+    ruta = Column(String(500), nullable=False)  # Directorio con un .parquet por tabla y manifest.json
+    filas = Column(Integer, nullable=False, default=0)  # Filas archivadas en total
+    bytes = Column(Integer, nullable=False, default=0)  # Tamaño en disco
+    manifiesto = Column(Text, nullable=True)  # Copia del manifest.json (filas y sha256 por tabla)
+
+    # Timestamps
+    archivado_en = Column(DateTime(timezone=True), server_default=func.now())
+
+class ReporteArchivado(Base):
+    """Índice de reportes de cuenta corriente archivados, para encontrarlos por id"""
+    __tablename__ = "reporte_archivado"
+
+    reporte_id = Column(Integer, primary_key=True)
+    proyecto_id = Column(Integer, ForeignKey("proyecto_archivo.proyecto_id", ondelete="CASCADE"), nullable=False)
+
+class HorasArchivadas(Base):
+    """
+    Horas de reporte_laboral de proyectos archivados, agregadas por día, para
+    que el cubo analítico y los rollups las sigan viendo sin leer los Parquet.
+    Se llena al archivar y se borra al restaurar.
+    """
+    __tablename__ = "horas_archivadas"
+
+    id = Column(Integer, primary_key=True)
+    proyecto_id = Column(Integer, ForeignKey("proyecto_archivo.proyecto_id", ondelete="CASCADE"), nullable=False)
+    maquina_id = Column(Integer, nullable=False)
+    usuario_id = Column(Integer, nullable=True)
+    fecha = Column(Date, nullable=True)  # fecha_asignacion::date
+    registros = Column(Integer, nullable=False)
+    horas = Column(Numeric(14, 2), nullable=False)
+    horas_sin_tarifa = Column(Numeric(14, 2), nullable=False)
+    importe = Column(Float, nullable=False)  # Suma de horas_turno × tarifa_hora (como el cubo)
+    importe_horas = Column(Numeric(16, 2), nullable=False)  # Redondeado por fila (como el rollup de rentabilidad)
+    horometro_min = Column(Float, nullable=True)
+    horometro_max = Column(Float, nullable=True)
+
+    __table_args__ = (
+        Index("idx_horas_archivadas_maquina_fecha", "maquina_id", "fecha"),
+        Index("idx_horas_archivadas_proyecto", "proyecto_id"),
+    )
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, BigInteger, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class ProyectoVersion(Base):
+    """
+    Contador de cambios de horas y áridos por proyecto.
+    Lo incrementan triggers por sentencia sobre reporte_laboral, entrega_arido
+    y los renombres de maquina (migraciones 0016 y 0030), así cualquier
+    escritura, desde cualquier worker, invalida los snapshots cacheados del
+    portal de clientes.
+    """
+    __tablename__ = "proyecto_version"
+
+    proyecto_id = Column(Integer, ForeignKey("proyecto.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+    # Timestamps
+    updated = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
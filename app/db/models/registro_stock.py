@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class RegistroStock(Base):
+    """
+    Libro de stock por producto: una fila por cada variación de inventario.
+    El stock de un producto a una fecha es la suma de `delta` hasta esa fecha.
+    """
+    __tablename__ = "registro_stock"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    producto_id = Column(Integer, ForeignKey("producto.id", ondelete="CASCADE"), nullable=False)
+    movimiento_id = Column(Integer, ForeignKey("movimiento_inventario.id", ondelete="SET NULL"), nullable=True)
+    delta = Column(Integer, nullable=False)
+    stock_resultante = Column(Integer, nullable=False)  # Inventario del producto tras aplicar el delta
+    motivo = Column(String(30), nullable=False)  # "apertura", "movimiento", "reversion", "ajuste_movimiento", "ajuste_manual"
+    fecha = Column(DateTime, nullable=False)  # Fecha efectiva de la variación
+
+    # Relaciones
+    producto = relationship("Producto")
+    movimiento = relationship("MovimientoInventario")
+
+    # Timestamps
+    created = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Índices
+    __table_args__ = (
+        Index('idx_registro_stock_producto_fecha', 'producto_id', 'fecha'),
+        Index('idx_registro_stock_movimiento', 'movimiento_id'),
+    )
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, Date, DateTime, Numeric, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class RentabilidadMaquinaMensual(Base):
+    """
+    Rollup mensual de la economía de cada máquina: horas e importe facturable
+    (horas_turno × tarifa_hora), gastos de combustible y otros, y costo de
+    mantenimientos. Lo mantienen triggers sobre reporte_laboral, gasto y
+    mantenimiento (migración 0023); las horas sin tarifa se valorizan al leer
+    con el catálogo de precios.
+    """
+    __tablename__ = "rentabilidad_maquina_mensual"
+
+    maquina_id = Column(Integer, ForeignKey("maquina.id", ondelete="CASCADE"), primary_key=True)
+    mes = Column(Date, primary_key=True)  # Primer día del mes
+    horas = Column(Numeric(14, 2), nullable=False, default=0)
+    horas_sin_tarifa = Column(Numeric(14, 2), nullable=False, default=0)
+    importe_horas = Column(Numeric(16, 2), nullable=False, default=0)  # Solo horas con tarifa_hora propia
+    gasto_combustible = Column(Numeric(16, 2), nullable=False, default=0)
+    gasto_otros = Column(Numeric(16, 2), nullable=False, default=0)
+    costo_mantenimiento = Column(Numeric(16, 2), nullable=False, default=0)
+
+    # Relaciones
+    maquina = relationship("Maquina")
+
+    # Timestamps
+    updated = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Índices
+    __table_args__ = (
+        Index('idx_rentabilidad_maquina_mes', 'mes'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Boolean, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
@@ -32,3 +32,32 @@ class ReporteItemHora(Base):
     # Relaciones
     reporte = relationship("ReporteCuentaCorriente", back_populates="items_horas_rel")
     reporte_laboral = relationship("ReporteLaboral")
+
+
+class ReporteLinea(Base):
+    """
+    Línea con precio congelada al crear un reporte de cuenta corriente: una por
+    entrega de árido o reporte laboral incluido, con la cantidad, el precio y el
+    importe vigentes en ese momento. El detalle y las exportaciones del reporte
+    se arman solo con estas líneas, así no cambian si después cambian los precios.
+    """
+    __tablename__ = "reporte_linea"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    reporte_id = Column(Integer, ForeignKey("reportes_cuenta_corriente.id", ondelete="CASCADE"), nullable=False)
+    tipo = Column(String(10), nullable=False)  # "arido" o "horas"
+    origen_id = Column(Integer, nullable=False)  # entrega_arido.id o reporte_laboral.id (sin FK: sobrevive al archivo)
+    maquina_id = Column(Integer, nullable=True)  # Solo en líneas de horas
+    etiqueta = Column(String(255), nullable=False)  # Tipo de árido o nombre de la máquina
+    fecha = Column(Date, nullable=False)
+    cantidad = Column(Float, nullable=False)  # m³ o horas
+    precio_unitario = Column(Float, nullable=False)
+    precio_informado = Column(Boolean, nullable=False)  # False si el precio salió de la tabla por defecto
+    importe = Column(Float, nullable=False)
+    usuario_nombre = Column(String(255), nullable=True)
+    pagado = Column(Boolean, default=False, nullable=False)  # Se sincroniza desde actualizar_items_pago
+
+    __table_args__ = (
+        Index("idx_reporte_linea_reporte_id", "reporte_id", "tipo"),
+        Index("idx_reporte_linea_origen", "tipo", "origen_id"),
+    )
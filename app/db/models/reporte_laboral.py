@@ -5,6 +5,7 @@ from sqlalchemy.sql import func
 
 class ReporteLaboral(Base):
     __tablename__ = "reporte_laboral"
+    # Particionada por mes de fecha_asignacion (migración 0018, ver app/db/particiones.py)
     id = Column(Integer, primary_key=True, autoincrement=True)
     maquina_id = Column(Integer, ForeignKey("maquina.id"))
     usuario_id = Column(Integer, ForeignKey("usuario.id"))
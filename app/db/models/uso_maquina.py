@@ -0,0 +1,59 @@
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class UsoMaquinaDiario(Base):
+    """
+    Rollup diario de uso por máquina.
+    Se mantiene de forma incremental cada vez que se crea, modifica o elimina un
+    reporte laboral, de modo que los gráficos de uso no recorren reporte_laboral.
+    """
+    __tablename__ = "uso_maquina_diario"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    maquina_id = Column(Integer, ForeignKey("maquina.id", ondelete="CASCADE"), nullable=False)
+    fecha = Column(Date, nullable=False)
+    horas = Column(Float, nullable=False, default=0)
+    registros = Column(Integer, nullable=False, default=0)
+    horometro_min = Column(Float, nullable=True)  # Menor lectura de horómetro del día
+    horometro_max = Column(Float, nullable=True)  # Mayor lectura de horómetro del día
+
+    # Relaciones
+    maquina = relationship("Maquina")
+
+    # Timestamps
+    updated = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Índices
+    __table_args__ = (
+        UniqueConstraint('maquina_id', 'fecha', name='uq_uso_maquina_diario'),
+        Index('idx_uso_maquina_diario_fecha', 'fecha'),
+    )
+
+
+class UsoMaquinaSemanal(Base):
+    """
+    Rollup semanal de uso por máquina (semana ISO, comienza el lunes).
+    """
+    __tablename__ = "uso_maquina_semanal"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    maquina_id = Column(Integer, ForeignKey("maquina.id", ondelete="CASCADE"), nullable=False)
+    semana_inicio = Column(Date, nullable=False)
+    horas = Column(Float, nullable=False, default=0)
+    registros = Column(Integer, nullable=False, default=0)
+    horometro_min = Column(Float, nullable=True)
+    horometro_max = Column(Float, nullable=True)
+
+    # Relaciones
+    maquina = relationship("Maquina")
+
+    # Timestamps
+    updated = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Índices
+    __table_args__ = (
+        UniqueConstraint('maquina_id', 'semana_inicio', name='uq_uso_maquina_semanal'),
+        Index('idx_uso_maquina_semanal_semana', 'semana_inicio'),
+    )
@@ -0,0 +1,563 @@
+# app/db/particiones.py
+"""
+Particionado mensual por rango de fecha de las tablas históricas.
+
+- entrega_arido (fecha_entrega), reporte_laboral (fecha_asignacion) y
+  jornada_laboral (fecha) se particionan por mes: las consultas de facturación
+  y liquidación filtran por rango de fechas y PostgreSQL descarta las
+  particiones fuera del rango. Las filas sin fecha o fuera de las particiones
+  existentes van a la partición default.
+- `particionar_tabla` convierte una tabla existente sin cortar el servicio:
+  un trigger espejo replica los cambios en la tabla nueva mientras se copian
+  los datos por lotes, y el reemplazo final es un rename bajo lock breve.
+- `crear_particiones_futuras` mantiene creadas las particiones de los próximos
+  meses (tarea diaria del scheduler y `python particiones.py --crear`).
+- `archivar_anio` junta los meses de un año cerrado en una partición anual
+  congelada (VACUUM FREEZE), y `desvincular_anio` la saca de la tabla al
+  esquema `archivo`, de modo que vacuum y mantenimiento de índices no crecen
+  con la historia.
+
+PostgreSQL no admite FKs hacia una tabla particionada cuya clave única no
+incluya la columna de partición: las FKs que apuntaban a estas tablas se
+reemplazan por triggers con la misma acción ON DELETE. Las FKs que salen de
+estas tablas (a proyecto, usuario, maquina) sí se mantienen en la particionada.
+"""
+
+from datetime import date
+from typing import Dict, List, Optional
+import logging
+import re
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+# Tabla -> columna de partición
+TABLAS_PARTICIONADAS: Dict[str, str] = {
+    "entrega_arido": "fecha_entrega",
+    "reporte_laboral": "fecha_asignacion",
+    "jornada_laboral": "fecha",
+}
+
+# Meses hacia adelante que se mantienen creados
+MESES_FUTUROS = 3
+
+# Filas copiadas por transacción durante la conversión
+TAMANO_LOTE = 5000
+
+# Clave del advisory lock que serializa el mantenimiento de particiones
+ADVISORY_LOCK_PARTICIONES = 7_035_001
+
+ESQUEMA_ARCHIVO = "archivo"
+LOCK_TIMEOUT = "5s"
+REINTENTOS_LOCK = 5
+
+
+# ============= Nombres y fechas =============
+
+def _mes(fecha: date) -> date:
+    return date(fecha.year, fecha.month, 1)
+
+
+def _sumar_meses(mes: date, meses: int) -> date:
+    indice = mes.year * 12 + mes.month - 1 + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def _recortar(nombre: str) -> str:
+    """Los identificadores de PostgreSQL tienen como máximo 63 caracteres"""
+    return nombre[:63]
+
+
+def nombre_particion(tabla: str, mes: date) -> str:
+    return f"{tabla}_{mes:%Y_%m}"
+
+
+def nombre_default(tabla: str) -> str:
+    return f"{tabla}_default"
+
+
+def nombre_anual(tabla: str, anio: int) -> str:
+    return f"{tabla}_{anio}"
+
+
+def _columna(tabla: str) -> str:
+    if tabla not in TABLAS_PARTICIONADAS:
+        raise ValueError(f"La tabla {tabla} no está configurada para particionado")
+    return TABLAS_PARTICIONADAS[tabla]
+
+
+# ============= Consultas de catálogo =============
+
+def es_particionada(connection, tabla: str) -> bool:
+    return bool(connection.execute(text(
+        "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:tabla)"
+    ), {"tabla": f"public.{tabla}"}).scalar())
+
+
+def _existe(connection, nombre: str, esquema: str = "public") -> bool:
+    return connection.execute(
+        text("SELECT to_regclass(:nombre) IS NOT NULL"), {"nombre": f"{esquema}.{nombre}"}
+    ).scalar()
+
+
+def listar_particiones(connection, tabla: str) -> List[Dict]:
+    """Particiones de la tabla con sus límites y filas estimadas"""
+    return [dict(f) for f in connection.execute(text("""
+        SELECT c.relname AS nombre,
+               pg_get_expr(c.relpartbound, c.oid) AS limites,
+               GREATEST(c.reltuples, 0)::bigint AS filas_estimadas,
+               pg_total_relation_size(c.oid) AS bytes
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(:tabla)
+        ORDER BY c.relname
+    """), {"tabla": f"public.{tabla}"}).mappings().all()]
+
+
+def _ejecutar_con_reintentos(engine, funcion, descripcion: str):
+    """Ejecuta `funcion(connection)` en una transacción con lock_timeout, reintentando si no consigue el lock"""
+    for intento in range(1, REINTENTOS_LOCK + 1):
+        try:
+            with engine.begin() as connection:
+                connection.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+                return funcion(connection)
+        except OperationalError as e:
+            if "lock timeout" not in str(e) or intento == REINTENTOS_LOCK:
+                raise
+            logger.warning(f"⏳ {descripcion}: lock ocupado, reintento {intento}/{REINTENTOS_LOCK}")
+            time.sleep(intento)
+
+
+# ============= Creación de particiones =============
+
+def crear_particion(connection, tabla: str, mes: date) -> bool:
+    """
+    Crea la partición del mes si no existe. Se crea suelta y se adjunta con
+    ATTACH PARTITION, que toma SHARE UPDATE EXCLUSIVE sobre la tabla (no bloquea
+    lecturas ni escrituras, a diferencia de CREATE TABLE ... PARTITION OF).
+    La partición default sí queda bloqueada (ACCESS EXCLUSIVE) hasta el commit:
+    ATTACH la recorre para validar que no tenga filas del mes, así que las
+    escrituras que caen en la default esperan mientras tanto. Las filas de ese
+    mes que ya estaban en la default se mueven en la misma transacción, con la
+    default bloqueada antes, para que no entre ninguna nueva entre el movimiento
+    y el ATTACH. Por eso conviene tener las particiones creadas con anticipación
+    (MESES_FUTUROS) y la default casi vacía.
+    """
+    columna = _columna(tabla)
+    nombre = nombre_particion(tabla, mes)
+    if _existe(connection, nombre):
+        return False
+
+    desde, hasta = mes, _sumar_meses(mes, 1)
+    default = nombre_default(tabla)
+    connection.execute(text(f"CREATE TABLE {nombre} (LIKE {tabla} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    if _existe(connection, default):
+        connection.execute(text(f"LOCK TABLE {default} IN ACCESS EXCLUSIVE MODE"))
+        movidas = connection.execute(text(f"""
+            WITH movidas AS (
+                DELETE FROM {default} WHERE {columna} >= :desde AND {columna} < :hasta RETURNING *
+            )
+            INSERT INTO {nombre} SELECT * FROM movidas
+        """), {"desde": desde, "hasta": hasta}).rowcount
+        if movidas:
+            logger.warning(f"⚠️  {movidas} filas de {mes:%Y-%m} movidas de {default} a {nombre}")
+    connection.execute(text(
+        f"ALTER TABLE {tabla} ATTACH PARTITION {nombre} FOR VALUES FROM ('{desde}') TO ('{hasta}')"
+    ))
+    logger.info(f"📅 Partición {nombre} creada")
+    return True
+
+
+def crear_particiones_futuras(engine, meses: int = MESES_FUTUROS, hoy: Optional[date] = None) -> List[str]:
+    """
+    Asegura las particiones del mes actual y de los `meses` siguientes en todas
+    las tablas particionadas. Si otro proceso ya lo está haciendo, no hace nada.
+    """
+    actual = _mes(hoy or date.today())
+    creadas = []
+
+    def crear(connection):
+        creadas.clear()
+        if not connection.execute(
+            text("SELECT pg_try_advisory_xact_lock(:clave)"), {"clave": ADVISORY_LOCK_PARTICIONES}
+        ).scalar():
+            return
+        for tabla in TABLAS_PARTICIONADAS:
+            if not es_particionada(connection, tabla):
+                continue
+            for i in range(meses + 1):
+                mes = _sumar_meses(actual, i)
+                if crear_particion(connection, tabla, mes):
+                    creadas.append(nombre_particion(tabla, mes))
+
+    _ejecutar_con_reintentos(engine, crear, "Creación de particiones")
+    return creadas
+
+
+# ============= Conversión de una tabla existente =============
+
+def _indices_a_copiar(connection, tabla: str, columna: str) -> List[Dict]:
+    """Índices secundarios de la tabla original que se recrean en la particionada"""
+    indices = []
+    for fila in connection.execute(text("""
+        SELECT i.relname AS nombre, pg_get_indexdef(i.oid) AS definicion, ix.indisunique AS unico
+        FROM pg_index ix
+        JOIN pg_class i ON i.oid = ix.indexrelid
+        WHERE ix.indrelid = to_regclass(:tabla) AND NOT ix.indisprimary
+    """), {"tabla": f"public.{tabla}"}).mappings():
+        cuerpo = fila["definicion"].split(" USING ", 1)[1]
+        if fila["unico"] and columna not in cuerpo:
+            logger.warning(f"⚠️  Índice único {fila['nombre']} omitido: no incluye {columna}")
+            continue
+        indices.append({"nombre": fila["nombre"], "cuerpo": cuerpo, "unico": fila["unico"]})
+    return indices
+
+
+def _fks_salientes(connection, tabla: str) -> List[Dict]:
+    """FKs de la tabla hacia otras (LIKE no las copia)"""
+    return [dict(f) for f in connection.execute(text("""
+        SELECT conname AS nombre, pg_get_constraintdef(oid) AS definicion
+        FROM pg_constraint
+        WHERE contype = 'f' AND conrelid = to_regclass(:tabla)
+        ORDER BY conname
+    """), {"tabla": f"public.{tabla}"}).mappings().all()]
+
+
+def _crear_tabla_particionada(connection, tabla: str, nueva: str, columna: str, indices: List[Dict]):
+    connection.execute(text(f"""
+        CREATE TABLE {nueva} (LIKE {tabla} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS)
+        PARTITION BY RANGE ({columna})
+    """))
+    # Las FKs salientes (con su ON DELETE) se crean con la tabla vacía: se validan
+    # fila a fila durante la copia en lugar de recorrer la tabla bajo el lock final
+    for fk in _fks_salientes(connection, tabla):
+        connection.execute(text(f"ALTER TABLE {nueva} ADD CONSTRAINT {fk['nombre']} {fk['definicion']}"))
+    nullable = connection.execute(text("""
+        SELECT NOT attnotnull FROM pg_attribute
+        WHERE attrelid = to_regclass(:tabla) AND attname = :columna
+    """), {"tabla": f"public.{tabla}", "columna": columna}).scalar()
+    # La clave única tiene que incluir la columna de partición; con fechas nulas no puede ser PK
+    if nullable:
+        connection.execute(text(f"CREATE UNIQUE INDEX {_recortar(nueva + '_id_key')} ON {nueva} (id, {columna})"))
+    else:
+        connection.execute(text(f"ALTER TABLE {nueva} ADD CONSTRAINT {_recortar(nueva + '_pkey')} PRIMARY KEY (id, {columna})"))
+
+    for indice in indices:
+        unico = "UNIQUE " if indice["unico"] else ""
+        connection.execute(text(
+            f"CREATE {unico}INDEX {_recortar(indice['nombre'] + '_p')} ON {nueva} USING {indice['cuerpo']}"
+        ))
+
+    meses = {r[0] for r in connection.execute(text(
+        f"SELECT DISTINCT date_trunc('month', {columna})::date FROM {tabla} WHERE {columna} IS NOT NULL"
+    ))}
+    actual = _mes(date.today())
+    meses.update(_sumar_meses(actual, i) for i in range(MESES_FUTUROS + 1))
+    for mes in sorted(meses):
+        connection.execute(text(
+            f"CREATE TABLE {nombre_particion(tabla, mes)} PARTITION OF {nueva} "
+            f"FOR VALUES FROM ('{mes}') TO ('{_sumar_meses(mes, 1)}')"
+        ))
+    connection.execute(text(f"CREATE TABLE {nombre_default(tabla)} PARTITION OF {nueva} DEFAULT"))
+
+    # Cambios concurrentes en la tabla original durante la copia
+    connection.execute(text(f"""
+        CREATE FUNCTION {tabla}_espejo() RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM {nueva} WHERE id = OLD.id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {nueva} SELECT NEW.*;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """))
+    connection.execute(text(f"""
+        CREATE TRIGGER {tabla}_espejo AFTER INSERT OR UPDATE OR DELETE ON {tabla}
+        FOR EACH ROW EXECUTE FUNCTION {tabla}_espejo()
+    """))
+    # Lo posterior al trigger ya se replica: la copia por lotes llega hasta este id
+    tope = connection.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {tabla}")).scalar()
+    return len(meses), tope
+
+
+def _copiar_lote(engine, tabla: str, nueva: str, desde: int, tope: int, lote: int) -> Optional[int]:
+    """
+    Copia el siguiente lote de filas por id. Los ids hasta `tope` ya existían al
+    crear el trigger espejo, así que el lote no recibe filas nuevas; FOR SHARE
+    impide que cambien mientras se copian, y lo que el trigger haya escrito
+    para ese rango se reemplaza por la versión actual.
+    """
+    with engine.begin() as connection:
+        ids = connection.execute(text(
+            f"SELECT id FROM {tabla} WHERE id > :desde AND id <= :tope ORDER BY id LIMIT :lote FOR SHARE"
+        ), {"desde": desde, "tope": tope, "lote": lote}).scalars().all()
+        if not ids:
+            return None
+        rango = {"desde": desde, "hasta": ids[-1]}
+        connection.execute(text(f"DELETE FROM {nueva} WHERE id > :desde AND id <= :hasta"), rango)
+        connection.execute(text(
+            f"INSERT INTO {nueva} SELECT * FROM {tabla} WHERE id > :desde AND id <= :hasta"
+        ), rango)
+        return ids[-1]
+
+
+def _reemplazar_fk(connection, tabla: str, fk: Dict):
+    """Reemplaza una FK hacia la tabla particionada por triggers equivalentes"""
+    referente, columna, accion = fk["referente"], fk["columna"], fk["accion"]
+    base = fk["nombre"]
+    if accion == "c":
+        al_borrar = f"DELETE FROM {referente} WHERE {columna} = OLD.id;"
+    elif accion == "n":
+        al_borrar = f"UPDATE {referente} SET {columna} = NULL WHERE {columna} = OLD.id;"
+    else:
+        al_borrar = f"""IF EXISTS (SELECT 1 FROM {referente} WHERE {columna} = OLD.id) THEN
+                RAISE EXCEPTION 'No se puede borrar %.id=%: referenciado desde {referente}.{columna}', TG_TABLE_NAME, OLD.id
+                    USING ERRCODE = 'foreign_key_violation';
+            END IF;"""
+
+    connection.execute(text(f"ALTER TABLE {referente} DROP CONSTRAINT {base}"))
+    # Mover una fila de partición (cambio de fecha) dispara DELETE + INSERT: si el
+    # id sigue existiendo no es un borrado real
+    connection.execute(text(f"""
+        CREATE OR REPLACE FUNCTION {_recortar(base + '_del')}() RETURNS TRIGGER AS $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM {tabla} WHERE id = OLD.id) THEN
+                RETURN NULL;
+            END IF;
+            {al_borrar}
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """))
+    connection.execute(text(f"""
+        CREATE TRIGGER {_recortar(base + '_del')} AFTER DELETE ON {tabla}
+        FOR EACH ROW EXECUTE FUNCTION {_recortar(base + '_del')}()
+    """))
+    connection.execute(text(f"""
+        CREATE OR REPLACE FUNCTION {_recortar(base + '_chk')}() RETURNS TRIGGER AS $$
+        BEGIN
+            IF NEW.{columna} IS NULL THEN
+                RETURN NEW;
+            END IF;
+            -- Como una FK: el lock impide que un borrado concurrente deje la fila huérfana
+            PERFORM 1 FROM {tabla} WHERE id = NEW.{columna} FOR KEY SHARE;
+            IF NOT FOUND THEN
+                RAISE EXCEPTION '{referente}.{columna}=% no existe en {tabla}', NEW.{columna}
+                    USING ERRCODE = 'foreign_key_violation';
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """))
+    connection.execute(text(f"""
+        CREATE TRIGGER {_recortar(base + '_chk')} BEFORE INSERT OR UPDATE OF {columna} ON {referente}
+        FOR EACH ROW EXECUTE FUNCTION {_recortar(base + '_chk')}()
+    """))
+
+
+def _intercambiar(connection, tabla: str, nueva: str, indices: List[Dict]):
+    """Reemplazo final bajo ACCESS EXCLUSIVE: la tabla particionada pasa a llamarse como la original"""
+    legado = f"{tabla}_legacy"
+    connection.execute(text(f"LOCK TABLE {tabla} IN ACCESS EXCLUSIVE MODE"))
+
+    triggers = connection.execute(text("""
+        SELECT tgname, pg_get_triggerdef(oid) FROM pg_trigger
+        WHERE tgrelid = to_regclass(:tabla) AND NOT tgisinternal AND tgname <> :espejo
+    """), {"tabla": f"public.{tabla}", "espejo": f"{tabla}_espejo"}).all()
+    fks = connection.execute(text("""
+        SELECT con.conname AS nombre, ref.relname AS referente, att.attname AS columna, con.confdeltype AS accion
+        FROM pg_constraint con
+        JOIN pg_class ref ON ref.oid = con.conrelid
+        JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = con.conkey[1]
+        WHERE con.contype = 'f' AND con.confrelid = to_regclass(:tabla)
+    """), {"tabla": f"public.{tabla}"}).mappings().all()
+    secuencia = connection.execute(
+        text("SELECT pg_get_serial_sequence(:tabla, 'id')"), {"tabla": tabla}
+    ).scalar()
+    salientes = _fks_salientes(connection, tabla)
+    copiadas = {fk["nombre"] for fk in _fks_salientes(connection, nueva)}
+    if copiadas != {fk["nombre"] for fk in salientes}:
+        raise RuntimeError(
+            f"{nueva} tiene FKs {sorted(copiadas)} y {tabla} {sorted(fk['nombre'] for fk in salientes)}; no se reemplaza"
+        )
+
+    connection.execute(text(f"DROP TRIGGER {tabla}_espejo ON {tabla}"))
+    connection.execute(text(f"DROP FUNCTION {tabla}_espejo()"))
+
+    connection.execute(text(f"ALTER TABLE {tabla} RENAME TO {legado}"))
+    # La copia de verificación no debe frenar ni recibir cascadas de los borrados en las tablas referidas
+    for fk in salientes:
+        connection.execute(text(f"ALTER TABLE {legado} DROP CONSTRAINT {fk['nombre']}"))
+    for nombre_indice in connection.execute(text(
+        "SELECT indexrelid::regclass::text FROM pg_index WHERE indrelid = to_regclass(:legado)"
+    ), {"legado": f"public.{legado}"}).scalars().all():
+        connection.execute(text(f"ALTER INDEX {nombre_indice} RENAME TO {_recortar(nombre_indice + '_legacy')}"))
+
+    connection.execute(text(f"ALTER TABLE {nueva} RENAME TO {tabla}"))
+    for sufijo in ("_pkey", "_id_key"):
+        if _existe(connection, _recortar(nueva + sufijo)):
+            connection.execute(text(f"ALTER INDEX {_recortar(nueva + sufijo)} RENAME TO {_recortar(tabla + sufijo)}"))
+    for indice in indices:
+        connection.execute(text(f"ALTER INDEX {_recortar(indice['nombre'] + '_p')} RENAME TO {indice['nombre']}"))
+    if secuencia:
+        connection.execute(text(f"ALTER SEQUENCE {secuencia} OWNED BY {tabla}.id"))
+
+    for nombre_trigger, definicion in triggers:
+        connection.execute(text(f'DROP TRIGGER "{nombre_trigger}" ON {legado}'))
+        connection.execute(text(definicion))
+    for fk in fks:
+        _reemplazar_fk(connection, tabla, fk)
+
+
+def particionar_tabla(engine, tabla: str, lote: int = TAMANO_LOTE) -> bool:
+    """
+    Convierte `tabla` en una tabla particionada por mes sin bloquear escrituras
+    más que durante el rename final. La tabla original queda como
+    <tabla>_legacy para verificación; se borra a mano. Devuelve False si la
+    tabla ya estaba particionada.
+    """
+    columna = _columna(tabla)
+    nueva = f"{tabla}_particionada"
+
+    with engine.begin() as connection:
+        if es_particionada(connection, tabla):
+            return False
+        if _existe(connection, f"{tabla}_legacy"):
+            raise RuntimeError(f"Ya existe {tabla}_legacy de una conversión anterior; revisar y borrarla antes")
+        # Restos de un intento interrumpido
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {tabla}_espejo ON {tabla}"))
+        connection.execute(text(f"DROP FUNCTION IF EXISTS {tabla}_espejo()"))
+        connection.execute(text(f"DROP TABLE IF EXISTS {nueva}"))
+
+    def preparar(connection):
+        indices = _indices_a_copiar(connection, tabla, columna)
+        cantidad, tope = _crear_tabla_particionada(connection, tabla, nueva, columna, indices)
+        return indices, cantidad, tope
+
+    indices, cantidad, tope = _ejecutar_con_reintentos(engine, preparar, f"Preparación de {tabla}")
+    logger.info(f"🧱 {nueva}: {cantidad} particiones mensuales + default")
+
+    copiadas, desde, inicio = 0, 0, time.perf_counter()
+    while True:
+        hasta = _copiar_lote(engine, tabla, nueva, desde, tope, lote)
+        if hasta is None:
+            break
+        desde = hasta
+        copiadas += 1
+        if copiadas % 20 == 0:
+            logger.info(f"   {tabla}: copiado hasta id {hasta}")
+    logger.info(f"📦 {tabla}: datos copiados en {copiadas} lotes ({time.perf_counter() - inicio:.1f}s)")
+
+    _ejecutar_con_reintentos(engine, lambda c: _intercambiar(c, tabla, nueva, indices), f"Reemplazo de {tabla}")
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text(f"ANALYZE {tabla}"))
+    logger.info(f"✅ {tabla} particionada por {columna}; original en {tabla}_legacy")
+    return True
+
+
+# ============= Archivo de años cerrados =============
+
+def _validar_anio_cerrado(anio: int):
+    if anio >= date.today().year:
+        raise ValueError(f"El año {anio} no está cerrado")
+
+
+def archivar_anio(engine, tabla: str, anio: int) -> Optional[str]:
+    """
+    Reemplaza las particiones mensuales de un año cerrado por una partición
+    anual congelada. Las escrituras a ese año quedan bloqueadas mientras dura
+    la copia; el resto de la tabla sigue disponible.
+    """
+    _validar_anio_cerrado(anio)
+    columna = _columna(tabla)
+    anual = nombre_anual(tabla, anio)
+    desde, hasta = date(anio, 1, 1), date(anio + 1, 1, 1)
+
+    def archivar(connection):
+        if _existe(connection, anual):
+            return None
+        mensuales = [
+            p["nombre"] for p in listar_particiones(connection, tabla)
+            if re.fullmatch(rf"{re.escape(tabla)}_{anio}_\d{{2}}", p["nombre"])
+        ]
+        if not mensuales:
+            return None
+        connection.execute(text(f"CREATE TABLE {anual} (LIKE {tabla} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        for mensual in mensuales:
+            connection.execute(text(f"LOCK TABLE {mensual} IN SHARE MODE"))
+            connection.execute(text(f"INSERT INTO {anual} SELECT * FROM {mensual}"))
+        connection.execute(text(f"""
+            WITH movidas AS (
+                DELETE FROM {nombre_default(tabla)} WHERE {columna} >= :desde AND {columna} < :hasta RETURNING *
+            )
+            INSERT INTO {anual} SELECT * FROM movidas
+        """), {"desde": desde, "hasta": hasta})
+        # Con el CHECK, ATTACH no necesita recorrer la tabla para validar el rango
+        connection.execute(text(f"""
+            ALTER TABLE {anual} ADD CONSTRAINT {_recortar(anual + '_rango')}
+            CHECK ({columna} IS NOT NULL AND {columna} >= '{desde}' AND {columna} < '{hasta}')
+        """))
+        for mensual in mensuales:
+            connection.execute(text(f"ALTER TABLE {tabla} DETACH PARTITION {mensual}"))
+            connection.execute(text(f"DROP TABLE {mensual}"))
+        connection.execute(text(
+            f"ALTER TABLE {tabla} ATTACH PARTITION {anual} FOR VALUES FROM ('{desde}') TO ('{hasta}')"
+        ))
+        return anual
+
+    resultado = _ejecutar_con_reintentos(engine, archivar, f"Archivo de {tabla} {anio}")
+    if resultado:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text(f"VACUUM (FREEZE, ANALYZE) {anual}"))
+        logger.info(f"🗄️  {tabla}: {anio} archivado en {anual}")
+    return resultado
+
+
+def desvincular_anio(engine, tabla: str, anio: int) -> bool:
+    """Saca la partición anual de la tabla y la mueve al esquema de archivo (deja de verse en las consultas)"""
+    _validar_anio_cerrado(anio)
+    _columna(tabla)
+    anual = nombre_anual(tabla, anio)
+
+    def desvincular(connection):
+        if not _existe(connection, anual):
+            return False
+        connection.execute(text(f"ALTER TABLE {tabla} DETACH PARTITION {anual}"))
+        connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ESQUEMA_ARCHIVO}"))
+        connection.execute(text(f"ALTER TABLE {anual} SET SCHEMA {ESQUEMA_ARCHIVO}"))
+        return True
+
+    return _ejecutar_con_reintentos(engine, desvincular, f"Desvinculación de {anual}")
+
+
+def revincular_anio(engine, tabla: str, anio: int) -> bool:
+    """Vuelve a adjuntar una partición anual desvinculada"""
+    _columna(tabla)
+    anual = nombre_anual(tabla, anio)
+
+    def revincular(connection):
+        if not _existe(connection, anual, ESQUEMA_ARCHIVO):
+            return False
+        connection.execute(text(f"ALTER TABLE {ESQUEMA_ARCHIVO}.{anual} SET SCHEMA public"))
+        connection.execute(text(
+            f"ALTER TABLE {tabla} ATTACH PARTITION {anual} "
+            f"FOR VALUES FROM ('{date(anio, 1, 1)}') TO ('{date(anio + 1, 1, 1)}')"
+        ))
+        return True
+
+    return _ejecutar_con_reintentos(engine, revincular, f"Revinculación de {anual}")
+
+
+def estado_particiones(engine) -> Dict[str, List[Dict]]:
+    with engine.connect() as connection:
+        return {
+            tabla: listar_particiones(connection, tabla)
+            for tabla in TABLAS_PARTICIONADAS
+            if es_particionada(connection, tabla)
+        }
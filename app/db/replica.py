@@ -0,0 +1,176 @@
+# app/db/replica.py
+"""
+Ruteo de lecturas pesadas a la réplica.
+
+- `get_db_lectura` (app/db/dependencies.py) entrega una sesión de la réplica
+  para endpoints de solo lectura (resúmenes, APIs de consulta). No sirve para
+  leer por id lo que el cliente acaba de escribir (la exportación de un reporte
+  recién creado o pagado): esos endpoints siguen en el primario.
+- `@solo_lectura` marca un servicio como de solo lectura: si lo llaman con una
+  sesión del primario sin escrituras pendientes, se ejecuta con una sesión de
+  la réplica que se cierra al terminar. Solo sirve para servicios que devuelven
+  datos ya materializados (schemas, dicts, bytes), no objetos ORM.
+
+En ambos casos se vuelve al primario si no hay réplica configurada, si no
+responde o si su retraso de replicación supera REPLICA_MAX_LAG_SECONDS. El
+retraso se mide como mucho cada REPLICA_LAG_CHECK_SECONDS por worker.
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock
+import inspect
+import logging
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal, ReplicaSessionLocal, replica_engine
+
+logger = logging.getLogger(__name__)
+
+# Segundos de retraso de la réplica; 0 si está al día o si es un primario
+# (mismo DSN dos veces en desarrollo)
+_SQL_RETRASO = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class EstadoReplica:
+    """Disponibilidad de la réplica, medida con un intervalo mínimo entre chequeos"""
+
+    def __init__(self, engine, max_retraso: float, intervalo: float):
+        self.engine = engine
+        self.max_retraso = max_retraso
+        self.intervalo = intervalo
+        self._lock = Lock()
+        self._disponible = False
+        self._retraso = None
+        self._proximo_chequeo = 0.0
+
+    @property
+    def retraso(self):
+        return self._retraso
+
+    def disponible(self) -> bool:
+        if self.engine is None:
+            return False
+        if time.monotonic() < self._proximo_chequeo:
+            return self._disponible
+        # Un solo hilo mide; los demás usan el último resultado mientras tanto
+        if not self._lock.acquire(blocking=False):
+            return self._disponible
+        try:
+            self._actualizar(self._medir())
+        finally:
+            self._proximo_chequeo = time.monotonic() + self.intervalo
+            self._lock.release()
+        return self._disponible
+
+    def marcar_caida(self, error: Exception):
+        """Deja de usar la réplica hasta el próximo chequeo"""
+        with self._lock:
+            self._actualizar(None, error)
+            self._proximo_chequeo = time.monotonic() + self.intervalo
+
+    def _medir(self):
+        try:
+            with self.engine.connect() as connection:
+                return float(connection.execute(_SQL_RETRASO).scalar() or 0)
+        except Exception as e:
+            logger.debug(f"No se pudo medir el retraso de la réplica: {e}")
+            return None
+
+    def _actualizar(self, retraso, error: Exception = None):
+        disponible = retraso is not None and retraso <= self.max_retraso
+        if disponible != self._disponible:
+            if disponible:
+                logger.info(f"✅ Réplica de lectura disponible (retraso {retraso:.1f}s)")
+            elif retraso is None:
+                logger.warning(f"⚠️  Réplica de lectura no disponible, lecturas al primario{f': {error}' if error else ''}")
+            else:
+                logger.warning(
+                    f"⚠️  Réplica con {retraso:.1f}s de retraso (máximo {self.max_retraso:.0f}s), lecturas al primario"
+                )
+        self._disponible = disponible
+        self._retraso = retraso
+
+
+estado_replica = EstadoReplica(
+    replica_engine,
+    max_retraso=settings.REPLICA_MAX_LAG_SECONDS,
+    intervalo=settings.REPLICA_LAG_CHECK_SECONDS
+)
+
+
+def es_sesion_replica(session: Session) -> bool:
+    return bool(session.info.get("replica"))
+
+
+def _tiene_escrituras(session: Session) -> bool:
+    """Cambios sin commitear: leerlos de la réplica daría datos viejos"""
+    return bool(session.new or session.dirty or session.deleted or session.info.get("escrituras"))
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _marcar_escrituras(session, flush_context):
+    session.info["escrituras"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+@event.listens_for(SessionLocal, "after_rollback")
+def _limpiar_escrituras(session):
+    session.info.pop("escrituras", None)
+
+
+def nueva_sesion_lectura() -> Session:
+    """Sesión de la réplica si está disponible; si no, del primario"""
+    if estado_replica.disponible():
+        return ReplicaSessionLocal()
+    return SessionLocal()
+
+
+@contextmanager
+def sesion_replica():
+    db = ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def solo_lectura(funcion):
+    """
+    Marca un servicio como de solo lectura y lo ejecuta contra la réplica.
+    El servicio recibe la sesión como parámetro `db` o `session`.
+    """
+    firma = inspect.signature(funcion)
+    parametro = next((p for p in ("db", "session") if p in firma.parameters), None)
+    if parametro is None:
+        raise TypeError(f"{funcion.__qualname__} no recibe una sesión 'db' o 'session'")
+
+    @wraps(funcion)
+    def envoltura(*args, **kwargs):
+        argumentos = firma.bind(*args, **kwargs)
+        sesion = argumentos.arguments[parametro]
+        if es_sesion_replica(sesion) or _tiene_escrituras(sesion) or not estado_replica.disponible():
+            return funcion(*args, **kwargs)
+
+        try:
+            with sesion_replica() as replica:
+                argumentos.arguments[parametro] = replica
+                return funcion(*argumentos.args, **argumentos.kwargs)
+        except OperationalError as e:
+            # Réplica caída a mitad de la consulta: la lectura se puede repetir en el primario
+            estado_replica.marcar_caida(e)
+            return funcion(*args, **kwargs)
+
+    envoltura.solo_lectura = True
+    return envoltura
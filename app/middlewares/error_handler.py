@@ -1,13 +1,37 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi import FastAPI, Request, Response
 from fastapi.responses import JSONResponse
+import logging
 
-class ErrorHandler(BaseHTTPMiddleware):
-    def __init__(self, app: FastAPI) -> None:
-        super().__init__(app)
+logger = logging.getLogger(__name__)
+
+class ErrorHandler:
+    """
+    Middleware ASGI que convierte excepciones no manejadas en un JSON 500.
+    A diferencia de BaseHTTPMiddleware no crea una tarea ni envuelve el stream
+    de la respuesta, así que StreamingResponse (PDF, Excel) pasa sin overhead.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        respuesta_iniciada = False
+
+        async def send_wrapper(message):
+            nonlocal respuesta_iniciada
+            if message["type"] == "http.response.start":
+                respuesta_iniciada = True
+            await send(message)
 
-    async def dispatch(self, request: Request, call_next) -> Response | JSONResponse:
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            return JSONResponse(status_code=500, content={"message": str(e)})
\ No newline at end of file
+            # Si los headers ya salieron no se puede cambiar la respuesta
+            if respuesta_iniciada:
+                raise
+            logger.exception(f"Error no manejado en {scope['method']} {scope['path']}")
+            response = JSONResponse(status_code=500, content={"message": str(e)})
+            await response(scope, receive, send)
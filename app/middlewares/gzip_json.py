@@ -0,0 +1,62 @@
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+
+TIPOS_COMPRIMIBLES = ("application/json", "text/")
+
+
+def _comprimible(content_type: str) -> bool:
+    # Incluye los tipos propios application/vnd.*+json (p. ej. el formato columnar)
+    return content_type.startswith(TIPOS_COMPRIMIBLES) or content_type.split(";")[0].endswith("+json")
+
+
+class GZipJSONMiddleware:
+    """
+    Middleware ASGI que comprime con gzip las respuestas JSON/texto grandes.
+
+    A diferencia de GZipMiddleware de Starlette, solo retiene el inicio de la respuesta
+    cuando el content-type es comprimible: las descargas binarias (PDF, Excel, archivos)
+    pasan sin buffer ni recompresión, y las respuestas en streaming no se tocan.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, compresslevel: int = 6) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or "gzip" not in Headers(scope=scope).get("accept-encoding", ""):
+            await self.app(scope, receive, send)
+            return
+
+        inicio = None
+        comprimir = False
+
+        async def send_wrapper(message):
+            nonlocal inicio, comprimir
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                comprimir = (
+                    _comprimible(headers.get("content-type", ""))
+                    and "content-encoding" not in headers
+                )
+                if comprimir:
+                    inicio = message
+                else:
+                    await send(message)
+                return
+
+            if message["type"] == "http.response.body" and inicio is not None:
+                start, inicio = inicio, None
+                body = message.get("body", b"")
+                if not message.get("more_body", False) and len(body) >= self.minimum_size:
+                    body = gzip.compress(body, compresslevel=self.compresslevel)
+                    headers = MutableHeaders(scope=start)
+                    headers["Content-Encoding"] = "gzip"
+                    headers["Content-Length"] = str(len(body))
+                    headers.add_vary_header("Accept-Encoding")
+                    message = {**message, "body": body}
+                await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,50 @@
+from fastapi import FastAPI
+from typing import Callable, Dict, List
+import logging
+
+from app.core.config import settings
+from app.middlewares.error_handler import ErrorHandler
+from app.middlewares.gzip_json import GZipJSONMiddleware
+from app.middlewares.request_id import RequestIdMiddleware
+from app.middlewares.request_metrics import RequestMetricsMiddleware
+
+logger = logging.getLogger(__name__)
+
+# Middlewares disponibles para MIDDLEWARE_STACK. Todos son ASGI puros.
+MIDDLEWARES_DISPONIBLES: Dict[str, Callable[[FastAPI], None]] = {
+    "request_id": lambda app: app.add_middleware(RequestIdMiddleware),
+    "timing": lambda app: app.add_middleware(RequestMetricsMiddleware),
+    "gzip": lambda app: app.add_middleware(
+        GZipJSONMiddleware,
+        minimum_size=settings.GZIP_MINIMUM_SIZE,
+        compresslevel=settings.GZIP_COMPRESSLEVEL
+    ),
+    "errors": lambda app: app.add_middleware(ErrorHandler),
+}
+
+
+def parse_stack(valor: str) -> List[str]:
+    nombres = [n.strip() for n in valor.split(",") if n.strip()]
+    desconocidos = [n for n in nombres if n not in MIDDLEWARES_DISPONIBLES]
+    if desconocidos:
+        raise ValueError(
+            f"Middlewares desconocidos en MIDDLEWARE_STACK: {', '.join(desconocidos)}. "
+            f"Disponibles: {', '.join(MIDDLEWARES_DISPONIBLES)}"
+        )
+    return nombres
+
+
+def configurar_middlewares(app: FastAPI, stack: str = None) -> List[str]:
+    """
+    Instala los middlewares de MIDDLEWARE_STACK, listados de afuera hacia adentro.
+    Starlette envuelve con el último agregado, por eso se agregan en orden inverso.
+    """
+    nombres = parse_stack(stack if stack is not None else settings.MIDDLEWARE_STACK)
+    if not settings.METRICS_ENABLED and "timing" in nombres:
+        nombres.remove("timing")
+
+    for nombre in reversed(nombres):
+        MIDDLEWARES_DISPONIBLES[nombre](app)
+
+    logger.info(f"Middlewares activos (afuera -> adentro): {', '.join(nombres) or 'ninguno'}")
+    return nombres
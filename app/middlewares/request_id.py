@@ -0,0 +1,41 @@
+from contextvars import ContextVar
+from typing import Optional
+import uuid
+
+from starlette.datastructures import MutableHeaders
+
+HEADER_REQUEST_ID = "X-Request-ID"
+
+request_id_actual: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+class RequestIdMiddleware:
+    """
+    Middleware ASGI que asigna un ID a cada request.
+    Respeta el X-Request-ID entrante (por ejemplo, el que agrega nginx) y lo devuelve
+    en la respuesta; queda disponible en `request_id_actual` para los logs.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for nombre, valor in scope["headers"]:
+            if nombre == b"x-request-id":
+                request_id = valor.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        request_id_actual.set(request_id)
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[HEADER_REQUEST_ID] = request_id
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,43 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+
+from app.core.metrics import iniciar_request, registro_metricas
+
+
+class RequestMetricsMiddleware:
+    """
+    Middleware ASGI que mide latencia, cantidad de queries y tiempo de DB por request.
+    No envuelve el body de la respuesta, así que no interfiere con StreamingResponse.
+    Agrega un header Server-Timing con el tiempo hasta el primer byte y el tiempo de DB.
+    """
+
+    def __init__(self, app, excluir: tuple = ("/metrics", "/health")) -> None:
+        self.app = app
+        self.excluir = excluir
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.excluir:
+            await self.app(scope, receive, send)
+            return
+
+        stats = iniciar_request()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                app_ms = (time.perf_counter() - stats.inicio) * 1000
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", f"app;dur={app_ms:.1f}, db;dur={stats.db_ms:.1f}"
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Ruta con parámetros (/maquinas/{id}) en lugar del path concreto
+            route = scope.get("route")
+            ruta = getattr(route, "path", None) or "sin_ruta"
+            registro_metricas.cerrar_request(scope["method"], ruta, status, stats)
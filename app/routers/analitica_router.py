@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import List
+from sqlalchemy.orm import Session
+from app.db.dependencies import get_db_lectura
+from app.schemas.schemas import ConsultaCubo, ResultadoCubo, HechoAnaliticoOut
+from app.services import analitica_service
+from app.security.auth import get_current_user
+
+router = APIRouter(
+    prefix="/analitica",
+    tags=["Analítica"],
+    dependencies=[Depends(get_current_user)]
+)
+
+
+@router.get("/hechos", response_model=List[HechoAnaliticoOut])
+def listar_hechos():
+    """Hechos disponibles con sus dimensiones, medidas y granularidades"""
+    return analitica_service.listar_hechos()
+
+
+@router.post("/consulta", response_model=ResultadoCubo)
+def consultar_cubo(
+    consulta: ConsultaCubo,
+    db: Session = Depends(get_db_lectura)
+):
+    """
+    Totales agrupados por período y dimensiones, p. ej. horas por máquina y mes
+    o m³ por tipo de árido y proyecto por semana. Usa los rollups cuando la
+    consulta lo permite y cachea el resultado por ANALITICA_CACHE_TTL_SECONDS.
+    """
+    try:
+        return analitica_service.consultar_cubo(db, consulta)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
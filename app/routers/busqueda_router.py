@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.db.dependencies import get_db
+from app.schemas.schemas import ResultadoBusquedaOut
+from app.services.busqueda_service import buscar, LIMITE_MAXIMO, LONGITUD_MINIMA
+from app.security.auth import get_current_user
+
+router = APIRouter(
+    prefix="/busqueda",
+    tags=["Búsqueda"],
+    dependencies=[Depends(get_current_user)]
+)
+
+
+@router.get("", response_model=List[ResultadoBusquedaOut])
+def buscar_entidades(
+    q: str = Query(..., min_length=LONGITUD_MINIMA, description="Texto a buscar"),
+    tipos: Optional[str] = Query(None, description="Entidades separadas por coma: maquina,proyecto,cliente,producto"),
+    limite: int = Query(10, ge=1, le=LIMITE_MAXIMO),
+    db: Session = Depends(get_db)
+):
+    """Búsqueda typeahead sobre máquinas, proyectos, clientes y productos, ordenada por relevancia"""
+    lista_tipos = [t.strip() for t in tipos.split(",") if t.strip()] if tipos else None
+    try:
+        return buscar(db, q, tipos=lista_tipos, limite=limite)
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
@@ -6,21 +6,11 @@ Requiere autenticación JWT mediante token Bearer
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
-from app.schemas.client_api import (
-    ClientAPIResponse,
-    ClientProjectView,
-    ClientMaquinaView,
-    ClientAridoView
-)
+from app.schemas.client_api import ClientAPIResponse
 from app.schemas.external_api import TokenData
 from app.security.jwt_auth import verify_token
 from app.db.dependencies import get_db
-from app.db.models.proyecto import Proyecto
-from app.db.models.reporte_laboral import ReporteLaboral
-from app.db.models.entrega_arido import EntregaArido
-from app.db.models.maquina import Maquina
+from app.services.proyecto_cliente_service import get_vistas_proyectos_cliente
 
 router = APIRouter(
     prefix="/v1/client",
@@ -28,121 +18,6 @@ router = APIRouter(
 )
 
 
-def _get_maquinas_asignadas(db: Session, proyecto_id: int) -> tuple[List[ClientMaquinaView], float]:
-    """
-    Obtiene las máquinas asignadas a un proyecto con sus horas trabajadas
-
-    Args:
-        db: Sesión de base de datos
-        proyecto_id: ID del proyecto
-
-    Returns:
-        Tupla con (lista de máquinas, total de horas)
-    """
-    # Query con JOIN entre ReporteLaboral y Maquina
-    maquinas_data = db.query(
-        Maquina.nombre,
-        func.sum(ReporteLaboral.horas_turno).label('horas_trabajadas')
-    ).join(
-        ReporteLaboral, ReporteLaboral.maquina_id == Maquina.id
-    ).filter(
-        ReporteLaboral.proyecto_id == proyecto_id
-    ).group_by(
-        Maquina.id, Maquina.nombre
-    ).all()
-
-    # Convertir a lista de objetos ClientMaquinaView
-    maquinas_list = [
-        ClientMaquinaView(
-            nombre=m.nombre,
-            horas_trabajadas=float(m.horas_trabajadas or 0)
-        )
-        for m in maquinas_data
-    ]
-
-    # Calcular total de horas
-    total_horas = sum(m.horas_trabajadas for m in maquinas_list)
-
-    return maquinas_list, total_horas
-
-
-def _get_aridos_utilizados(db: Session, proyecto_id: int) -> tuple[List[ClientAridoView], float]:
-    """
-    Obtiene los áridos utilizados en un proyecto agrupados por tipo
-
-    Args:
-        db: Sesión de base de datos
-        proyecto_id: ID del proyecto
-
-    Returns:
-        Tupla con (lista de áridos, total de cantidad)
-    """
-    # Query agrupando por tipo_arido
-    aridos_data = db.query(
-        EntregaArido.tipo_arido,
-        func.sum(EntregaArido.cantidad).label('cantidad'),
-        func.count(EntregaArido.id).label('cantidad_registros')
-    ).filter(
-        EntregaArido.proyecto_id == proyecto_id
-    ).group_by(
-        EntregaArido.tipo_arido
-    ).all()
-
-    # Convertir a lista de objetos ClientAridoView
-    aridos_list = [
-        ClientAridoView(
-            tipo=a.tipo_arido,
-            cantidad=float(a.cantidad or 0),
-            unidad="m³",  # Unidad estándar (puede ajustarse según necesidad)
-            cantidad_registros=int(a.cantidad_registros)
-        )
-        for a in aridos_data
-    ]
-
-    # Calcular total de áridos
-    total_aridos = sum(a.cantidad for a in aridos_list)
-
-    return aridos_list, total_aridos
-
-
-def _build_project_view(db: Session, proyecto: Proyecto) -> ClientProjectView:
-    """
-    Construye la vista completa de un proyecto con todos sus datos agregados
-
-    Args:
-        db: Sesión de base de datos
-        proyecto: Instancia del modelo Proyecto
-
-    Returns:
-        Vista completa del proyecto para clientes
-    """
-    # Obtener máquinas asignadas con horas
-    maquinas_list, total_horas = _get_maquinas_asignadas(db, proyecto.id)
-
-    # Obtener áridos utilizados
-    aridos_list, total_aridos = _get_aridos_utilizados(db, proyecto.id)
-
-    # Mapear estado booleano a texto legible
-    estado_texto = "EN PROGRESO" if proyecto.estado else "COMPLETADO"
-
-    # Formatear fecha
-    fecha_inicio_str = proyecto.fecha_inicio.strftime("%Y-%m-%d") if proyecto.fecha_inicio else None
-
-    # Construir vista del proyecto
-    return ClientProjectView(
-        id=proyecto.id,
-        nombre=proyecto.nombre,
-        estado=estado_texto,
-        descripcion=proyecto.descripcion or "",
-        fecha_inicio=fecha_inicio_str,
-        ubicacion=proyecto.ubicacion or "",
-        maquinas_asignadas=maquinas_list,
-        total_horas_maquinas=total_horas,
-        aridos_utilizados=aridos_list,
-        total_aridos=total_aridos
-    )
-
-
 @router.get("/proyectos", response_model=ClientAPIResponse)
 async def get_client_proyectos(
     token: TokenData = Depends(verify_token),
@@ -180,16 +55,8 @@ async def get_client_proyectos(
         }
     """
     try:
-        # Obtener todos los proyectos activos
-        proyectos = db.query(Proyecto).filter(
-            Proyecto.estado == True
-        ).all()
-
-        # Construir lista de vistas de proyectos
-        proyectos_view = [
-            _build_project_view(db, proyecto)
-            for proyecto in proyectos
-        ]
+        # Proyectos activos con sus agregados (snapshots cacheados por proyecto)
+        proyectos_view = get_vistas_proyectos_cliente(db)
 
         return ClientAPIResponse(
             success=True,
@@ -244,21 +111,17 @@ async def get_client_proyecto(
         }
     """
     try:
-        # Buscar proyecto activo por ID
-        proyecto = db.query(Proyecto).filter(
-            Proyecto.id == proyecto_id,
-            Proyecto.estado == True
-        ).first()
+        # Buscar proyecto activo por ID con sus agregados
+        vistas = get_vistas_proyectos_cliente(db, proyecto_id=proyecto_id)
 
         # Validar que el proyecto existe
-        if not proyecto:
+        if not vistas:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Proyecto con ID {proyecto_id} no encontrado o no está activo"
             )
 
-        # Construir vista del proyecto
-        proyecto_view = _build_project_view(db, proyecto)
+        proyecto_view = vistas[0]
 
         return ClientAPIResponse(
             success=True,
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, Response
 from typing import List, Optional
 from datetime import date, datetime
-from app.db.dependencies import get_db
+from app.db.dependencies import get_db, get_db_lectura
 from app.db.models import Proyecto, EntregaArido, ReporteLaboral
 from app.schemas.schemas import (
     ReporteCuentaCorrienteCreate,
@@ -22,13 +22,18 @@ from app.schemas.schemas import (
     ReporteCuentaCorrienteConDetalleOut,
     PagoReporteCreate,
     PagoReporteOut,
-    RegistrarPagoResponse
+    RegistrarPagoResponse,
+    FacturacionLoteCreate,
+    LoteFacturacionOut,
+    PrecioCatalogoCreate,
+    PrecioCatalogoOut,
+    SimulacionPreciosRequest,
+    SimulacionPreciosOut
 )
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.services import cuenta_corriente_service
+from app.services import cuenta_corriente_service, facturacion_lote_service, precio_catalogo_service, simulador_precios_service
 from app.security.auth import get_current_user
-from app.db.models.pago_reporte import PagoReporte
+from app.core.coalescencia import coalescer
 from decimal import Decimal
 import io
 import pandas as pd
@@ -48,35 +53,82 @@ router = APIRouter(
 # ============= Endpoints de Precios y Tarifas =============
 
 @router.get("/aridos/precios", response_model=List[PrecioAridoSchema])
-def get_precios_aridos(session: Session = Depends(get_db)):
+def get_precios_aridos(
+    fecha: Optional[date] = Query(None, description="Fecha de vigencia (por defecto hoy)"),
+    session: Session = Depends(get_db)
+):
     """
     Obtiene todos los precios de áridos disponibles por m³
     """
-    return cuenta_corriente_service.get_todos_precios_aridos()
+    return cuenta_corriente_service.get_todos_precios_aridos(fecha)
 
 @router.get("/maquinas/{maquina_id}/tarifa", response_model=TarifaMaquinaSchema)
 def get_tarifa_maquina(
     maquina_id: int,
+    fecha: Optional[date] = Query(None, description="Fecha de vigencia (por defecto hoy)"),
     session: Session = Depends(get_db)
 ):
     """
     Obtiene la tarifa por hora de una máquina específica
     """
-    tarifa = cuenta_corriente_service.get_tarifa_maquina_por_id(session, maquina_id)
+    tarifa = cuenta_corriente_service.get_tarifa_maquina_por_id(session, maquina_id, fecha)
 
     if not tarifa:
         raise HTTPException(status_code=404, detail=f"Máquina con ID {maquina_id} no encontrada")
 
     return tarifa
 
+@router.get("/precios/catalogo", response_model=List[PrecioCatalogoOut])
+def listar_precios_catalogo(
+    categoria: Optional[str] = Query(None, description="arido o maquina"),
+    clave: Optional[str] = Query(None, description="Tipo de árido o nombre de la máquina"),
+    fecha: Optional[date] = Query(None, description="Solo los precios vigentes en esta fecha"),
+    session: Session = Depends(get_db)
+):
+    """
+    Lista los precios del catálogo con sus intervalos de vigencia
+    """
+    return precio_catalogo_service.listar_precios(session, categoria, clave, fecha)
+
+@router.post("/precios/catalogo", response_model=PrecioCatalogoOut, status_code=201)
+def registrar_precio_catalogo(
+    data: PrecioCatalogoCreate,
+    session: Session = Depends(get_db)
+):
+    """
+    Registra un precio de lista vigente desde una fecha. No modifica el precio
+    de los registros existentes: los períodos anteriores se siguen valorizando
+    con el precio que estaba vigente. Todos los workers lo toman en segundos.
+    """
+    try:
+        return precio_catalogo_service.registrar_precio(session, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/simulaciones/precios", response_model=SimulacionPreciosOut)
+def simular_precios(
+    datos: SimulacionPreciosRequest,
+    session: Session = Depends(get_db_lectura)
+):
+    """
+    Simula cuánto se habría facturado en el período (por defecto, los últimos
+    12 meses) con otras listas de precios de áridos o tarifas de máquinas.
+    Devuelve totales por mes por escenario; no modifica ningún registro.
+    """
+    try:
+        return simulador_precios_service.simular_precios(session, datos)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 # ============= Endpoints de Resumen de Proyecto =============
 
 @router.get("/proyectos/{proyecto_id}/resumen", response_model=ResumenProyectoSchema)
+@coalescer("cuenta_corriente.resumen_proyecto", entre_workers=True)
 def get_resumen_proyecto(
     proyecto_id: int,
     periodo_inicio: date = Query(..., description="Fecha de inicio del período"),
     periodo_fin: date = Query(..., description="Fecha de fin del período"),
-    session: Session = Depends(get_db)
+    session: Session = Depends(get_db_lectura)
 ):
     """
     Obtiene el resumen de áridos y horas de un proyecto con precios calculados
@@ -134,6 +186,7 @@ def get_reporte(
     return reporte
 
 @router.get("/reportes/{reporte_id}/detalle", response_model=DetalleReporteResponse)
+@coalescer("cuenta_corriente.detalle_reporte", entre_workers=True)
 def get_detalle_reporte(
     reporte_id: int,
     session: Session = Depends(get_db)
@@ -385,9 +438,54 @@ def listar_pagos(
 
     return pagos
 
+# ============= Facturación por Lote =============
+
+@router.post("/facturacion-lote", response_model=LoteFacturacionOut, status_code=202)
+def iniciar_facturacion_lote(
+    datos: FacturacionLoteCreate,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_db)
+):
+    """
+    Genera en segundo plano los reportes de un período para todos los proyectos
+    activos con áridos u horas en ese período (o solo los indicados).
+
+    Los proyectos que ya tienen un reporte del período se omiten. El progreso
+    y el resumen se consultan con GET /facturacion-lote/{lote_id}.
+    """
+    try:
+        lote, candidatos = facturacion_lote_service.iniciar_lote(
+            session, datos.periodo_inicio, datos.periodo_fin, datos.proyectos_ids
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    background_tasks.add_task(facturacion_lote_service.ejecutar_lote, lote.id, candidatos, datos.max_workers)
+    return facturacion_lote_service.get_lote(session, lote.id)
+
+@router.get("/facturacion-lote", response_model=List[LoteFacturacionOut])
+def listar_lotes_facturacion(
+    limite: int = Query(20, ge=1, le=100),
+    session: Session = Depends(get_db)
+):
+    """Lista los últimos lotes de facturación"""
+    return facturacion_lote_service.listar_lotes(session, limite)
+
+@router.get("/facturacion-lote/{lote_id}", response_model=LoteFacturacionOut)
+def get_lote_facturacion(
+    lote_id: int,
+    session: Session = Depends(get_db)
+):
+    """Progreso y resumen de un lote de facturación, con el resultado de cada proyecto"""
+    lote = facturacion_lote_service.get_lote(session, lote_id)
+    if not lote:
+        raise HTTPException(status_code=404, detail=f"Lote de facturación {lote_id} no encontrado")
+    return lote
+
 # ============= Endpoints de Exportación =============
 
 @router.get("/reportes/{reporte_id}/excel")
+@coalescer("cuenta_corriente.reporte_excel", entre_workers=True)
 def exportar_reporte_excel(
     reporte_id: int,
     session: Session = Depends(get_db)
@@ -403,29 +501,24 @@ def exportar_reporte_excel(
             detail=f"Reporte con ID {reporte_id} no encontrado"
         )
 
-    # Obtener el resumen detallado
-    resumen = cuenta_corriente_service.get_resumen_proyecto(
-        session,
-        reporte.proyecto_id,
-        reporte.periodo_inicio,
-        reporte.periodo_fin
-    )
+    # Obtener el resumen con los precios congelados al crear el reporte
+    resumen = cuenta_corriente_service.get_resumen_reporte(session, reporte_id)
 
     if not resumen:
         raise HTTPException(status_code=404, detail="No se pudo obtener el resumen del proyecto")
 
-    # Obtener todos los pagos del reporte
-    pagos = session.query(PagoReporte).filter(
-        PagoReporte.reporte_id == reporte_id
-    ).order_by(PagoReporte.fecha.desc()).all()
+    # Obtener todos los pagos del reporte (también de reportes archivados)
+    pagos = sorted(
+        cuenta_corriente_service.listar_pagos_reporte(session, reporte_id) or [],
+        key=lambda p: p.fecha,
+        reverse=True
+    )
 
     # Calcular total pagado
-    total_pagado = session.query(func.sum(PagoReporte.monto)).filter(
-        PagoReporte.reporte_id == reporte_id
-    ).scalar() or Decimal('0.0')
+    total_pagado = sum((Decimal(str(p.monto)) for p in pagos), Decimal('0.0'))
 
     # Calcular saldo pendiente
-    saldo_pendiente = (reporte.importe_total or Decimal('0.0')) - total_pagado
+    saldo_pendiente = Decimal(str(reporte.importe_total or 0)) - total_pagado
 
     # Crear el archivo Excel en memoria
     output = io.BytesIO()
@@ -532,17 +625,16 @@ def exportar_reporte_excel(
             df_pagos = pd.DataFrame(pagos_data)
             df_pagos.to_excel(writer, sheet_name='Detalle Pagos', index=False)
 
-    output.seek(0)
-
     filename = f"reporte_cuenta_corriente_{reporte_id}_{resumen.proyecto_nombre.replace(' ', '_')}.xlsx"
 
-    return StreamingResponse(
-        output,
+    return Response(
+        output.getvalue(),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
 @router.get("/reportes/{reporte_id}/pdf")
+@coalescer("cuenta_corriente.reporte_pdf", entre_workers=True)
 def exportar_reporte_pdf(
     reporte_id: int,
     session: Session = Depends(get_db)
@@ -560,29 +652,24 @@ def exportar_reporte_pdf(
                 detail=f"Reporte con ID {reporte_id} no encontrado"
             )
 
-        # Obtener el resumen detallado
-        resumen = cuenta_corriente_service.get_resumen_proyecto(
-            session,
-            reporte.proyecto_id,
-            reporte.periodo_inicio,
-            reporte.periodo_fin
-        )
+        # Obtener el resumen con los precios congelados al crear el reporte
+        resumen = cuenta_corriente_service.get_resumen_reporte(session, reporte_id)
 
         if not resumen:
             raise HTTPException(status_code=404, detail="No se pudo obtener el resumen del proyecto")
 
-        # Obtener todos los pagos del reporte
-        pagos = session.query(PagoReporte).filter(
-            PagoReporte.reporte_id == reporte_id
-        ).order_by(PagoReporte.fecha.desc()).all()
+        # Obtener todos los pagos del reporte (también de reportes archivados)
+        pagos = sorted(
+            cuenta_corriente_service.listar_pagos_reporte(session, reporte_id) or [],
+            key=lambda p: p.fecha,
+            reverse=True
+        )
 
         # Calcular total pagado
-        total_pagado = session.query(func.sum(PagoReporte.monto)).filter(
-            PagoReporte.reporte_id == reporte_id
-        ).scalar() or Decimal('0.0')
+        total_pagado = sum((Decimal(str(p.monto)) for p in pagos), Decimal('0.0'))
 
         # Calcular saldo pendiente
-        saldo_pendiente = (reporte.importe_total or Decimal('0.0')) - total_pagado
+        saldo_pendiente = Decimal(str(reporte.importe_total or 0)) - total_pagado
 
         # Crear el PDF en memoria
         buffer = io.BytesIO()
@@ -801,12 +888,11 @@ def exportar_reporte_pdf(
 
         # Generar PDF
         doc.build(elements)
-        buffer.seek(0)
 
         filename = f"reporte_cuenta_corriente_{reporte_id}_{resumen.proyecto_nombre.replace(' ', '_')}.pdf"
 
-        return StreamingResponse(
-            buffer,
+        return Response(
+            buffer.getvalue(),
             media_type="application/pdf",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
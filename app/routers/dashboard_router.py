@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.db.dependencies import get_db
+from app.schemas.schemas import DashboardResumenOut
+from app.services.dashboard_service import get_resumen, LIMITE_LISTADOS, MAX_LIMITE_LISTADOS
+from app.security.auth import get_current_user
+
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["Dashboard"],
+    dependencies=[Depends(get_current_user)]
+)
+
+
+@router.get("/resumen", response_model=DashboardResumenOut)
+def resumen_dashboard(
+    limite: int = Query(LIMITE_LISTADOS, ge=1, le=MAX_LIMITE_LISTADOS, description="Registros de cada listado reciente"),
+    db: Session = Depends(get_db)
+):
+    """
+    KPIs del mes (horas, material, combustible), proyectos activos y los
+    últimos reportes, entregas, gastos y proyectos, en una sola consulta.
+    Se cachea por worker durante DASHBOARD_CACHE_TTL_SECONDS y se calcula en
+    la réplica, salvo justo después de una invalidación (ver dashboard_service).
+    """
+    return get_resumen(db, limite)
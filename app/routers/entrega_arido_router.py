@@ -1,18 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from app.core.paginacion import CursorInvalido, ParametrosPagina, parametros_pagina
 from typing import List
 from app.db.dependencies import get_db
-from app.schemas.schemas import EntregaAridoCreate, EntregaAridoOut
+from app.schemas.schemas import EntregaAridoCreate, EntregaAridoOut, PaginaOut
 from app.services.entrega_arido_service import (
     create_entrega_arido,
     get_entrega_arido,
-    get_all_entregas_arido,
+    get_all_entregas_arido_filas,
     update_entrega_arido,
     delete_entrega_arido,
     get_suma_material_mes_actual,
     get_all_entregas_arido_paginated
 )
 from app.security.auth import get_current_user
+from app.core.serializacion import FilasJSONResponse, formato_columnar, respuesta_filas
 
 # ← CORREGIDO: Agregada la ruta /aridos/registros para compatibilidad
 router = APIRouter(prefix="/aridos", tags=["Entregas de Arido"], dependencies=[Depends(get_current_user)])
@@ -24,17 +26,25 @@ def suma_material_mes_actual(db: Session = Depends(get_db)):
     suma = get_suma_material_mes_actual(db)
     return {"suma_material_mes_actual": suma}
 
-@router.get("/registros/paginado")
-def entregas_arido_paginado(skip: int = 0, limit: int = 15, db: Session = Depends(get_db)):
-    """Lista paginada de entregas de áridos"""
-    return get_all_entregas_arido_paginated(db, skip=skip, limit=limit)
+@router.get("/registros/paginado", response_model=PaginaOut[EntregaAridoOut])
+def entregas_arido_paginado(pagina: ParametrosPagina = Depends(parametros_pagina), db: Session = Depends(get_db)):
+    """Lista paginada de entregas de áridos, las más recientes primero"""
+    try:
+        return get_all_entregas_arido_paginated(db, pagina)
+    except CursorInvalido as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 # ← RUTA PRINCIPAL QUE ESTABA FALTANDO
-@router.get("/registros", response_model=List[EntregaAridoOut])
-def read_all_registros(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Obtiene todos los registros de áridos - RUTA QUE LLAMA EL FRONTEND"""
+@router.get("/registros", response_model=List[EntregaAridoOut], response_class=FilasJSONResponse)
+def read_all_registros(
+    skip: int = 0,
+    limit: int = 100,
+    columnar: bool = Depends(formato_columnar),
+    db: Session = Depends(get_db)
+):
+    """Obtiene todos los registros de áridos - RUTA QUE LLAMA EL FRONTEND (admite ?format=columnar)"""
     try:
-        return get_all_entregas_arido(db, skip=skip, limit=limit)
+        return respuesta_filas(get_all_entregas_arido_filas(db, skip=skip, limit=limit, columnar=columnar), columnar)
     except Exception as e:
         print(f"Error en /registros: {str(e)}")
         import traceback
@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 from typing import Optional
 from app.schemas.external_api import APIResponse, GenericRequest, TokenData
 from app.security.jwt_auth import verify_token
-from app.db.dependencies import get_db
+from app.db.dependencies import get_db, get_db_lectura
 
 # Importar servicios
 from app.services import (
@@ -93,7 +93,7 @@ async def get_recursos(
     resource: str,
     id: Optional[int] = None,
     token: TokenData = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db_lectura)
 ):
     """
     Obtiene recursos del sistema según el tipo solicitado
@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Form, Query, Request
+from fastapi.responses import JSONResponse, Response
 from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
+from app.core.paginacion import CursorInvalido, ParametrosPagina, parametros_pagina
 from app.db.dependencies import get_db
 from app.db.models import Gasto
-from app.schemas.schemas import GastoSchema
+from app.schemas.schemas import GastoSchema, GastoOut, PaginaOut
 from app.services.gasto_service import (
     get_gastos as service_get_gastos,
     get_gasto as service_get_gasto,
@@ -14,12 +15,27 @@ from app.services.gasto_service import (
     update_gasto as service_update_gasto,
     delete_gasto as service_delete_gasto,
     get_total_combustible_mes_actual,
-    get_all_gastos_paginated
+    get_all_gastos_paginated,
+    consulta_gastos,
+    gasto_con_imagen,
+    programar_miniaturas,
+    imagen_gasto
 )
 from app.security.auth import get_current_user
+from app.core.serializacion import formato_columnar, modelos_como_columnas, respuesta_filas
 
 router = APIRouter(prefix="/gastos", tags=["Gastos"], dependencies=[Depends(get_current_user)])
 
+# Comprobante en las listas: completo (por defecto), miniatura WebP o sin imagen
+IMAGEN_LISTA = Query(
+    "completa",
+    pattern="^(completa|miniatura|ninguna)$",
+    description=(
+        "completa: comprobante original; miniatura: WebP de pocos KB (null mientras se genera "
+        "o si el comprobante no es una imagen; el original está en /gastos/{id}/imagen); ninguna: sin imagen"
+    )
+)
+
 # ================================
 # MODELOS
 # ================================
@@ -71,22 +87,31 @@ def convert_form_data(
 # GET todos los gastos CON FILTRO DE FECHAS (igual que pagos)
 @router.get("/", response_model=List[GastoSchema])
 def get_gastos(
+    background_tasks: BackgroundTasks,
     fechaInicio: Optional[datetime] = Query(None),
     fechaFin: Optional[datetime] = Query(None),
+    columnar: bool = Depends(formato_columnar),
+    imagen: str = IMAGEN_LISTA,
     session: Session = Depends(get_db)
 ):
     """
     Obtener gastos con filtro opcional de fechas.
     Funciona exactamente igual que el endpoint de pagos.
+    Con ?format=columnar (o Accept columnar) devuelve columnas con esquema compartido.
+    Con ?imagen=miniatura los comprobantes van como miniaturas WebP.
     """
     try:
-        query = session.query(Gasto)
+        query = consulta_gastos(session, imagen)
         if fechaInicio:
             query = query.filter(Gasto.fecha >= fechaInicio)
         if fechaFin:
             query = query.filter(Gasto.fecha <= fechaFin)
-        gastos = query.order_by(Gasto.fecha.desc()).all()
-        return [GastoSchema.from_orm(g) for g in gastos]
+        pendientes = []
+        gastos = [gasto_con_imagen(g, imagen, GastoSchema, pendientes) for g in query.order_by(Gasto.fecha.desc()).all()]
+        programar_miniaturas(pendientes, background_tasks)
+        if columnar:
+            return respuesta_filas(modelos_como_columnas(gastos, GastoSchema), True)
+        return gastos
     except Exception as e:
         print(f"❌ Error al obtener gastos: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error al obtener gastos: {str(e)}")
@@ -142,6 +167,7 @@ async def create_gasto_json(
 # CREATE gasto desde FormData (con imagen)
 @router.post("/", response_model=GastoSchema, status_code=201)
 async def create_gasto_form(
+    background_tasks: BackgroundTasks,
     usuario_id: int = Form(...),
     tipo: str = Form(...),
     importe_total: float = Form(...),
@@ -160,7 +186,8 @@ async def create_gasto_form(
             importe_total,
             fecha,
             descripcion,
-            imagen
+            imagen,
+            tareas=background_tasks
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al crear gasto FormData: {str(e)}")
@@ -170,6 +197,7 @@ async def create_gasto_form(
 @router.put("/{id}", response_model=GastoSchema)
 async def update_gasto(
     id: int,
+    background_tasks: BackgroundTasks,
     usuario_id: int = Form(...),
     tipo: str = Form(...),
     importe_total: float = Form(...),
@@ -189,12 +217,31 @@ async def update_gasto(
             importe_total,
             fecha,
             descripcion,
-            imagen
+            imagen,
+            tareas=background_tasks
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al actualizar gasto: {str(e)}")
 
 
+# Comprobante del gasto en el ancho pedido (derivado WebP, o el original si no hay derivados)
+@router.get("/{id}/imagen")
+def imagen_del_gasto(
+    id: int,
+    request: Request,
+    ancho: Optional[int] = Query(None, ge=1, description="Ancho en px; se usa el menor derivado que lo cubre"),
+    session: Session = Depends(get_db)
+):
+    resultado = imagen_gasto(session, id, ancho)
+    if not resultado:
+        raise HTTPException(status_code=404, detail="Gasto o comprobante no encontrado")
+    contenido, media_type, etag = resultado
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=0, must-revalidate"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=contenido, media_type=media_type, headers=headers)
+
+
 # DELETE gasto
 @router.delete("/{id}")
 def delete_gasto(id: int, session: Session = Depends(get_db)):
@@ -215,6 +262,14 @@ def total_combustible_mes_actual(session: Session = Depends(get_db)):
 
 
 # GASTOS paginados
-@router.get("/paginado/lista")
-def gastos_paginado(skip: int = 0, limit: int = 15, session: Session = Depends(get_db)):
-    return get_all_gastos_paginated(session, skip=skip, limit=limit)
\ No newline at end of file
+@router.get("/paginado/lista", response_model=PaginaOut[GastoOut])
+def gastos_paginado(
+    background_tasks: BackgroundTasks,
+    pagina: ParametrosPagina = Depends(parametros_pagina),
+    imagen: str = IMAGEN_LISTA,
+    session: Session = Depends(get_db)
+):
+    try:
+        return get_all_gastos_paginated(session, pagina, imagen, background_tasks)
+    except CursorInvalido as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
\ No newline at end of file
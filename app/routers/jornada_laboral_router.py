@@ -15,6 +15,7 @@ from app.schemas.schemas import (
 )
 from app.services.jornada_laboral_service import JornadaLaboralService
 from app.security.auth import get_current_user
+from app.core.serializacion import formato_columnar, modelos_como_columnas, respuesta_filas
 from sqlalchemy import and_, desc
 from app.db.models.jornada_laboral import JornadaLaboral, _get_limites_dia
 # ✅ SCHEMAS CORREGIDOS PARA REQUEST BODY
@@ -436,9 +437,10 @@ async def obtener_jornadas_usuario(
     usuario_id: int,
     limite: int = Query(500, description="Cantidad de registros"),
     offset: int = Query(0, description="Desde qué registro"),
+    columnar: bool = Depends(formato_columnar),
     db: Session = Depends(get_db)
 ):
-    """✅ Obtener jornadas de un usuario"""
+    """✅ Obtener jornadas de un usuario (admite ?format=columnar)"""
     try:
         print(f"📋 Obteniendo jornadas para usuario: {usuario_id} (limite: {limite}, offset: {offset})")
         
@@ -452,6 +454,8 @@ async def obtener_jornadas_usuario(
         response = [JornadaLaboralResponse.from_orm(j) for j in jornadas]
         print(f"✅ Se encontraron {len(response)} jornadas")
         
+        if columnar:
+            return respuesta_filas(modelos_como_columnas(response, JornadaLaboralResponse), True)
         return response
         
     except Exception as e:
@@ -464,9 +468,10 @@ async def obtener_jornadas_periodo(
     fecha_inicio: Optional[date] = Query(None, description="Fecha de inicio"),
     fecha_fin: Optional[date] = Query(None, description="Fecha de fin"),
     limite: int = Query(50, description="Cantidad máxima de registros"),
+    columnar: bool = Depends(formato_columnar),
     db: Session = Depends(get_db)
 ):
-    """✅ Obtener jornadas por periodo"""
+    """✅ Obtener jornadas por periodo (admite ?format=columnar)"""
     try:
         jornadas = JornadaLaboralService.obtener_jornadas_periodo(
             db=db,
@@ -477,6 +482,8 @@ async def obtener_jornadas_periodo(
         )
         
         response = [JornadaLaboralResponse.from_orm(j) for j in jornadas]
+        if columnar:
+            return respuesta_filas(modelos_como_columnas(response, JornadaLaboralResponse), True)
         return response
         
     except Exception as e:
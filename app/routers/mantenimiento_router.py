@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
 from typing import List
 from app.db.dependencies import get_db
-from app.schemas.schemas import MantenimientoSchema, MantenimientoCreate
+from app.schemas.schemas import MantenimientoSchema, MantenimientoCreate, MantenimientoOut, PaginaOut
 from sqlalchemy.orm import Session
+from app.core.paginacion import CursorInvalido, ParametrosPagina, parametros_pagina
 from app.services.mantenimiento_service import (
     get_mantenimientos as service_get_mantenimientos,
     get_mantenimiento as service_get_mantenimiento,
@@ -21,6 +22,13 @@ router = APIRouter(prefix="/mantenimientos", tags=["Mantenimientos"], dependenci
 def get_mantenimientos(session: Session = Depends(get_db)):
     return service_get_mantenimientos(session)
 
+@router.get("/paginado", response_model=PaginaOut[MantenimientoOut])
+def mantenimientos_paginado(pagina: ParametrosPagina = Depends(parametros_pagina), session: Session = Depends(get_db)):
+    try:
+        return get_all_mantenimientos_paginated(session, pagina)
+    except CursorInvalido as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+
 @router.get("/{id}", response_model=MantenimientoSchema)
 def get_mantenimiento(id: int, session: Session = Depends(get_db)):
     mantenimiento = service_get_mantenimiento(session, id)
@@ -49,10 +57,6 @@ def delete_mantenimiento(id: int, session: Session = Depends(get_db)):
     else:
         return JSONResponse(content={"error": "Mantenimiento no encontrado"}, status_code=404)
 
-@router.get("/paginado")
-def mantenimientos_paginado(skip: int = 0, limit: int = 15, session: Session = Depends(get_db)):
-    return get_all_mantenimientos_paginated(session, skip=skip, limit=limit)
-
 @router.get("/maquina/{maquina_id}")
 def mantenimientos_por_maquina(maquina_id: int, db: Session = Depends(get_db)):
     return get_mantenimientos_maquina(db, maquina_id)
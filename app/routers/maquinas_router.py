@@ -1,17 +1,21 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import JSONResponse
 from typing import List, Optional
+from datetime import date
 from sqlalchemy.orm import Session
+from app.core.paginacion import CursorInvalido, ParametrosPagina, parametros_pagina
 from sqlalchemy import func
 
-from app.db.dependencies import get_db
+from app.db.dependencies import get_db, get_db_lectura
 from app.schemas.schemas import (
     MaquinaSchema, MaquinaCreate, RegistroHorasMaquinaCreate,
     HistorialHorasOut, EstadisticasHorasOut, UsuarioOut,
-    NotaMaquinaOut, NotaMaquinaCreate, ProximoMantenimientoUpdate
+    NotaMaquinaOut, NotaMaquinaCreate, ProximoMantenimientoUpdate,
+    UsoMaquinaPuntoOut, AnomaliaUsoMaquinaOut, RentabilidadMaquinaOut,
+    MaquinaOut, PaginaOut
 )
 from app.services.maquina_service import (
-    get_maquinas as service_get_maquinas,
+    get_maquinas_filas as service_get_maquinas_filas,
     get_maquina as service_get_maquina,
     create_maquina as service_create_maquina,
     update_maquina as service_update_maquina,
@@ -21,6 +25,17 @@ from app.services.maquina_service import (
     obtener_historial_horas_maquina,
     obtener_estadisticas_horas_maquina
 )
+from app.services.uso_maquina_service import (
+    get_uso_maquina,
+    detectar_anomalias,
+    reconstruir_rollups,
+    recalcular_uso,
+    recalcular_uso_cambio
+)
+from app.services.rentabilidad_maquina_service import (
+    get_rentabilidad_flota,
+    reconstruir_rentabilidad
+)
 from app.services.nota_maquina_service import (
     listar_notas_maquina,
     crear_nota_maquina,
@@ -28,19 +43,56 @@ from app.services.nota_maquina_service import (
 )
 from app.db.models import ReporteLaboral, Maquina, HorometroHistorial
 from app.security.auth import get_current_user
+from app.core.serializacion import FilasJSONResponse
 from app.schemas.schemas import UsuarioOut as Usuario
 
 router = APIRouter(prefix="/maquinas", tags=["Maquinas"])
 
 # ==================== CRUD MÁQUINAS ====================
 
-@router.get("/", response_model=List[MaquinaSchema])
+@router.get("/", response_model=List[MaquinaSchema], response_class=FilasJSONResponse)
 def get_maquinas(session: Session = Depends(get_db)):
-    return service_get_maquinas(session)
+    return FilasJSONResponse(service_get_maquinas_filas(session))
+
+@router.get("/paginado", response_model=PaginaOut[MaquinaOut])
+def maquinas_paginado(pagina: ParametrosPagina = Depends(parametros_pagina), session: Session = Depends(get_db)):
+    try:
+        return get_all_maquinas_paginated(session, pagina)
+    except CursorInvalido as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+
+# ==================== RENTABILIDAD ====================
+
+@router.get("/rentabilidad", response_model=List[RentabilidadMaquinaOut])
+def rentabilidad_flota(
+    desde: Optional[date] = Query(None, description="Desde el mes de esta fecha"),
+    hasta: Optional[date] = Query(None, description="Hasta el mes de esta fecha"),
+    maquina_id: Optional[int] = Query(None, description="Solo esta máquina"),
+    por_mes: bool = Query(False, description="Incluir el detalle mensual"),
+    session: Session = Depends(get_db_lectura)
+):
+    """
+    Importe facturado por horas, gastos (combustible y otros) y costo de
+    mantenimiento de toda la flota, leídos del rollup mensual por máquina
+    """
+    try:
+        return get_rentabilidad_flota(session, desde, hasta, maquina_id, por_mes)
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
 
-@router.get("/paginado")
-def maquinas_paginado(skip: int = 0, limit: int = 15, session: Session = Depends(get_db)):
-    return get_all_maquinas_paginated(session, skip=skip, limit=limit)
+@router.post("/rentabilidad/reconstruir")
+def reconstruir_rentabilidad_flota(
+    maquina_id: Optional[int] = Query(None, description="Reconstruir solo esta máquina"),
+    session: Session = Depends(get_db),
+    current_user: UsuarioOut = Depends(get_current_user)
+):
+    """
+    Reconstruye el rollup de rentabilidad desde horas, gastos y mantenimientos (reparación)
+    """
+    try:
+        return reconstruir_rentabilidad(session, maquina_id)
+    except Exception as e:
+        return JSONResponse(content={"error": str(e)}, status_code=500)
 
 # ==================== HORÓMETRO INICIAL (ACTUALIZADO) ====================
 
@@ -260,8 +312,10 @@ def actualizar_registro_horas(
     if not registro:
         return JSONResponse(content={"error": "Registro no encontrado"}, status_code=404)
 
+    anterior = (registro.maquina_id, registro.fecha_asignacion)
     registro.horas_turno = datos.horas
     registro.fecha_asignacion = datos.fecha
+    recalcular_uso_cambio(session, anterior, registro)
     session.commit()
     session.refresh(registro)
 
@@ -290,9 +344,55 @@ def eliminar_registro_horas(
         return JSONResponse(content={"error": "Registro no encontrado"}, status_code=404)
 
     session.delete(registro)
+    recalcular_uso(session, registro.maquina_id, registro.fecha_asignacion)
     session.commit()
     return {"message": f"Registro {registro_id} eliminado correctamente"}
 
+# ==================== SERIE DE USO (ROLLUPS) ====================
+
+@router.get("/{maquina_id}/uso", response_model=List[UsoMaquinaPuntoOut])
+def serie_uso_maquina(
+    maquina_id: int,
+    fecha_desde: Optional[date] = Query(None, description="Fecha desde (YYYY-MM-DD)"),
+    fecha_hasta: Optional[date] = Query(None, description="Fecha hasta (YYYY-MM-DD)"),
+    granularidad: str = Query("dia", description="'dia' o 'semana'"),
+    session: Session = Depends(get_db)
+):
+    """
+    Serie de uso de una máquina por día o por semana, leída de los rollups
+    """
+    try:
+        return get_uso_maquina(session, maquina_id, fecha_desde, fecha_hasta, granularidad)
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+
+@router.get("/{maquina_id}/uso/anomalias", response_model=List[AnomaliaUsoMaquinaOut])
+def anomalias_uso_maquina(
+    maquina_id: int,
+    fecha_desde: Optional[date] = Query(None, description="Fecha desde (YYYY-MM-DD)"),
+    fecha_hasta: Optional[date] = Query(None, description="Fecha hasta (YYYY-MM-DD)"),
+    dias_hueco: int = Query(7, ge=1, description="Días sin actividad para informar un hueco"),
+    session: Session = Depends(get_db)
+):
+    """
+    Retrocesos de horómetro, huecos sin actividad y días con exceso de horas
+    """
+    return detectar_anomalias(session, maquina_id, fecha_desde, fecha_hasta, dias_hueco)
+
+@router.post("/uso/reconstruir")
+def reconstruir_uso(
+    maquina_id: Optional[int] = Query(None, description="Reconstruir solo esta máquina"),
+    session: Session = Depends(get_db),
+    current_user: UsuarioOut = Depends(get_current_user)
+):
+    """
+    Reconstruye los rollups de uso desde reporte_laboral (backfill o reparación)
+    """
+    try:
+        return reconstruir_rollups(session, maquina_id)
+    except Exception as e:
+        return JSONResponse(content={"error": str(e)}, status_code=500)
+
 # ==================== NOTAS DE MÁQUINAS ====================
 
 @router.get("/{maquina_id}/notas", response_model=List[NotaMaquinaOut])
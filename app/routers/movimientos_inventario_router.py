@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import JSONResponse
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 from app.db.dependencies import get_db
-from app.schemas.schemas import MovimientoInventarioSchema
+from app.schemas.schemas import (
+    MovimientoInventarioSchema,
+    MovimientoInventarioBulkCreate,
+    MovimientoInventarioBulkResponse,
+    RegistroStockOut,
+    StockPuntualOut
+)
 from sqlalchemy.orm import Session
 from app.services.movimiento_inventario_service import (
     get_movimientos_inventario as service_get_movimientos_inventario,
@@ -10,7 +17,10 @@ from app.services.movimiento_inventario_service import (
     create_movimiento_inventario as service_create_movimiento_inventario,
     update_movimiento_inventario as service_update_movimiento_inventario,
     delete_movimiento_inventario as service_delete_movimiento_inventario,
-    get_all_movimientos_inventario_paginated
+    get_all_movimientos_inventario_paginated,
+    create_movimientos_inventario_bulk,
+    get_stock_a_fecha,
+    get_libro_stock
 )
 from app.security.auth import get_current_user
 
@@ -21,6 +31,32 @@ router = APIRouter(prefix="/movimientos-inventario", tags=["Movimientos de Inven
 def get_movimientos_inventario(session: Session = Depends(get_db)):
     return service_get_movimientos_inventario(session)
 
+@router.get("/productos/{producto_id}/stock", response_model=StockPuntualOut)
+def stock_producto_a_fecha(
+    producto_id: int,
+    fecha: Optional[datetime] = Query(None, description="Fecha/hora de consulta (por defecto, ahora)"),
+    session: Session = Depends(get_db)
+):
+    """
+    Stock de un producto a una fecha, calculado desde el libro de stock
+    """
+    stock = get_stock_a_fecha(session, producto_id, fecha)
+    if stock:
+        return stock
+    return JSONResponse(content={"error": "Producto no encontrado"}, status_code=404)
+
+@router.get("/productos/{producto_id}/libro", response_model=List[RegistroStockOut])
+def libro_stock_producto(
+    producto_id: int,
+    fecha_desde: Optional[datetime] = Query(None),
+    fecha_hasta: Optional[datetime] = Query(None),
+    session: Session = Depends(get_db)
+):
+    """
+    Variaciones de stock de un producto, ordenadas por fecha
+    """
+    return get_libro_stock(session, producto_id, fecha_desde, fecha_hasta)
+
 @router.get("/{id}", response_model=MovimientoInventarioSchema)
 def get_movimiento_inventario(id: int, session: Session = Depends(get_db)):
     movimiento = service_get_movimiento_inventario(session, id)
@@ -33,6 +69,16 @@ def get_movimiento_inventario(id: int, session: Session = Depends(get_db)):
 def create_movimiento_inventario(movimiento_inventario: MovimientoInventarioSchema, session: Session = Depends(get_db)):
     return service_create_movimiento_inventario(session, movimiento_inventario)
 
+@router.post("/bulk", response_model=MovimientoInventarioBulkResponse, status_code=201)
+def create_movimientos_inventario_bulk_endpoint(lote: MovimientoInventarioBulkCreate, session: Session = Depends(get_db)):
+    """
+    Registra varios movimientos en una sola transacción (un UPDATE de stock por producto)
+    """
+    try:
+        return create_movimientos_inventario_bulk(session, lote.movimientos)
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+
 @router.put("/{id}", response_model=MovimientoInventarioSchema)
 def update_movimiento_inventario(id: int, movimiento_inventario: MovimientoInventarioSchema, session: Session = Depends(get_db)):
     updated = service_update_movimiento_inventario(session, id, movimiento_inventario)
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends, File, UploadFile, Form
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, File, UploadFile, Form, Query, Request
+from fastapi.responses import JSONResponse, RedirectResponse
 from typing import List, Optional
 from app.db.dependencies import get_db
 from app.schemas.schemas import ProductoSchema
@@ -10,7 +10,8 @@ from app.services.producto_service import (
     create_producto as service_create_producto,
     update_producto as service_update_producto,
     delete_producto as service_delete_producto,
-    get_all_productos_paginated
+    get_all_productos_paginated,
+    url_imagen_producto
 )
 import os
 from app.security.auth import get_current_user
@@ -45,25 +46,27 @@ def productos_paginado(
 # Crear producto
 @router.post("/", response_model=ProductoSchema, status_code=201)
 def create_producto(
+    background_tasks: BackgroundTasks,
     nombre: str = Form(...),
     codigo_producto: str = Form(...),
     inventario: int = Form(...),
     imagen: Optional[UploadFile] = File(None),
     session: Session = Depends(get_db)
 ):
-    return service_create_producto(session, nombre, codigo_producto, inventario, imagen)
+    return service_create_producto(session, nombre, codigo_producto, inventario, imagen, tareas=background_tasks)
 
 # Actualizar producto
 @router.put("/{id}", response_model=ProductoSchema)
 def update_producto(
     id: int,
+    background_tasks: BackgroundTasks,
     nombre: str = Form(...),
     codigo_producto: str = Form(...),
     inventario: int = Form(...),
     imagen: Optional[UploadFile] = File(None),
     session: Session = Depends(get_db)
 ):
-    updated = service_update_producto(session, id, nombre, codigo_producto, inventario, imagen)
+    updated = service_update_producto(session, id, nombre, codigo_producto, inventario, imagen, tareas=background_tasks)
     if updated:
         return updated
     else:
@@ -78,6 +81,19 @@ def delete_producto(id: int, session: Session = Depends(get_db)):
     else:
         return JSONResponse(content={"error": "Producto no encontrado"}, status_code=404)
 
+# Imagen del producto en el ancho pedido: redirige al derivado WebP en /static (inmutable)
+@router.get("/{id}/imagen")
+def imagen_producto(
+    id: int,
+    request: Request,
+    ancho: Optional[int] = Query(None, ge=1, description="Ancho en px; se usa el menor derivado que lo cubre"),
+    session: Session = Depends(get_db)
+):
+    url = url_imagen_producto(session, id, ancho)
+    if not url:
+        return JSONResponse(content={"error": "Producto o imagen no encontrados"}, status_code=404)
+    return RedirectResponse(request.scope.get("root_path", "") + url, status_code=307)
+
 # 🔹 Obtener un producto (este va al final para no pisar /paginado)
 @router.get("/{id}", response_model=ProductoSchema)
 def get_producto(id: int, session: Session = Depends(get_db)):
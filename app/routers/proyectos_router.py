@@ -1,21 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Header, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
 from typing import List, Optional
 from app.db.dependencies import get_db
 from app.schemas.schemas import (
     ProyectoSchema,
     ProyectoCreate,
+    ProyectoFormulario,
+    ProyectoFormularioAlta,
     ContratoArchivoResponse,
     ProyectoConDetallesResponse,
     ActualizarPrecioAridoRequest,
     ActualizarPrecioAridoResponse,
     ActualizarTarifaMaquinaRequest,
-    ActualizarTarifaMaquinaResponse
+    ActualizarTarifaMaquinaResponse,
+    ProyectoOut,
+    PaginaOut,
+    SubidaContratoCreate,
+    SubidaContratoOut
 )
 from sqlalchemy.orm import Session
-import shutil
+from pydantic import ValidationError
+from app.core.paginacion import CursorInvalido, ParametrosPagina, parametros_pagina
 import os
-import time
 from datetime import datetime, date
 from app.services.proyecto_service import (
     get_proyectos as service_get_proyectos,
@@ -26,6 +33,21 @@ from app.services.proyecto_service import (
     get_cantidad_proyectos_activos,
     get_all_proyectos_paginated
 )
+from app.services.archivo_frio_service import restaurar_proyecto
+from app.services.subida_contrato_service import (
+    DIRECTORIO_CONTRATOS,
+    ConflictoSubida,
+    guardar_contrato,
+    confirmar_contrato,
+    iniciar_subida,
+    get_subida,
+    recibir_parte,
+    cancelar_subida
+)
+from app.core import subidas
+from app.core.config import settings
+from app.core.subidas import ArchivoDemasiadoGrande
+from app.core.descargas import respuesta_archivo
 from app.services.proyecto_optimizado_service import (
     get_proyecto_con_detalles_optimizado,
     get_proyectos_con_detalles_optimizado
@@ -36,8 +58,7 @@ from app.db.models import ReporteLaboral, Proyecto, ContratoArchivo, EntregaArid
 router = APIRouter(prefix="/proyectos", tags=["Proyectos"], dependencies=[Depends(get_current_user)])
 
 # Configuración de uploads
-UPLOAD_DIR = "uploads/contratos"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+os.makedirs(DIRECTORIO_CONTRATOS, exist_ok=True)
 
 # Endpoints Proyectos
 @router.get("/", response_model=List[ProyectoSchema])
@@ -110,9 +131,12 @@ def cantidad_proyectos_activos(session: Session = Depends(get_db)):
     cantidad = get_cantidad_proyectos_activos(session)
     return {"cantidad_activos": cantidad}
 
-@router.get("/paginado")
-def proyectos_paginado(skip: int = 0, limit: int = 15, session: Session = Depends(get_db)):
-    return get_all_proyectos_paginated(session, skip=skip, limit=limit)
+@router.get("/paginado", response_model=PaginaOut[ProyectoOut])
+def proyectos_paginado(pagina: ParametrosPagina = Depends(parametros_pagina), session: Session = Depends(get_db)):
+    try:
+        return get_all_proyectos_paginated(session, pagina)
+    except CursorInvalido as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
 
 # ============= RUTAS CON PARÁMETROS (/{id} debe ir después) =============
 
@@ -135,81 +159,64 @@ def get_proyecto(id: int, session: Session = Depends(get_db)):
     else:
         raise HTTPException(status_code=404, detail="Proyecto no encontrado")
 
-@router.post("/", status_code=201)
-async def create_proyecto(
-    nombre: str = Form(...),
-    fecha_inicio: str = Form(...),
-    estado: bool = Form(...),
-    gerente: str = Form(...),
-    ubicacion: str = Form(...),
-    descripcion: str = Form(...),
-    fecha_creacion: str = Form(...),
-    contrato: Optional[UploadFile] = File(None),
-    session: Session = Depends(get_db)
-):
+def _cuerpo_formulario(modelo) -> dict:
+    """requestBody de OpenAPI para los endpoints que leen el formulario a mano"""
+    esquema = modelo.model_json_schema()
+    esquema["properties"]["contrato"] = {"type": "string", "format": "binary", "title": "Contrato"}
+    return {"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": esquema}}}}
+
+
+async def _leer_formulario(request: Request, modelo):
+    """
+    Campos del proyecto y contrato opcional, leídos de request.stream(): el
+    límite de CONTRATO_MAX_BYTES corta la transferencia mientras llega.
+    """
+    try:
+        campos, contrato = await subidas.recibir_formulario(request, "contrato", settings.CONTRATO_MAX_BYTES)
+    except ArchivoDemasiadoGrande as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        return modelo.model_validate(campos), contrato
+    except ValidationError as e:
+        if contrato:
+            await subidas.descartar(contrato.temporal)
+        raise RequestValidationError([{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)])
+
+
+@router.post("/", status_code=201, openapi_extra=_cuerpo_formulario(ProyectoFormularioAlta))
+async def create_proyecto(request: Request, session: Session = Depends(get_db)):
     """
     Crear proyecto con archivo de contrato opcional
     """
+    datos, contrato = await _leer_formulario(request, ProyectoFormularioAlta)
     try:
         # Convertir fecha_inicio a date
-        fecha_inicio_date = datetime.strptime(fecha_inicio, "%Y-%m-%d").date()
-        fecha_creacion_date = datetime.strptime(fecha_creacion, "%Y-%m-%d").date()
+        fecha_inicio_date = datetime.strptime(datos.fecha_inicio, "%Y-%m-%d").date()
+        fecha_creacion_date = datetime.strptime(datos.fecha_creacion, "%Y-%m-%d").date()
         
         # Crear proyecto
         nuevo_proyecto = Proyecto(
-            nombre=nombre,
+            nombre=datos.nombre,
             fecha_inicio=fecha_inicio_date,
-            estado=estado,
-            gerente=gerente,
-            ubicacion=ubicacion,
-            descripcion=descripcion,
+            estado=datos.estado,
+            gerente=datos.gerente,
+            ubicacion=datos.ubicacion,
+            descripcion=datos.descripcion,
             fecha_creacion=fecha_creacion_date
         )
         
         session.add(nuevo_proyecto)
         session.flush()  # Para obtener el ID antes del commit
         
-        # Si hay archivo de contrato, guardarlo
+        # Si hay archivo de contrato, registrarlo; el archivo se ubica después del commit
         if contrato:
-            # Validar tipo de archivo
-            allowed_types = [
-                "application/pdf", 
-                "application/msword",
-                "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                "image/jpeg",
-                "image/png",
-                "image/jpg"
-            ]
-            
-            if contrato.content_type not in allowed_types:
-                raise HTTPException(status_code=400, detail="Tipo de archivo no permitido")
-            
-            # Crear directorio del proyecto
-            proyecto_dir = os.path.join(UPLOAD_DIR, str(nuevo_proyecto.id))
-            os.makedirs(proyecto_dir, exist_ok=True)
-            
-            # Generar nombre único
-            file_extension = contrato.filename.split('.')[-1]
-            unique_filename = f"contrato_{nuevo_proyecto.id}_{int(time.time())}.{file_extension}"
-            file_path = os.path.join(proyecto_dir, unique_filename)
-            
-            # Guardar archivo físico
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(contrato.file, buffer)
-            
-            # Guardar registro en base de datos
-            contrato_archivo = ContratoArchivo(
-                proyecto_id=nuevo_proyecto.id,
-                nombre_archivo=contrato.filename,
-                ruta_archivo=file_path,
-                tipo_archivo=contrato.content_type,
-                tamaño_archivo=contrato.size or 0
-            )
-            
-            session.add(contrato_archivo)
-            nuevo_proyecto.contrato_file_path = file_path
+            contrato_archivo = await guardar_contrato(session, nuevo_proyecto, contrato)
         
         session.commit()
+        if contrato:
+            await confirmar_contrato(contrato, contrato_archivo)
         session.refresh(nuevo_proyecto)
         
         # Agregar URLs del contrato para la respuesta
@@ -224,80 +231,54 @@ async def create_proyecto(
         
         return nuevo_proyecto
         
+    except HTTPException:
+        session.rollback()
+        raise
+    except ArchivoDemasiadoGrande as e:
+        session.rollback()
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        session.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=f"Error al crear proyecto: {str(e)}")
+    finally:
+        # Si ya se ubicó no existe más
+        if contrato:
+            await subidas.descartar(contrato.temporal)
 
-@router.put("/{id}")
-async def update_proyecto(
-    id: int,
-    nombre: str = Form(...),
-    fecha_inicio: str = Form(...),
-    estado: bool = Form(...),
-    gerente: str = Form(...),
-    ubicacion: str = Form(...),
-    descripcion: str = Form(...),
-    contrato: Optional[UploadFile] = File(None),
-    session: Session = Depends(get_db)
-):
+@router.put("/{id}", openapi_extra=_cuerpo_formulario(ProyectoFormulario))
+async def update_proyecto(id: int, request: Request, session: Session = Depends(get_db)):
     """
     Actualizar proyecto con archivo de contrato opcional
     """
+    datos, contrato = await _leer_formulario(request, ProyectoFormulario)
     try:
         # Buscar proyecto
         proyecto = session.query(Proyecto).filter(Proyecto.id == id).first()
         if not proyecto:
             raise HTTPException(status_code=404, detail="Proyecto no encontrado")
         
+        # Reabrir un proyecto archivado devuelve sus filas a las tablas
+        if datos.estado and not proyecto.estado:
+            restaurar_proyecto(session, proyecto.id)
+
         # Actualizar campos
-        proyecto.nombre = nombre
-        proyecto.fecha_inicio = datetime.strptime(fecha_inicio, "%Y-%m-%d").date()
-        proyecto.estado = estado
-        proyecto.gerente = gerente
-        proyecto.ubicacion = ubicacion
-        proyecto.descripcion = descripcion
+        proyecto.nombre = datos.nombre
+        proyecto.fecha_inicio = datetime.strptime(datos.fecha_inicio, "%Y-%m-%d").date()
+        proyecto.estado = datos.estado
+        proyecto.gerente = datos.gerente
+        proyecto.ubicacion = datos.ubicacion
+        proyecto.descripcion = datos.descripcion
         
-        # Si hay nuevo archivo de contrato
+        # Si hay nuevo archivo de contrato, registrarlo; el archivo se ubica después del commit
         if contrato:
-            # Validar tipo de archivo
-            allowed_types = [
-                "application/pdf", 
-                "application/msword",
-                "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                "image/jpeg",
-                "image/png",
-                "image/jpg"
-            ]
-            
-            if contrato.content_type not in allowed_types:
-                raise HTTPException(status_code=400, detail="Tipo de archivo no permitido")
-            
-            # Crear directorio si no existe
-            proyecto_dir = os.path.join(UPLOAD_DIR, str(proyecto.id))
-            os.makedirs(proyecto_dir, exist_ok=True)
-            
-            # Generar nombre único
-            file_extension = contrato.filename.split('.')[-1]
-            unique_filename = f"contrato_{proyecto.id}_{int(time.time())}.{file_extension}"
-            file_path = os.path.join(proyecto_dir, unique_filename)
-            
-            # Guardar nuevo archivo
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(contrato.file, buffer)
-            
-            # Guardar registro en base de datos
-            contrato_archivo = ContratoArchivo(
-                proyecto_id=proyecto.id,
-                nombre_archivo=contrato.filename,
-                ruta_archivo=file_path,
-                tipo_archivo=contrato.content_type,
-                tamaño_archivo=contrato.size or 0
-            )
-            
-            session.add(contrato_archivo)
-            proyecto.contrato_file_path = file_path
+            contrato_archivo = await guardar_contrato(session, proyecto, contrato)
         
         session.commit()
+        if contrato:
+            await confirmar_contrato(contrato, contrato_archivo)
         session.refresh(proyecto)
         
         # Agregar URLs del contrato para la respuesta
@@ -314,13 +295,26 @@ async def update_proyecto(
         
     except HTTPException:
         raise
+    except ArchivoDemasiadoGrande as e:
+        session.rollback()
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        session.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         session.rollback()
         raise HTTPException(status_code=500, detail=f"Error al actualizar proyecto: {str(e)}")
+    finally:
+        # Si ya se ubicó no existe más
+        if contrato:
+            await subidas.descartar(contrato.temporal)
 
 @router.delete("/{id}")
 def delete_proyecto(id: int, session: Session = Depends(get_db)):
-    deleted = service_delete_proyecto(session, id)
+    try:
+        deleted = service_delete_proyecto(session, id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if deleted:
         return {"message": "Proyecto eliminado"}
     else:
@@ -436,11 +430,82 @@ async def descargar_contrato(proyecto_id: int, db: Session = Depends(get_db)):
     filename = contrato_archivo.nombre_archivo if contrato_archivo else f"contrato_{proyecto_id}.pdf"
     media_type = contrato_archivo.tipo_archivo if contrato_archivo else "application/pdf"
     
-    return FileResponse(
-        proyecto.contrato_file_path,
-        media_type=media_type,
-        filename=filename
-    )
+    # Con DESCARGAS_MODO=x-accel el archivo lo envía nginx
+    return respuesta_archivo(proyecto.contrato_file_path, media_type, filename)
+
+# ============= SUBIDA DE CONTRATOS POR PARTES =============
+
+def _error_subida(e: ValueError) -> HTTPException:
+    if isinstance(e, ConflictoSubida):
+        return HTTPException(status_code=409, detail=str(e))
+    if isinstance(e, ArchivoDemasiadoGrande):
+        return HTTPException(status_code=413, detail=str(e))
+    return HTTPException(status_code=400, detail=str(e))
+
+
+def _con_offset(response: Response, estado: SubidaContratoOut) -> SubidaContratoOut:
+    response.headers["Upload-Offset"] = str(estado.recibido)
+    response.headers["Upload-Length"] = str(estado.tamaño_total)
+    return estado
+
+
+@router.post("/{proyecto_id}/contrato/subidas", response_model=SubidaContratoOut, status_code=201)
+async def crear_subida_contrato(
+    proyecto_id: int,
+    datos: SubidaContratoCreate,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    """
+    Inicia la subida reanudable de un contrato. Las partes se envían con
+    PATCH y el header Upload-Offset; si el proyecto ya tiene un archivo con el
+    mismo sha256 la subida queda completa sin transferir nada.
+    """
+    try:
+        estado = await iniciar_subida(db, proyecto_id, datos)
+    except ValueError as e:
+        raise _error_subida(e)
+    if estado is None:
+        raise HTTPException(status_code=404, detail="Proyecto no encontrado")
+    return _con_offset(response, estado)
+
+
+@router.get("/{proyecto_id}/contrato/subidas/{subida_id}", response_model=SubidaContratoOut)
+async def estado_subida_contrato(proyecto_id: int, subida_id: str, response: Response, db: Session = Depends(get_db)):
+    """Bytes recibidos de una subida, para reanudarla desde ese offset"""
+    estado = await get_subida(db, proyecto_id, subida_id)
+    if estado is None:
+        raise HTTPException(status_code=404, detail="Subida no encontrada")
+    return _con_offset(response, estado)
+
+
+@router.patch("/{proyecto_id}/contrato/subidas/{subida_id}", response_model=SubidaContratoOut)
+async def enviar_parte_contrato(
+    proyecto_id: int,
+    subida_id: str,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    db: Session = Depends(get_db)
+):
+    """
+    Agrega el cuerpo del request (bytes crudos, application/offset+octet-stream)
+    a la subida. Con la última parte el contrato queda guardado en el proyecto.
+    """
+    try:
+        estado = await recibir_parte(db, proyecto_id, subida_id, upload_offset, request.stream())
+    except ValueError as e:
+        raise _error_subida(e)
+    if estado is None:
+        raise HTTPException(status_code=404, detail="Subida no encontrada")
+    return _con_offset(response, estado)
+
+
+@router.delete("/{proyecto_id}/contrato/subidas/{subida_id}", status_code=204)
+async def cancelar_subida_contrato(proyecto_id: int, subida_id: str, db: Session = Depends(get_db)):
+    if not await cancelar_subida(db, proyecto_id, subida_id):
+        raise HTTPException(status_code=404, detail="Subida no encontrada")
+    return Response(status_code=204)
 
 # ============= ENDPOINTS PARA ACTUALIZACIÓN DE PRECIOS Y TARIFAS =============
 
@@ -5,11 +5,13 @@ from app.db.dependencies import get_db
 from app.schemas.schemas import (
     ReporteLaboralSchema,
     ReporteLaboralCreate,
-    ReporteLaboralOut
+    ReporteLaboralOut,
+    PaginaOut
 )
 from sqlalchemy.orm import Session
+from app.core.paginacion import CursorInvalido, ParametrosPagina, parametros_pagina
 from app.services.reporte_laboral_service import (
-    get_reportes_laborales as service_get_reportes_laborales,
+    get_reportes_laborales_filas as service_get_reportes_laborales_filas,
     get_reporte_laboral as service_get_reporte_laboral,
     create_reporte_laboral as service_create_reporte_laboral,
     update_reporte_laboral as service_update_reporte_laboral,
@@ -18,6 +20,10 @@ from app.services.reporte_laboral_service import (
     get_all_reportes_laborales_paginated
 )
 from app.security.auth import get_current_user
+from app.core.serializacion import FilasJSONResponse, formato_columnar, respuesta_filas
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/reportes-laborales",
@@ -32,13 +38,16 @@ def total_horas_mes_actual(session: Session = Depends(get_db)):
     total = get_total_horas_mes_actual(session)
     return {"total_horas_mes_actual": total}
 
-@router.get("/paginado", response_model=List[ReporteLaboralOut])
-def reportes_laborales_paginado(skip: int = 0, limit: int = 15, session: Session = Depends(get_db)):
-    return get_all_reportes_laborales_paginated(session, skip=skip, limit=limit)
+@router.get("/paginado", response_model=PaginaOut[ReporteLaboralOut])
+def reportes_laborales_paginado(pagina: ParametrosPagina = Depends(parametros_pagina), session: Session = Depends(get_db)):
+    try:
+        return get_all_reportes_laborales_paginated(session, pagina)
+    except CursorInvalido as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
 
 # --------- CRUD CON FILTROS ---------
 
-@router.get("/", response_model=List[ReporteLaboralOut])
+@router.get("/", response_model=List[ReporteLaboralOut], response_class=FilasJSONResponse)
 def get_reportes_laborales(
     busqueda: Optional[str] = Query(None, description="Buscar por nombre de máquina"),
     maquina_id: Optional[int] = Query(None, description="Filtrar por ID de máquina"),
@@ -46,10 +55,12 @@ def get_reportes_laborales(
     usuario_id: Optional[int] = Query(None, description="Filtrar por ID de usuario"),
     fecha_desde: Optional[str] = Query(None, description="Fecha desde (YYYY-MM-DD)"),
     fecha_hasta: Optional[str] = Query(None, description="Fecha hasta (YYYY-MM-DD)"),
+    columnar: bool = Depends(formato_columnar),
     session: Session = Depends(get_db)
 ):
     """
-    Obtiene reportes laborales con filtros opcionales
+    Obtiene reportes laborales con filtros opcionales.
+    Con ?format=columnar (o Accept columnar) devuelve columnas con esquema compartido.
     """
     # Construir diccionario de filtros
     filtros = {}
@@ -67,9 +78,9 @@ def get_reportes_laborales(
         filtros['fecha_hasta'] = fecha_hasta
     
     # Debug (puedes quitarlo después)
-    print(f"🔍 Filtros recibidos en backend: {filtros}")
+    logger.debug(f"🔍 Filtros recibidos en backend: {filtros}")
     
-    return service_get_reportes_laborales(session, filtros=filtros)
+    return respuesta_filas(service_get_reportes_laborales_filas(session, filtros=filtros, columnar=columnar), columnar)
 
 @router.get("/{id}", response_model=ReporteLaboralOut)
 def get_reporte_laboral(id: int, session: Session = Depends(get_db)):
@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
 from typing import List
 from app.db.dependencies import get_db
-from app.schemas.schemas import UsuarioSchema, UsuarioOut, UsuarioCreate, UsuarioUpdate
+from app.schemas.schemas import UsuarioSchema, UsuarioOut, UsuarioCreate, UsuarioUpdate, PaginaOut
 from sqlalchemy.orm import Session
+from app.core.paginacion import CursorInvalido, ParametrosPagina, parametros_pagina
 from app.services.usuario_service import (
     get_usuarios as service_get_usuarios,
     get_usuario as service_get_usuario,
@@ -21,6 +22,13 @@ router = APIRouter(prefix="/usuarios", tags=["Usuarios"])
 def get_usuarios(session: Session = Depends(get_db)):
     return service_get_usuarios(session)
 
+@router.get("/paginado", response_model=PaginaOut[UsuarioOut])
+def usuarios_paginado(pagina: ParametrosPagina = Depends(parametros_pagina), session: Session = Depends(get_db)):
+    try:
+        return get_all_usuarios_paginated(session, pagina)
+    except CursorInvalido as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+
 @router.get("/{id}", response_model=UsuarioSchema, dependencies=[Depends(get_current_user)])
 def get_usuario(id: int, session: Session = Depends(get_db)):
     usuario = service_get_usuario(session, id)
@@ -48,7 +56,3 @@ def delete_usuario(id: int, session: Session = Depends(get_db)):
         return {"message": "Usuario eliminado"}
     else:
         return JSONResponse(content={"error": "Usuario no encontrado"}, status_code=404)
-
-@router.get("/paginado")
-def usuarios_paginado(skip: int = 0, limit: int = 15, session: Session = Depends(get_db)):
-    return get_all_usuarios_paginated(session, skip=skip, limit=limit)
\ No newline at end of file
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from datetime import datetime, date
-from typing import List, Optional, Union, Dict, Any
+from typing import List, Optional, Union, Dict, Any, Generic, TypeVar
 import base64
 # Mantenimiento
 class MantenimientoBase(BaseModel):
@@ -266,6 +266,32 @@ class MovimientoInventarioOut(MovimientoInventarioBase):
     class Config:
         from_attributes = True
 
+class MovimientoInventarioBulkCreate(BaseModel):
+    movimientos: List[MovimientoInventarioCreate] = Field(..., min_length=1, description="Movimientos a registrar en una sola transacción")
+
+class MovimientoInventarioBulkResponse(BaseModel):
+    creados: int
+    movimientos: List[MovimientoInventarioOut]
+    stock_actual: Dict[int, int]  # producto_id -> inventario tras aplicar el lote
+
+class RegistroStockOut(BaseModel):
+    id: int
+    producto_id: int
+    movimiento_id: Optional[int] = None
+    delta: int
+    stock_resultante: int
+    motivo: str
+    fecha: datetime
+
+    class Config:
+        from_attributes = True
+
+class StockPuntualOut(BaseModel):
+    """Stock de un producto a una fecha determinada, calculado desde el libro de stock"""
+    producto_id: int
+    fecha: datetime
+    stock: int
+
 # Pago
 class PagoBase(BaseModel):
     proyecto_id: Optional[int] = None
@@ -300,12 +326,18 @@ class ProductoCreate(ProductoBase):
 
 class ProductoSchema(ProductoBase):
     id: Optional[int] = None
+    # Derivados WebP (app/core/imagenes.py), cuando ya están generados
+    url_miniatura: Optional[str] = None
+    srcset_imagen: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 class ProductoOut(ProductoBase):
     id: Optional[int] = None
+    # Derivados WebP (app/core/imagenes.py), cuando ya están generados
+    url_miniatura: Optional[str] = None
+    srcset_imagen: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -324,6 +356,7 @@ class ContratoArchivoCreate(ContratoArchivoBase):
 
 class ContratoArchivoResponse(ContratoArchivoBase):
     id: int
+    sha256: Optional[str] = None
     
     class Config:
         from_attributes = True
@@ -363,6 +396,19 @@ class ProyectoUpdate(BaseModel):
     contrato_id: Optional[int] = None
     ubicacion: Optional[str] = None
     
+class ProyectoFormulario(BaseModel):
+    """Campos de texto del formulario multipart de PUT /proyectos/{id} (el contrato va aparte)"""
+    nombre: str
+    fecha_inicio: str
+    estado: bool
+    gerente: str
+    ubicacion: str
+    descripcion: str
+
+class ProyectoFormularioAlta(ProyectoFormulario):
+    """Campos de texto del formulario multipart de POST /proyectos"""
+    fecha_creacion: str
+
 class ProyectoSchema(ProyectoBase):
     id: Optional[int] = None
 
@@ -688,7 +734,24 @@ class EstadisticasHorasOut(BaseModel):
 
     class Config:
         from_attributes = True
-        
+
+class UsoMaquinaPuntoOut(BaseModel):
+    """Punto de la serie de uso de una máquina (día o semana)"""
+    fecha: date  # día, o lunes de la semana
+    horas: float
+    registros: int
+    horometro_min: Optional[float] = None
+    horometro_max: Optional[float] = None
+
+class AnomaliaUsoMaquinaOut(BaseModel):
+    """Anomalía detectada en la serie de uso de una máquina"""
+    tipo: str  # "horometro_retroceso", "hueco" o "exceso_horas"
+    fecha: date
+    detalle: str
+    valor_anterior: Optional[float] = None
+    valor_nuevo: Optional[float] = None
+    dias: Optional[int] = None
+
 class CambiarProyectoRequest(BaseModel):
     nuevo_proyecto_id: int
     fecha_cambio: datetime
@@ -1287,4 +1350,238 @@ class RegistrarPagoResponse(BaseModel):
     pago: PagoReporteOut
     reporte_actualizado: ReporteCuentaCorrienteOut
     total_pagado: float
-    saldo_pendiente: float
\ No newline at end of file
+    saldo_pendiente: float
+# ============= BÚSQUEDA =============
+class ResultadoBusquedaOut(BaseModel):
+    """Resultado de la búsqueda unificada (typeahead)"""
+    tipo: str  # "maquina", "proyecto", "cliente" o "producto"
+    id: int
+    titulo: str
+    subtitulo: Optional[str] = None
+    score: float
+
+# ============= FACTURACIÓN POR LOTE =============
+class FacturacionLoteCreate(BaseModel):
+    periodo_inicio: date
+    periodo_fin: date
+    proyectos_ids: Optional[List[int]] = None  # Por defecto, todos los proyectos activos con items en el período
+    max_workers: Optional[int] = None  # Reportes generados en paralelo (por defecto FACTURACION_MAX_WORKERS)
+
+class ResultadoFacturacionProyecto(BaseModel):
+    proyecto_id: int
+    proyecto_nombre: Optional[str] = None
+    estado: str  # "creado", "omitido" o "error"
+    reporte_id: Optional[int] = None
+    importe_total: Optional[float] = None
+    motivo: Optional[str] = None
+    duracion_ms: Optional[int] = None
+
+class LoteFacturacionOut(BaseModel):
+    id: int
+    periodo_inicio: date
+    periodo_fin: date
+    estado: str  # "en_curso", "completado", "con_errores", "fallido" o "interrumpido"
+    total_proyectos: int
+    procesados: int
+    reportes_creados: int
+    omitidos: int
+    errores: int
+    importe_total: float
+    resultados: List[ResultadoFacturacionProyecto] = []
+    iniciado: Optional[datetime] = None
+    actualizado: Optional[datetime] = None
+    finalizado: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+# ============= CATÁLOGO DE PRECIOS =============
+class PrecioCatalogoCreate(BaseModel):
+    categoria: str  # "arido" o "maquina"
+    clave: str  # Tipo de árido o nombre exacto de la máquina ("default": tarifa general de máquinas)
+    precio: float  # Por m³ para áridos, por hora para máquinas
+    vigente_desde: Optional[date] = None  # Por defecto, hoy
+
+class PrecioCatalogoOut(BaseModel):
+    id: int
+    categoria: str
+    clave: str
+    precio: float
+    vigente_desde: date
+    vigente_hasta: Optional[date] = None  # None: vigente
+    created: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+# ============= SIMULACIÓN DE PRECIOS =============
+class EscenarioPrecios(BaseModel):
+    nombre: str
+    precios_aridos: Dict[str, float] = {}  # Precio por m³ por tipo de árido; los que no figuran mantienen su precio
+    tarifas_maquinas: Dict[str, float] = {}  # Tarifa por hora por nombre de máquina ("default": todas las no listadas)
+    factor_aridos: float = 1.0  # Multiplicador sobre el precio resultante (1.1 = +10%)
+    factor_horas: float = 1.0
+    solo_sin_precio: bool = False  # True: los registros con precio propio (negociado) lo conservan
+
+class SimulacionPreciosRequest(BaseModel):
+    desde: Optional[date] = None  # Por defecto, 12 meses antes de `hasta`
+    hasta: Optional[date] = None  # Por defecto, hoy
+    proyectos_ids: Optional[List[int]] = None  # Por defecto, todos los proyectos
+    escenarios: List[EscenarioPrecios]
+
+class ImporteMensualSimulado(BaseModel):
+    mes: str  # "YYYY-MM"
+    importe_aridos: float
+    importe_horas: float
+    importe_total: float
+
+class ResultadoEscenario(BaseModel):
+    nombre: str
+    importe_aridos: float
+    importe_horas: float
+    importe_total: float
+    diferencia: float  # Contra lo facturado con los precios actuales
+    diferencia_porcentaje: Optional[float] = None
+    por_mes: List[ImporteMensualSimulado] = []
+
+class SimulacionPreciosOut(BaseModel):
+    desde: date
+    hasta: date
+    proyectos_ids: Optional[List[int]] = None
+    total_aridos_m3: float
+    total_horas: float
+    registros_aridos: int
+    registros_horas: int
+    actual: ResultadoEscenario
+    escenarios: List[ResultadoEscenario]
+
+# ============= RENTABILIDAD DE MÁQUINAS =============
+class RentabilidadMaquinaMesOut(BaseModel):
+    mes: date  # Primer día del mes
+    horas: float
+    importe_horas: float  # Horas × tarifa (propia o del catálogo)
+    gasto_combustible: float
+    gasto_otros: float
+    costo_mantenimiento: float
+    costo_total: float
+    resultado: float  # importe_horas - costo_total
+
+class RentabilidadMaquinaOut(BaseModel):
+    maquina_id: int
+    maquina_nombre: str
+    horas: float
+    horas_sin_tarifa: float  # Valorizadas con el catálogo de precios
+    importe_horas: float
+    gasto_combustible: float
+    gasto_otros: float
+    costo_mantenimiento: float
+    costo_total: float
+    resultado: float
+    margen_porcentaje: Optional[float] = None  # resultado / importe_horas
+    costo_por_hora: Optional[float] = None
+    por_mes: List[RentabilidadMaquinaMesOut] = []
+
+# ============= ANALÍTICA =============
+class ConsultaCubo(BaseModel):
+    hecho: str  # horas, aridos, gastos, mantenimientos, cuenta_corriente
+    dimensiones: List[str] = []  # Ver GET /analitica/hechos
+    medidas: List[str] = []  # Vacío: todas las del hecho
+    granularidad: str = "mes"  # dia, semana, mes, trimestre, año o total
+    desde: Optional[date] = None
+    hasta: Optional[date] = None  # Inclusive
+    filtros: Dict[str, List[Union[int, str]]] = {}  # Dimensión -> valores admitidos
+    limite: int = Field(1000, ge=1, le=5000)
+
+class ResultadoCubo(BaseModel):
+    hecho: str
+    fuente: str  # Tabla o rollup del que se leyó
+    granularidad: str
+    dimensiones: List[str]
+    medidas: List[str]
+    filas: List[Dict[str, Any]]  # periodo, <dimensión>, <dimensión>_nombre, <medida>...
+    truncado: bool = False
+    desde_cache: bool = False
+    generado: datetime
+
+class HechoAnaliticoOut(BaseModel):
+    nombre: str
+    descripcion: str
+    dimensiones: List[str]
+    medidas: List[str]
+    granularidades: List[str]
+
+# ============= DASHBOARD =============
+class DashboardReporteLaboralOut(BaseModel):
+    id: int
+    maquina_id: Optional[int] = None
+    maquina_nombre: Optional[str] = None
+    proyecto_id: Optional[int] = None
+    proyecto_nombre: Optional[str] = None
+    fecha_asignacion: Optional[datetime] = None
+    horas_turno: Optional[int] = None
+
+class DashboardEntregaAridoOut(BaseModel):
+    id: int
+    proyecto_id: Optional[int] = None
+    proyecto_nombre: Optional[str] = None
+    tipo_arido: Optional[str] = None
+    cantidad: Optional[float] = None
+    fecha_entrega: Optional[datetime] = None
+
+class DashboardGastoOut(BaseModel):
+    id: int
+    maquina_id: Optional[int] = None
+    maquina_nombre: Optional[str] = None
+    tipo: Optional[str] = None
+    importe_total: Optional[float] = None
+    fecha: Optional[datetime] = None
+    descripcion: Optional[str] = None
+
+class DashboardProyectoOut(BaseModel):
+    id: int
+    nombre: str
+    estado: Optional[bool] = None
+    progreso: Optional[int] = None
+    fecha_inicio: Optional[date] = None
+    fecha_fin: Optional[date] = None
+    ubicacion: Optional[str] = None
+
+class DashboardResumenOut(BaseModel):
+    total_horas_mes_actual: float
+    suma_material_mes_actual: float
+    total_combustible_mes_actual: int
+    cantidad_proyectos_activos: int
+    # Últimos registros cargados, del más nuevo al más viejo
+    reportes_laborales: List[DashboardReporteLaboralOut] = []
+    entregas_arido: List[DashboardEntregaAridoOut] = []
+    gastos: List[DashboardGastoOut] = []
+    proyectos: List[DashboardProyectoOut] = []
+    generado: datetime
+    desde_cache: bool = False
+
+# ============= PAGINACIÓN =============
+T = TypeVar("T")
+
+class PaginaOut(BaseModel, Generic[T]):
+    items: List[T]
+    limit: int
+    siguiente_cursor: Optional[str] = None  # Pasar como ?cursor= para pedir la página siguiente
+    hay_mas: bool = False
+    total_estimado: Optional[int] = None  # Según las estadísticas del planner, solo con ?contar=true
+
+# ============= SUBIDAS DE CONTRATOS =============
+class SubidaContratoCreate(BaseModel):
+    nombre_archivo: str = Field(..., min_length=1, max_length=255)
+    tipo_archivo: str
+    tamaño: int = Field(..., gt=0)
+    sha256: Optional[str] = Field(None, pattern="^[0-9a-f]{64}$")  # Si ya hay un archivo idéntico no se transfiere nada
+
+class SubidaContratoOut(BaseModel):
+    id: Optional[str] = None  # None si se completó por deduplicación al crearla
+    proyecto_id: int
+    nombre_archivo: str
+    tipo_archivo: str
+    tamaño_total: int
+    recibido: int  # Próximo Upload-Offset
+    completa: bool = False
+    contrato: Optional[ContratoArchivoResponse] = None
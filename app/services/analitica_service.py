@@ -0,0 +1,418 @@
+"""
+Cubo analítico para dashboards: totales por proyecto, período, máquina, tipo de
+árido, etc., armados como una sola consulta agrupada a partir de una
+especificación (hecho, dimensiones, medidas, filtros y granularidad).
+
+- Cada hecho declara sus dimensiones (columnas de agrupación, con la tabla de
+  la que sale su nombre) y sus medidas (agregados SQL).
+- Si la consulta solo pide dimensiones y medidas que tiene un rollup
+  (uso_maquina_diario/semanal, rentabilidad_maquina_mensual) y el rango de
+  fechas cubre períodos completos del rollup, se lee del rollup en vez de la
+  tabla base; el resultado informa la fuente usada. Las dos fuentes dan lo
+  mismo: los rollups conservan las horas de los proyectos archivados y la
+  base de "horas" las suma desde horas_archivadas (ver archivo_frio_service).
+- Todas las fuentes agrupan por el día calendario de la misma manera: las
+  columnas TIMESTAMP sin zona tal cual, y las TIMESTAMP WITH TIME ZONE
+  (fecha_mantenimiento) con fecha_local(), igual que el trigger del rollup.
+- Los resultados se guardan por worker durante ANALITICA_CACHE_TTL_SECONDS,
+  con clave en la especificación normalizada de la consulta.
+
+Se usa desde POST /analitica/consulta; GET /analitica/hechos lista lo disponible.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+import calendar
+import json
+import logging
+import time
+
+from sqlalchemy import Date, DateTime, cast, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.cache import CacheTTL
+from app.core.config import settings
+from app.db.models import (
+    ReporteLaboral, EntregaArido, Gasto, Mantenimiento, ReporteCuentaCorriente, PagoReporte,
+    UsoMaquinaDiario, UsoMaquinaSemanal, RentabilidadMaquinaMensual, HorasArchivadas, Maquina, Proyecto, Usuario
+)
+from app.schemas.schemas import ConsultaCubo, ResultadoCubo, HechoAnaliticoOut
+
+logger = logging.getLogger(__name__)
+
+# Granularidad -> unidad de date_trunc; "total" no agrupa por período
+GRANULARIDADES = {"dia": "day", "semana": "week", "mes": "month", "trimestre": "quarter", "año": "year", "total": None}
+
+MAX_FILAS = 5000
+
+
+def _alineado(desde: Optional[date], hasta: Optional[date], grano: str) -> bool:
+    if grano == "semana":
+        return (desde is None or desde.weekday() == 0) and (hasta is None or hasta.weekday() == 6)
+    if grano == "mes":
+        ultimo_dia = hasta and calendar.monthrange(hasta.year, hasta.month)[1]
+        return (desde is None or desde.day == 1) and (hasta is None or hasta.day == ultimo_dia)
+    return True
+
+
+class Dimension:
+    """Columna de agrupación de un hecho y, si corresponde, de dónde sale su nombre"""
+
+    def __init__(self, columna: str, etiqueta=None):
+        self.columna = columna
+        self.etiqueta = etiqueta  # (modelo, columna de nombre) unido por id
+
+
+class Fuente:
+    """
+    Tabla (o subconsulta) de la que se leen un hecho o un rollup. `columnas`
+    mapea nombres comunes (fecha, maquina_id, ...) a columnas de la fuente y
+    `medidas` mapea cada medida a su agregado.
+    """
+
+    def __init__(
+        self,
+        nombre: str,
+        tabla: Callable,
+        columnas: Callable[[object], Dict],
+        medidas: Dict[str, Callable[[Dict], object]],
+        dimensiones: Optional[List[str]] = None,
+        grano: str = "dia",
+        granularidades: Tuple[str, ...] = tuple(GRANULARIDADES)
+    ):
+        self.nombre = nombre
+        self._tabla = tabla
+        self._columnas = columnas
+        self.medidas = medidas
+        self.dimensiones = dimensiones
+        self.grano = grano  # Período de cada fila de la fuente
+        self.granularidades = granularidades  # Las que se pueden armar sumando filas de la fuente
+
+    def armar(self):
+        tabla = self._tabla()
+        return tabla, self._columnas(tabla)
+
+    def admite(self, consulta: ConsultaCubo, medidas: List[str]) -> bool:
+        """Un rollup sirve si tiene todo lo pedido y sus períodos caben en los de la consulta"""
+        pedidas = set(consulta.dimensiones) | set(consulta.filtros)
+        if self.dimensiones is not None and not pedidas <= set(self.dimensiones):
+            return False
+        if not set(medidas) <= set(self.medidas):
+            return False
+        if consulta.granularidad not in self.granularidades:
+            return False
+        # Un rollup semanal o mensual solo responde rangos de semanas o meses completos
+        return _alineado(consulta.desde, consulta.hasta, self.grano)
+
+
+class Hecho:
+    def __init__(self, descripcion: str, dimensiones: Dict[str, Dimension], base: Fuente, rollups: List[Fuente] = ()):
+        self.descripcion = descripcion
+        self.dimensiones = dimensiones
+        self.base = base
+        self.rollups = list(rollups)
+
+    @property
+    def medidas(self) -> List[str]:
+        return list(self.base.medidas)
+
+    def fuente(self, consulta: ConsultaCubo, medidas: List[str]) -> Fuente:
+        # Los rollups se declaran del más agregado al menos agregado
+        return next((r for r in self.rollups if r.admite(consulta, medidas)), self.base)
+
+
+_PROYECTO = Dimension("proyecto_id", (Proyecto, "nombre"))
+_MAQUINA = Dimension("maquina_id", (Maquina, "nombre"))
+_USUARIO = Dimension("usuario_id", (Usuario, "nombre"))
+
+
+def _suma(columna: str):
+    return lambda c: func.coalesce(func.sum(c[columna]), 0)
+
+
+def _conteo(c):
+    return func.count()
+
+
+def _horas():
+    """Reportes laborales con máquina y las horas archivadas de proyectos cerrados"""
+    calientes = select(
+        ReporteLaboral.fecha_asignacion.label("fecha"),
+        ReporteLaboral.proyecto_id,
+        ReporteLaboral.maquina_id,
+        ReporteLaboral.usuario_id,
+        ReporteLaboral.horas_turno.label("horas"),
+        literal(1).label("registros"),
+        (ReporteLaboral.horas_turno * ReporteLaboral.tarifa_hora).label("importe")
+    ).where(ReporteLaboral.maquina_id.isnot(None))
+    archivadas = select(
+        cast(HorasArchivadas.fecha, DateTime),
+        HorasArchivadas.proyecto_id,
+        HorasArchivadas.maquina_id,
+        HorasArchivadas.usuario_id,
+        HorasArchivadas.horas,
+        HorasArchivadas.registros,
+        HorasArchivadas.importe
+    )
+    return union_all(calientes, archivadas).subquery("horas")
+
+
+def _cuenta_corriente():
+    """Facturado por fecha de emisión del reporte y pagado por fecha del pago"""
+    facturado = select(
+        ReporteCuentaCorriente.proyecto_id,
+        ReporteCuentaCorriente.fecha_generacion.label("fecha"),
+        ReporteCuentaCorriente.importe_total.label("facturado"),
+        literal(0).label("pagado")
+    )
+    pagado = select(
+        ReporteCuentaCorriente.proyecto_id,
+        PagoReporte.fecha.label("fecha"),
+        literal(0).label("facturado"),
+        PagoReporte.monto.label("pagado")
+    ).join(ReporteCuentaCorriente, ReporteCuentaCorriente.id == PagoReporte.reporte_id)
+    return union_all(facturado, pagado).subquery("cuenta_corriente")
+
+
+HECHOS: Dict[str, Hecho] = {
+    "horas": Hecho(
+        "Horas de máquina cargadas en reportes laborales",
+        {"proyecto": _PROYECTO, "maquina": _MAQUINA, "usuario": _USUARIO},
+        Fuente(
+            "reporte_laboral+horas_archivadas",
+            _horas,
+            lambda t: dict(t.c),
+            {"horas": _suma("horas"), "registros": _suma("registros"), "importe": _suma("importe")}
+        ),
+        rollups=[
+            Fuente(
+                "rentabilidad_maquina_mensual",
+                lambda: RentabilidadMaquinaMensual.__table__,
+                # importe_horas del rollup valoriza con el catálogo las horas sin tarifa: no equivale a "importe"
+                # Las filas del mes sin horas (solo gastos o mantenimientos) no existen en la base
+                lambda t: {"fecha": t.c.mes, "maquina_id": t.c.maquina_id, "horas": t.c.horas, "_condicion": t.c.horas != 0},
+                {"horas": _suma("horas")},
+                dimensiones=["maquina"],
+                grano="mes",
+                granularidades=("mes", "trimestre", "año", "total")
+            ),
+            Fuente(
+                "uso_maquina_semanal",
+                lambda: UsoMaquinaSemanal.__table__,
+                lambda t: {"fecha": t.c.semana_inicio, "maquina_id": t.c.maquina_id, "horas": t.c.horas, "registros": t.c.registros},
+                {"horas": _suma("horas"), "registros": _suma("registros")},
+                dimensiones=["maquina"],
+                grano="semana",
+                granularidades=("semana", "total")
+            ),
+            Fuente(
+                "uso_maquina_diario",
+                lambda: UsoMaquinaDiario.__table__,
+                lambda t: {"fecha": t.c.fecha, "maquina_id": t.c.maquina_id, "horas": t.c.horas, "registros": t.c.registros},
+                {"horas": _suma("horas"), "registros": _suma("registros")},
+                dimensiones=["maquina"]
+            )
+        ]
+    ),
+    "aridos": Hecho(
+        "Entregas de áridos",
+        {"proyecto": _PROYECTO, "tipo_arido": Dimension("tipo_arido"), "usuario": _USUARIO},
+        Fuente(
+            "entrega_arido",
+            lambda: EntregaArido.__table__,
+            lambda t: {
+                "fecha": t.c.fecha_entrega, "proyecto_id": t.c.proyecto_id, "tipo_arido": t.c.tipo_arido,
+                "usuario_id": t.c.usuario_id, "cantidad": t.c.cantidad, "precio_unitario": t.c.precio_unitario
+            },
+            {
+                "m3": _suma("cantidad"),
+                "entregas": _conteo,
+                "importe": lambda c: func.coalesce(func.sum(c["cantidad"] * c["precio_unitario"]), 0)
+            }
+        )
+    ),
+    "gastos": Hecho(
+        "Gastos cargados (combustible y otros)",
+        {"maquina": _MAQUINA, "tipo": Dimension("tipo"), "usuario": _USUARIO},
+        Fuente(
+            "gasto",
+            lambda: Gasto.__table__,
+            lambda t: {
+                "fecha": t.c.fecha, "maquina_id": t.c.maquina_id, "tipo": t.c.tipo,
+                "usuario_id": t.c.usuario_id, "importe": t.c.importe_total
+            },
+            {"importe": _suma("importe"), "gastos": _conteo}
+        )
+    ),
+    "mantenimientos": Hecho(
+        "Mantenimientos de máquinas",
+        {"maquina": _MAQUINA, "tipo": Dimension("tipo")},
+        Fuente(
+            "mantenimiento",
+            lambda: Mantenimiento.__table__,
+            lambda t: {
+                "fecha": func.fecha_local(t.c.fecha_mantenimiento, type_=DateTime), "maquina_id": t.c.maquina_id,
+                "tipo": t.c.tipo_mantenimiento, "costo": t.c.costo
+            },
+            {"costo": _suma("costo"), "mantenimientos": _conteo}
+        ),
+        rollups=[
+            Fuente(
+                "rentabilidad_maquina_mensual",
+                lambda: RentabilidadMaquinaMensual.__table__,
+                lambda t: {
+                    "fecha": t.c.mes, "maquina_id": t.c.maquina_id, "costo": t.c.costo_mantenimiento,
+                    "_condicion": t.c.costo_mantenimiento != 0
+                },
+                {"costo": _suma("costo")},
+                dimensiones=["maquina"],
+                grano="mes",
+                granularidades=("mes", "trimestre", "año", "total")
+            )
+        ]
+    ),
+    "cuenta_corriente": Hecho(
+        "Facturado (reportes de cuenta corriente) y pagado",
+        {"proyecto": _PROYECTO},
+        Fuente(
+            "reportes_cuenta_corriente+pagos_reportes",
+            _cuenta_corriente,
+            lambda t: dict(t.c),
+            {
+                "facturado": _suma("facturado"),
+                "pagado": _suma("pagado"),
+                "saldo": lambda c: func.coalesce(func.sum(c["facturado"]), 0) - func.coalesce(func.sum(c["pagado"]), 0)
+            }
+        )
+    )
+}
+
+
+def listar_hechos() -> List[HechoAnaliticoOut]:
+    return [
+        HechoAnaliticoOut(
+            nombre=nombre,
+            descripcion=hecho.descripcion,
+            dimensiones=list(hecho.dimensiones),
+            medidas=hecho.medidas,
+            granularidades=list(GRANULARIDADES)
+        )
+        for nombre, hecho in HECHOS.items()
+    ]
+
+
+def _validar(consulta: ConsultaCubo) -> Tuple[Hecho, List[str]]:
+    hecho = HECHOS.get(consulta.hecho)
+    if hecho is None:
+        raise ValueError(f"Hecho desconocido: {consulta.hecho}. Válidos: {', '.join(HECHOS)}")
+    if consulta.granularidad not in GRANULARIDADES:
+        raise ValueError(f"Granularidad inválida: {consulta.granularidad}. Válidas: {', '.join(GRANULARIDADES)}")
+    for dimension in list(consulta.dimensiones) + list(consulta.filtros):
+        if dimension not in hecho.dimensiones:
+            raise ValueError(
+                f"Dimensión desconocida para '{consulta.hecho}': {dimension}. Válidas: {', '.join(hecho.dimensiones)}"
+            )
+    if len(set(consulta.dimensiones)) != len(consulta.dimensiones):
+        raise ValueError("Hay dimensiones repetidas")
+    medidas = list(dict.fromkeys(consulta.medidas)) or hecho.medidas
+    invalidas = [m for m in medidas if m not in hecho.base.medidas]
+    if invalidas:
+        raise ValueError(
+            f"Medidas desconocidas para '{consulta.hecho}': {', '.join(invalidas)}. Válidas: {', '.join(hecho.medidas)}"
+        )
+    if consulta.desde and consulta.hasta and consulta.hasta < consulta.desde:
+        raise ValueError("La fecha 'hasta' es anterior a 'desde'")
+    return hecho, medidas
+
+
+def _armar_consulta(hecho: Hecho, fuente: Fuente, consulta: ConsultaCubo, medidas: List[str]):
+    tabla, c = fuente.armar()
+    desde = tabla
+    columnas, grupo = [], []
+
+    unidad = GRANULARIDADES[consulta.granularidad]
+    if unidad:
+        periodo = cast(func.date_trunc(unidad, c["fecha"]), Date)
+        columnas.append(periodo.label("periodo"))
+        grupo.append(periodo)
+
+    for nombre in consulta.dimensiones:
+        dimension = hecho.dimensiones[nombre]
+        clave = c[dimension.columna]
+        columnas.append(clave.label(nombre))
+        grupo.append(clave)
+        if dimension.etiqueta:
+            modelo, atributo = dimension.etiqueta
+            etiquetas = modelo.__table__.alias(f"{nombre}_etiqueta")
+            desde = desde.outerjoin(etiquetas, etiquetas.c.id == clave)
+            columnas.append(etiquetas.c[atributo].label(f"{nombre}_nombre"))
+            grupo.append(etiquetas.c[atributo])
+
+    for medida in medidas:
+        columnas.append(fuente.medidas[medida](c).label(medida))
+
+    query = select(*columnas).select_from(desde)
+    if "_condicion" in c:
+        query = query.where(c["_condicion"])
+    if consulta.desde:
+        query = query.where(c["fecha"] >= consulta.desde)
+    if consulta.hasta:
+        # Las fechas de las tablas base son timestamps: incluir el día completo
+        query = query.where(c["fecha"] < consulta.hasta + timedelta(days=1))
+    for nombre, valores in consulta.filtros.items():
+        query = query.where(c[hecho.dimensiones[nombre].columna].in_(valores))
+
+    return query.group_by(*grupo).order_by(*grupo).limit(min(consulta.limite, MAX_FILAS) + 1)
+
+
+def _valor(valor):
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    return valor
+
+
+def consultar(db: Session, consulta: ConsultaCubo) -> ResultadoCubo:
+    """Ejecuta la consulta sin pasar por el cache. Lanza ValueError si la especificación no es válida."""
+    hecho, medidas = _validar(consulta)
+    fuente = hecho.fuente(consulta, medidas)
+    limite = min(consulta.limite, MAX_FILAS)
+
+    inicio = time.perf_counter()
+    filas = db.execute(_armar_consulta(hecho, fuente, consulta, medidas)).mappings().all()
+    logger.info(
+        f"📊 Cubo '{consulta.hecho}' desde {fuente.nombre}: {min(len(filas), limite)} filas "
+        f"en {(time.perf_counter() - inicio) * 1000:.0f} ms"
+    )
+    return ResultadoCubo(
+        hecho=consulta.hecho,
+        fuente=fuente.nombre,
+        granularidad=consulta.granularidad,
+        dimensiones=list(consulta.dimensiones),
+        medidas=medidas,
+        filas=[{k: _valor(v) for k, v in fila.items()} for fila in filas[:limite]],
+        truncado=len(filas) > limite,
+        generado=datetime.now(timezone.utc)
+    )
+
+
+cache_resultados = CacheTTL(settings.ANALITICA_CACHE_TTL_SECONDS, settings.ANALITICA_CACHE_MAX_ENTRADAS)
+
+
+def _clave(consulta: ConsultaCubo) -> str:
+    datos = consulta.model_dump(mode="json")
+    datos["filtros"] = {k: sorted(v, key=str) for k, v in datos["filtros"].items()}
+    return json.dumps(datos, sort_keys=True, ensure_ascii=False)
+
+
+def consultar_cubo(db: Session, consulta: ConsultaCubo) -> ResultadoCubo:
+    """Consulta del cubo con cache de resultados por worker"""
+    clave = _clave(consulta)
+    resultado = cache_resultados.obtener(clave)
+    if resultado is not None:
+        return resultado.model_copy(update={"desde_cache": True})
+    resultado = consultar(db, consulta)
+    cache_resultados.guardar(clave, resultado)
+    return resultado
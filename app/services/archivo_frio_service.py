@@ -0,0 +1,507 @@
+"""
+Archivo frío de proyectos cerrados.
+
+Un proyecto con estado=False puede mover a archivos Parquet (zstd) en
+ARCHIVO_FRIO_DIR/proyecto_<id>/ sus horas (reporte_laboral), entregas de
+áridos y reportes de cuenta corriente (con sus items y pagos). Las filas salen
+de las tablas calientes, así que su tamaño queda acotado por los proyectos
+activos. Los registros de contrato_archivo quedan en la base: son pocos y
+describen archivos que siguen en uploads/contratos, que se descargan con su
+nombre y tipo.
+
+- Los archivos se escriben en un directorio temporal, se releen y se comparan
+  contra las filas exportadas antes de publicarlos; recién entonces se borran
+  las filas, en una sola transacción que también registra el proyecto en
+  proyecto_archivo y sus reportes en reporte_archivado.
+- Las lecturas de reportes, pagos y resúmenes de un proyecto archivado se
+  responden desde los archivos (ver cuenta_corriente_service), con los mismos
+  resultados que antes de archivar.
+- `restaurar_proyecto` devuelve las filas a las tablas con sus ids originales;
+  se llama al reabrir el proyecto, dentro de la transacción de quien llama. El
+  directorio del archivo se borra recién cuando esa transacción hace commit.
+- Un proyecto archivado no se puede eliminar: hay que restaurarlo antes, igual
+  que un proyecto con horas o entregas no se puede borrar por sus FKs.
+- Archivar y restaurar no cambia el rollup de rentabilidad de máquinas: sus
+  triggers se saltean con kedikian.conservar_rollups. Las horas archivadas
+  quedan además agregadas por día en horas_archivadas, que leen el cubo
+  analítico y la reconstrucción de los rollups.
+
+Se usa con `python archivo_frio.py`. Requiere pyarrow.
+"""
+
+from datetime import date, datetime, time as dtime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+from sqlalchemy import (
+    event, select, delete, insert, update, func, exists, text, case, cast, literal,
+    Boolean, Integer, Float, Numeric, DateTime, Date
+)
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models import (
+    Proyecto, ReporteLaboral, EntregaArido, ReporteCuentaCorriente, ReporteItemArido,
+    ReporteItemHora, ReporteLinea, PagoReporte, HorometroHistorial,
+    ProyectoArchivo, ReporteArchivado, HorasArchivadas
+)
+from app.schemas.schemas import ReporteCuentaCorrienteOut, PagoReporteOut
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow solo hace falta si hay proyectos archivados
+    pa = pc = pq = None
+
+logger = logging.getLogger(__name__)
+
+ARCHIVO_FRIO_DIR = Path(settings.ARCHIVO_FRIO_DIR)
+COMPRESION = "zstd"
+MANIFIESTO = "manifest.json"
+
+# Referencias de horometro_historial a horas archivadas: se ponen en NULL al
+# archivar y se restauran junto con las horas
+REFERENCIAS_HOROMETRO = "horometro_historial_refs"
+
+# Los triggers de rollups que deben conservar las filas archivadas no actúan en la transacción
+SQL_CONSERVAR_ROLLUPS = "SET LOCAL kedikian.conservar_rollups = 'on'"
+
+# Ids por sentencia al borrar filas exportadas
+TAMANO_LOTE = 5000
+
+
+def _requerir_pyarrow():
+    if pa is None:
+        raise RuntimeError("El archivo frío requiere pyarrow (pip install pyarrow)")
+
+
+def _tablas(proyecto_id: int) -> List[Tuple]:
+    """Modelos archivados y el filtro de sus filas, padres antes que hijos"""
+    reportes = select(ReporteCuentaCorriente.id).where(ReporteCuentaCorriente.proyecto_id == proyecto_id)
+    return [
+        (ReporteLaboral, ReporteLaboral.proyecto_id == proyecto_id),
+        (EntregaArido, EntregaArido.proyecto_id == proyecto_id),
+        (ReporteCuentaCorriente, ReporteCuentaCorriente.proyecto_id == proyecto_id),
+        (ReporteItemArido, ReporteItemArido.reporte_id.in_(reportes)),
+        (ReporteItemHora, ReporteItemHora.reporte_id.in_(reportes)),
+        (ReporteLinea, ReporteLinea.reporte_id.in_(reportes)),
+        (PagoReporte, PagoReporte.reporte_id.in_(reportes)),
+    ]
+
+
+def _tipo_arrow(tipo):
+    if isinstance(tipo, Boolean):
+        return pa.bool_()
+    if isinstance(tipo, Integer):
+        return pa.int64()
+    if isinstance(tipo, Float):
+        return pa.float64()
+    if isinstance(tipo, Numeric):
+        return pa.decimal128(tipo.precision or 38, tipo.scale if tipo.scale is not None else 10)
+    if isinstance(tipo, DateTime):
+        return pa.timestamp("us", tz="UTC" if tipo.timezone else None)
+    if isinstance(tipo, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def _esquema(columnas) -> "pa.Schema":
+    return pa.schema([pa.field(c.key, _tipo_arrow(c.type), nullable=c.nullable) for c in columnas])
+
+
+def _sha256(ruta: Path) -> str:
+    digest = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b""):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def _escribir(ruta: Path, esquema, filas: List[Dict]) -> Dict:
+    tabla = pa.Table.from_pylist([dict(f) for f in filas], schema=esquema)
+    pq.write_table(tabla, ruta, compression=COMPRESION)
+    # Verificar antes de borrar nada: misma cantidad de filas y mismos valores
+    if not pq.read_table(ruta).equals(tabla):
+        raise RuntimeError(f"El archivo {ruta.name} no coincide con las filas exportadas")
+    return {"filas": tabla.num_rows, "bytes": ruta.stat().st_size, "sha256": _sha256(ruta)}
+
+
+def _borrar_por_ids(db: Session, modelo, ids: List[int]):
+    for i in range(0, len(ids), TAMANO_LOTE):
+        db.execute(delete(modelo).where(modelo.id.in_(ids[i:i + TAMANO_LOTE])))
+
+
+def _agregar_horas(proyecto_id: int):
+    """INSERT en horas_archivadas de las horas del proyecto agregadas por máquina, usuario y día"""
+    horas = func.coalesce(ReporteLaboral.horas_turno, 0)
+    importe = ReporteLaboral.horas_turno * ReporteLaboral.tarifa_hora
+    dia = cast(ReporteLaboral.fecha_asignacion, Date)
+    agregado = select(
+        literal(proyecto_id), ReporteLaboral.maquina_id, ReporteLaboral.usuario_id, dia,
+        func.count(),
+        func.sum(horas),
+        func.sum(case((ReporteLaboral.tarifa_hora.is_(None), horas), else_=0)),
+        func.coalesce(func.sum(importe), 0),
+        # Mismo redondeo por fila que el trigger de rentabilidad
+        func.coalesce(func.sum(func.round(cast(importe, Numeric), 2)), 0),
+        func.min(ReporteLaboral.horometro_inicial),
+        func.max(ReporteLaboral.horometro_inicial)
+    ).where(
+        ReporteLaboral.proyecto_id == proyecto_id,
+        ReporteLaboral.maquina_id.isnot(None)
+    ).group_by(ReporteLaboral.maquina_id, ReporteLaboral.usuario_id, dia)
+    return insert(HorasArchivadas).from_select([
+        "proyecto_id", "maquina_id", "usuario_id", "fecha", "registros", "horas", "horas_sin_tarifa",
+        "importe", "importe_horas", "horometro_min", "horometro_max"
+    ], agregado)
+
+
+def archivar_proyecto(db: Session, proyecto_id: int, forzar: bool = False) -> ProyectoArchivo:
+    """
+    Exporta y quita de las tablas calientes las filas de un proyecto cerrado.
+    Lanza ValueError si el proyecto no existe, está activo, ya está archivado o
+    tiene reportes sin pagar (salvo forzar=True).
+    """
+    _requerir_pyarrow()
+
+    proyecto = db.query(Proyecto).filter(Proyecto.id == proyecto_id).with_for_update().first()
+    if not proyecto:
+        raise ValueError(f"No se encontró el proyecto con ID {proyecto_id}")
+    if proyecto.estado:
+        raise ValueError(f"El proyecto {proyecto_id} está activo; solo se archivan proyectos cerrados")
+    if db.get(ProyectoArchivo, proyecto_id):
+        raise ValueError(f"El proyecto {proyecto_id} ya está archivado")
+    if not forzar:
+        pendientes = db.query(func.count(ReporteCuentaCorriente.id)).filter(
+            ReporteCuentaCorriente.proyecto_id == proyecto_id,
+            ReporteCuentaCorriente.estado != "pagado"
+        ).scalar()
+        if pendientes:
+            raise ValueError(f"El proyecto {proyecto_id} tiene {pendientes} reportes sin pagar")
+
+    destino = ARCHIVO_FRIO_DIR / f"proyecto_{proyecto_id}"
+    temporal = destino.with_name(destino.name + ".tmp")
+    shutil.rmtree(temporal, ignore_errors=True)
+    temporal.mkdir(parents=True)
+
+    tablas = _tablas(proyecto_id)
+    ids: Dict[str, List[int]] = {}
+    manifiesto = {
+        "proyecto_id": proyecto_id,
+        "archivado_en": datetime.now(timezone.utc).isoformat(),
+        "tablas": {}
+    }
+    try:
+        for modelo, filtro in tablas:
+            columnas = list(modelo.__table__.columns)
+            filas = db.execute(select(*columnas).where(filtro).order_by(modelo.id)).mappings().all()
+            nombre = modelo.__tablename__
+            ids[nombre] = [f["id"] for f in filas]
+            manifiesto["tablas"][nombre] = _escribir(temporal / f"{nombre}.parquet", _esquema(columnas), filas)
+
+        referencias = db.execute(
+            select(HorometroHistorial.id, HorometroHistorial.reporte_laboral_id)
+            .where(HorometroHistorial.reporte_laboral_id.in_(
+                select(ReporteLaboral.id).where(ReporteLaboral.proyecto_id == proyecto_id)
+            ))
+        ).mappings().all()
+        esquema_referencias = pa.schema([("id", pa.int64()), ("reporte_laboral_id", pa.int64())])
+        manifiesto["tablas"][REFERENCIAS_HOROMETRO] = _escribir(
+            temporal / f"{REFERENCIAS_HOROMETRO}.parquet", esquema_referencias, referencias
+        )
+
+        (temporal / MANIFIESTO).write_text(json.dumps(manifiesto, indent=2), encoding="utf-8")
+        # Un directorio sin registro en proyecto_archivo es de un intento fallido anterior
+        shutil.rmtree(destino, ignore_errors=True)
+        os.replace(temporal, destino)
+    except Exception:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+
+    try:
+        # Las horas archivadas siguen contando en el rollup de rentabilidad de máquinas
+        db.execute(text(SQL_CONSERVAR_ROLLUPS))
+        archivo = ProyectoArchivo(
+            proyecto_id=proyecto_id,
+            ruta=str(destino),
+            filas=sum(t["filas"] for t in manifiesto["tablas"].values()),
+            bytes=sum(t["bytes"] for t in manifiesto["tablas"].values()),
+            manifiesto=json.dumps(manifiesto)
+        )
+        db.add(archivo)
+        db.flush()
+        # ... y en las consultas del cubo analítico, agregadas por día
+        db.execute(_agregar_horas(proyecto_id))
+        if referencias:
+            db.execute(
+                update(HorometroHistorial)
+                .where(HorometroHistorial.id.in_([r["id"] for r in referencias]))
+                .values(reporte_laboral_id=None)
+            )
+        for modelo, _ in reversed(tablas):
+            _borrar_por_ids(db, modelo, ids[modelo.__tablename__])
+
+        # Filas creadas entre la exportación y el borrado quedarían fuera del archivo
+        for modelo, filtro in tablas:
+            if db.query(exists().where(filtro)).scalar():
+                raise RuntimeError(
+                    f"Se escribieron filas en {modelo.__tablename__} durante el archivo del proyecto {proyecto_id}"
+                )
+
+        db.add_all([
+            ReporteArchivado(reporte_id=reporte_id, proyecto_id=proyecto_id)
+            for reporte_id in ids[ReporteCuentaCorriente.__tablename__]
+        ])
+        db.commit()
+    except Exception:
+        db.rollback()
+        shutil.rmtree(destino, ignore_errors=True)
+        raise
+
+    logger.info(
+        f"🧊 Proyecto {proyecto_id} archivado: {archivo.filas} filas, {archivo.bytes / 1024:.0f} KB en {destino}"
+    )
+    return archivo
+
+
+def restaurar_proyecto(db: Session, proyecto_id: int) -> int:
+    """
+    Devuelve a las tablas calientes las filas archivadas de un proyecto, con sus
+    ids originales. No hace commit: el directorio del archivo se borra después
+    del commit de quien llama, y si la transacción se revierte queda intacto.
+    Devuelve las filas restauradas (0 si el proyecto no estaba archivado).
+    """
+    archivo = db.get(ProyectoArchivo, proyecto_id)
+    if not archivo:
+        return 0
+    _requerir_pyarrow()
+
+    ruta = Path(archivo.ruta)
+    restauradas = 0
+    # Las horas archivadas nunca dejaron el rollup de rentabilidad de máquinas
+    db.execute(text(SQL_CONSERVAR_ROLLUPS))
+    # El contrato_archivo.parquet de archivos anteriores se ignora: esas filas ya volvieron (0031)
+    for modelo, _ in _tablas(proyecto_id):
+        if not _existe(archivo, modelo.__tablename__):
+            continue  # Tabla agregada al archivo después de archivar este proyecto
+        filas = _leer(archivo, modelo.__tablename__).to_pylist()
+        if filas:
+            db.execute(insert(modelo.__table__), filas)
+            restauradas += len(filas)
+
+    for referencia in _leer(archivo, REFERENCIAS_HOROMETRO).to_pylist():
+        db.execute(
+            update(HorometroHistorial)
+            .where(HorometroHistorial.id == referencia["id"], HorometroHistorial.reporte_laboral_id.is_(None))
+            .values(reporte_laboral_id=referencia["reporte_laboral_id"])
+        )
+
+    # Borra también sus horas_archivadas y reporte_archivado (ON DELETE CASCADE)
+    db.delete(archivo)
+    db.flush()
+    db.info.setdefault("archivo_frio_descartar", []).append(ruta)
+
+    logger.info(f"♨️  Proyecto {proyecto_id} restaurado desde el archivo frío: {restauradas} filas")
+    return restauradas
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _borrar_restaurados(session):
+    rutas = session.info.pop("archivo_frio_descartar", None)
+    if rutas:
+        _leer_archivo.cache_clear()
+        for ruta in rutas:
+            shutil.rmtree(ruta, ignore_errors=True)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _conservar_restaurados(session):
+    session.info.pop("archivo_frio_descartar", None)
+
+
+def archivar_cerrados(db: Session) -> List[int]:
+    """Archiva los proyectos cerrados sin reportes pendientes. Devuelve los ids archivados."""
+    candidatos = db.execute(
+        select(Proyecto.id).where(
+            Proyecto.estado == False,
+            ~exists().where(ProyectoArchivo.proyecto_id == Proyecto.id),
+            ~exists().where(
+                ReporteCuentaCorriente.proyecto_id == Proyecto.id,
+                ReporteCuentaCorriente.estado != "pagado"
+            )
+        ).order_by(Proyecto.id)
+    ).scalars().all()
+
+    archivados = []
+    for proyecto_id in candidatos:
+        try:
+            archivar_proyecto(db, proyecto_id)
+            archivados.append(proyecto_id)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ No se pudo archivar el proyecto {proyecto_id}: {e}")
+    return archivados
+
+
+def estado_archivo(db: Session) -> List[Dict]:
+    """Proyectos archivados con su tamaño y filas por tabla"""
+    return [
+        {
+            "proyecto_id": a.proyecto_id,
+            "ruta": a.ruta,
+            "filas": a.filas,
+            "bytes": a.bytes,
+            "archivado_en": a.archivado_en,
+            "tablas": {
+                nombre: datos["filas"]
+                for nombre, datos in json.loads(a.manifiesto or "{}").get("tablas", {}).items()
+            }
+        }
+        for a in db.query(ProyectoArchivo).order_by(ProyectoArchivo.proyecto_id).all()
+    ]
+
+
+# ============= Lecturas desde el archivo =============
+
+@lru_cache(maxsize=128)
+def _leer_archivo(ruta: str, modificado: float) -> "pa.Table":
+    return pq.read_table(ruta)
+
+
+def _leer(archivo: ProyectoArchivo, nombre: str) -> "pa.Table":
+    """Tabla archivada; las lecturas repetidas salen de memoria mientras el archivo no cambie"""
+    _requerir_pyarrow()
+    ruta = Path(archivo.ruta) / f"{nombre}.parquet"
+    return _leer_archivo(str(ruta), ruta.stat().st_mtime)
+
+
+def _existe(archivo: ProyectoArchivo, nombre: str) -> bool:
+    return (Path(archivo.ruta) / f"{nombre}.parquet").exists()
+
+
+def get_archivo(db: Session, proyecto_id: int) -> Optional[ProyectoArchivo]:
+    return db.get(ProyectoArchivo, proyecto_id)
+
+
+def _archivo_de_reporte(db: Session, reporte_id: int) -> Optional[ProyectoArchivo]:
+    return db.query(ProyectoArchivo).join(
+        ReporteArchivado, ReporteArchivado.proyecto_id == ProyectoArchivo.proyecto_id
+    ).filter(ReporteArchivado.reporte_id == reporte_id).first()
+
+
+def get_reportes_archivados(db: Session, proyecto_id: Optional[int] = None) -> List[ReporteCuentaCorrienteOut]:
+    query = db.query(ProyectoArchivo)
+    if proyecto_id:
+        query = query.filter(ProyectoArchivo.proyecto_id == proyecto_id)
+    return [
+        ReporteCuentaCorrienteOut.model_validate(fila)
+        for archivo in query.all()
+        for fila in _leer(archivo, ReporteCuentaCorriente.__tablename__).to_pylist()
+    ]
+
+
+def get_reporte_archivado(db: Session, reporte_id: int) -> Optional[ReporteCuentaCorrienteOut]:
+    archivo = _archivo_de_reporte(db, reporte_id)
+    if not archivo:
+        return None
+    tabla = _leer(archivo, ReporteCuentaCorriente.__tablename__)
+    filas = tabla.filter(pc.equal(tabla["id"], reporte_id)).to_pylist()
+    return ReporteCuentaCorrienteOut.model_validate(filas[0]) if filas else None
+
+
+def listar_pagos_archivados(db: Session, reporte_id: int) -> Optional[List[PagoReporteOut]]:
+    """Pagos de un reporte archivado, más recientes primero; None si el reporte no está archivado"""
+    archivo = _archivo_de_reporte(db, reporte_id)
+    if not archivo:
+        return None
+    tabla = _leer(archivo, PagoReporte.__tablename__)
+    pagos = tabla.filter(pc.equal(tabla["reporte_id"], reporte_id)).to_pylist()
+    pagos.sort(key=lambda p: p["fecha_registro"] or datetime.min, reverse=True)
+    return [PagoReporteOut.model_validate(p) for p in pagos]
+
+
+def get_lineas_archivadas(db: Session, reporte_id: int) -> List[Dict]:
+    """Líneas congeladas de un reporte archivado, en el orden de get_lineas_reporte"""
+    archivo = _archivo_de_reporte(db, reporte_id)
+    if not archivo or not _existe(archivo, ReporteLinea.__tablename__):
+        return []
+    tabla = _leer(archivo, ReporteLinea.__tablename__)
+    lineas = tabla.filter(pc.equal(tabla["reporte_id"], reporte_id)).to_pylist()
+    lineas.sort(key=lambda l: (l["tipo"], l["fecha"], l["origen_id"]))
+    return lineas
+
+
+def _en_periodo(tabla: "pa.Table", columna: str, inicio: date, fin: date):
+    # Misma semántica que comparar la columna DateTime contra fechas en SQL (medianoche)
+    valores = tabla[columna]
+    desde = pa.scalar(datetime.combine(inicio, dtime.min), type=valores.type)
+    hasta = pa.scalar(datetime.combine(fin, dtime.min), type=valores.type)
+    return pc.and_(pc.greater_equal(valores, desde), pc.less_equal(valores, hasta))
+
+
+def acumular_resumen(
+    archivo: ProyectoArchivo,
+    periodo_inicio: date,
+    periodo_fin: date,
+    tipos_aridos: Optional[List[str]],
+    maquinas_ids: Optional[List[int]],
+    aridos: Dict,
+    horas: Dict
+):
+    """
+    Suma a los acumuladores de get_resumen_proyecto las entregas y horas
+    archivadas del período: {clave: [cantidad, suma de precios, precios
+    informados, {día: cantidad sin precio}]}
+    """
+    entregas = _leer(archivo, EntregaArido.__tablename__)
+    mascara = _en_periodo(entregas, "fecha_entrega", periodo_inicio, periodo_fin)
+    if tipos_aridos:
+        mascara = pc.and_(mascara, pc.is_in(entregas["tipo_arido"], value_set=pa.array(tipos_aridos, pa.string())))
+    por_tipo = _por_dia(entregas.filter(mascara), "fecha_entrega", "cantidad", "precio_unitario").group_by(
+        ["tipo_arido", "dia"]
+    ).aggregate([
+        ("cantidad", "sum"), ("precio_unitario", "sum"), ("precio_unitario", "count"), ("sin_precio", "sum")
+    ])
+    for fila in por_tipo.to_pylist():
+        acumulado = aridos.setdefault(fila["tipo_arido"], [0.0, 0.0, 0, {}])
+        acumulado[0] += fila["cantidad_sum"] or 0.0
+        acumulado[1] += fila["precio_unitario_sum"] or 0.0
+        acumulado[2] += fila["precio_unitario_count"]
+        if fila["sin_precio_sum"]:
+            acumulado[3][fila["dia"]] = acumulado[3].get(fila["dia"], 0.0) + fila["sin_precio_sum"]
+
+    reportes = _leer(archivo, ReporteLaboral.__tablename__)
+    mascara = pc.and_(
+        _en_periodo(reportes, "fecha_asignacion", periodo_inicio, periodo_fin),
+        pc.is_valid(reportes["maquina_id"])
+    )
+    if maquinas_ids:
+        mascara = pc.and_(mascara, pc.is_in(reportes["maquina_id"], value_set=pa.array(maquinas_ids, pa.int64())))
+    por_maquina = _por_dia(reportes.filter(mascara), "fecha_asignacion", "horas_turno", "tarifa_hora").group_by(
+        ["maquina_id", "dia"]
+    ).aggregate([
+        ("horas_turno", "sum"), ("tarifa_hora", "sum"), ("tarifa_hora", "count"), ("sin_precio", "sum")
+    ])
+    for fila in por_maquina.to_pylist():
+        acumulado = horas.setdefault(fila["maquina_id"], [0.0, 0.0, 0, {}])
+        acumulado[0] += fila["horas_turno_sum"] or 0
+        acumulado[1] += fila["tarifa_hora_sum"] or 0.0
+        acumulado[2] += fila["tarifa_hora_count"]
+        if fila["sin_precio_sum"]:
+            acumulado[3][fila["dia"]] = acumulado[3].get(fila["dia"], 0.0) + fila["sin_precio_sum"]
+
+
+def _por_dia(tabla: "pa.Table", columna_fecha: str, columna_cantidad: str, columna_precio: str) -> "pa.Table":
+    """Agrega el día de cada fila y la cantidad sin precio propio (se valoriza con el catálogo de ese día)"""
+    cantidad = tabla[columna_cantidad]
+    sin_precio = pc.if_else(pc.is_null(tabla[columna_precio]), cantidad, pa.scalar(0, cantidad.type))
+    return tabla.append_column("dia", pc.cast(tabla[columna_fecha], pa.date32())).append_column("sin_precio", sin_precio)
+
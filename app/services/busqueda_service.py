@@ -0,0 +1,111 @@
+"""
+Búsqueda unificada (typeahead) sobre máquinas, proyectos, clientes y productos.
+
+Cada entidad se filtra con ILIKE '%texto%' o con el operador de similitud de
+palabra de pg_trgm (texto <% columna); ambos usan los índices GIN trigram de la
+migración 0017, así que la búsqueda no recorre las tablas. Los resultados se
+ordenan por coincidencia de prefijo y luego por word_similarity, con un límite
+por entidad y uno global, en una sola consulta (UNION ALL).
+"""
+
+from typing import Dict, List, Optional, Sequence
+import logging
+
+from sqlalchemy import select, union_all, literal, func, case, or_, cast, String
+from sqlalchemy.orm import Session
+
+from app.db.models import Maquina, Proyecto, Cliente, Producto
+from app.schemas.schemas import ResultadoBusquedaOut
+
+logger = logging.getLogger(__name__)
+
+LIMITE_MAXIMO = 50
+LONGITUD_MINIMA = 2
+
+
+class EntidadBusqueda:
+    """Qué columnas se buscan en una entidad y cómo se muestra cada resultado"""
+
+    __slots__ = ("modelo", "campos", "titulo", "subtitulo", "filtros")
+
+    def __init__(self, modelo, campos: Sequence, titulo, subtitulo=None, filtros: Sequence = ()):
+        self.modelo = modelo
+        self.campos = campos
+        self.titulo = titulo
+        self.subtitulo = subtitulo
+        self.filtros = filtros
+
+
+ENTIDADES: Dict[str, EntidadBusqueda] = {
+    "maquina": EntidadBusqueda(Maquina, [Maquina.nombre], Maquina.nombre),
+    "proyecto": EntidadBusqueda(
+        Proyecto, [Proyecto.nombre, Proyecto.ubicacion], Proyecto.nombre, Proyecto.ubicacion
+    ),
+    "cliente": EntidadBusqueda(
+        Cliente, [Cliente.nombre, Cliente.email], Cliente.nombre, Cliente.email,
+        filtros=[Cliente.oculto == False]
+    ),
+    "producto": EntidadBusqueda(
+        Producto, [Producto.nombre, Producto.codigo_producto], Producto.nombre, Producto.codigo_producto
+    ),
+}
+
+
+def _escapar_like(texto: str) -> str:
+    return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _consulta_entidad(tipo: str, entidad: EntidadBusqueda, texto: str, limite: int):
+    patron = _escapar_like(texto)
+    termino = literal(texto, String)
+
+    coincide = or_(*(
+        condicion
+        for campo in entidad.campos
+        for condicion in (campo.ilike(f"%{patron}%", escape="\\"), termino.op("<%")(campo))
+    ))
+    prefijo = or_(*(campo.ilike(f"{patron}%", escape="\\") for campo in entidad.campos))
+    similitud = func.greatest(*(func.word_similarity(termino, func.coalesce(campo, "")) for campo in entidad.campos))
+    score = (case((prefijo, 1.0), else_=0.0) + similitud).label("score")
+
+    return select(
+        literal(tipo, String).label("tipo"),
+        entidad.modelo.id.label("id"),
+        func.coalesce(entidad.titulo, "").label("titulo"),
+        cast(entidad.subtitulo, String).label("subtitulo") if entidad.subtitulo is not None
+        else literal(None, String).label("subtitulo"),
+        score
+    ).where(coincide, *entidad.filtros).order_by(score.desc()).limit(limite).subquery()
+
+
+def buscar(db: Session, texto: str, tipos: Optional[List[str]] = None, limite: int = 10) -> List[ResultadoBusquedaOut]:
+    """
+    Busca en las entidades pedidas (todas por defecto) y devuelve los mejores
+    resultados ordenados por relevancia. Lanza ValueError si un tipo no existe.
+    """
+    texto = (texto or "").strip()
+    if len(texto) < LONGITUD_MINIMA:
+        return []
+    limite = max(1, min(limite, LIMITE_MAXIMO))
+
+    tipos = tipos or list(ENTIDADES)
+    desconocidos = [t for t in tipos if t not in ENTIDADES]
+    if desconocidos:
+        raise ValueError(f"Tipos de búsqueda no válidos: {', '.join(desconocidos)}")
+
+    subconsultas = [select(_consulta_entidad(t, ENTIDADES[t], texto, limite)) for t in tipos]
+    resultados = union_all(*subconsultas).subquery() if len(subconsultas) > 1 else subconsultas[0].subquery()
+    filas = db.execute(
+        select(resultados).order_by(resultados.c.score.desc(), resultados.c.titulo).limit(limite)
+    ).mappings().all()
+
+    return [
+        ResultadoBusquedaOut(
+            tipo=f["tipo"],
+            id=f["id"],
+            titulo=f["titulo"],
+            subtitulo=f["subtitulo"],
+            score=round(float(f["score"]), 4)
+        )
+        for f in filas
+    ]
@@ -14,8 +14,8 @@ from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 
-# Importar precios y tarifas desde cuenta_corriente_service
-from app.services.cuenta_corriente_service import PRECIOS_ARIDOS, TARIFAS_MAQUINAS
+# Precios y tarifas de lista del catálogo con vigencia
+from app.services.precio_catalogo_service import catalogo_precios, CLAVE_DEFAULT
 
 # ============= FUNCIONES DE CLIENTES =============
 
@@ -105,12 +105,12 @@ def create_cliente(db: Session, cliente_data: ClienteCreate) -> ClienteOut:
 def get_servicios_predefinidos() -> ServiciosPredefinidosOut:
     """
     Obtiene la lista de servicios predefinidos con precios por defecto.
-    Combina áridos y máquinas de cuenta_corriente_service.
+    Combina áridos y máquinas del catálogo de precios vigente.
     """
     servicios = []
 
     # Agregar áridos
-    for tipo_arido, precio in PRECIOS_ARIDOS.items():
+    for tipo_arido, precio in catalogo_precios.vigentes("arido").items():
         servicios.append(ServicioPredefinido(
             nombre=tipo_arido,
             precio_por_defecto=precio,
@@ -119,8 +119,8 @@ def get_servicios_predefinidos() -> ServiciosPredefinidosOut:
         ))
 
     # Agregar máquinas (excluir "default")
-    for maquina_nombre, tarifa in TARIFAS_MAQUINAS.items():
-        if maquina_nombre != "default":
+    for maquina_nombre, tarifa in catalogo_precios.vigentes("maquina").items():
+        if maquina_nombre != CLAVE_DEFAULT:
             servicios.append(ServicioPredefinido(
                 nombre=maquina_nombre,
                 precio_por_defecto=tarifa,
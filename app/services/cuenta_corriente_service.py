@@ -1,4 +1,4 @@
-from app.db.models import ReporteCuentaCorriente, Proyecto, EntregaArido, ReporteLaboral, Maquina, ReporteItemArido, ReporteItemHora, PagoReporte
+from app.db.models import ReporteCuentaCorriente, Proyecto, EntregaArido, ReporteLaboral, Maquina, ReporteItemArido, ReporteItemHora, ReporteLinea, PagoReporte, Usuario
 from app.schemas.schemas import (
     ReporteCuentaCorrienteCreate,
     ReporteCuentaCorrienteUpdate,
@@ -20,59 +20,25 @@ from app.schemas.schemas import (
     RegistrarPagoResponse
 )
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
-from typing import List, Optional, Dict
+from sqlalchemy import func, select, insert, literal, case
+from app.services import archivo_frio_service, precio_catalogo_service
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime, date
 from decimal import Decimal
 
-# ============= PRECIOS DE ÁRIDOS POR M³ =============
-# Estos son valores por defecto que se usan como fallback
-# Si el registro tiene precio_unitario en la BD, se usa ese valor
-PRECIOS_ARIDOS: Dict[str, float] = {
-    "Arena Fina": 54000.0,
-    "Granza": 54000.0,
-    "Arena Común": 33680.0,
-    "Relleno": 16000.0,
-    "Tierra Negra": 16000.0,
-    "Piedra": 12000.0,
-    "0.20": 8000.0,
-    "Blinder": 10000.0,
-    "Arena Lavada": 33680.0
-}
-
-
-# ============= TARIFAS DE MÁQUINAS POR HORA =============
-# IMPORTANTE: Usa los nombres EXACTOS de las máquinas como aparecen en la BD
-# Para obtener los nombres: SELECT id, nombre FROM maquina;
-#
-# Formato: "Nombre_Exacto_Maquina": tarifa_por_hora
-#
-# INSTRUCCIONES:
-# 1. Consulta tus máquinas en la BD
-# 2. Reemplaza estos ejemplos con tus máquinas reales
-# 3. Usa el nombre EXACTO (case-sensitive)
-# 4. La tarifa "default" se usa si la máquina no está en la lista
-
-TARIFAS_MAQUINAS: Dict[str, float] = {
-    # ===== TARIFA POR DEFECTO =====
-    "default": 15000.0,  # Se usa si la máquina no está en la lista
-    "BOBCAT 2018 S650.": 700000,
-    "BOBCAT S530 2017": 700000,
-    "EXCAVADORA 2020 SANY EU50.": 100000,
-    "EXCAVADORA 2023 XCMG E60.": 100000,
-    "EXCAVADORA 2022 LONKING 6150.": 150000,
-    "EXCAVADORA 2015 LONKING 6150.": 150000,
-    "PALA 2022 SINOMACH 933.": 100000
-}
-
-def get_precio_arido(tipo_arido: str) -> float:
-    """Obtiene el precio por m³ de un tipo de árido"""
-    return PRECIOS_ARIDOS.get(tipo_arido, 0.0)
-
-def get_tarifa_maquina(maquina_nombre: str) -> float:
-    """Obtiene la tarifa por hora de una máquina"""
-    # Primero intenta buscar por nombre específico, si no usa la tarifa default
-    return TARIFAS_MAQUINAS.get(maquina_nombre, TARIFAS_MAQUINAS["default"])
+# ============= PRECIOS DE LISTA =============
+# Se usan cuando el registro no tiene precio_unitario / tarifa_hora en la BD.
+# Salen del catálogo con vigencia (precio_catalogo_service): el precio que
+# corresponde es el vigente en la fecha de la entrega o de las horas.
+
+def get_precio_arido(tipo_arido: str, fecha: Optional[date] = None) -> float:
+    """Obtiene el precio por m³ de un tipo de árido vigente en una fecha (por defecto hoy)"""
+    return precio_catalogo_service.precio_arido(tipo_arido, fecha)
+
+def get_tarifa_maquina(maquina_nombre: str, fecha: Optional[date] = None) -> float:
+    """Obtiene la tarifa por hora de una máquina vigente en una fecha (por defecto hoy)"""
+    # Si la máquina no tiene tarifa propia en el catálogo se usa la "default"
+    return precio_catalogo_service.tarifa_maquina(maquina_nombre, fecha)
 
 def get_resumen_proyecto(
     db: Session,
@@ -102,11 +68,22 @@ def get_resumen_proyecto(
     if not proyecto:
         return None
 
+    # Acumuladores por tipo de árido y por máquina:
+    # [cantidad, suma de precios, precios informados, {día: cantidad sin precio}].
+    # Sumas y conteos (no promedios) para poder combinar la BD con el archivo frío;
+    # la cantidad sin precio va por día para valorizarla con el catálogo de ese día.
+    aridos_acumulados: Dict[str, List] = {}
+    horas_acumuladas: Dict[int, List] = {}
+
     # Obtener entregas de áridos en el período con precio_unitario desde la BD
+    dia_entrega = func.date(EntregaArido.fecha_entrega)
     query_aridos = db.query(
         EntregaArido.tipo_arido,
+        dia_entrega.label('dia'),
         func.sum(EntregaArido.cantidad).label('total_cantidad'),
-        func.avg(EntregaArido.precio_unitario).label('precio_promedio')
+        func.sum(EntregaArido.precio_unitario).label('suma_precios'),
+        func.count(EntregaArido.precio_unitario).label('precios_informados'),
+        func.sum(case((EntregaArido.precio_unitario.is_(None), EntregaArido.cantidad), else_=0)).label('sin_precio')
     ).filter(
         EntregaArido.proyecto_id == proyecto_id,
         EntregaArido.fecha_entrega >= periodo_inicio,
@@ -117,17 +94,87 @@ def get_resumen_proyecto(
     if tipos_aridos and len(tipos_aridos) > 0:
         query_aridos = query_aridos.filter(EntregaArido.tipo_arido.in_(tipos_aridos))
 
-    entregas_aridos = query_aridos.group_by(EntregaArido.tipo_arido).all()
+    for tipo_arido, dia, cantidad, suma_precios, precios_informados, sin_precio in query_aridos.group_by(EntregaArido.tipo_arido, dia_entrega).all():
+        _acumular(aridos_acumulados, tipo_arido, dia, cantidad or 0.0, suma_precios or 0.0, precios_informados, sin_precio)
 
+    # Obtener horas de máquinas en el período con tarifa_hora desde la BD
+    dia_asignacion = func.date(ReporteLaboral.fecha_asignacion)
+    query_horas = db.query(
+        ReporteLaboral.maquina_id,
+        dia_asignacion.label('dia'),
+        func.sum(ReporteLaboral.horas_turno).label('total_horas'),
+        func.sum(ReporteLaboral.tarifa_hora).label('suma_tarifas'),
+        func.count(ReporteLaboral.tarifa_hora).label('tarifas_informadas'),
+        func.sum(case((ReporteLaboral.tarifa_hora.is_(None), ReporteLaboral.horas_turno), else_=0)).label('sin_tarifa')
+    ).filter(
+        ReporteLaboral.proyecto_id == proyecto_id,
+        ReporteLaboral.maquina_id.isnot(None),
+        ReporteLaboral.fecha_asignacion >= periodo_inicio,
+        ReporteLaboral.fecha_asignacion <= periodo_fin
+    )
+
+    # Aplicar filtro de máquinas si se especifica
+    if maquinas_ids and len(maquinas_ids) > 0:
+        query_horas = query_horas.filter(ReporteLaboral.maquina_id.in_(maquinas_ids))
+
+    for maquina_id, dia, horas, suma_tarifas, tarifas_informadas, sin_tarifa in query_horas.group_by(ReporteLaboral.maquina_id, dia_asignacion).all():
+        _acumular(horas_acumuladas, maquina_id, dia, horas or 0, suma_tarifas or 0.0, tarifas_informadas, sin_tarifa)
+
+    # Proyecto archivado: sumar las filas que están en el archivo frío
+    archivo = archivo_frio_service.get_archivo(db, proyecto_id)
+    if archivo:
+        archivo_frio_service.acumular_resumen(
+            archivo, periodo_inicio, periodo_fin, tipos_aridos, maquinas_ids,
+            aridos_acumulados, horas_acumuladas
+        )
+
+    # Nombres de las máquinas con horas en el período (las que ya no existen se omiten)
+    nombres_maquinas = dict(
+        db.query(Maquina.id, Maquina.nombre).filter(Maquina.id.in_(list(horas_acumuladas))).all()
+    ) if horas_acumuladas else {}
+
+    return _armar_resumen(
+        proyecto_id, proyecto.nombre, periodo_inicio, periodo_fin,
+        aridos_acumulados, horas_acumuladas, nombres_maquinas
+    )
+
+def _acumular(acumulados: Dict, clave, dia: date, cantidad, suma_precios, precios_informados: int, sin_precio):
+    acumulado = acumulados.setdefault(clave, [0.0, 0.0, 0, {}])
+    acumulado[0] += cantidad
+    acumulado[1] += suma_precios
+    acumulado[2] += precios_informados
+    if sin_precio:
+        acumulado[3][dia] = acumulado[3].get(dia, 0.0) + sin_precio
+
+def _armar_resumen(
+    proyecto_id: int,
+    proyecto_nombre: str,
+    periodo_inicio: date,
+    periodo_fin: date,
+    aridos_acumulados: Dict[str, List],
+    horas_acumuladas: Dict[int, List],
+    nombres_maquinas: Dict[int, str]
+) -> ResumenProyectoSchema:
+    """
+    Arma el resumen con precios a partir de los acumuladores por árido y por
+    máquina ([cantidad, suma de precios, precios informados, {día: cantidad sin
+    precio}]). El precio de cada grupo es el promedio de los informados; sin
+    ninguno, cada día se valoriza con el precio del catálogo vigente ese día y el
+    precio del grupo es el promedio ponderado.
+    """
     # Calcular detalles de áridos con precios REALES de la BD
     detalles_aridos = []
     total_aridos_m3 = 0.0
     total_importe_aridos = 0.0
 
-    for tipo_arido, cantidad, precio_promedio in entregas_aridos:
-        # Usar el precio de la BD, si es None usar el diccionario como fallback
-        precio_unitario = precio_promedio if precio_promedio is not None else get_precio_arido(tipo_arido)
-        importe = cantidad * precio_unitario
+    for tipo_arido, (cantidad, suma_precios, precios_informados, sin_precio) in sorted(aridos_acumulados.items(), key=lambda a: a[0] or ""):
+        # Usar el precio promedio de la BD, si no hay ninguno usar el catálogo como fallback
+        if precios_informados:
+            precio_unitario = suma_precios / precios_informados
+            importe = cantidad * precio_unitario
+        else:
+            importe = sum(c * get_precio_arido(tipo_arido, dia) for dia, c in sin_precio.items())
+            precio_unitario = importe / cantidad if cantidad else get_precio_arido(tipo_arido, periodo_fin)
 
         detalles_aridos.append(DetalleAridoConPrecio(
             tipo_arido=tipo_arido,
@@ -139,35 +186,22 @@ def get_resumen_proyecto(
         total_aridos_m3 += cantidad
         total_importe_aridos += importe
 
-    # Obtener horas de máquinas en el período con tarifa_hora desde la BD
-    query_horas = db.query(
-        Maquina.id,
-        Maquina.nombre,
-        func.sum(ReporteLaboral.horas_turno).label('total_horas'),
-        func.avg(ReporteLaboral.tarifa_hora).label('tarifa_promedio')
-    ).join(
-        ReporteLaboral, ReporteLaboral.maquina_id == Maquina.id
-    ).filter(
-        ReporteLaboral.proyecto_id == proyecto_id,
-        ReporteLaboral.fecha_asignacion >= periodo_inicio,
-        ReporteLaboral.fecha_asignacion <= periodo_fin
-    )
-
-    # Aplicar filtro de máquinas si se especifica
-    if maquinas_ids and len(maquinas_ids) > 0:
-        query_horas = query_horas.filter(Maquina.id.in_(maquinas_ids))
-
-    horas_maquinas = query_horas.group_by(Maquina.id, Maquina.nombre).all()
-
     # Calcular detalles de horas con tarifas REALES de la BD
     detalles_horas = []
     total_horas = 0.0
     total_importe_horas = 0.0
 
-    for maquina_id, maquina_nombre, horas, tarifa_promedio in horas_maquinas:
-        # Usar la tarifa de la BD, si es None usar el diccionario como fallback
-        tarifa_hora = tarifa_promedio if tarifa_promedio is not None else get_tarifa_maquina(maquina_nombre)
-        importe = horas * tarifa_hora
+    for maquina_id, (horas, suma_tarifas, tarifas_informadas, sin_tarifa) in sorted(horas_acumuladas.items()):
+        if maquina_id not in nombres_maquinas:
+            continue
+        maquina_nombre = nombres_maquinas[maquina_id]
+        # Usar la tarifa promedio de la BD, si no hay ninguna usar el catálogo como fallback
+        if tarifas_informadas:
+            tarifa_hora = suma_tarifas / tarifas_informadas
+            importe = horas * tarifa_hora
+        else:
+            importe = sum(h * get_tarifa_maquina(maquina_nombre, dia) for dia, h in sin_tarifa.items())
+            tarifa_hora = importe / horas if horas else get_tarifa_maquina(maquina_nombre, periodo_fin)
 
         detalles_horas.append(DetalleHorasConTarifa(
             maquina_id=maquina_id,
@@ -185,7 +219,7 @@ def get_resumen_proyecto(
 
     return ResumenProyectoSchema(
         proyecto_id=proyecto_id,
-        proyecto_nombre=proyecto.nombre,
+        proyecto_nombre=proyecto_nombre,
         periodo_inicio=periodo_inicio,
         periodo_fin=periodo_fin,
         aridos=detalles_aridos,
@@ -204,9 +238,12 @@ def get_reportes(db: Session, proyecto_id: Optional[int] = None) -> List[Reporte
     if proyecto_id:
         query = query.filter(ReporteCuentaCorriente.proyecto_id == proyecto_id)
 
-    reportes = query.order_by(ReporteCuentaCorriente.fecha_generacion.desc()).all()
+    reportes = [ReporteCuentaCorrienteOut.model_validate(r) for r in query.all()]
 
-    return [ReporteCuentaCorrienteOut.model_validate(r) for r in reportes]
+    # Reportes de proyectos archivados (archivo frío)
+    reportes.extend(archivo_frio_service.get_reportes_archivados(db, proyecto_id))
+
+    return sorted(reportes, key=lambda r: r.fecha_generacion, reverse=True)
 
 def get_reporte(db: Session, reporte_id: int) -> Optional[ReporteCuentaCorrienteOut]:
     """Obtiene un reporte específico por ID"""
@@ -216,7 +253,200 @@ def get_reporte(db: Session, reporte_id: int) -> Optional[ReporteCuentaCorriente
 
     if reporte:
         return ReporteCuentaCorrienteOut.model_validate(reporte)
-    return None
+    return archivo_frio_service.get_reporte_archivado(db, reporte_id)
+
+def _vincular_aridos(reporte_id: int, reporte_data: ReporteCuentaCorrienteCreate):
+    """
+    INSERT ... SELECT de las entregas del período en reporte_items_aridos, en
+    una sola sentencia que además devuelve las entregas vinculadas.
+    """
+    seleccion = select(
+        EntregaArido.id,
+        EntregaArido.tipo_arido,
+        EntregaArido.cantidad,
+        EntregaArido.precio_unitario,
+        EntregaArido.pagado,
+        EntregaArido.fecha_entrega
+    ).where(
+        EntregaArido.proyecto_id == reporte_data.proyecto_id,
+        EntregaArido.fecha_entrega >= reporte_data.periodo_inicio,
+        EntregaArido.fecha_entrega <= reporte_data.periodo_fin
+    )
+    if reporte_data.aridos_seleccionados:
+        seleccion = seleccion.where(EntregaArido.tipo_arido.in_(reporte_data.aridos_seleccionados))
+    seleccion = seleccion.cte("seleccion")
+
+    vinculo = insert(ReporteItemArido).from_select(
+        ["reporte_id", "entrega_arido_id"],
+        select(literal(reporte_id), seleccion.c.id)
+    ).cte("vinculo")
+
+    return select(seleccion).add_cte(vinculo).order_by(seleccion.c.fecha_entrega, seleccion.c.id)
+
+def _vincular_horas(reporte_id: int, reporte_data: ReporteCuentaCorrienteCreate):
+    """
+    INSERT ... SELECT de los reportes laborales del período en
+    reporte_items_horas, devolviendo las horas vinculadas con máquina y usuario.
+    """
+    seleccion = select(
+        ReporteLaboral.id,
+        ReporteLaboral.maquina_id,
+        Maquina.nombre.label("maquina_nombre"),
+        ReporteLaboral.horas_turno,
+        ReporteLaboral.tarifa_hora,
+        ReporteLaboral.pagado,
+        ReporteLaboral.fecha_asignacion,
+        Usuario.nombre.label("usuario_nombre")
+    ).outerjoin(
+        Maquina, Maquina.id == ReporteLaboral.maquina_id
+    ).outerjoin(
+        Usuario, Usuario.id == ReporteLaboral.usuario_id
+    ).where(
+        ReporteLaboral.proyecto_id == reporte_data.proyecto_id,
+        ReporteLaboral.fecha_asignacion >= reporte_data.periodo_inicio,
+        ReporteLaboral.fecha_asignacion <= reporte_data.periodo_fin
+    )
+    if reporte_data.maquinas_seleccionadas:
+        seleccion = seleccion.where(ReporteLaboral.maquina_id.in_(reporte_data.maquinas_seleccionadas))
+    seleccion = seleccion.cte("seleccion")
+
+    vinculo = insert(ReporteItemHora).from_select(
+        ["reporte_id", "reporte_laboral_id"],
+        select(literal(reporte_id), seleccion.c.id)
+    ).cte("vinculo")
+
+    return select(seleccion).add_cte(vinculo).order_by(seleccion.c.fecha_asignacion, seleccion.c.id)
+
+def _lineas_reporte(reporte_id: int, entregas, horas) -> List[Dict]:
+    """Líneas con precio de un reporte a partir de las filas vinculadas (horas sin máquina no se facturan)"""
+    lineas = []
+    for e in entregas:
+        precio_informado = e["precio_unitario"] is not None
+        precio_unitario = e["precio_unitario"] if precio_informado else get_precio_arido(e["tipo_arido"], e["fecha_entrega"].date())
+        lineas.append({
+            "reporte_id": reporte_id,
+            "tipo": "arido",
+            "origen_id": e["id"],
+            "maquina_id": None,
+            "etiqueta": e["tipo_arido"],
+            "fecha": e["fecha_entrega"].date(),
+            "cantidad": e["cantidad"],
+            "precio_unitario": precio_unitario,
+            "precio_informado": precio_informado,
+            "importe": e["cantidad"] * precio_unitario,
+            "usuario_nombre": None,
+            "pagado": bool(e["pagado"])
+        })
+    for h in horas:
+        if h["maquina_nombre"] is None:
+            continue
+        precio_informado = h["tarifa_hora"] is not None
+        tarifa_hora = h["tarifa_hora"] if precio_informado else get_tarifa_maquina(h["maquina_nombre"], h["fecha_asignacion"].date())
+        lineas.append({
+            "reporte_id": reporte_id,
+            "tipo": "horas",
+            "origen_id": h["id"],
+            "maquina_id": h["maquina_id"],
+            "etiqueta": h["maquina_nombre"],
+            "fecha": h["fecha_asignacion"].date(),
+            "cantidad": h["horas_turno"],
+            "precio_unitario": tarifa_hora,
+            "precio_informado": precio_informado,
+            "importe": h["horas_turno"] * tarifa_hora,
+            "usuario_nombre": h["usuario_nombre"],
+            "pagado": bool(h["pagado"])
+        })
+    return lineas
+
+def _items_desde_lineas(lineas) -> Tuple[List[ItemAridoDetalle], List[ItemHoraDetalle]]:
+    items_aridos = []
+    items_horas = []
+    for l in lineas:
+        if l["tipo"] == "arido":
+            items_aridos.append(ItemAridoDetalle(
+                id=l["origen_id"],
+                tipo_arido=l["etiqueta"],
+                cantidad=l["cantidad"],
+                precio_unitario=l["precio_unitario"],
+                importe=l["importe"],
+                pagado=l["pagado"],
+                fecha=l["fecha"]
+            ))
+        else:
+            items_horas.append(ItemHoraDetalle(
+                id=l["origen_id"],
+                maquina_id=l["maquina_id"],
+                maquina_nombre=l["etiqueta"],
+                total_horas=l["cantidad"],
+                tarifa_hora=l["precio_unitario"],
+                importe=l["importe"],
+                pagado=l["pagado"],
+                fecha=l["fecha"],
+                usuario_nombre=l["usuario_nombre"]
+            ))
+    return items_aridos, items_horas
+
+def get_lineas_reporte(db: Session, reporte_id: int) -> List[Dict]:
+    """
+    Líneas congeladas de un reporte (también de reportes archivados), ordenadas
+    por tipo y fecha. Vacío para reportes creados antes de que existieran.
+    """
+    columnas = [c for c in ReporteLinea.__table__.columns if c.key != "id"]
+    lineas = db.execute(
+        select(*columnas).where(ReporteLinea.reporte_id == reporte_id)
+        .order_by(ReporteLinea.tipo, ReporteLinea.fecha, ReporteLinea.origen_id)
+    ).mappings().all()
+    if lineas:
+        return lineas
+    return archivo_frio_service.get_lineas_archivadas(db, reporte_id)
+
+def get_resumen_reporte(db: Session, reporte_id: int) -> Optional[ResumenProyectoSchema]:
+    """
+    Resumen con precios de un reporte ya generado, armado solo con sus líneas
+    congeladas: no cambia aunque después cambien los precios o los datos del
+    período. Los reportes sin líneas (anteriores) se recalculan con
+    get_resumen_proyecto como antes.
+    """
+    reporte = get_reporte(db, reporte_id)
+    if not reporte:
+        return None
+
+    lineas = get_lineas_reporte(db, reporte_id)
+    if not lineas:
+        return get_resumen_proyecto(db, reporte.proyecto_id, reporte.periodo_inicio, reporte.periodo_fin)
+
+    proyecto_nombre = db.query(Proyecto.nombre).filter(Proyecto.id == reporte.proyecto_id).scalar()
+
+    # Mismos acumuladores que get_resumen_proyecto; un grupo sin precios informados
+    # usa los importes del catálogo que quedaron congelados en sus líneas
+    aridos_acumulados: Dict[str, List] = {}
+    horas_acumuladas: Dict[int, List] = {}
+    nombres_maquinas: Dict[int, str] = {}
+    respaldo: Dict = {}
+    for l in lineas:
+        if l["tipo"] == "arido":
+            clave, acumulados = l["etiqueta"], aridos_acumulados
+        else:
+            clave, acumulados = l["maquina_id"], horas_acumuladas
+            nombres_maquinas[clave] = l["etiqueta"]
+        acumulado = acumulados.setdefault(clave, [0.0, 0.0, 0, {}])
+        acumulado[0] += l["cantidad"]
+        if l["precio_informado"]:
+            acumulado[1] += l["precio_unitario"]
+            acumulado[2] += 1
+        else:
+            respaldo[(l["tipo"], clave)] = respaldo.get((l["tipo"], clave), 0.0) + l["importe"]
+
+    for (tipo, clave), importe in respaldo.items():
+        acumulado = (aridos_acumulados if tipo == "arido" else horas_acumuladas)[clave]
+        if acumulado[2] == 0 and acumulado[0]:
+            # Precio promedio ponderado de las líneas: cantidad * precio = importe congelado
+            acumulado[1], acumulado[2] = importe / acumulado[0], 1
+
+    return _armar_resumen(
+        reporte.proyecto_id, proyecto_nombre or "", reporte.periodo_inicio, reporte.periodo_fin,
+        aridos_acumulados, horas_acumuladas, nombres_maquinas
+    )
 
 def create_reporte(db: Session, reporte_data: ReporteCuentaCorrienteCreate):
     """
@@ -228,131 +458,94 @@ def create_reporte(db: Session, reporte_data: ReporteCuentaCorrienteCreate):
     - maquinas_seleccionadas: Lista de IDs de máquinas a incluir
 
     Si no se especifican, se incluyen todos los items del período.
+
+    Todo ocurre en una transacción: los items se vinculan con un INSERT ... SELECT
+    por tipo que devuelve las filas vinculadas, y con esas mismas filas se validan
+    las selecciones, se calculan los totales y se arma la respuesta.
     """
     # Validar que el proyecto existe
     proyecto = db.query(Proyecto).filter(Proyecto.id == reporte_data.proyecto_id).first()
     if not proyecto:
         raise ValueError(f"No se encontró el proyecto con ID {reporte_data.proyecto_id}")
-
-    # Validar tipos de áridos si se especificaron
-    if reporte_data.aridos_seleccionados is not None and len(reporte_data.aridos_seleccionados) > 0:
-        tipos_existentes = db.query(EntregaArido.tipo_arido).filter(
-            EntregaArido.proyecto_id == reporte_data.proyecto_id,
-            EntregaArido.fecha_entrega >= reporte_data.periodo_inicio,
-            EntregaArido.fecha_entrega <= reporte_data.periodo_fin
-        ).distinct().all()
-        tipos_existentes = [t[0] for t in tipos_existentes]
-
-        tipos_invalidos = [t for t in reporte_data.aridos_seleccionados if t not in tipos_existentes]
-        if tipos_invalidos:
-            raise ValueError(f"Tipos de áridos no encontrados en el período: {', '.join(tipos_invalidos)}")
-
-    # Validar máquinas si se especificaron
-    if reporte_data.maquinas_seleccionadas is not None and len(reporte_data.maquinas_seleccionadas) > 0:
-        maquinas_existentes = db.query(ReporteLaboral.maquina_id).filter(
-            ReporteLaboral.proyecto_id == reporte_data.proyecto_id,
-            ReporteLaboral.fecha_asignacion >= reporte_data.periodo_inicio,
-            ReporteLaboral.fecha_asignacion <= reporte_data.periodo_fin
-        ).distinct().all()
-        maquinas_existentes = [m[0] for m in maquinas_existentes]
-
-        maquinas_invalidas = [m for m in reporte_data.maquinas_seleccionadas if m not in maquinas_existentes]
-        if maquinas_invalidas:
-            raise ValueError(f"Máquinas no encontradas en el período: {', '.join(map(str, maquinas_invalidas))}")
-
-    # Obtener resumen del proyecto para el período con filtros opcionales
-    resumen = get_resumen_proyecto(
-        db,
-        reporte_data.proyecto_id,
-        reporte_data.periodo_inicio,
-        reporte_data.periodo_fin,
-        tipos_aridos=reporte_data.aridos_seleccionados,
-        maquinas_ids=reporte_data.maquinas_seleccionadas
-    )
-
-    if not resumen:
-        raise ValueError(f"No se encontró el proyecto con ID {reporte_data.proyecto_id}")
-
-    # Validar que haya al menos un item para generar el reporte
-    if resumen.total_aridos_m3 == 0 and resumen.total_horas == 0:
-        raise ValueError("No se puede generar un reporte sin items. Debe seleccionar al menos un árido o máquina.")
-
-    # Crear el reporte con los datos calculados
-    nuevo_reporte = ReporteCuentaCorriente(
-        proyecto_id=reporte_data.proyecto_id,
-        periodo_inicio=reporte_data.periodo_inicio,
-        periodo_fin=reporte_data.periodo_fin,
-        total_aridos=resumen.total_aridos_m3,
-        total_horas=resumen.total_horas,
-        importe_aridos=Decimal(str(resumen.total_importe_aridos)),
-        importe_horas=Decimal(str(resumen.total_importe_horas)),
-        importe_total=Decimal(str(resumen.importe_total)),
-        estado="pendiente",
-        fecha_generacion=datetime.now(),
-        observaciones=reporte_data.observaciones
-    )
-
-    db.add(nuevo_reporte)
-    db.commit()
-    db.refresh(nuevo_reporte)
-
-    # Obtener los registros de áridos que pertenecen a este reporte
-    query_aridos = db.query(EntregaArido).filter(
-        EntregaArido.proyecto_id == reporte_data.proyecto_id,
-        EntregaArido.fecha_entrega >= reporte_data.periodo_inicio,
-        EntregaArido.fecha_entrega <= reporte_data.periodo_fin
-    )
-    if reporte_data.aridos_seleccionados and len(reporte_data.aridos_seleccionados) > 0:
-        query_aridos = query_aridos.filter(EntregaArido.tipo_arido.in_(reporte_data.aridos_seleccionados))
-
-    entregas_aridos = query_aridos.all()
-
-    # Guardar relaciones de áridos
-    for entrega in entregas_aridos:
-        item_rel = ReporteItemArido(
-            reporte_id=nuevo_reporte.id,
-            entrega_arido_id=entrega.id
+    if archivo_frio_service.get_archivo(db, proyecto.id):
+        raise ValueError(f"El proyecto {proyecto.id} está archivado; debe reabrirse para generar reportes")
+
+    try:
+        # Crear el reporte; los totales se completan con los items vinculados
+        nuevo_reporte = ReporteCuentaCorriente(
+            proyecto_id=reporte_data.proyecto_id,
+            periodo_inicio=reporte_data.periodo_inicio,
+            periodo_fin=reporte_data.periodo_fin,
+            estado="pendiente",
+            fecha_generacion=datetime.now(),
+            observaciones=reporte_data.observaciones
         )
-        db.add(item_rel)
-
-    # Obtener los reportes laborales que pertenecen a este reporte
-    query_horas = db.query(ReporteLaboral).filter(
-        ReporteLaboral.proyecto_id == reporte_data.proyecto_id,
-        ReporteLaboral.fecha_asignacion >= reporte_data.periodo_inicio,
-        ReporteLaboral.fecha_asignacion <= reporte_data.periodo_fin
-    )
-    if reporte_data.maquinas_seleccionadas and len(reporte_data.maquinas_seleccionadas) > 0:
-        query_horas = query_horas.filter(ReporteLaboral.maquina_id.in_(reporte_data.maquinas_seleccionadas))
+        db.add(nuevo_reporte)
+        db.flush()
+
+        entregas = db.execute(_vincular_aridos(nuevo_reporte.id, reporte_data)).mappings().all()
+        horas = db.execute(_vincular_horas(nuevo_reporte.id, reporte_data)).mappings().all()
+
+        # Validar que los áridos y máquinas seleccionados tengan items en el período
+        if reporte_data.aridos_seleccionados:
+            tipos_existentes = {e["tipo_arido"] for e in entregas}
+            tipos_invalidos = [t for t in reporte_data.aridos_seleccionados if t not in tipos_existentes]
+            if tipos_invalidos:
+                raise ValueError(f"Tipos de áridos no encontrados en el período: {', '.join(tipos_invalidos)}")
+
+        if reporte_data.maquinas_seleccionadas:
+            maquinas_existentes = {h["maquina_id"] for h in horas}
+            maquinas_invalidas = [m for m in reporte_data.maquinas_seleccionadas if m not in maquinas_existentes]
+            if maquinas_invalidas:
+                raise ValueError(f"Máquinas no encontradas en el período: {', '.join(map(str, maquinas_invalidas))}")
+
+        # Acumular por árido y por máquina, igual que get_resumen_proyecto
+        aridos_acumulados: Dict[str, List] = {}
+        for e in entregas:
+            informado = e["precio_unitario"] is not None
+            _acumular(
+                aridos_acumulados, e["tipo_arido"], e["fecha_entrega"].date(), e["cantidad"] or 0.0,
+                e["precio_unitario"] if informado else 0.0, int(informado), None if informado else e["cantidad"]
+            )
 
-    reportes_horas = query_horas.all()
+        horas_acumuladas: Dict[int, List] = {}
+        nombres_maquinas: Dict[int, str] = {}
+        for h in horas:
+            if h["maquina_nombre"] is None:
+                continue
+            nombres_maquinas[h["maquina_id"]] = h["maquina_nombre"]
+            informada = h["tarifa_hora"] is not None
+            _acumular(
+                horas_acumuladas, h["maquina_id"], h["fecha_asignacion"].date(), h["horas_turno"] or 0,
+                h["tarifa_hora"] if informada else 0.0, int(informada), None if informada else h["horas_turno"]
+            )
 
-    # Guardar relaciones de horas
-    for reporte_hora in reportes_horas:
-        item_rel = ReporteItemHora(
-            reporte_id=nuevo_reporte.id,
-            reporte_laboral_id=reporte_hora.id
+        resumen = _armar_resumen(
+            proyecto.id, proyecto.nombre, reporte_data.periodo_inicio, reporte_data.periodo_fin,
+            aridos_acumulados, horas_acumuladas, nombres_maquinas
         )
-        db.add(item_rel)
 
-    # Commit de las relaciones
-    db.commit()
+        # Validar que haya al menos un item para generar el reporte
+        if resumen.total_aridos_m3 == 0 and resumen.total_horas == 0:
+            raise ValueError("No se puede generar un reporte sin items. Debe seleccionar al menos un árido o máquina.")
 
-    # Obtener items individuales filtrados para el response
-    items_aridos = _get_items_aridos_filtrados(
-        db,
-        reporte_data.proyecto_id,
-        reporte_data.periodo_inicio,
-        reporte_data.periodo_fin,
-        reporte_data.aridos_seleccionados
-    )
+        nuevo_reporte.total_aridos = resumen.total_aridos_m3
+        nuevo_reporte.total_horas = resumen.total_horas
+        nuevo_reporte.importe_aridos = Decimal(str(resumen.total_importe_aridos))
+        nuevo_reporte.importe_horas = Decimal(str(resumen.total_importe_horas))
+        nuevo_reporte.importe_total = Decimal(str(resumen.importe_total))
 
-    items_horas = _get_items_horas_filtrados(
-        db,
-        reporte_data.proyecto_id,
-        reporte_data.periodo_inicio,
-        reporte_data.periodo_fin,
-        reporte_data.maquinas_seleccionadas
-    )
+        # Congelar las líneas con precio del reporte
+        lineas = _lineas_reporte(nuevo_reporte.id, entregas, horas)
+        if lineas:
+            db.execute(insert(ReporteLinea), lineas)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    # Items individuales para el response, desde las mismas líneas
+    items_aridos, items_horas = _items_desde_lineas(lineas)
 
     # Construir response con items incluidos
     return ReporteCuentaCorrienteConDetalleOut(
@@ -463,21 +656,21 @@ def actualizar_reporte(
     # Retornar reporte actualizado
     return ReporteCuentaCorrienteOut.model_validate(reporte)
 
-def get_todos_precios_aridos() -> List[PrecioAridoSchema]:
-    """Obtiene todos los precios de áridos disponibles"""
+def get_todos_precios_aridos(fecha: Optional[date] = None) -> List[PrecioAridoSchema]:
+    """Obtiene todos los precios de áridos vigentes en una fecha (por defecto hoy)"""
     return [
         PrecioAridoSchema(tipo_arido=tipo, precio_m3=precio)
-        for tipo, precio in PRECIOS_ARIDOS.items()
+        for tipo, precio in precio_catalogo_service.catalogo_precios.vigentes("arido", fecha).items()
     ]
 
-def get_tarifa_maquina_por_id(db: Session, maquina_id: int) -> Optional[TarifaMaquinaSchema]:
-    """Obtiene la tarifa por hora de una máquina específica"""
+def get_tarifa_maquina_por_id(db: Session, maquina_id: int, fecha: Optional[date] = None) -> Optional[TarifaMaquinaSchema]:
+    """Obtiene la tarifa por hora de una máquina específica vigente en una fecha"""
     maquina = db.query(Maquina).filter(Maquina.id == maquina_id).first()
 
     if not maquina:
         return None
 
-    tarifa = get_tarifa_maquina(maquina.nombre)
+    tarifa = get_tarifa_maquina(maquina.nombre, fecha)
 
     return TarifaMaquinaSchema(
         maquina_id=maquina.id,
@@ -485,91 +678,6 @@ def get_tarifa_maquina_por_id(db: Session, maquina_id: int) -> Optional[TarifaMa
         tarifa_hora=tarifa
     )
 
-def _get_items_aridos_filtrados(
-    db: Session,
-    proyecto_id: int,
-    periodo_inicio: date,
-    periodo_fin: date,
-    tipos_aridos: Optional[List[str]] = None
-) -> List[ItemAridoDetalle]:
-    """
-    Obtiene los items individuales de áridos con filtros opcionales.
-    Función auxiliar privada para create_reporte.
-    """
-    query = db.query(EntregaArido).filter(
-        EntregaArido.proyecto_id == proyecto_id,
-        EntregaArido.fecha_entrega >= periodo_inicio,
-        EntregaArido.fecha_entrega <= periodo_fin
-    )
-
-    # Aplicar filtro de tipos si se especifica
-    if tipos_aridos and len(tipos_aridos) > 0:
-        query = query.filter(EntregaArido.tipo_arido.in_(tipos_aridos))
-
-    entregas_aridos = query.all()
-
-    items_aridos = []
-    for arido in entregas_aridos:
-        precio_unitario = arido.precio_unitario if arido.precio_unitario is not None else get_precio_arido(arido.tipo_arido)
-        importe = arido.cantidad * precio_unitario
-
-        items_aridos.append(ItemAridoDetalle(
-            id=arido.id,
-            tipo_arido=arido.tipo_arido,
-            cantidad=arido.cantidad,
-            precio_unitario=precio_unitario,
-            importe=importe,
-            pagado=arido.pagado if arido.pagado is not None else False,
-            fecha=arido.fecha_entrega.date()
-        ))
-
-    return items_aridos
-
-def _get_items_horas_filtrados(
-    db: Session,
-    proyecto_id: int,
-    periodo_inicio: date,
-    periodo_fin: date,
-    maquinas_ids: Optional[List[int]] = None
-) -> List[ItemHoraDetalle]:
-    """
-    Obtiene los items individuales de horas con filtros opcionales.
-    Función auxiliar privada para create_reporte.
-    """
-    query = db.query(ReporteLaboral).options(
-        joinedload(ReporteLaboral.maquina),
-        joinedload(ReporteLaboral.usuario)
-    ).filter(
-        ReporteLaboral.proyecto_id == proyecto_id,
-        ReporteLaboral.fecha_asignacion >= periodo_inicio,
-        ReporteLaboral.fecha_asignacion <= periodo_fin
-    )
-
-    # Aplicar filtro de máquinas si se especifica
-    if maquinas_ids and len(maquinas_ids) > 0:
-        query = query.filter(ReporteLaboral.maquina_id.in_(maquinas_ids))
-
-    reportes_horas = query.all()
-
-    items_horas = []
-    for reporte_hora in reportes_horas:
-        tarifa_hora = reporte_hora.tarifa_hora if reporte_hora.tarifa_hora is not None else get_tarifa_maquina(reporte_hora.maquina.nombre)
-        importe = reporte_hora.horas_turno * tarifa_hora
-
-        items_horas.append(ItemHoraDetalle(
-            id=reporte_hora.id,
-            maquina_id=reporte_hora.maquina_id,
-            maquina_nombre=reporte_hora.maquina.nombre,
-            total_horas=reporte_hora.horas_turno,
-            tarifa_hora=tarifa_hora,
-            importe=importe,
-            pagado=reporte_hora.pagado if reporte_hora.pagado is not None else False,
-            fecha=reporte_hora.fecha_asignacion.date(),
-            usuario_nombre=reporte_hora.usuario.nombre if reporte_hora.usuario else None
-        ))
-
-    return items_horas
-
 def get_detalle_reporte(
     db: Session,
     reporte_id: int
@@ -577,9 +685,17 @@ def get_detalle_reporte(
     """
     Obtiene el detalle de items individuales de áridos y horas de un reporte.
 
-    IMPORTANTE: Lee los items desde las tablas relacionales (reporte_items_aridos, reporte_items_horas)
+    IMPORTANTE: Lee los items desde las líneas congeladas del reporte (reporte_linea),
+    con los precios vigentes al crearlo. Los reportes anteriores a esas líneas se
+    leen desde las tablas relacionales (reporte_items_aridos, reporte_items_horas)
     para obtener SOLO los items que fueron seleccionados al crear el reporte.
     """
+    # Reportes con líneas congeladas: una sola lectura
+    lineas = get_lineas_reporte(db, reporte_id)
+    if lineas:
+        items_aridos, items_horas = _items_desde_lineas(lineas)
+        return DetalleReporteResponse(items_aridos=items_aridos, items_horas=items_horas)
+
     # Obtener el reporte
     reporte = db.query(ReporteCuentaCorriente).filter(
         ReporteCuentaCorriente.id == reporte_id
@@ -603,7 +719,7 @@ def get_detalle_reporte(
     # Convertir áridos a ItemAridoDetalle
     items_aridos = []
     for arido in entregas_aridos:
-        precio_unitario = arido.precio_unitario if arido.precio_unitario is not None else get_precio_arido(arido.tipo_arido)
+        precio_unitario = arido.precio_unitario if arido.precio_unitario is not None else get_precio_arido(arido.tipo_arido, arido.fecha_entrega.date())
         importe = arido.cantidad * precio_unitario
 
         items_aridos.append(ItemAridoDetalle(
@@ -634,7 +750,7 @@ def get_detalle_reporte(
     # Convertir horas a ItemHoraDetalle
     items_horas = []
     for reporte_hora in reportes_horas:
-        tarifa_hora = reporte_hora.tarifa_hora if reporte_hora.tarifa_hora is not None else get_tarifa_maquina(reporte_hora.maquina.nombre)
+        tarifa_hora = reporte_hora.tarifa_hora if reporte_hora.tarifa_hora is not None else get_tarifa_maquina(reporte_hora.maquina.nombre, reporte_hora.fecha_asignacion.date())
         importe = reporte_hora.horas_turno * tarifa_hora
 
         items_horas.append(ItemHoraDetalle(
@@ -654,6 +770,24 @@ def get_detalle_reporte(
         items_horas=items_horas
     )
 
+def _contar_items_pagados(db: Session, reporte_id: int) -> Tuple[int, int]:
+    """Items y items pagados de un reporte sin líneas congeladas, desde las tablas relacionales"""
+    aridos = db.query(
+        func.count(EntregaArido.id),
+        func.count(EntregaArido.id).filter(EntregaArido.pagado == True)
+    ).join(
+        ReporteItemArido, ReporteItemArido.entrega_arido_id == EntregaArido.id
+    ).filter(ReporteItemArido.reporte_id == reporte_id).one()
+
+    horas = db.query(
+        func.count(ReporteLaboral.id),
+        func.count(ReporteLaboral.id).filter(ReporteLaboral.pagado == True)
+    ).join(
+        ReporteItemHora, ReporteItemHora.reporte_laboral_id == ReporteLaboral.id
+    ).filter(ReporteItemHora.reporte_id == reporte_id).one()
+
+    return aridos[0] + horas[0], aridos[1] + horas[1]
+
 def actualizar_items_pago(
     db: Session,
     reporte_id: int,
@@ -680,6 +814,8 @@ def actualizar_items_pago(
 
     aridos_actualizados = 0
     horas_actualizadas = 0
+    # Ids actualizados por tipo de línea y estado de pago, para las líneas congeladas
+    cambios = {"arido": {True: [], False: []}, "horas": {True: [], False: []}}
 
     # Actualizar items de áridos
     for item in items_data.items_aridos:
@@ -691,6 +827,7 @@ def actualizar_items_pago(
         if arido:
             arido.pagado = item.pagado
             aridos_actualizados += 1
+            cambios["arido"][item.pagado].append(item.item_id)
 
     # Actualizar items de horas
     for item in items_data.items_horas:
@@ -702,55 +839,42 @@ def actualizar_items_pago(
         if reporte_hora:
             reporte_hora.pagado = item.pagado
             horas_actualizadas += 1
+            cambios["horas"][item.pagado].append(item.item_id)
+
+    # Reflejar el estado de pago en las líneas congeladas de todos los reportes que incluyen esos items
+    for tipo, por_estado in cambios.items():
+        for pagado, ids in por_estado.items():
+            if ids:
+                db.query(ReporteLinea).filter(
+                    ReporteLinea.tipo == tipo,
+                    ReporteLinea.origen_id.in_(ids)
+                ).update({ReporteLinea.pagado: pagado}, synchronize_session=False)
 
     # Guardar cambios de items individuales
     db.commit()
 
     # ============= CALCULAR ESTADO GENERAL DEL REPORTE =============
-    # Obtener SOLO los items de áridos que pertenecen a este reporte (desde tabla relacional)
-    items_aridos_rel = db.query(ReporteItemArido).filter(
-        ReporteItemArido.reporte_id == reporte_id
-    ).all()
-
-    todos_aridos = []
-    for item_rel in items_aridos_rel:
-        arido = db.query(EntregaArido).filter(EntregaArido.id == item_rel.entrega_arido_id).first()
-        if arido:
-            todos_aridos.append(arido)
-
-    # Obtener SOLO los items de horas que pertenecen a este reporte (desde tabla relacional)
-    items_horas_rel = db.query(ReporteItemHora).filter(
-        ReporteItemHora.reporte_id == reporte_id
-    ).all()
-
-    todos_reportes_horas = []
-    for item_rel in items_horas_rel:
-        reporte_hora = db.query(ReporteLaboral).filter(ReporteLaboral.id == item_rel.reporte_laboral_id).first()
-        if reporte_hora:
-            todos_reportes_horas.append(reporte_hora)
+    total_items, total_pagados = db.query(
+        func.count(ReporteLinea.id),
+        func.count(ReporteLinea.id).filter(ReporteLinea.pagado == True)
+    ).filter(ReporteLinea.reporte_id == reporte_id).one()
 
-    # Calcular totales
-    total_items = len(todos_aridos) + len(todos_reportes_horas)
+    if total_items == 0:
+        # Reporte anterior a las líneas congeladas: contar desde las tablas relacionales
+        total_items, total_pagados = _contar_items_pagados(db, reporte_id)
 
     if total_items == 0:
         # Si no hay items, mantener el estado pendiente
         reporte.estado = "pendiente"
+    elif total_pagados == 0:
+        # Ningún item pagado
+        reporte.estado = "pendiente"
+    elif total_pagados == total_items:
+        # Todos los items pagados
+        reporte.estado = "pagado"
     else:
-        # Contar items pagados
-        aridos_pagados = sum(1 for arido in todos_aridos if arido.pagado)
-        horas_pagadas = sum(1 for hora in todos_reportes_horas if hora.pagado)
-        total_pagados = aridos_pagados + horas_pagadas
-
-        # Determinar estado del reporte basándose en items pagados
-        if total_pagados == 0:
-            # Ningún item pagado
-            reporte.estado = "pendiente"
-        elif total_pagados == total_items:
-            # Todos los items pagados
-            reporte.estado = "pagado"
-        else:
-            # Algunos items pagados (pago parcial)
-            reporte.estado = "parcial"
+        # Algunos items pagados (pago parcial)
+        reporte.estado = "parcial"
 
     # Guardar cambios del estado del reporte
     db.commit()
@@ -855,7 +979,7 @@ def listar_pagos_reporte(
     ).first()
 
     if not reporte:
-        return None
+        return archivo_frio_service.listar_pagos_archivados(db, reporte_id)
 
     # Obtener todos los pagos del reporte
     pagos = db.query(PagoReporte).filter(
@@ -0,0 +1,182 @@
+"""
+Resumen del dashboard de administración en una sola consulta.
+
+Reemplaza las llamadas en paralelo de la pantalla de inicio (horas, material y
+combustible del mes, proyectos activos y los listados recientes) por un único
+SELECT con CTEs que devuelve una fila.
+
+- El resultado se guarda por worker durante DASHBOARD_CACHE_TTL_SECONDS y se
+  calcula en la réplica (@solo_lectura).
+- Un commit de este worker que toca reportes laborales, entregas de áridos,
+  gastos o proyectos (por el ORM o con insert/update/delete de Core) invalida
+  el cache en el acto; los demás workers lo refrescan al vencer el TTL.
+- Después de una invalidación el resumen se recalcula en el primario durante
+  REPLICA_MAX_LAG_SECONDS: la réplica todavía puede no tener el cambio y el
+  resultado viejo quedaría cacheado todo el TTL.
+"""
+
+from datetime import datetime, timezone
+from typing import Tuple
+import logging
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.cache import CacheTTL
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.replica import solo_lectura
+from app.db.models import ReporteLaboral, EntregaArido, Gasto, Proyecto
+from app.schemas.schemas import DashboardResumenOut
+
+logger = logging.getLogger(__name__)
+
+LIMITE_LISTADOS = 15
+MAX_LIMITE_LISTADOS = 50
+
+# Modelos cuyos cambios desactualizan el resumen
+_MODELOS_RESUMEN = (ReporteLaboral, EntregaArido, Gasto, Proyecto)
+_TABLAS_RESUMEN = frozenset(modelo.__tablename__ for modelo in _MODELOS_RESUMEN)
+
+_SQL_RESUMEN = text("""
+    WITH horas_mes AS (
+        SELECT COALESCE(SUM(horas_turno), 0) AS total
+        FROM reporte_laboral
+        WHERE fecha_asignacion >= :inicio_mes AND fecha_asignacion < :fin_mes
+    ),
+    material_mes AS (
+        SELECT COALESCE(SUM(cantidad), 0) AS total
+        FROM entrega_arido
+        WHERE fecha_entrega >= :inicio_mes AND fecha_entrega < :fin_mes
+    ),
+    combustible_mes AS (
+        SELECT COALESCE(SUM(importe_total), 0) AS total
+        FROM gasto
+        WHERE tipo = 'Combustible' AND fecha >= :inicio_mes AND fecha < :fin_mes
+    ),
+    proyectos_activos AS (
+        SELECT COUNT(*) AS cantidad FROM proyecto WHERE estado = true
+    ),
+    ultimos_reportes AS (
+        SELECT r.id, r.maquina_id, m.nombre AS maquina_nombre, r.proyecto_id,
+               p.nombre AS proyecto_nombre, r.fecha_asignacion, r.horas_turno
+        FROM reporte_laboral r
+        LEFT JOIN maquina m ON m.id = r.maquina_id
+        LEFT JOIN proyecto p ON p.id = r.proyecto_id
+        ORDER BY r.id DESC
+        LIMIT :limite
+    ),
+    ultimas_entregas AS (
+        SELECT e.id, e.proyecto_id, p.nombre AS proyecto_nombre, e.tipo_arido, e.cantidad, e.fecha_entrega
+        FROM entrega_arido e
+        LEFT JOIN proyecto p ON p.id = e.proyecto_id
+        ORDER BY e.id DESC
+        LIMIT :limite
+    ),
+    ultimos_gastos AS (
+        SELECT g.id, g.maquina_id, m.nombre AS maquina_nombre, g.tipo, g.importe_total, g.fecha, g.descripcion
+        FROM gasto g
+        LEFT JOIN maquina m ON m.id = g.maquina_id
+        ORDER BY g.id DESC
+        LIMIT :limite
+    ),
+    ultimos_proyectos AS (
+        SELECT id, nombre, estado, progreso, fecha_inicio, fecha_fin, ubicacion
+        FROM proyecto
+        ORDER BY id DESC
+        LIMIT :limite
+    )
+    SELECT
+        horas_mes.total AS total_horas_mes_actual,
+        material_mes.total AS suma_material_mes_actual,
+        combustible_mes.total AS total_combustible_mes_actual,
+        proyectos_activos.cantidad AS cantidad_proyectos_activos,
+        (SELECT COALESCE(json_agg(u ORDER BY u.id DESC), '[]') FROM ultimos_reportes u) AS reportes_laborales,
+        (SELECT COALESCE(json_agg(u ORDER BY u.id DESC), '[]') FROM ultimas_entregas u) AS entregas_arido,
+        (SELECT COALESCE(json_agg(u ORDER BY u.id DESC), '[]') FROM ultimos_gastos u) AS gastos,
+        (SELECT COALESCE(json_agg(u ORDER BY u.id DESC), '[]') FROM ultimos_proyectos u) AS proyectos
+    FROM horas_mes, material_mes, combustible_mes, proyectos_activos
+""")
+
+cache_resumen = CacheTTL(settings.DASHBOARD_CACHE_TTL_SECONDS, maximo=MAX_LIMITE_LISTADOS)
+
+
+def _mes_actual() -> Tuple[datetime, datetime]:
+    """Inicio del mes actual y del siguiente, en hora local como los endpoints de KPIs"""
+    inicio = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    fin = inicio.replace(year=inicio.year + 1, month=1) if inicio.month == 12 else inicio.replace(month=inicio.month + 1)
+    return inicio, fin
+
+
+def calcular_resumen(db: Session, limite: int = LIMITE_LISTADOS) -> DashboardResumenOut:
+    """Calcula el resumen sin pasar por el cache, en la sesión recibida"""
+    inicio_mes, fin_mes = _mes_actual()
+    inicio = time.perf_counter()
+    fila = db.execute(_SQL_RESUMEN, {"inicio_mes": inicio_mes, "fin_mes": fin_mes, "limite": limite}).mappings().one()
+    logger.debug(f"📊 Resumen del dashboard calculado en {(time.perf_counter() - inicio) * 1000:.0f} ms")
+    return DashboardResumenOut(
+        total_horas_mes_actual=float(fila["total_horas_mes_actual"]),
+        suma_material_mes_actual=float(fila["suma_material_mes_actual"]),
+        total_combustible_mes_actual=int(fila["total_combustible_mes_actual"]),
+        cantidad_proyectos_activos=fila["cantidad_proyectos_activos"],
+        reportes_laborales=fila["reportes_laborales"],
+        entregas_arido=fila["entregas_arido"],
+        gastos=fila["gastos"],
+        proyectos=fila["proyectos"],
+        generado=datetime.now(timezone.utc)
+    )
+
+
+calcular_resumen_replica = solo_lectura(calcular_resumen)
+
+
+def get_resumen(db: Session, limite: int = LIMITE_LISTADOS) -> DashboardResumenOut:
+    """
+    Resumen del dashboard, desde el cache del worker si está vigente.
+    `db` es una sesión del primario: se usa si el cache se invalidó hace poco.
+    """
+    resumen = cache_resumen.obtener(limite)
+    if resumen is not None:
+        return resumen.model_copy(update={"desde_cache": True})
+    generacion = cache_resumen.generacion
+    if cache_resumen.invalidado_hace_menos_de(settings.REPLICA_MAX_LAG_SECONDS):
+        resumen = calcular_resumen(db, limite)
+    else:
+        resumen = calcular_resumen_replica(db, limite)
+    cache_resumen.guardar(limite, resumen, generacion)
+    return resumen
+
+
+# ============= Invalidación por escrituras de este worker =============
+
+def _afecta_resumen(session: Session) -> bool:
+    return any(isinstance(obj, _MODELOS_RESUMEN) for obj in (*session.new, *session.dirty, *session.deleted))
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _marcar_flush(session, flush_context):
+    if _afecta_resumen(session):
+        session.info["dashboard_desactualizado"] = True
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _marcar_dml(orm_execute_state):
+    # query.update() / delete() y los insert/update/delete de Core
+    # (db.execute(insert(Modelo)), insert(Modelo.__table__)) no pasan por el flush
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    tabla = getattr(orm_execute_state.statement, "table", None)
+    if getattr(tabla, "name", None) in _TABLAS_RESUMEN:
+        orm_execute_state.session.info["dashboard_desactualizado"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _invalidar_al_commitear(session):
+    if session.info.pop("dashboard_desactualizado", None):
+        cache_resumen.invalidar()
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _descartar_marca(session):
+    session.info.pop("dashboard_desactualizado", None)
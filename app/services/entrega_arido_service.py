@@ -1,10 +1,12 @@
 from sqlalchemy.orm import Session
 from app.db.models.entrega_arido import EntregaArido
-from app.schemas.schemas import EntregaAridoCreate, EntregaAridoOut
+from app.schemas.schemas import EntregaAridoCreate, EntregaAridoOut, PaginaOut
 from typing import List, Optional
 from datetime import datetime
 from sqlalchemy import extract, func
 from fastapi import HTTPException
+from app.core.serializacion import filas_como_columnas, filas_como_dicts
+from app.core.paginacion import CursorInvalido, ParametrosPagina, paginar
 import traceback
 
 def create_entrega_arido(db: Session, entrega_data: EntregaAridoCreate) -> EntregaAridoOut:
@@ -53,6 +55,35 @@ def get_all_entregas_arido(db: Session, skip: int = 0, limit: int = 100) -> List
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error al obtener entregas: {str(e)}")
 
+# Columnas del listado, en el orden de los campos de EntregaAridoOut
+COLUMNAS_ENTREGA_ARIDO = (
+    EntregaArido.proyecto_id,
+    EntregaArido.usuario_id,
+    EntregaArido.tipo_arido,
+    EntregaArido.nombre,
+    EntregaArido.cantidad,
+    EntregaArido.precio_unitario,
+    EntregaArido.fecha_entrega,
+    EntregaArido.observaciones,
+    EntregaArido.pagado,
+    EntregaArido.id,
+    EntregaArido.created,
+    EntregaArido.updated,
+)
+
+def get_all_entregas_arido_filas(db: Session, skip: int = 0, limit: int = 100, columnar: bool = False):
+    """
+    Listado de entregas consultando solo columnas, como dicts listos para
+    FilasJSONResponse (sin model_validate por fila), o en formato columnar.
+    """
+    try:
+        query = db.query(*COLUMNAS_ENTREGA_ARIDO).order_by(EntregaArido.id).offset(skip).limit(limit)
+        return filas_como_columnas(query) if columnar else filas_como_dicts(query)
+    except Exception as e:
+        print(f"Error en get_all_entregas_arido_filas: {str(e)}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Error al obtener entregas: {str(e)}")
+
 def update_entrega_arido(db: Session, entrega_id: int, entrega_data: EntregaAridoCreate) -> Optional[EntregaAridoOut]:
     try:
         entrega = db.query(EntregaArido).filter(EntregaArido.id == entrega_id).first()
@@ -98,17 +129,21 @@ def get_suma_material_mes_actual(db: Session) -> float:
         traceback.print_exc()
         return 0.0
 
-def get_all_entregas_arido_paginated(db: Session, skip: int = 0, limit: int = 15) -> dict:
+def get_all_entregas_arido_paginated(db: Session, pagina: ParametrosPagina) -> PaginaOut[EntregaAridoOut]:
+    """Entregas paginadas por keyset, las más recientes primero"""
     try:
-        total = db.query(EntregaArido).count()
-        entregas = db.query(EntregaArido).offset(skip).limit(limit).all()
-        
-        return {
-            "total": total,
-            "skip": skip,
-            "limit": limit,
-            "items": [EntregaAridoOut.model_validate(e) for e in entregas]
-        }
+        return paginar(
+            db,
+            db.query(EntregaArido),
+            EntregaArido.id,
+            EntregaAridoOut.model_validate,
+            pagina,
+            columna_orden=EntregaArido.fecha_entrega,
+            descendente=True
+        )
+    except CursorInvalido:
+        # Lo informa el router como 400
+        raise
     except Exception as e:
         print(f"Error en paginación: {str(e)}")
         traceback.print_exc()
@@ -0,0 +1,263 @@
+"""
+Facturación por lote: genera en paralelo los reportes de cuenta corriente de un
+período para todos los proyectos activos con áridos u horas en ese período.
+
+- Cada proyecto se factura con su propia sesión y transacción
+  (cuenta_corriente_service.create_reporte), así que un error en uno no afecta
+  a los demás y queda registrado en el resultado del lote.
+- Los reportes se generan en un pool de FACTURACION_MAX_WORKERS hilos, acotado
+  por el tamaño del pool de conexiones.
+- Los proyectos que ya tienen un reporte del mismo período se omiten, así que
+  volver a correr un lote solo factura lo que faltaba.
+- El progreso y el resumen se guardan en lote_facturacion después de cada
+  proyecto; solo puede haber un lote en curso por período.
+
+Se usa desde POST /cuenta-corriente/facturacion-lote o `python facturar_periodo.py`.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import logging
+import time
+
+from sqlalchemy import select, exists, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import SessionLocal, engine
+from app.db.models import Proyecto, EntregaArido, ReporteLaboral, ReporteCuentaCorriente, LoteFacturacion
+from app.schemas.schemas import ReporteCuentaCorrienteCreate, LoteFacturacionOut, ResultadoFacturacionProyecto
+from app.services.cuenta_corriente_service import create_reporte
+
+logger = logging.getLogger(__name__)
+
+# Un lote "en curso" sin avances en este tiempo se considera interrumpido (worker reiniciado)
+LOTE_SIN_AVANCE = timedelta(minutes=15)
+
+
+def _max_workers(pedido: Optional[int]) -> int:
+    # Dejar conexiones libres para el coordinador y el tráfico normal del worker
+    limite = max(1, engine.pool.size() - 1) if hasattr(engine.pool, "size") else settings.FACTURACION_MAX_WORKERS
+    return max(1, min(pedido or settings.FACTURACION_MAX_WORKERS, limite))
+
+
+def _ya_facturado(periodo_inicio: date, periodo_fin: date):
+    return exists().where(
+        ReporteCuentaCorriente.proyecto_id == Proyecto.id,
+        ReporteCuentaCorriente.periodo_inicio == periodo_inicio,
+        ReporteCuentaCorriente.periodo_fin == periodo_fin
+    )
+
+
+def proyectos_facturables(
+    db: Session,
+    periodo_inicio: date,
+    periodo_fin: date,
+    proyectos_ids: Optional[List[int]] = None
+) -> List[Tuple[int, str]]:
+    """
+    Proyectos activos con entregas de áridos u horas de máquina en el período
+    y sin reporte de ese mismo período. Mismo criterio de fechas que create_reporte.
+    """
+    con_aridos = exists().where(
+        EntregaArido.proyecto_id == Proyecto.id,
+        EntregaArido.fecha_entrega >= periodo_inicio,
+        EntregaArido.fecha_entrega <= periodo_fin
+    )
+    con_horas = exists().where(
+        ReporteLaboral.proyecto_id == Proyecto.id,
+        ReporteLaboral.maquina_id.isnot(None),
+        ReporteLaboral.fecha_asignacion >= periodo_inicio,
+        ReporteLaboral.fecha_asignacion <= periodo_fin
+    )
+    query = select(Proyecto.id, Proyecto.nombre).where(
+        Proyecto.estado == True,
+        con_aridos | con_horas,
+        ~_ya_facturado(periodo_inicio, periodo_fin)
+    )
+    if proyectos_ids:
+        query = query.where(Proyecto.id.in_(proyectos_ids))
+    return [(fila.id, fila.nombre) for fila in db.execute(query.order_by(Proyecto.id))]
+
+
+def iniciar_lote(
+    db: Session,
+    periodo_inicio: date,
+    periodo_fin: date,
+    proyectos_ids: Optional[List[int]] = None
+) -> Tuple[LoteFacturacion, List[Tuple[int, str]]]:
+    """
+    Registra un lote en curso con los proyectos a facturar. Lanza ValueError si
+    el período no es válido o si ya hay un lote en curso para ese período.
+    """
+    if periodo_fin < periodo_inicio:
+        raise ValueError("La fecha de fin del período es anterior a la de inicio")
+
+    # Lotes que quedaron "en curso" porque se cortó el proceso que los ejecutaba
+    db.execute(
+        update(LoteFacturacion)
+        .where(
+            LoteFacturacion.estado == "en_curso",
+            LoteFacturacion.actualizado < datetime.now(timezone.utc) - LOTE_SIN_AVANCE
+        )
+        .values(estado="interrumpido", finalizado=datetime.now(timezone.utc))
+    )
+
+    candidatos = proyectos_facturables(db, periodo_inicio, periodo_fin, proyectos_ids)
+    lote = LoteFacturacion(
+        periodo_inicio=periodo_inicio,
+        periodo_fin=periodo_fin,
+        estado="en_curso",
+        total_proyectos=len(candidatos),
+        resultados="[]"
+    )
+    db.add(lote)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError(f"Ya hay un lote de facturación en curso para {periodo_inicio} - {periodo_fin}")
+    db.refresh(lote)
+    return lote, candidatos
+
+
+def _facturar_proyecto(proyecto_id: int, proyecto_nombre: str, periodo_inicio: date, periodo_fin: date, lote_id: int) -> Dict:
+    """Genera el reporte de un proyecto en su propia sesión; nunca lanza excepciones"""
+    inicio = time.perf_counter()
+    resultado = {"proyecto_id": proyecto_id, "proyecto_nombre": proyecto_nombre}
+    db = SessionLocal()
+    try:
+        # Otro usuario pudo haberlo facturado desde que se armó el lote
+        facturado = db.query(_ya_facturado(periodo_inicio, periodo_fin)).filter(Proyecto.id == proyecto_id).scalar()
+        if facturado:
+            resultado.update(estado="omitido", motivo="Ya tiene un reporte del período")
+        else:
+            reporte = create_reporte(db, ReporteCuentaCorrienteCreate(
+                proyecto_id=proyecto_id,
+                periodo_inicio=periodo_inicio,
+                periodo_fin=periodo_fin,
+                observaciones=f"Facturación por lote #{lote_id}"
+            ))
+            resultado.update(estado="creado", reporte_id=reporte.id, importe_total=reporte.importe_total)
+    except ValueError as e:
+        # Validaciones de create_reporte (p. ej. sin items facturables)
+        resultado.update(estado="omitido", motivo=str(e))
+    except Exception as e:
+        logger.exception(f"❌ Error facturando el proyecto {proyecto_id} en el lote {lote_id}")
+        resultado.update(estado="error", motivo=str(e))
+    finally:
+        db.close()
+    resultado["duracion_ms"] = int((time.perf_counter() - inicio) * 1000)
+    return resultado
+
+
+def _guardar_avance(db: Session, lote: LoteFacturacion, resultados: List[Dict], estado: Optional[str] = None):
+    por_estado = {e: sum(1 for r in resultados if r["estado"] == e) for e in ("creado", "omitido", "error")}
+    lote.procesados = len(resultados)
+    lote.reportes_creados = por_estado["creado"]
+    lote.omitidos = por_estado["omitido"]
+    lote.errores = por_estado["error"]
+    lote.importe_total = sum((Decimal(str(r.get("importe_total") or 0)) for r in resultados), Decimal("0"))
+    lote.resultados = json.dumps(resultados, ensure_ascii=False)
+    lote.actualizado = datetime.now(timezone.utc)
+    if estado:
+        lote.estado = estado
+        lote.finalizado = lote.actualizado
+    db.commit()
+
+
+def ejecutar_lote(
+    lote_id: int,
+    candidatos: List[Tuple[int, str]],
+    max_workers: Optional[int] = None,
+    al_avanzar: Optional[Callable[[LoteFacturacionOut], None]] = None
+) -> LoteFacturacionOut:
+    """
+    Factura los proyectos de un lote en un pool acotado de hilos y guarda el
+    progreso después de cada proyecto. `al_avanzar` recibe el lote actualizado.
+    """
+    workers = _max_workers(max_workers)
+    db = SessionLocal()
+    lote = db.get(LoteFacturacion, lote_id)
+    periodo_inicio, periodo_fin = lote.periodo_inicio, lote.periodo_fin
+    logger.info(
+        f"🧾 Lote {lote_id}: facturando {len(candidatos)} proyectos "
+        f"({periodo_inicio} - {periodo_fin}) con {workers} workers"
+    )
+    inicio = time.perf_counter()
+    resultados: List[Dict] = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"lote-{lote_id}") as pool:
+            futuros = [
+                pool.submit(_facturar_proyecto, proyecto_id, nombre, periodo_inicio, periodo_fin, lote_id)
+                for proyecto_id, nombre in candidatos
+            ]
+            for futuro in as_completed(futuros):
+                resultados.append(futuro.result())
+                _guardar_avance(db, lote, resultados)
+                if al_avanzar:
+                    al_avanzar(_lote_out(lote))
+
+        resultados.sort(key=lambda r: r["proyecto_id"])
+        _guardar_avance(db, lote, resultados, estado="con_errores" if lote.errores else "completado")
+        logger.info(
+            f"✅ Lote {lote_id}: {lote.reportes_creados} reportes, {lote.omitidos} omitidos, "
+            f"{lote.errores} errores, ${float(lote.importe_total):,.2f} en {time.perf_counter() - inicio:.1f}s"
+        )
+        return _lote_out(lote)
+    except Exception:
+        logger.exception(f"❌ Lote de facturación {lote_id} interrumpido")
+        db.rollback()
+        _guardar_avance(db, lote, resultados, estado="fallido")
+        raise
+    finally:
+        db.close()
+
+
+def facturar_periodo(
+    periodo_inicio: date,
+    periodo_fin: date,
+    proyectos_ids: Optional[List[int]] = None,
+    max_workers: Optional[int] = None,
+    al_avanzar: Optional[Callable[[LoteFacturacionOut], None]] = None
+) -> LoteFacturacionOut:
+    """Inicia y ejecuta un lote completo en el hilo actual (CLI)"""
+    db = SessionLocal()
+    try:
+        lote, candidatos = iniciar_lote(db, periodo_inicio, periodo_fin, proyectos_ids)
+    finally:
+        db.close()
+    return ejecutar_lote(lote.id, candidatos, max_workers, al_avanzar)
+
+
+def _lote_out(lote: LoteFacturacion) -> LoteFacturacionOut:
+    return LoteFacturacionOut(
+        id=lote.id,
+        periodo_inicio=lote.periodo_inicio,
+        periodo_fin=lote.periodo_fin,
+        estado=lote.estado,
+        total_proyectos=lote.total_proyectos,
+        procesados=lote.procesados,
+        reportes_creados=lote.reportes_creados,
+        omitidos=lote.omitidos,
+        errores=lote.errores,
+        importe_total=float(lote.importe_total or 0),
+        resultados=[ResultadoFacturacionProyecto(**r) for r in json.loads(lote.resultados or "[]")],
+        iniciado=lote.iniciado,
+        actualizado=lote.actualizado,
+        finalizado=lote.finalizado
+    )
+
+
+def get_lote(db: Session, lote_id: int) -> Optional[LoteFacturacionOut]:
+    lote = db.get(LoteFacturacion, lote_id)
+    return _lote_out(lote) if lote else None
+
+
+def listar_lotes(db: Session, limite: int = 20) -> List[LoteFacturacionOut]:
+    lotes = db.query(LoteFacturacion).order_by(LoteFacturacion.id.desc()).limit(limite).all()
+    return [_lote_out(l) for l in lotes]
@@ -1,11 +1,14 @@
 # Servicio para operaciones de Gasto
 
+from app.db.database import SessionLocal
 from app.db.models import Gasto
-from app.schemas.schemas import GastoSchema, GastoCreate, GastoOut
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from app.schemas.schemas import GastoSchema, GastoCreate, GastoOut, PaginaOut
+from app.core.paginacion import ParametrosPagina, paginar
+from app.core import imagenes
+from sqlalchemy.orm import Session, defer
+from typing import List, Optional, Tuple
 from sqlalchemy.exc import SQLAlchemyError
-from fastapi import UploadFile
+from fastapi import BackgroundTasks, UploadFile
 from datetime import datetime
 from sqlalchemy import extract, func
 import base64
@@ -108,7 +111,7 @@ def get_gasto(db: Session, gasto_id: int) -> Optional[GastoOut]:
         db.rollback()
         raise Exception(f"Error al obtener gasto: {str(e)}")
 
-def create_gasto(db: Session, usuario_id: int, maquina_id: int, tipo: str, importe_total: float, fecha: str, descripcion: str, imagen: UploadFile = None) -> GastoOut:
+def create_gasto(db: Session, usuario_id: int, maquina_id: int, tipo: str, importe_total: float, fecha: str, descripcion: str, imagen: UploadFile = None, tareas: Optional[BackgroundTasks] = None) -> GastoOut:
     from datetime import datetime
     try:
         # ✅ SOLUCIÓN: Manejar diferentes formatos de fecha ISO
@@ -130,6 +133,7 @@ def create_gasto(db: Session, usuario_id: int, maquina_id: int, tipo: str, impor
             "descripcion": descripcion,
             "imagen": imagen.file.read() if imagen else None
         }
+        gasto_data["imagen_sha256"] = _programar_derivados(gasto_data["imagen"], tareas)
         
         nuevo_gasto = Gasto(**gasto_data)
         db.add(nuevo_gasto)
@@ -153,7 +157,7 @@ def create_gasto(db: Session, usuario_id: int, maquina_id: int, tipo: str, impor
         db.rollback()
         raise Exception(f"Error en formato de fecha: {str(e)}")
 
-def update_gasto(db: Session, gasto_id: int, usuario_id: int, maquina_id: int, tipo: str, importe_total: float, fecha: str, descripcion: str, imagen: UploadFile = None) -> Optional[GastoOut]:
+def update_gasto(db: Session, gasto_id: int, usuario_id: int, maquina_id: int, tipo: str, importe_total: float, fecha: str, descripcion: str, imagen: UploadFile = None, tareas: Optional[BackgroundTasks] = None) -> Optional[GastoOut]:
     import os
     from datetime import datetime
     try:
@@ -168,6 +172,7 @@ def update_gasto(db: Session, gasto_id: int, usuario_id: int, maquina_id: int, t
 
             if imagen:
                 existing_gasto.imagen = imagen.file.read()
+                existing_gasto.imagen_sha256 = _programar_derivados(existing_gasto.imagen, tareas)
 
             db.commit()
             db.refresh(existing_gasto)
@@ -208,20 +213,7 @@ def get_total_combustible_mes_actual(db: Session) -> int:
     ).scalar()
     return int(total) if total else 0
 
-def get_all_gastos_paginated(db: Session, skip: int = 0, limit: int = 15) -> List[GastoOut]:
-    gastos = db.query(Gasto).offset(skip).limit(limit).all()
-    return [GastoOut(
-        id=g.id,
-        usuario_id=g.usuario_id,
-        maquina_id=g.maquina_id,
-        tipo=g.tipo,
-        importe_total=g.importe_total,
-        fecha=g.fecha,
-        descripcion=g.descripcion,
-        imagen=safe_base64_encode(g.imagen)
-    ) for g in gastos]
-
-def update_gasto(db: Session, gasto_id: int, usuario_id: int, maquina_id: int, tipo: str, importe_total: int, fecha: str, descripcion: str, imagen: UploadFile = None) -> Optional[GastoOut]:
+def update_gasto(db: Session, gasto_id: int, usuario_id: int, maquina_id: int, tipo: str, importe_total: int, fecha: str, descripcion: str, imagen: UploadFile = None, tareas: Optional[BackgroundTasks] = None) -> Optional[GastoOut]:
     import os
     from datetime import datetime
     try:
@@ -236,6 +228,7 @@ def update_gasto(db: Session, gasto_id: int, usuario_id: int, maquina_id: int, t
 
             if imagen:
                 existing_gasto.imagen = imagen.file.read()
+                existing_gasto.imagen_sha256 = _programar_derivados(existing_gasto.imagen, tareas)
 
             db.commit()
             db.refresh(existing_gasto)
@@ -276,9 +269,81 @@ def get_total_combustible_mes_actual(db: Session) -> int:
     ).scalar()
     return int(total) if total else 0
 
-def get_all_gastos_paginated(db: Session, skip: int = 0, limit: int = 15) -> List[GastoOut]:
-    gastos = db.query(Gasto).offset(skip).limit(limit).all()
-    return [GastoOut(
+# ============= Imágenes de comprobantes =============
+# Derivados WebP en uploads/derivados (no públicos): se sirven por GET /gastos/{id}/imagen
+# y, con ?imagen=miniatura, en las listas en lugar del comprobante completo.
+
+MODOS_IMAGEN = ("completa", "miniatura", "ninguna")
+
+
+def _programar_derivados(datos: Optional[bytes], tareas: Optional[BackgroundTasks]) -> Optional[str]:
+    """sha256 del comprobante; los derivados se generan después de responder"""
+    if not datos:
+        return None
+    sha256 = imagenes.sha256_bytes(datos)
+    if tareas is not None:
+        tareas.add_task(imagenes.generar_derivados, imagenes.DIRECTORIO_PRIVADO, datos, sha256)
+    return sha256
+
+
+def _derivado(db: Session, gasto_id: int, sha256: str, ancho: int) -> Tuple[Optional[bytes], Optional[bytes]]:
+    """(derivado, original): el original solo se lee de la base si el derivado no se pudo generar"""
+    datos = imagenes.leer_derivado(imagenes.DIRECTORIO_PRIVADO, sha256, ancho)
+    if datos is not None:
+        return datos, None
+    original = db.query(Gasto.imagen).filter(Gasto.id == gasto_id).scalar()
+    if original and imagenes.generar_derivados(imagenes.DIRECTORIO_PRIVADO, original, sha256):
+        return imagenes.leer_derivado(imagenes.DIRECTORIO_PRIVADO, sha256, ancho), None
+    return None, original
+
+
+def programar_miniaturas(pendientes: List[int], tareas: Optional[BackgroundTasks]) -> None:
+    """Genera después de responder las miniaturas que una lista no encontró en disco"""
+    if pendientes and tareas is not None:
+        tareas.add_task(generar_miniaturas, pendientes)
+
+
+def generar_miniaturas(ids: List[int]) -> None:
+    """Tarea de fondo: lee los comprobantes de `ids` en una consulta (por lotes) y genera sus derivados"""
+    db = SessionLocal()
+    try:
+        filas = db.query(Gasto.imagen_sha256, Gasto.imagen).filter(
+            Gasto.id.in_(ids), Gasto.imagen_sha256.isnot(None)
+        ).execution_options(yield_per=20)
+        for sha256, datos in filas:
+            # Otra lista pudo haberlos generado mientras tanto
+            if datos and imagenes.faltan(imagenes.DIRECTORIO_PRIVADO, sha256):
+                imagenes.generar_derivados(imagenes.DIRECTORIO_PRIVADO, datos, sha256)
+    except Exception as e:
+        print(f"❌ Error generando miniaturas de comprobantes: {str(e)}")
+    finally:
+        db.close()
+
+
+def consulta_gastos(db: Session, imagen: str = "completa"):
+    """Query de gastos; sin el comprobante completo si la lista no lo va a devolver"""
+    query = db.query(Gasto)
+    if imagen != "completa":
+        query = query.options(defer(Gasto.imagen))
+    return query
+
+
+def gasto_con_imagen(g: Gasto, imagen: str = "completa", esquema=GastoOut, pendientes: Optional[List[int]] = None):
+    """
+    Gasto de salida con el comprobante completo, su miniatura WebP o sin imagen (base64).
+    La miniatura solo se lee del disco: si falta va None y el id se agrega a `pendientes`
+    (ver programar_miniaturas); el comprobante completo nunca se lee fila por fila.
+    """
+    valor = None
+    if imagen == "completa":
+        valor = safe_base64_encode(g.imagen)
+    elif imagen == "miniatura" and g.imagen_sha256:
+        miniatura = imagenes.leer_derivado(imagenes.DIRECTORIO_PRIVADO, g.imagen_sha256, imagenes.ANCHO_MINIATURA)
+        if miniatura is not None:
+            valor = safe_base64_encode(miniatura)
+        elif pendientes is not None and imagenes.faltan(imagenes.DIRECTORIO_PRIVADO, g.imagen_sha256):
+            pendientes.append(g.id)
+    return esquema(
         id=g.id,
         usuario_id=g.usuario_id,
         maquina_id=g.maquina_id,
@@ -286,5 +351,44 @@ def get_all_gastos_paginated(db: Session, skip: int = 0, limit: int = 15) -> Lis
         importe_total=g.importe_total,
         fecha=g.fecha,
         descripcion=g.descripcion,
-        imagen=safe_base64_encode(g.imagen)
-    ) for g in gastos]
\ No newline at end of file
+        imagen=valor
+    )
+
+
+def imagen_gasto(db: Session, gasto_id: int, ancho: Optional[int] = None) -> Optional[Tuple[bytes, str, str]]:
+    """
+    (contenido, media type, etag) del comprobante en el ancho pedido: el derivado
+    WebP o, si no hay derivados (sin Pillow o no es una imagen), el original.
+    None si el gasto no existe o no tiene comprobante.
+    """
+    sha256 = db.query(Gasto.imagen_sha256).filter(Gasto.id == gasto_id).scalar()
+    if not sha256:
+        return None
+    ancho = imagenes.ancho_para(ancho)
+    derivado, original = _derivado(db, gasto_id, sha256, ancho)
+    if derivado is not None:
+        return derivado, imagenes.MEDIA_TYPE, f'"{sha256}-w{ancho}"'
+    if not original:
+        return None
+    return original, imagenes.media_type_de(original), f'"{sha256}"'
+
+
+def get_all_gastos_paginated(
+    db: Session,
+    pagina: ParametrosPagina,
+    imagen: str = "completa",
+    tareas: Optional[BackgroundTasks] = None
+) -> PaginaOut[GastoOut]:
+    """Gastos paginados por keyset, los más recientes primero"""
+    pendientes: List[int] = []
+    resultado = paginar(
+        db,
+        consulta_gastos(db, imagen),
+        Gasto.id,
+        lambda g: gasto_con_imagen(g, imagen, pendientes=pendientes),
+        pagina,
+        columna_orden=Gasto.fecha,
+        descendente=True
+    )
+    programar_miniaturas(pendientes, tareas)
+    return resultado
\ No newline at end of file
@@ -8,6 +8,9 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, date, timedelta
 from fastapi import HTTPException
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 class JornadaLaboralService:
 
@@ -41,12 +44,12 @@ class JornadaLaboralService:
         - horas_extras: excedente sobre límite regular (máx 4h)
         - total_horas: (hora_fin - hora_inicio - tiempo_descanso)
         """
-        print(f"🚀 Creando jornada manual para usuario {usuario_id}")
+        logger.debug(f"🚀 Creando jornada manual para usuario {usuario_id}")
 
         # 1. Verificar que el usuario existe
         usuario = db.query(Usuario).filter(Usuario.id == usuario_id).first()
         if not usuario:
-            print(f"❌ Usuario no encontrado: {usuario_id}")
+            logger.error(f"❌ Usuario no encontrado: {usuario_id}")
             raise HTTPException(status_code=404, detail="Usuario no encontrado")
 
         # 2. Parsear fechas y timestamps
@@ -93,11 +96,11 @@ class JornadaLaboralService:
 
         # 5. Calcular horas si tiene hora_fin
         if hora_fin_obj:
-            print(f"📊 Calculando horas trabajadas...")
+            logger.debug(f"📊 Calculando horas trabajadas...")
             JornadaLaboralService._calcular_horas_trabajadas(nueva_jornada)
-            print(f"   Horas regulares: {nueva_jornada.horas_regulares:.2f}h")
-            print(f"   Horas extras: {nueva_jornada.horas_extras:.2f}h")
-            print(f"   Total horas: {nueva_jornada.total_horas:.2f}h")
+            logger.debug(f"   Horas regulares: {nueva_jornada.horas_regulares:.2f}h")
+            logger.debug(f"   Horas extras: {nueva_jornada.horas_extras:.2f}h")
+            logger.debug(f"   Total horas: {nueva_jornada.total_horas:.2f}h")
 
         # 6. Guardar en la base de datos
         try:
@@ -105,16 +108,16 @@ class JornadaLaboralService:
             db.commit()
             db.refresh(nueva_jornada)
 
-            print(f"✅ Jornada manual creada exitosamente con ID: {nueva_jornada.id}")
-            print(f"   Usuario: {usuario_id}")
-            print(f"   Fecha: {fecha_obj}")
-            print(f"   Estado: {estado}")
-            print(f"   Total horas: {nueva_jornada.total_horas:.2f}h")
+            logger.debug(f"✅ Jornada manual creada exitosamente con ID: {nueva_jornada.id}")
+            logger.debug(f"   Usuario: {usuario_id}")
+            logger.debug(f"   Fecha: {fecha_obj}")
+            logger.debug(f"   Estado: {estado}")
+            logger.debug(f"   Total horas: {nueva_jornada.total_horas:.2f}h")
 
             return nueva_jornada
 
         except Exception as e:
-            print(f"❌ Error guardando jornada: {str(e)}")
+            logger.error(f"❌ Error guardando jornada: {str(e)}")
             db.rollback()
             raise HTTPException(status_code=500, detail=f"Error al guardar jornada: {str(e)}")
 
@@ -126,12 +129,12 @@ class JornadaLaboralService:
         ubicacion: Optional[Dict] = None
     ) -> JornadaLaboral:
         """✅ Inicia una nueva jornada laboral"""
-        print(f"🚀 Iniciando jornada para usuario {usuario_id}")
+        logger.debug(f"🚀 Iniciando jornada para usuario {usuario_id}")
         
         # Verificar que no haya una jornada activa
         jornada_existente = JornadaLaboralService.obtener_jornada_activa(db, usuario_id)
         if jornada_existente:
-            print(f"❌ Ya existe jornada activa: {jornada_existente.id}")
+            logger.error(f"❌ Ya existe jornada activa: {jornada_existente.id}")
             raise HTTPException(
                 status_code=409,
                 detail=f"Ya existe una jornada laboral activa (ID: {jornada_existente.id})"
@@ -142,7 +145,7 @@ class JornadaLaboralService:
         today = now.date()
 
         if today.weekday() == 6:  # Domingo
-            print(f"❌ Intento de fichaje en domingo bloqueado")
+            logger.error(f"❌ Intento de fichaje en domingo bloqueado")
             raise HTTPException(
                 status_code=403,
                 detail="No se permite fichar los domingos. Por favor, intenta en otro día."
@@ -180,11 +183,11 @@ class JornadaLaboralService:
             db.commit()
             db.refresh(jornada)
             
-            print(f"✅ Jornada creada exitosamente con ID: {jornada.id}")
+            logger.debug(f"✅ Jornada creada exitosamente con ID: {jornada.id}")
             return jornada
             
         except Exception as e:
-            print(f"❌ Error guardando jornada: {str(e)}")
+            logger.error(f"❌ Error guardando jornada: {str(e)}")
             db.rollback()
             raise HTTPException(status_code=500, detail=f"Error al guardar jornada: {str(e)}")
     
@@ -198,7 +201,7 @@ class JornadaLaboralService:
         forzado: bool = False
     ) -> JornadaLaboral:
         """✅ Finaliza una jornada laboral"""
-        print(f"🛑 Finalizando jornada ID: {jornada_id}")
+        logger.debug(f"🛑 Finalizando jornada ID: {jornada_id}")
         
         jornada = db.query(JornadaLaboral).filter(JornadaLaboral.id == jornada_id).first()
         if not jornada:
@@ -237,11 +240,11 @@ class JornadaLaboralService:
             db.commit()
             db.refresh(jornada)
             
-            print(f"✅ Jornada finalizada: {jornada.total_horas}h ({jornada.horas_regulares}h + {jornada.horas_extras}h extras)")
+            logger.debug(f"✅ Jornada finalizada: {jornada.total_horas}h ({jornada.horas_regulares}h + {jornada.horas_extras}h extras)")
             return jornada
             
         except Exception as e:
-            print(f"❌ Error finalizando jornada: {str(e)}")
+            logger.error(f"❌ Error finalizando jornada: {str(e)}")
             db.rollback()
             raise HTTPException(status_code=500, detail=f"Error al finalizar jornada: {str(e)}")
     
@@ -256,7 +259,7 @@ class JornadaLaboralService:
         - L-V: después de 8h REALES trabajadas
         - Sábados: después de 4h REALES trabajadas
         """
-        print(f"🕐 Confirmando horas extras para jornada: {jornada_id}")
+        logger.debug(f"🕐 Confirmando horas extras para jornada: {jornada_id}")
 
         jornada = db.query(JornadaLaboral).filter(JornadaLaboral.id == jornada_id).first()
         if not jornada:
@@ -268,7 +271,7 @@ class JornadaLaboralService:
         # ✅ Calcular horas en tiempo real PRIMERO
         if jornada.estado in ['activa', 'pausada']:
             JornadaLaboralService._calcular_horas_en_tiempo_real(jornada)
-            print(f"   Horas trabajadas (sin descanso): {jornada.horas_regulares:.2f}h")
+            logger.debug(f"   Horas trabajadas (sin descanso): {jornada.horas_regulares:.2f}h")
 
         # ✅ VALIDACIÓN: Estado activo o pausado
         if jornada.estado not in ['activa', 'pausada']:
@@ -290,7 +293,7 @@ class JornadaLaboralService:
         
         # ✅ VALIDACIÓN: No duplicar
         if jornada.overtime_confirmado:
-            print(f"⚠️ Horas extras ya confirmadas")
+            logger.warning(f"⚠️ Horas extras ya confirmadas")
             return jornada
         
         # ✅ ACTIVAR HORAS EXTRAS
@@ -307,7 +310,7 @@ class JornadaLaboralService:
         try:
             db.commit()
             db.refresh(jornada)
-            print(f"✅ Horas extras confirmadas: {jornada.horas_regulares:.2f}h regulares")
+            logger.debug(f"✅ Horas extras confirmadas: {jornada.horas_regulares:.2f}h regulares")
             return jornada
         except Exception as e:
             db.rollback()
@@ -350,7 +353,7 @@ class JornadaLaboralService:
         # Limpiar jornadas muy antiguas (>24h)
         hace_24h = datetime.now() - timedelta(hours=24)
         if jornada.created < hace_24h:
-            print(f"⚠️ Jornada antigua ({jornada.id}), finalizando automáticamente")
+            logger.warning(f"⚠️ Jornada antigua ({jornada.id}), finalizando automáticamente")
             JornadaLaboralService._calcular_horas_trabajadas(jornada)
             jornada.hora_fin = datetime.now()
             jornada.estado = 'completada'
@@ -393,7 +396,7 @@ class JornadaLaboralService:
             
             return jornadas
         except Exception as e:
-            print(f"❌ Error: {str(e)}")
+            logger.error(f"❌ Error: {str(e)}")
             raise
     
     @staticmethod
@@ -486,8 +489,8 @@ class JornadaLaboralService:
             not jornada.limite_regular_alcanzado and
             not jornada.overtime_confirmado):
 
-            print(f"⏰ AUTO-PAUSA: Jornada {jornada.id} alcanzó {max_regular}h REALES trabajadas")
-            print(f"   (Tiempo total transcurrido: {jornada.total_horas:.2f}h incluye {jornada.tiempo_descanso}min descanso)")
+            logger.debug(f"⏰ AUTO-PAUSA: Jornada {jornada.id} alcanzó {max_regular}h REALES trabajadas")
+            logger.debug(f"   (Tiempo total transcurrido: {jornada.total_horas:.2f}h incluye {jornada.tiempo_descanso}min descanso)")
 
             jornada.estado = 'pausada'
             jornada.limite_regular_alcanzado = True
@@ -497,9 +500,9 @@ class JornadaLaboralService:
 
         # LÍMITE 2: Horas totales máximas alcanzadas (finalización automática)
         if jornada.total_horas >= max_total:
-            print(f"🛑 AUTO-FINALIZACIÓN: Jornada {jornada.id} alcanzó {max_total}h REALES trabajadas")
-            print(f"   Horas regulares: {jornada.horas_regulares:.2f}h")
-            print(f"   Horas extras: {jornada.horas_extras:.2f}h")
+            logger.debug(f"🛑 AUTO-FINALIZACIÓN: Jornada {jornada.id} alcanzó {max_total}h REALES trabajadas")
+            logger.debug(f"   Horas regulares: {jornada.horas_regulares:.2f}h")
+            logger.debug(f"   Horas extras: {jornada.horas_extras:.2f}h")
 
             jornada.hora_fin = datetime.now()
             jornada.estado = 'completada'
@@ -514,9 +517,9 @@ class JornadaLaboralService:
             try:
                 db.commit()
                 db.refresh(jornada)
-                print(f"✅ Estado actualizado automáticamente")
+                logger.debug(f"✅ Estado actualizado automáticamente")
             except Exception as e:
-                print(f"❌ Error actualizando estado: {str(e)}")
+                logger.error(f"❌ Error actualizando estado: {str(e)}")
                 db.rollback()
     
     @staticmethod
@@ -543,9 +546,9 @@ class JornadaLaboralService:
                 JornadaLaboralService.verificar_limites_automaticos(db, jornada)
                 jornadas_actualizadas.append(jornada)
             except Exception as e:
-                print(f"❌ Error actualizando jornada {jornada.id}: {str(e)}")
+                logger.error(f"❌ Error actualizando jornada {jornada.id}: {str(e)}")
         
-        print(f"🔄 Verificadas {len(jornadas_activas)} jornadas activas")
+        logger.debug(f"🔄 Verificadas {len(jornadas_activas)} jornadas activas")
         return jornadas_actualizadas
     
     # ============ MÉTODOS DE UTILIDAD ============
@@ -580,10 +583,10 @@ class JornadaLaboralService:
         tiempo_trabajado_ms = tiempo_total_ms - tiempo_descanso_ms
         tiempo_trabajado_horas = max(0, tiempo_trabajado_ms / (1000 * 60 * 60))
 
-        print(f"📊 Cálculo de horas:")
-        print(f"   Tiempo total transcurrido: {tiempo_total_ms / (1000 * 60 * 60):.2f}h")
-        print(f"   Descanso descontado: {tiempo_descanso_ms / (1000 * 60 * 60):.2f}h ({jornada.tiempo_descanso}min)")
-        print(f"   Tiempo trabajado REAL: {tiempo_trabajado_horas:.2f}h")
+        logger.debug(f"📊 Cálculo de horas:")
+        logger.debug(f"   Tiempo total transcurrido: {tiempo_total_ms / (1000 * 60 * 60):.2f}h")
+        logger.debug(f"   Descanso descontado: {tiempo_descanso_ms / (1000 * 60 * 60):.2f}h ({jornada.tiempo_descanso}min)")
+        logger.debug(f"   Tiempo trabajado REAL: {tiempo_trabajado_horas:.2f}h")
 
         # ✅ Distribuir entre regulares y extras según límites del día
         if tiempo_trabajado_horas <= max_regular:
@@ -597,10 +600,10 @@ class JornadaLaboralService:
 
         jornada.total_horas = jornada.horas_regulares + jornada.horas_extras
 
-        print(f"✅ Resultado final:")
-        print(f"   Horas regulares: {jornada.horas_regulares:.2f}h (límite: {max_regular}h)")
-        print(f"   Horas extras: {jornada.horas_extras:.2f}h")
-        print(f"   Total trabajado: {jornada.total_horas:.2f}h")
+        logger.debug(f"✅ Resultado final:")
+        logger.debug(f"   Horas regulares: {jornada.horas_regulares:.2f}h (límite: {max_regular}h)")
+        logger.debug(f"   Horas extras: {jornada.horas_extras:.2f}h")
+        logger.debug(f"   Total trabajado: {jornada.total_horas:.2f}h")
 
     @staticmethod
     def _calcular_horas_en_tiempo_real(jornada: JornadaLaboral) -> None:
@@ -1,25 +1,34 @@
 from sqlalchemy.orm import Session
 from app.db.models.mantenimiento import Mantenimiento
 from app.db.models.maquina import Maquina
-from app.schemas.schemas import MantenimientoCreate, MantenimientoSchema, MantenimientoOut
+from app.schemas.schemas import MantenimientoCreate, MantenimientoSchema, MantenimientoOut, PaginaOut
+from app.core.paginacion import ParametrosPagina, paginar
 from typing import List, Optional
 from fastapi import HTTPException
 
-def get_all_mantenimientos_paginated(db: Session, skip: int = 0, limit: int = 15) -> List[MantenimientoOut]:
-    mantenimientos = db.query(Mantenimiento).offset(skip).limit(limit).all()
-    return [MantenimientoOut(
-        id=m.id,
-        maquina_id=m.maquina_id,
-        tipo_mantenimiento=m.tipo_mantenimiento,
-        descripcion=m.descripcion,
-        fecha_mantenimiento=m.fecha_mantenimiento,
-        horas_maquina=m.horas_maquina,
-        costo=m.costo,
-        responsable=m.responsable,
-        observaciones=m.observaciones,
-        created=m.created,
-        updated=m.updated
-    ) for m in mantenimientos]
+def get_all_mantenimientos_paginated(db: Session, pagina: ParametrosPagina) -> PaginaOut[MantenimientoOut]:
+    """Mantenimientos paginados por keyset, los más recientes primero"""
+    return paginar(
+        db,
+        db.query(Mantenimiento),
+        Mantenimiento.id,
+        lambda m: MantenimientoOut(
+            id=m.id,
+            maquina_id=m.maquina_id,
+            tipo_mantenimiento=m.tipo_mantenimiento,
+            descripcion=m.descripcion,
+            fecha_mantenimiento=m.fecha_mantenimiento,
+            horas_maquina=m.horas_maquina,
+            costo=m.costo,
+            responsable=m.responsable,
+            observaciones=m.observaciones,
+            created=m.created,
+            updated=m.updated
+        ),
+        pagina,
+        columna_orden=Mantenimiento.fecha_mantenimiento,
+        descendente=True
+    )
 
 def get_mantenimientos(db: Session) -> List[MantenimientoOut]:
     mantenimientos = db.query(Mantenimiento).all()
@@ -10,8 +10,11 @@ import logging
 from app.db.models import Maquina, ReporteLaboral, Gasto, Arrendamiento, Mantenimiento
 from app.schemas.schemas import (
     MaquinaSchema, MaquinaCreate, MaquinaOut,
-    RegistroHorasMaquinaCreate, HistorialHorasOut
+    RegistroHorasMaquinaCreate, HistorialHorasOut, PaginaOut
 )
+from app.services.uso_maquina_service import registrar_uso_reporte
+from app.core.serializacion import filas_como_dicts
+from app.core.paginacion import ParametrosPagina, paginar
 
 logger = logging.getLogger(__name__)
 
@@ -19,11 +22,26 @@ logger = logging.getLogger(__name__)
 
 def get_maquinas(db: Session) -> List[MaquinaOut]:
     maquinas = db.query(Maquina).all()
-    print(f"🔍 DEBUG - get_maquinas:")
+    logger.debug(f"🔍 DEBUG - get_maquinas:")
     for m in maquinas:
-        print(f"   - Máquina ID {m.id} ({m.nombre}): horometro_inicial = {m.horometro_inicial}")
+        logger.debug(f"   - Máquina ID {m.id} ({m.nombre}): horometro_inicial = {m.horometro_inicial}")
     return [MaquinaOut.model_validate(m) for m in maquinas]
 
+# Columnas del listado, en el orden de los campos de MaquinaSchema
+COLUMNAS_MAQUINA = (
+    Maquina.id,
+    Maquina.nombre,
+    Maquina.estado,
+    Maquina.horas_uso,
+    Maquina.horas_maquina,
+    Maquina.horometro_inicial,
+    Maquina.proximo_mantenimiento,
+)
+
+def get_maquinas_filas(db: Session) -> List[dict]:
+    """Listado de máquinas por columnas, como dicts listos para FilasJSONResponse"""
+    return filas_como_dicts(db.query(*COLUMNAS_MAQUINA))
+
 def get_maquina(db: Session, maquina_id: int) -> Optional[MaquinaOut]:
     maquina = db.query(Maquina).filter(Maquina.id == maquina_id).first()
     return MaquinaOut.model_validate(maquina) if maquina else None
@@ -132,19 +150,11 @@ def delete_maquina(db: Session, maquina_id: int) -> bool:
         logger.error(f"Error inesperado al eliminar máquina {maquina_id}: {type(e).__name__} - {str(e)}")
         raise e
 
-def get_all_maquinas_paginated(db: Session, skip: int = 0, limit: int = 15):
+def get_all_maquinas_paginated(db: Session, pagina: ParametrosPagina) -> PaginaOut[MaquinaOut]:
     """
-    Obtener máquinas con paginación
+    Obtener máquinas con paginación por keyset (por id)
     """
-    maquinas = db.query(Maquina).offset(skip).limit(limit).all()
-    total = db.query(Maquina).count()
-    
-    return {
-        "items": [MaquinaOut.model_validate(m) for m in maquinas],
-        "total": total,
-        "skip": skip,
-        "limit": limit
-    }
+    return paginar(db, db.query(Maquina), Maquina.id, MaquinaOut.model_validate, pagina)
 
 # ========== HORAS DE USO ==========
 
@@ -182,6 +192,9 @@ def registrar_horas_maquina(
         maquina.horas_uso = 0
     maquina.horas_uso += registro.horas
 
+    db.flush()
+    registrar_uso_reporte(db, reporte)
+
     db.commit()
     db.refresh(reporte)
 
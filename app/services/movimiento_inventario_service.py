@@ -1,80 +1,260 @@
-from app.db.models import MovimientoInventario, Producto
-from app.schemas.schemas import MovimientoInventarioSchema, MovimientoInventarioCreate, MovimientoInventarioOut
+from app.db.models import MovimientoInventario, Producto, RegistroStock
+from app.schemas.schemas import (
+    MovimientoInventarioSchema, MovimientoInventarioCreate, MovimientoInventarioOut,
+    RegistroStockOut, StockPuntualOut
+)
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import update, insert, func
+from collections import defaultdict
+from typing import List, Optional, Dict
+from datetime import datetime
 
 # Servicio para operaciones de Movimiento de Inventario
+#
+# El stock se modifica siempre con UPDATE ... SET inventario = inventario + delta
+# (incremento atómico en SQL), nunca leyendo y escribiendo el valor desde Python,
+# y cada variación queda asentada en el libro de stock (registro_stock).
 
-def get_movimientos_inventario(db: Session) -> List[MovimientoInventarioOut]:
-    movimientos = db.query(MovimientoInventario).all()
-    return [MovimientoInventarioOut(
+def _delta_movimiento(tipo_transaccion: Optional[str], cantidad: Optional[int]) -> int:
+    if tipo_transaccion == "entrada":
+        return cantidad or 0
+    if tipo_transaccion == "salida":
+        return -(cantidad or 0)
+    return 0
+
+def _to_out(m: MovimientoInventario) -> MovimientoInventarioOut:
+    return MovimientoInventarioOut(
         id=m.id,
         producto_id=m.producto_id,
         usuario_id=m.usuario_id,
         cantidad=m.cantidad,
         fecha=m.fecha,
         tipo_transaccion=m.tipo_transaccion
-    ) for m in movimientos]
+    )
+
+def aplicar_delta_stock(db: Session, producto_id: int, delta: int) -> Optional[int]:
+    """
+    Incrementa atómicamente el inventario de un producto y devuelve el valor resultante.
+    Devuelve None si el producto no existe. No hace commit.
+    """
+    return db.execute(
+        update(Producto)
+        .where(Producto.id == producto_id)
+        .values(inventario=func.coalesce(Producto.inventario, 0) + delta)
+        .returning(Producto.inventario)
+    ).scalar()
+
+def registrar_variacion_stock(
+    db: Session,
+    producto_id: Optional[int],
+    delta: int,
+    motivo: str,
+    fecha: Optional[datetime] = None,
+    movimiento_id: Optional[int] = None
+) -> Optional[int]:
+    """
+    Aplica una variación de stock y la asienta en el libro. No hace commit.
+    Las correcciones de un movimiento se fechan en la fecha del movimiento, de modo
+    que el stock a una fecha refleje la historia corregida.
+    """
+    if producto_id is None or not delta:
+        return None
+
+    stock = aplicar_delta_stock(db, producto_id, delta)
+    if stock is None:
+        return None
+
+    db.add(RegistroStock(
+        producto_id=producto_id,
+        movimiento_id=movimiento_id,
+        delta=delta,
+        stock_resultante=stock,
+        motivo=motivo,
+        fecha=fecha or datetime.now()
+    ))
+    return stock
+
+def get_movimientos_inventario(db: Session) -> List[MovimientoInventarioOut]:
+    movimientos = db.query(MovimientoInventario).all()
+    return [_to_out(m) for m in movimientos]
 
 def get_movimiento_inventario(db: Session, movimiento_id: int) -> Optional[MovimientoInventarioOut]:
     m = db.query(MovimientoInventario).filter(MovimientoInventario.id == movimiento_id).first()
     if m:
-        return MovimientoInventarioOut(
-            id=m.id,
-            producto_id=m.producto_id,
-            usuario_id=m.usuario_id,
-            cantidad=m.cantidad,
-            fecha=m.fecha,
-            tipo_transaccion=m.tipo_transaccion
-        )
+        return _to_out(m)
     return None
 
 def create_movimiento_inventario(db: Session, movimiento: MovimientoInventarioCreate) -> MovimientoInventarioOut:
-    nuevo_movimiento = MovimientoInventario(**movimiento.model_dump())
-    db.add(nuevo_movimiento)
-    # Actualizar inventario del producto
-    producto = db.query(Producto).filter(Producto.id == movimiento.producto_id).first()
-    if producto:
-        if movimiento.tipo_transaccion == "entrada":
-            producto.inventario += movimiento.cantidad
-        elif movimiento.tipo_transaccion == "salida":
-            producto.inventario -= movimiento.cantidad
-    db.commit()
+    try:
+        nuevo_movimiento = MovimientoInventario(**movimiento.model_dump(exclude={"id"}))
+        db.add(nuevo_movimiento)
+        db.flush()
+        # Actualizar inventario del producto
+        registrar_variacion_stock(
+            db,
+            nuevo_movimiento.producto_id,
+            _delta_movimiento(nuevo_movimiento.tipo_transaccion, nuevo_movimiento.cantidad),
+            "movimiento",
+            nuevo_movimiento.fecha,
+            nuevo_movimiento.id
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     db.refresh(nuevo_movimiento)
-    return MovimientoInventarioOut(
-        id=nuevo_movimiento.id,
-        producto_id=nuevo_movimiento.producto_id,
-        usuario_id=nuevo_movimiento.usuario_id,
-        cantidad=nuevo_movimiento.cantidad,
-        fecha=nuevo_movimiento.fecha,
-        tipo_transaccion=nuevo_movimiento.tipo_transaccion
-    )
+    return _to_out(nuevo_movimiento)
+
+def create_movimientos_inventario_bulk(db: Session, movimientos: List[MovimientoInventarioCreate]) -> dict:
+    """
+    Registra un lote de movimientos en una sola transacción.
+    Se aplica un único UPDATE por producto (en orden de ID para evitar deadlocks
+    entre lotes concurrentes) y el libro de stock se inserta en bloque.
+    """
+    producto_ids = {m.producto_id for m in movimientos if m.producto_id is not None}
+    existentes = {pid for (pid,) in db.query(Producto.id).filter(Producto.id.in_(producto_ids)).all()}
+    faltantes = sorted(producto_ids - existentes)
+    if faltantes:
+        raise ValueError(f"Productos no encontrados: {', '.join(str(pid) for pid in faltantes)}")
+
+    try:
+        nuevos = [MovimientoInventario(**m.model_dump(exclude={"id"})) for m in movimientos]
+        db.add_all(nuevos)
+        db.flush()
+
+        deltas: Dict[int, int] = defaultdict(int)
+        for m in nuevos:
+            if m.producto_id is not None:
+                deltas[m.producto_id] += _delta_movimiento(m.tipo_transaccion, m.cantidad)
+
+        stock_final: Dict[int, int] = {}
+        for producto_id in sorted(deltas):
+            stock_final[producto_id] = aplicar_delta_stock(db, producto_id, deltas[producto_id])
+
+        # Reconstruir el stock resultante de cada movimiento dentro del lote
+        stock_corriente = {pid: stock_final[pid] - deltas[pid] for pid in stock_final}
+        registros = []
+        for m in nuevos:
+            delta = _delta_movimiento(m.tipo_transaccion, m.cantidad)
+            if m.producto_id is None or not delta:
+                continue
+            stock_corriente[m.producto_id] += delta
+            registros.append({
+                "producto_id": m.producto_id,
+                "movimiento_id": m.id,
+                "delta": delta,
+                "stock_resultante": stock_corriente[m.producto_id],
+                "motivo": "movimiento",
+                "fecha": m.fecha
+            })
+        if registros:
+            db.execute(insert(RegistroStock), registros)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {
+        "creados": len(nuevos),
+        "movimientos": [_to_out(m) for m in nuevos],
+        "stock_actual": stock_final
+    }
 
 def update_movimiento_inventario(db: Session, movimiento_id: int, movimiento: MovimientoInventarioSchema) -> Optional[MovimientoInventarioOut]:
-    existing_movimiento = db.query(MovimientoInventario).filter(MovimientoInventario.id == movimiento_id).first()
-    if existing_movimiento:
-        for field, value in movimiento.model_dump().items():
+    try:
+        # Bloquear el movimiento para que dos ediciones concurrentes no ajusten dos veces
+        existing_movimiento = db.query(MovimientoInventario).filter(
+            MovimientoInventario.id == movimiento_id
+        ).with_for_update().first()
+        if not existing_movimiento:
+            return None
+
+        producto_anterior = existing_movimiento.producto_id
+        fecha_anterior = existing_movimiento.fecha
+        delta_anterior = _delta_movimiento(existing_movimiento.tipo_transaccion, existing_movimiento.cantidad)
+
+        for field, value in movimiento.model_dump(exclude={"id"}).items():
             setattr(existing_movimiento, field, value)
+
+        producto_nuevo = existing_movimiento.producto_id
+        fecha_nueva = existing_movimiento.fecha
+        delta_nuevo = _delta_movimiento(existing_movimiento.tipo_transaccion, existing_movimiento.cantidad)
+
+        # Re-ajustar el stock con la diferencia entre el movimiento anterior y el nuevo.
+        # Si cambió el producto o la fecha, se revierte el anterior en su fecha y se
+        # aplica el nuevo en la suya: el stock a una fecha queda como si siempre
+        # hubiera sido el movimiento corregido
+        if producto_anterior == producto_nuevo and fecha_anterior == fecha_nueva:
+            ajustes = [(producto_nuevo, delta_nuevo - delta_anterior, fecha_nueva)]
+        else:
+            ajustes = [(producto_anterior, -delta_anterior, fecha_anterior), (producto_nuevo, delta_nuevo, fecha_nueva)]
+        for producto_id, delta, fecha in sorted(ajustes, key=lambda a: a[0] or 0):
+            registrar_variacion_stock(db, producto_id, delta, "ajuste_movimiento", fecha, existing_movimiento.id)
+
         db.commit()
-        db.refresh(existing_movimiento)
-        return MovimientoInventarioOut(
-            id=existing_movimiento.id,
-            producto_id=existing_movimiento.producto_id,
-            usuario_id=existing_movimiento.usuario_id,
-            cantidad=existing_movimiento.cantidad,
-            fecha=existing_movimiento.fecha,
-            tipo_transaccion=existing_movimiento.tipo_transaccion
-        )
-    return None
+    except Exception:
+        db.rollback()
+        raise
+    db.refresh(existing_movimiento)
+    return _to_out(existing_movimiento)
 
 def delete_movimiento_inventario(db: Session, movimiento_id: int) -> bool:
-    movimiento = db.query(MovimientoInventario).filter(MovimientoInventario.id == movimiento_id).first()
-    if movimiento:
+    try:
+        movimiento = db.query(MovimientoInventario).filter(
+            MovimientoInventario.id == movimiento_id
+        ).with_for_update().first()
+        if not movimiento:
+            return False
+
+        # Revertir el efecto del movimiento sobre el stock
+        registrar_variacion_stock(
+            db,
+            movimiento.producto_id,
+            -_delta_movimiento(movimiento.tipo_transaccion, movimiento.cantidad),
+            "reversion",
+            movimiento.fecha,
+            movimiento.id
+        )
+        db.flush()
         db.delete(movimiento)
         db.commit()
         return True
-    return False
+    except Exception:
+        db.rollback()
+        raise
 
 def get_all_movimientos_inventario_paginated(db: Session, skip: int = 0, limit: int = 15) -> List[MovimientoInventarioOut]:
     movimientos = db.query(MovimientoInventario).offset(skip).limit(limit).all()
-    return [MovimientoInventarioOut.model_validate(m) for m in movimientos]
\ No newline at end of file
+    return [MovimientoInventarioOut.model_validate(m) for m in movimientos]
+
+# ========== LIBRO DE STOCK ==========
+
+def get_stock_a_fecha(db: Session, producto_id: int, fecha: Optional[datetime] = None) -> Optional[StockPuntualOut]:
+    """
+    Stock de un producto a una fecha: suma de variaciones del libro hasta esa fecha
+    (usa el índice producto_id, fecha).
+    """
+    if not db.query(Producto.id).filter(Producto.id == producto_id).first():
+        return None
+
+    fecha = fecha or datetime.now()
+    stock = db.query(func.coalesce(func.sum(RegistroStock.delta), 0)).filter(
+        RegistroStock.producto_id == producto_id,
+        RegistroStock.fecha <= fecha
+    ).scalar()
+    return StockPuntualOut(producto_id=producto_id, fecha=fecha, stock=int(stock))
+
+def get_libro_stock(
+    db: Session,
+    producto_id: int,
+    fecha_desde: Optional[datetime] = None,
+    fecha_hasta: Optional[datetime] = None
+) -> List[RegistroStockOut]:
+    query = db.query(RegistroStock).filter(RegistroStock.producto_id == producto_id)
+    if fecha_desde:
+        query = query.filter(RegistroStock.fecha >= fecha_desde)
+    if fecha_hasta:
+        query = query.filter(RegistroStock.fecha <= fecha_hasta)
+    registros = query.order_by(RegistroStock.fecha, RegistroStock.id).all()
+    return [RegistroStockOut.model_validate(r) for r in registros]
@@ -0,0 +1,250 @@
+"""
+Catálogo de precios con vigencia: precio por m³ de cada tipo de árido y tarifa
+por hora de cada máquina (por nombre; "default" para las que no tienen tarifa
+propia). Es el precio de lista que se usa cuando la entrega o el reporte
+laboral no tienen precio_unitario/tarifa_hora propio.
+
+- Cada precio vale en [vigente_desde, vigente_hasta); un cambio de precio
+  registra un intervalo nuevo y cierra el anterior, así los reportes de
+  períodos pasados se siguen valorizando con el precio de ese momento.
+- Cada worker tiene el catálogo completo en memoria, con los intervalos de cada
+  clave ordenados: buscar un precio es una búsqueda binaria, sin consultas.
+- Un trigger incrementa precio_catalogo_version ante cualquier cambio
+  (migración 0022). Los workers consultan esa versión como mucho cada
+  PRECIOS_CATALOGO_CHECK_SECONDS y recargan el catálogo si cambió.
+- Si la base no responde se sigue con la última copia; si el worker todavía
+  no pudo cargarla nunca, las búsquedas lanzan CatalogoNoDisponible en lugar
+  de valorizar todo en 0.
+"""
+
+from bisect import bisect_right
+from datetime import date
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+import logging
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import engine
+from app.db.models import PrecioCatalogo, PrecioCatalogoVersion
+from app.schemas.schemas import PrecioCatalogoCreate, PrecioCatalogoOut
+
+logger = logging.getLogger(__name__)
+
+CATEGORIAS = ("arido", "maquina")
+
+# Tarifa de las máquinas sin precio propio en el catálogo
+CLAVE_DEFAULT = "default"
+
+
+class CatalogoNoDisponible(RuntimeError):
+    """El catálogo no se pudo cargar todavía: no hay precios con qué valorizar"""
+
+
+class _Intervalos:
+    """Precios de una clave ordenados por vigente_desde"""
+
+    __slots__ = ("desde", "hasta", "precios")
+
+    def __init__(self):
+        self.desde: List[date] = []
+        self.hasta: List[Optional[date]] = []
+        self.precios: List[float] = []
+
+    def precio(self, fecha: date) -> Optional[float]:
+        i = bisect_right(self.desde, fecha) - 1
+        if i < 0:
+            return None
+        hasta = self.hasta[i]
+        if hasta is not None and fecha >= hasta:
+            return None
+        return self.precios[i]
+
+
+class CatalogoPrecios:
+    """Copia en memoria del catálogo, validada por versión con un intervalo mínimo entre chequeos"""
+
+    def __init__(self, engine, intervalo: float):
+        self.engine = engine
+        self.intervalo = intervalo
+        self._lock = Lock()
+        self._version: Optional[int] = None
+        self._intervalos: Dict[Tuple[str, str], _Intervalos] = {}
+        self._proximo_chequeo = 0.0
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._version
+
+    def precio(self, categoria: str, clave: str, fecha: Optional[date] = None) -> Optional[float]:
+        """Precio vigente en `fecha` (por defecto hoy); None si la clave no tiene precio en esa fecha"""
+        self._actualizar()
+        intervalos = self._intervalos.get((categoria, clave))
+        if intervalos is None:
+            return None
+        return intervalos.precio(fecha or date.today())
+
+    def vigentes(self, categoria: str, fecha: Optional[date] = None) -> Dict[str, float]:
+        """Precios de todas las claves de una categoría vigentes en `fecha`"""
+        self._actualizar()
+        fecha = fecha or date.today()
+        precios = {}
+        for (categoria_clave, clave), intervalos in self._intervalos.items():
+            if categoria_clave != categoria:
+                continue
+            precio = intervalos.precio(fecha)
+            if precio is not None:
+                precios[clave] = precio
+        return precios
+
+    def invalidar(self):
+        """Fuerza el chequeo de versión en la próxima búsqueda"""
+        self._proximo_chequeo = 0.0
+
+    def _actualizar(self):
+        if time.monotonic() < self._proximo_chequeo:
+            return
+        # Un solo hilo recarga; los demás usan la copia actual mientras tanto,
+        # salvo en la primera carga, que esperan
+        if not self._lock.acquire(blocking=self._version is None):
+            return
+        try:
+            if time.monotonic() >= self._proximo_chequeo:
+                self._recargar_si_cambio()
+                self._proximo_chequeo = time.monotonic() + self.intervalo
+        finally:
+            self._lock.release()
+
+    def _recargar_si_cambio(self):
+        try:
+            with self.engine.connect() as connection:
+                version = connection.execute(
+                    select(PrecioCatalogoVersion.version).where(PrecioCatalogoVersion.id == 1)
+                ).scalar() or 0
+                if version == self._version:
+                    return
+                filas = connection.execute(
+                    select(
+                        PrecioCatalogo.categoria,
+                        PrecioCatalogo.clave,
+                        PrecioCatalogo.precio,
+                        PrecioCatalogo.vigente_desde,
+                        PrecioCatalogo.vigente_hasta
+                    ).order_by(PrecioCatalogo.categoria, PrecioCatalogo.clave, PrecioCatalogo.vigente_desde)
+                ).all()
+        except Exception as e:
+            if self._version is None:
+                # Sin copia cargada, un catálogo vacío daría precios en 0
+                raise CatalogoNoDisponible(f"No se pudo cargar el catálogo de precios: {e}") from e
+            # Se sigue con la última copia cargada; se reintenta en el próximo chequeo
+            logger.warning(f"⚠️  No se pudo leer el catálogo de precios: {e}")
+            return
+
+        intervalos: Dict[Tuple[str, str], _Intervalos] = {}
+        for categoria, clave, precio, desde, hasta in filas:
+            clave_intervalos = intervalos.get((categoria, clave))
+            if clave_intervalos is None:
+                clave_intervalos = intervalos[(categoria, clave)] = _Intervalos()
+            clave_intervalos.desde.append(desde)
+            clave_intervalos.hasta.append(hasta)
+            clave_intervalos.precios.append(float(precio))
+
+        self._intervalos = intervalos
+        self._version = version
+        logger.info(f"💲 Catálogo de precios v{version} cargado: {len(filas)} precios")
+
+
+catalogo_precios = CatalogoPrecios(engine, intervalo=settings.PRECIOS_CATALOGO_CHECK_SECONDS)
+
+
+def precio_arido(tipo_arido: str, fecha: Optional[date] = None) -> float:
+    """Precio por m³ de un tipo de árido en una fecha; 0 si no está en el catálogo"""
+    precio = catalogo_precios.precio("arido", tipo_arido, fecha)
+    return precio if precio is not None else 0.0
+
+
+def tarifa_maquina(maquina_nombre: str, fecha: Optional[date] = None) -> float:
+    """Tarifa por hora de una máquina en una fecha; si no tiene tarifa propia, la "default" """
+    tarifa = catalogo_precios.precio("maquina", maquina_nombre, fecha)
+    if tarifa is None:
+        tarifa = catalogo_precios.precio("maquina", CLAVE_DEFAULT, fecha)
+    return tarifa if tarifa is not None else 0.0
+
+
+def listar_precios(
+    db: Session,
+    categoria: Optional[str] = None,
+    clave: Optional[str] = None,
+    fecha: Optional[date] = None
+) -> List[PrecioCatalogoOut]:
+    """Intervalos del catálogo; con `fecha`, solo los vigentes en esa fecha"""
+    query = db.query(PrecioCatalogo)
+    if categoria:
+        query = query.filter(PrecioCatalogo.categoria == categoria)
+    if clave:
+        query = query.filter(PrecioCatalogo.clave == clave)
+    if fecha:
+        query = query.filter(
+            PrecioCatalogo.vigente_desde <= fecha,
+            (PrecioCatalogo.vigente_hasta.is_(None)) | (PrecioCatalogo.vigente_hasta > fecha)
+        )
+    precios = query.order_by(PrecioCatalogo.categoria, PrecioCatalogo.clave, PrecioCatalogo.vigente_desde).all()
+    return [PrecioCatalogoOut.model_validate(p) for p in precios]
+
+
+def registrar_precio(db: Session, data: PrecioCatalogoCreate) -> PrecioCatalogoOut:
+    """
+    Registra un precio vigente desde `vigente_desde` (por defecto hoy). Cierra el
+    intervalo que estaba vigente en esa fecha y, si hay un cambio ya programado
+    para más adelante, el nuevo precio vale hasta ese cambio. Si ya hay un precio
+    que empieza en la misma fecha, se reemplaza. Lanza ValueError si los datos
+    no son válidos.
+    """
+    if data.categoria not in CATEGORIAS:
+        raise ValueError(f"Categoría inválida: '{data.categoria}'. Válidas: {', '.join(CATEGORIAS)}")
+    clave = data.clave.strip()
+    if not clave:
+        raise ValueError("La clave del precio no puede estar vacía")
+    if data.precio <= 0:
+        raise ValueError("El precio debe ser mayor a 0")
+    if data.categoria == "arido" and clave == CLAVE_DEFAULT:
+        raise ValueError(f"'{CLAVE_DEFAULT}' solo se usa para la tarifa general de máquinas")
+    vigente_desde = data.vigente_desde or date.today()
+
+    try:
+        # Serializa los cambios del catálogo: dos altas simultáneas no pueden solaparse
+        db.query(PrecioCatalogoVersion).filter(PrecioCatalogoVersion.id == 1).with_for_update().one()
+
+        intervalos = db.query(PrecioCatalogo).filter(
+            PrecioCatalogo.categoria == data.categoria,
+            PrecioCatalogo.clave == clave
+        ).order_by(PrecioCatalogo.vigente_desde).all()
+
+        precio = next((p for p in intervalos if p.vigente_desde == vigente_desde), None)
+        if precio is not None:
+            precio.precio = data.precio
+        else:
+            anterior = next((p for p in reversed(intervalos) if p.vigente_desde < vigente_desde), None)
+            siguiente = next((p for p in intervalos if p.vigente_desde > vigente_desde), None)
+            if anterior is not None and (anterior.vigente_hasta is None or anterior.vigente_hasta > vigente_desde):
+                anterior.vigente_hasta = vigente_desde
+            precio = PrecioCatalogo(
+                categoria=data.categoria,
+                clave=clave,
+                precio=data.precio,
+                vigente_desde=vigente_desde,
+                vigente_hasta=siguiente.vigente_desde if siguiente else None
+            )
+            db.add(precio)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    db.refresh(precio)
+    catalogo_precios.invalidar()
+    logger.info(f"💲 Precio de {data.categoria} '{clave}': ${data.precio:,.2f} desde {vigente_desde}")
+    return PrecioCatalogoOut.model_validate(precio)
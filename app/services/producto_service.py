@@ -1,7 +1,11 @@
 from app.db.models import Producto
 from app.schemas.schemas import ProductoSchema, ProductoCreate, ProductoOut
 from sqlalchemy.orm import Session
+from app.services.movimiento_inventario_service import registrar_variacion_stock
+from app.core import imagenes
+from fastapi import BackgroundTasks
 from typing import List, Optional
+from datetime import datetime
 import os
 
 UPLOAD_DIR = "static/productos/"
@@ -9,75 +13,72 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 # Servicio para operaciones de Producto
 
-def get_productos(db: Session) -> List[ProductoOut]:
-    productos = db.query(Producto).all()
-    return [ProductoOut(
+def _producto_out(p: Producto) -> ProductoOut:
+    listos = imagenes.listos(imagenes.DIRECTORIO_PUBLICO, p.imagen_sha256)
+    return ProductoOut(
         id=p.id,
         nombre=p.nombre,
         codigo_producto=p.codigo_producto,
         inventario=p.inventario,
-        url_imagen=p.url_imagen
-    ) for p in productos]
+        url_imagen=p.url_imagen,
+        url_miniatura=imagenes.url_publica(p.imagen_sha256, imagenes.ANCHO_MINIATURA) if listos else None,
+        srcset_imagen=imagenes.srcset(p.imagen_sha256) if listos else None
+    )
+
+def _guardar_imagen(producto: Producto, codigo_producto: str, imagen, tareas: Optional[BackgroundTasks]):
+    """Guarda la imagen en static/productos y programa sus derivados para después de responder"""
+    filename = f"{codigo_producto}_{imagen.filename}"
+    file_path = os.path.join(UPLOAD_DIR, filename)
+    datos = imagen.file.read()
+    with open(file_path, "wb") as f:
+        f.write(datos)
+    producto.url_imagen = f"/static/productos/{filename}"
+    producto.imagen_sha256 = imagenes.sha256_bytes(datos)
+    if tareas is not None:
+        tareas.add_task(imagenes.generar_derivados, imagenes.DIRECTORIO_PUBLICO, datos, producto.imagen_sha256)
+
+def get_productos(db: Session) -> List[ProductoOut]:
+    productos = db.query(Producto).all()
+    return [_producto_out(p) for p in productos]
 
 def get_producto(db: Session, producto_id: int) -> Optional[ProductoOut]:
     p = db.query(Producto).filter(Producto.id == producto_id).first()
     if p:
-        return ProductoOut(
-            id=p.id,
-            nombre=p.nombre,
-            codigo_producto=p.codigo_producto,
-            inventario=p.inventario,
-            url_imagen=p.url_imagen
-        )
+        return _producto_out(p)
     return None
 
-def create_producto(db: Session, nombre: str, codigo_producto: str, inventario: int, imagen=None) -> ProductoOut:
-    if imagen:
-        filename = f"{codigo_producto}_{imagen.filename}"
-        file_path = os.path.join(UPLOAD_DIR, filename)
-        with open(file_path, "wb") as f:
-            f.write(imagen.file.read())
-        url_imagen = f"/static/productos/{filename}"
-    else:
-        url_imagen = None  # o '' si prefieres string vacío
+def create_producto(db: Session, nombre: str, codigo_producto: str, inventario: int, imagen=None, tareas: Optional[BackgroundTasks] = None) -> ProductoOut:
     nuevo_producto = Producto(
         nombre=nombre,
         codigo_producto=codigo_producto,
-        inventario=inventario,
-        url_imagen=url_imagen
+        inventario=0,
+        url_imagen=None
     )
+    if imagen:
+        _guardar_imagen(nuevo_producto, codigo_producto, imagen, tareas)
     db.add(nuevo_producto)
+    db.flush()
+    # El stock inicial entra por el libro de stock
+    registrar_variacion_stock(db, nuevo_producto.id, inventario or 0, "apertura", datetime.now())
     db.commit()
     db.refresh(nuevo_producto)
-    return ProductoOut(
-        id=nuevo_producto.id,
-        nombre=nuevo_producto.nombre,
-        codigo_producto=nuevo_producto.codigo_producto,
-        inventario=nuevo_producto.inventario,
-        url_imagen=nuevo_producto.url_imagen
-    )
+    return _producto_out(nuevo_producto)
 
-def update_producto(db: Session, producto_id: int, nombre: str, codigo_producto: str, inventario: int, imagen=None) -> Optional[ProductoOut]:
-    existing_producto = db.query(Producto).filter(Producto.id == producto_id).first()
+def update_producto(db: Session, producto_id: int, nombre: str, codigo_producto: str, inventario: int, imagen=None, tareas: Optional[BackgroundTasks] = None) -> Optional[ProductoOut]:
+    existing_producto = db.query(Producto).filter(Producto.id == producto_id).with_for_update().first()
     if existing_producto:
         existing_producto.nombre = nombre
         existing_producto.codigo_producto = codigo_producto
-        existing_producto.inventario = inventario
+        # El inventario editado a mano se asienta como ajuste en el libro de stock
+        ajuste = (inventario or 0) - (existing_producto.inventario or 0)
+        if ajuste:
+            db.flush()
+            registrar_variacion_stock(db, existing_producto.id, ajuste, "ajuste_manual", datetime.now())
         if imagen:
-            filename = f"{codigo_producto}_{imagen.filename}"
-            file_path = os.path.join(UPLOAD_DIR, filename)
-            with open(file_path, "wb") as f:
-                f.write(imagen.file.read())
-            existing_producto.url_imagen = f"/static/productos/{filename}"
+            _guardar_imagen(existing_producto, codigo_producto, imagen, tareas)
         db.commit()
         db.refresh(existing_producto)
-        return ProductoOut(
-            id=existing_producto.id,
-            nombre=existing_producto.nombre,
-            codigo_producto=existing_producto.codigo_producto,
-            inventario=existing_producto.inventario,
-            url_imagen=existing_producto.url_imagen
-        )
+        return _producto_out(existing_producto)
     return None
 
 def delete_producto(db: Session, producto_id: int) -> bool:
@@ -90,4 +91,24 @@ def delete_producto(db: Session, producto_id: int) -> bool:
 
 def get_all_productos_paginated(db: Session, skip: int = 0, limit: int = 15) -> List[ProductoOut]:
     productos = db.query(Producto).offset(skip).limit(limit).all()
-    return [ProductoOut.model_validate(p) for p in productos]
\ No newline at end of file
+    return [_producto_out(p) for p in productos]
+
+def url_imagen_producto(db: Session, producto_id: int, ancho: Optional[int] = None) -> Optional[str]:
+    """
+    URL en /static del derivado WebP que cubre `ancho`, o de la imagen original
+    si no hay derivados (sin Pillow o no es una imagen). None si no tiene imagen.
+    Los derivados que falten se generan acá (productos anteriores a los derivados).
+    """
+    p = db.query(Producto).filter(Producto.id == producto_id).first()
+    if not p or not p.url_imagen:
+        return None
+    ruta = p.url_imagen.lstrip("/")
+    if not os.path.isfile(ruta):
+        return None
+    if not p.imagen_sha256:
+        p.imagen_sha256 = imagenes.sha256_archivo(ruta)
+        db.commit()
+    if imagenes.listos(imagenes.DIRECTORIO_PUBLICO, p.imagen_sha256) or \
+            imagenes.generar_derivados_archivo(imagenes.DIRECTORIO_PUBLICO, ruta, p.imagen_sha256):
+        return imagenes.url_publica(p.imagen_sha256, imagenes.ancho_para(ancho))
+    return p.url_imagen
\ No newline at end of file
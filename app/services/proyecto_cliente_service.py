@@ -0,0 +1,178 @@
+"""
+Vistas de proyectos para el portal de clientes.
+
+Los agregados de horas por máquina y de áridos por tipo se calculan con dos
+consultas agrupadas por proyecto_id para todos los proyectos pedidos a la vez,
+y se cachean por proyecto en cada worker junto con la versión de
+proyecto_version con la que se calcularon. Los triggers de las migraciones
+0016 y 0030 incrementan esa versión ante cualquier cambio de horas o áridos y
+al renombrar una máquina, así que un listado con todos los snapshots vigentes
+es una sola consulta.
+"""
+
+from collections import defaultdict
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models import Proyecto, ProyectoVersion, ReporteLaboral, EntregaArido, Maquina
+from app.db.replica import solo_lectura
+from app.schemas.client_api import ClientProjectView, ClientMaquinaView, ClientAridoView
+
+logger = logging.getLogger(__name__)
+
+
+class _Agregados:
+    """Máquinas y áridos de un proyecto, con sus totales"""
+
+    __slots__ = ("maquinas", "total_horas", "aridos", "total_aridos")
+
+    def __init__(self):
+        self.maquinas: List[ClientMaquinaView] = []
+        self.total_horas = 0.0
+        self.aridos: List[ClientAridoView] = []
+        self.total_aridos = 0.0
+
+
+class SnapshotsProyecto:
+    """Cache en memoria de agregados por proyecto, validada por versión"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._snapshots: Dict[int, Tuple[int, _Agregados]] = {}
+
+    def obtener(self, proyecto_id: int, version: int) -> Optional[_Agregados]:
+        with self._lock:
+            snapshot = self._snapshots.get(proyecto_id)
+        if snapshot is not None and snapshot[0] == version:
+            return snapshot[1]
+        return None
+
+    def guardar(self, proyecto_id: int, version: int, agregados: _Agregados):
+        with self._lock:
+            self._snapshots[proyecto_id] = (version, agregados)
+
+    def invalidar(self, proyecto_id: Optional[int] = None):
+        with self._lock:
+            if proyecto_id is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(proyecto_id, None)
+
+    def conservar(self, proyecto_ids: Iterable[int]):
+        """Descarta snapshots de proyectos que ya no se listan (cerrados o eliminados)"""
+        vigentes = set(proyecto_ids)
+        with self._lock:
+            for proyecto_id in list(self._snapshots):
+                if proyecto_id not in vigentes:
+                    del self._snapshots[proyecto_id]
+
+
+snapshots_proyecto = SnapshotsProyecto()
+
+
+def _calcular_agregados(db: Session, proyecto_ids: List[int]) -> Dict[int, _Agregados]:
+    """Dos consultas agrupadas para todos los proyectos: horas por máquina y áridos por tipo"""
+    agregados: Dict[int, _Agregados] = defaultdict(_Agregados)
+
+    maquinas_data = db.query(
+        ReporteLaboral.proyecto_id,
+        Maquina.nombre,
+        func.sum(ReporteLaboral.horas_turno).label('horas_trabajadas')
+    ).join(
+        ReporteLaboral, ReporteLaboral.maquina_id == Maquina.id
+    ).filter(
+        ReporteLaboral.proyecto_id.in_(proyecto_ids)
+    ).group_by(
+        ReporteLaboral.proyecto_id, Maquina.id, Maquina.nombre
+    ).order_by(
+        ReporteLaboral.proyecto_id, Maquina.nombre
+    ).all()
+
+    for m in maquinas_data:
+        horas = float(m.horas_trabajadas or 0)
+        proyecto = agregados[m.proyecto_id]
+        proyecto.maquinas.append(ClientMaquinaView(nombre=m.nombre, horas_trabajadas=horas))
+        proyecto.total_horas += horas
+
+    aridos_data = db.query(
+        EntregaArido.proyecto_id,
+        EntregaArido.tipo_arido,
+        func.sum(EntregaArido.cantidad).label('cantidad'),
+        func.count(EntregaArido.id).label('cantidad_registros')
+    ).filter(
+        EntregaArido.proyecto_id.in_(proyecto_ids)
+    ).group_by(
+        EntregaArido.proyecto_id, EntregaArido.tipo_arido
+    ).order_by(
+        EntregaArido.proyecto_id, EntregaArido.tipo_arido
+    ).all()
+
+    for a in aridos_data:
+        cantidad = float(a.cantidad or 0)
+        proyecto = agregados[a.proyecto_id]
+        proyecto.aridos.append(ClientAridoView(
+            tipo=a.tipo_arido,
+            cantidad=cantidad,
+            unidad="m³",  # Unidad estándar (puede ajustarse según necesidad)
+            cantidad_registros=int(a.cantidad_registros)
+        ))
+        proyecto.total_aridos += cantidad
+
+    return {proyecto_id: agregados[proyecto_id] for proyecto_id in proyecto_ids}
+
+
+def _armar_vista(proyecto: Proyecto, agregados: _Agregados) -> ClientProjectView:
+    return ClientProjectView(
+        id=proyecto.id,
+        nombre=proyecto.nombre,
+        # Mapear estado booleano a texto legible
+        estado="EN PROGRESO" if proyecto.estado else "COMPLETADO",
+        descripcion=proyecto.descripcion or "",
+        fecha_inicio=proyecto.fecha_inicio.strftime("%Y-%m-%d") if proyecto.fecha_inicio else None,
+        ubicacion=proyecto.ubicacion or "",
+        maquinas_asignadas=agregados.maquinas,
+        total_horas_maquinas=agregados.total_horas,
+        aridos_utilizados=agregados.aridos,
+        total_aridos=agregados.total_aridos
+    )
+
+
+@solo_lectura
+def get_vistas_proyectos_cliente(db: Session, proyecto_id: Optional[int] = None) -> List[ClientProjectView]:
+    """
+    Vistas de los proyectos activos (o de uno solo) para el portal de clientes.
+    Una consulta trae proyectos y versiones; solo los proyectos con snapshot
+    vencido disparan las dos consultas agrupadas, acotadas a esos proyectos.
+    """
+    query = db.query(
+        Proyecto, func.coalesce(ProyectoVersion.version, 0)
+    ).outerjoin(
+        ProyectoVersion, ProyectoVersion.proyecto_id == Proyecto.id
+    ).filter(Proyecto.estado == True)
+    if proyecto_id is not None:
+        query = query.filter(Proyecto.id == proyecto_id)
+    proyectos = query.order_by(Proyecto.id).all()
+
+    agregados_por_proyecto: Dict[int, _Agregados] = {}
+    vencidos: Dict[int, int] = {}
+    for proyecto, version in proyectos:
+        agregados = snapshots_proyecto.obtener(proyecto.id, version)
+        if agregados is None:
+            vencidos[proyecto.id] = version
+        else:
+            agregados_por_proyecto[proyecto.id] = agregados
+
+    if vencidos:
+        logger.debug(f"Snapshots de portal recalculados: {len(vencidos)} de {len(proyectos)} proyectos")
+        for vencido_id, agregados in _calcular_agregados(db, list(vencidos)).items():
+            snapshots_proyecto.guardar(vencido_id, vencidos[vencido_id], agregados)
+            agregados_por_proyecto[vencido_id] = agregados
+
+    if proyecto_id is None:
+        snapshots_proyecto.conservar(agregados_por_proyecto)
+
+    return [_armar_vista(proyecto, agregados_por_proyecto[proyecto.id]) for proyecto, _ in proyectos]
@@ -9,6 +9,7 @@ from typing import List, Optional, Dict, Any
 from collections import defaultdict
 
 from app.db.models import Proyecto, ReporteLaboral, EntregaArido, ContratoArchivo, Maquina, Usuario
+from app.db.replica import solo_lectura
 from app.schemas.schemas import (
     ProyectoConDetallesResponse,
     MaquinaConHorasSchema,
@@ -201,6 +202,7 @@ def get_proyecto_con_detalles_optimizado(
         raise Exception(f"Error al obtener proyecto con detalles: {str(e)}")
 
 
+@solo_lectura
 def get_proyectos_con_detalles_optimizado(
     db: Session,
     solo_activos: bool = True
@@ -1,5 +1,6 @@
-from app.db.models import Proyecto, Contrato, ReporteLaboral, Maquina
-from app.schemas.schemas import ProyectoSchema, ProyectoCreate, ProyectoOut
+from app.db.models import Proyecto, Contrato, ReporteLaboral, Maquina, ProyectoArchivo
+from app.schemas.schemas import ProyectoSchema, ProyectoCreate, ProyectoOut, PaginaOut
+from app.core.paginacion import ParametrosPagina, paginar
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import SQLAlchemyError
 from typing import List, Optional
@@ -116,8 +117,14 @@ def update_proyecto(db: Session, proyecto_id: int, proyecto: ProyectoSchema) ->
         raise Exception(f"Error inesperado al actualizar proyecto: {str(e)}")
 
 def delete_proyecto(db: Session, proyecto_id: int) -> bool:
+    """
+    Lanza ValueError si el proyecto está en el archivo frío: borrarlo dejaría
+    sus archivos Parquet sin registro (hay que restaurarlo antes).
+    """
     proyecto = db.query(Proyecto).filter(Proyecto.id == proyecto_id).first()
     if proyecto:
+        if db.get(ProyectoArchivo, proyecto_id):
+            raise ValueError("El proyecto está archivado: hay que restaurarlo antes de eliminarlo")
         db.delete(proyecto)
         db.commit()
         return True
@@ -181,9 +188,8 @@ def get_aridos_by_proyecto(db: Session, proyecto_id: int):
 def get_cantidad_proyectos_activos(db: Session) -> int:
     return db.query(Proyecto).filter(Proyecto.estado == True).count()
 
-def get_all_proyectos_paginated(db: Session, skip: int = 0, limit: int = 15) -> List[ProyectoOut]:
-    proyectos = db.query(Proyecto).offset(skip).limit(limit).all()
-    return [ProyectoOut(
+def _proyecto_out(p: Proyecto) -> ProyectoOut:
+    return ProyectoOut(
         id=p.id,
         nombre=p.nombre,
         descripcion=p.descripcion,
@@ -195,4 +201,7 @@ def get_all_proyectos_paginated(db: Session, skip: int = 0, limit: int = 15) ->
         gerente=p.gerente,
         contrato_id=p.contrato_id,
         ubicacion=p.ubicacion
-    ) for p in proyectos]
\ No newline at end of file
+    )
+
+def get_all_proyectos_paginated(db: Session, pagina: ParametrosPagina) -> PaginaOut[ProyectoOut]:
+    return paginar(db, db.query(Proyecto), Proyecto.id, _proyecto_out, pagina)
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""
+Rentabilidad de la flota por máquina y por mes.
+
+El rollup rentabilidad_maquina_mensual junta por máquina y mes:
+- horas de reporte_laboral e importe facturable (horas_turno × tarifa_hora);
+- gastos con maquina_id, separando combustible de los demás;
+- costo de los mantenimientos.
+
+Lo mantienen triggers de la migración 0023 ante cualquier alta, baja o
+modificación, así que el listado de toda la flota es una sola consulta. Las
+horas sin tarifa_hora propia se valorizan al leer, con la tarifa del catálogo
+vigente el último día del mes. Las horas de proyectos en el archivo frío
+siguen contando (horas_archivadas). Los mantenimientos van al mes de
+fecha_local(fecha_mantenimiento), como en el cubo analítico.
+"""
+
+from calendar import monthrange
+from datetime import date
+from typing import Dict, List, Optional
+import logging
+
+from sqlalchemy import select, delete, union_all, literal, case, cast, func, and_, text, Numeric, Date
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.models import (
+    Maquina, ReporteLaboral, Gasto, Mantenimiento, RentabilidadMaquinaMensual, HorasArchivadas
+)
+from app.schemas.schemas import RentabilidadMaquinaOut, RentabilidadMaquinaMesOut
+from app.services.precio_catalogo_service import tarifa_maquina
+
+logger = logging.getLogger(__name__)
+
+TIPO_COMBUSTIBLE = "Combustible"
+
+_COLUMNAS = (
+    "horas", "horas_sin_tarifa", "importe_horas",
+    "gasto_combustible", "gasto_otros", "costo_mantenimiento"
+)
+
+
+def _primer_dia(fecha: date) -> date:
+    return fecha.replace(day=1)
+
+
+def _ultimo_dia(mes: date) -> date:
+    return mes.replace(day=monthrange(mes.year, mes.month)[1])
+
+
+def get_rentabilidad_flota(
+    db: Session,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    maquina_id: Optional[int] = None,
+    por_mes: bool = False
+) -> List[RentabilidadMaquinaOut]:
+    """
+    Rentabilidad de todas las máquinas (o de una) en los meses de [desde, hasta],
+    en una consulta sobre el rollup. Las máquinas sin movimientos salen en cero.
+    """
+    if desde and hasta and desde > hasta:
+        raise ValueError("La fecha de inicio debe ser anterior a la fecha de fin")
+
+    R = RentabilidadMaquinaMensual
+    condicion = R.maquina_id == Maquina.id
+    if desde:
+        condicion = and_(condicion, R.mes >= _primer_dia(desde))
+    if hasta:
+        condicion = and_(condicion, R.mes <= hasta)
+    query = select(Maquina.id, Maquina.nombre, R.mes, *(getattr(R, c) for c in _COLUMNAS)).outerjoin(R, condicion)
+    if maquina_id is not None:
+        query = query.where(Maquina.id == maquina_id)
+
+    maquinas: Dict[int, RentabilidadMaquinaOut] = {}
+    for fila in db.execute(query.order_by(Maquina.nombre, Maquina.id, R.mes)).mappings():
+        maquina = maquinas.get(fila["id"])
+        if maquina is None:
+            maquina = maquinas[fila["id"]] = RentabilidadMaquinaOut(
+                maquina_id=fila["id"],
+                maquina_nombre=fila["nombre"],
+                **{c: 0.0 for c in _COLUMNAS},
+                costo_total=0.0,
+                resultado=0.0
+            )
+        if fila["mes"] is None:
+            continue
+
+        horas_sin_tarifa = float(fila["horas_sin_tarifa"])
+        importe_horas = float(fila["importe_horas"])
+        if horas_sin_tarifa:
+            importe_horas += horas_sin_tarifa * tarifa_maquina(fila["nombre"], _ultimo_dia(fila["mes"]))
+        costo_total = float(fila["gasto_combustible"] + fila["gasto_otros"] + fila["costo_mantenimiento"])
+
+        maquina.horas += float(fila["horas"])
+        maquina.horas_sin_tarifa += horas_sin_tarifa
+        maquina.importe_horas += importe_horas
+        maquina.gasto_combustible += float(fila["gasto_combustible"])
+        maquina.gasto_otros += float(fila["gasto_otros"])
+        maquina.costo_mantenimiento += float(fila["costo_mantenimiento"])
+        maquina.costo_total += costo_total
+        if por_mes:
+            maquina.por_mes.append(RentabilidadMaquinaMesOut(
+                mes=fila["mes"],
+                horas=float(fila["horas"]),
+                importe_horas=round(importe_horas, 2),
+                gasto_combustible=float(fila["gasto_combustible"]),
+                gasto_otros=float(fila["gasto_otros"]),
+                costo_mantenimiento=float(fila["costo_mantenimiento"]),
+                costo_total=round(costo_total, 2),
+                resultado=round(importe_horas - costo_total, 2)
+            ))
+
+    for maquina in maquinas.values():
+        maquina.resultado = maquina.importe_horas - maquina.costo_total
+        maquina.margen_porcentaje = round(maquina.resultado / maquina.importe_horas * 100, 2) if maquina.importe_horas else None
+        maquina.costo_por_hora = round(maquina.costo_total / maquina.horas, 2) if maquina.horas else None
+        for campo in ("horas", "horas_sin_tarifa", "importe_horas", "gasto_combustible", "gasto_otros",
+                      "costo_mantenimiento", "costo_total", "resultado"):
+            setattr(maquina, campo, round(getattr(maquina, campo), 2))
+    return list(maquinas.values())
+
+
+def _movimientos(maquina_id: Optional[int]):
+    """Filas de reporte_laboral, gasto y mantenimiento con las columnas del rollup, por máquina y mes"""
+    cero = literal(0, Numeric)
+    horas = func.coalesce(ReporteLaboral.horas_turno, 0)
+    importe_gasto = func.round(cast(func.coalesce(Gasto.importe_total, 0), Numeric), 2)
+    es_combustible = Gasto.tipo == TIPO_COMBUSTIBLE
+
+    consultas = [
+        select(
+            ReporteLaboral.maquina_id.label("maquina_id"),
+            func.date_trunc("month", ReporteLaboral.fecha_asignacion).label("mes"),
+            horas.label("horas"),
+            case((ReporteLaboral.tarifa_hora.is_(None), horas), else_=0).label("horas_sin_tarifa"),
+            func.coalesce(func.round(cast(ReporteLaboral.horas_turno * ReporteLaboral.tarifa_hora, Numeric), 2), 0).label("importe_horas"),
+            cero.label("gasto_combustible"), cero.label("gasto_otros"), cero.label("costo_mantenimiento")
+        ).where(ReporteLaboral.maquina_id.isnot(None), ReporteLaboral.fecha_asignacion.isnot(None)),
+        select(
+            Gasto.maquina_id, func.date_trunc("month", Gasto.fecha), cero, cero, cero,
+            case((es_combustible, importe_gasto), else_=0),
+            case((es_combustible, 0), else_=importe_gasto),
+            cero
+        ).where(Gasto.maquina_id.isnot(None), Gasto.fecha.isnot(None)),
+        select(
+            Mantenimiento.maquina_id, func.date_trunc("month", func.fecha_local(Mantenimiento.fecha_mantenimiento)),
+            cero, cero, cero, cero, cero,
+            func.round(cast(func.coalesce(Mantenimiento.costo, 0), Numeric), 2)
+        ).where(Mantenimiento.maquina_id.isnot(None), Mantenimiento.fecha_mantenimiento.isnot(None)),
+        # Horas de proyectos archivados (ya no están en reporte_laboral); solo máquinas que existen
+        select(
+            HorasArchivadas.maquina_id, func.date_trunc("month", HorasArchivadas.fecha),
+            HorasArchivadas.horas, HorasArchivadas.horas_sin_tarifa, HorasArchivadas.importe_horas,
+            cero, cero, cero
+        ).where(
+            HorasArchivadas.fecha.isnot(None),
+            HorasArchivadas.maquina_id.in_(select(Maquina.id))
+        )
+    ]
+    if maquina_id is not None:
+        consultas[0] = consultas[0].where(ReporteLaboral.maquina_id == maquina_id)
+        consultas[1] = consultas[1].where(Gasto.maquina_id == maquina_id)
+        consultas[2] = consultas[2].where(Mantenimiento.maquina_id == maquina_id)
+        consultas[3] = consultas[3].where(HorasArchivadas.maquina_id == maquina_id)
+    return union_all(*consultas).subquery("movimientos")
+
+
+def recalcular_rollup(db: Session, maquina_id: Optional[int] = None) -> int:
+    """
+    Rearma el rollup desde reporte_laboral, gasto, mantenimiento y
+    horas_archivadas. No hace commit: el lock del rollup dura hasta el commit
+    del que llama. Devuelve la cantidad de filas del rollup.
+    """
+    R = RentabilidadMaquinaMensual
+    # Los triggers suman sobre el rollup: con el lock esperan a que termine la
+    # reconstrucción (y ella a las transacciones que ya sumaron), así ningún
+    # movimiento se pierde ni se cuenta dos veces
+    db.execute(text(f"LOCK TABLE {R.__tablename__} IN EXCLUSIVE MODE"))
+    borrar = delete(R)
+    if maquina_id is not None:
+        borrar = borrar.where(R.maquina_id == maquina_id)
+    db.execute(borrar)
+
+    movimientos = _movimientos(maquina_id)
+    agregado = select(
+        movimientos.c.maquina_id,
+        cast(movimientos.c.mes, Date),
+        *(func.sum(movimientos.c[c]) for c in _COLUMNAS)
+    ).group_by(movimientos.c.maquina_id, cast(movimientos.c.mes, Date))
+    db.execute(pg_insert(R).from_select(["maquina_id", "mes", *_COLUMNAS], agregado))
+
+    contar = select(func.count()).select_from(R)
+    if maquina_id is not None:
+        contar = contar.where(R.maquina_id == maquina_id)
+    return db.scalar(contar)
+
+
+def reconstruir_rentabilidad(db: Session, maquina_id: Optional[int] = None) -> dict:
+    """Reconstruye el rollup de rentabilidad (reparación) y hace commit"""
+    try:
+        filas = recalcular_rollup(db, maquina_id)
+        db.commit()
+        logger.info(f"Rollup de rentabilidad de máquinas reconstruido: {filas} filas")
+        return {"maquina_id": maquina_id, "filas": filas}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error reconstruyendo el rollup de rentabilidad: {str(e)}")
+        raise e
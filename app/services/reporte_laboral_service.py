@@ -1,64 +1,76 @@
 from app.db.models import ReporteLaboral, Maquina, HorometroHistorial
-from app.schemas.schemas import ReporteLaboralSchema, ReporteLaboralCreate, ReporteLaboralOut
+from app.schemas.schemas import ReporteLaboralSchema, ReporteLaboralCreate, ReporteLaboralOut, PaginaOut
+from app.core.paginacion import ParametrosPagina, paginar
+from app.services.uso_maquina_service import registrar_uso_reporte, recalcular_uso, recalcular_uso_cambio
+from app.core.serializacion import filas_como_columnas, filas_como_dicts
 from sqlalchemy.orm import Session
-from sqlalchemy import extract, func, and_
+from sqlalchemy import extract, func, and_, select
 from typing import List, Optional, Dict
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Servicio para operaciones de Reporte Laboral
 
+def _filtrar_reportes(query, filtros: Optional[Dict]):
+    """Aplica los filtros opcionales del listado a una query sobre ReporteLaboral"""
+    if not filtros:
+        return query
+
+    conditions = []
+
+    # Filtro por búsqueda en nombre de máquina: subconsulta sobre el índice
+    # trigram de maquina.nombre en lugar de un JOIN contra toda la tabla
+    if filtros.get('busqueda'):
+        busqueda = f"%{filtros['busqueda']}%"
+        conditions.append(ReporteLaboral.maquina_id.in_(
+            select(Maquina.id).where(Maquina.nombre.ilike(busqueda))
+        ))
+
+    # Filtro por máquina
+    if filtros.get('maquina_id'):
+        conditions.append(ReporteLaboral.maquina_id == int(filtros['maquina_id']))
+
+    # Filtro por proyecto
+    if filtros.get('proyecto_id'):
+        conditions.append(ReporteLaboral.proyecto_id == int(filtros['proyecto_id']))
+
+    # Filtro por usuario
+    if filtros.get('usuario_id'):
+        conditions.append(ReporteLaboral.usuario_id == int(filtros['usuario_id']))
+
+    # Filtro por fecha desde
+    if filtros.get('fecha_desde'):
+        try:
+            fecha_desde = datetime.strptime(filtros['fecha_desde'], '%Y-%m-%d').date()
+            conditions.append(ReporteLaboral.fecha_asignacion >= fecha_desde)
+        except ValueError:
+            pass
+
+    # Filtro por fecha hasta
+    if filtros.get('fecha_hasta'):
+        try:
+            fecha_hasta = datetime.strptime(filtros['fecha_hasta'], '%Y-%m-%d').date()
+            conditions.append(ReporteLaboral.fecha_asignacion <= fecha_hasta)
+        except ValueError:
+            pass
+
+    # Aplicar todas las condiciones
+    if conditions:
+        query = query.filter(and_(*conditions))
+    return query
+
 def get_reportes_laborales(db: Session, filtros: Optional[Dict] = None) -> List[ReporteLaboralOut]:
     """
     Obtiene reportes laborales con filtros opcionales
     """
-    query = db.query(ReporteLaboral)
-    
-    # Aplicar filtros si existen
-    if filtros:
-        conditions = []
-        
-        # Filtro por búsqueda en nombre de máquina
-        if filtros.get('busqueda'):
-            busqueda = f"%{filtros['busqueda']}%"
-            query = query.join(Maquina, ReporteLaboral.maquina_id == Maquina.id)
-            conditions.append(Maquina.nombre.ilike(busqueda))
-        
-        # Filtro por máquina
-        if filtros.get('maquina_id'):
-            conditions.append(ReporteLaboral.maquina_id == int(filtros['maquina_id']))
-        
-        # Filtro por proyecto
-        if filtros.get('proyecto_id'):
-            conditions.append(ReporteLaboral.proyecto_id == int(filtros['proyecto_id']))
-        
-        # Filtro por usuario
-        if filtros.get('usuario_id'):
-            conditions.append(ReporteLaboral.usuario_id == int(filtros['usuario_id']))
-        
-        # Filtro por fecha desde
-        if filtros.get('fecha_desde'):
-            try:
-                fecha_desde = datetime.strptime(filtros['fecha_desde'], '%Y-%m-%d').date()
-                conditions.append(ReporteLaboral.fecha_asignacion >= fecha_desde)
-            except ValueError:
-                pass
-        
-        # Filtro por fecha hasta
-        if filtros.get('fecha_hasta'):
-            try:
-                fecha_hasta = datetime.strptime(filtros['fecha_hasta'], '%Y-%m-%d').date()
-                conditions.append(ReporteLaboral.fecha_asignacion <= fecha_hasta)
-            except ValueError:
-                pass
-        
-        # Aplicar todas las condiciones
-        if conditions:
-            query = query.filter(and_(*conditions))
+    query = _filtrar_reportes(db.query(ReporteLaboral), filtros)
     
     # Ordenar por fecha descendente
     reportes = query.order_by(ReporteLaboral.fecha_asignacion.desc()).all()
     
-    print(f"✅ Backend - Reportes encontrados: {len(reportes)}")  # Debug
+    logger.debug(f"✅ Backend - Reportes encontrados: {len(reportes)}")
     
     return [ReporteLaboralOut(
         id=r.id,
@@ -70,6 +82,33 @@ def get_reportes_laborales(db: Session, filtros: Optional[Dict] = None) -> List[
         horometro_inicial=r.horometro_inicial
     ) for r in reportes]
 
+# Columnas del listado, en el orden de los campos de ReporteLaboralOut
+COLUMNAS_REPORTE_LABORAL = (
+    ReporteLaboral.maquina_id,
+    ReporteLaboral.usuario_id,
+    ReporteLaboral.proyecto_id,
+    ReporteLaboral.fecha_asignacion,
+    ReporteLaboral.horas_turno,
+    ReporteLaboral.tarifa_hora,
+    ReporteLaboral.horometro_inicial,
+    ReporteLaboral.pagado,
+    ReporteLaboral.id,
+)
+
+def get_reportes_laborales_filas(db: Session, filtros: Optional[Dict] = None, columnar: bool = False):
+    """
+    Igual que get_reportes_laborales pero consulta solo las columnas del listado y
+    devuelve dicts listos para FilasJSONResponse, sin construir modelos por fila.
+    Con columnar=True devuelve el formato columnar (ver app/core/serializacion.py).
+    """
+    query = _filtrar_reportes(db.query(*COLUMNAS_REPORTE_LABORAL), filtros)
+    query = query.order_by(ReporteLaboral.fecha_asignacion.desc())
+    if columnar:
+        return filas_como_columnas(query)
+    filas = filas_como_dicts(query)
+    logger.debug(f"✅ Backend - Reportes encontrados: {len(filas)}")
+    return filas
+
 
 def get_reporte_laboral(db: Session, reporte_id: int) -> Optional[ReporteLaboralOut]:
     r = db.query(ReporteLaboral).filter(ReporteLaboral.id == reporte_id).first()
@@ -92,9 +131,9 @@ def create_reporte_laboral(db: Session, reporte: ReporteLaboralCreate) -> Report
     db.add(nuevo_reporte)
     db.flush()  # Obtener el ID del reporte antes de commit
 
-    print(f"🔍 DEBUG - Reporte creado:")
-    print(f"   - maquina_id: {nuevo_reporte.maquina_id}")
-    print(f"   - horometro_inicial del reporte: {nuevo_reporte.horometro_inicial}")
+    logger.debug(f"🔍 DEBUG - Reporte creado:")
+    logger.debug(f"   - maquina_id: {nuevo_reporte.maquina_id}")
+    logger.debug(f"   - horometro_inicial del reporte: {nuevo_reporte.horometro_inicial}")
 
     # Si el reporte tiene un horometro_inicial, actualizar el de la máquina
     if nuevo_reporte.horometro_inicial is not None and nuevo_reporte.maquina_id:
@@ -104,15 +143,15 @@ def create_reporte_laboral(db: Session, reporte: ReporteLaboralCreate) -> Report
             valor_anterior = maquina.horometro_inicial
             valor_nuevo = nuevo_reporte.horometro_inicial
 
-            print(f"🔍 DEBUG - Actualizando máquina ID {maquina.id}:")
-            print(f"   - Valor anterior: {valor_anterior}")
-            print(f"   - Valor nuevo: {valor_nuevo}")
+            logger.debug(f"🔍 DEBUG - Actualizando máquina ID {maquina.id}:")
+            logger.debug(f"   - Valor anterior: {valor_anterior}")
+            logger.debug(f"   - Valor nuevo: {valor_nuevo}")
 
             # Solo actualizar si el valor cambió
             if valor_anterior != valor_nuevo:
                 # Actualizar el horometro_inicial de la máquina
                 maquina.horometro_inicial = valor_nuevo
-                print(f"✅ Horómetro actualizado de {valor_anterior} a {valor_nuevo}")
+                logger.debug(f"✅ Horómetro actualizado de {valor_anterior} a {valor_nuevo}")
 
                 # Registrar el cambio en el historial
                 historial = HorometroHistorial(
@@ -125,9 +164,12 @@ def create_reporte_laboral(db: Session, reporte: ReporteLaboralCreate) -> Report
                 )
                 db.add(historial)
             else:
-                print(f"⚠️  No se actualizó - valores iguales")
+                logger.debug(f"⚠️  No se actualizó - valores iguales")
     else:
-        print(f"⚠️  No se actualizó el horómetro - horometro_inicial es None o no hay maquina_id")
+        logger.debug(f"⚠️  No se actualizó el horómetro - horometro_inicial es None o no hay maquina_id")
+
+    # Sumar el reporte a los rollups de uso de la máquina
+    registrar_uso_reporte(db, nuevo_reporte)
 
     db.commit()
     db.refresh(nuevo_reporte)
@@ -146,8 +188,10 @@ def create_reporte_laboral(db: Session, reporte: ReporteLaboralCreate) -> Report
 def update_reporte_laboral(db: Session, reporte_id: int, reporte: ReporteLaboralSchema) -> Optional[ReporteLaboralOut]:
     existing_reporte = db.query(ReporteLaboral).filter(ReporteLaboral.id == reporte_id).first()
     if existing_reporte:
+        anterior = (existing_reporte.maquina_id, existing_reporte.fecha_asignacion)
         for field, value in reporte.model_dump().items():
             setattr(existing_reporte, field, value)
+        recalcular_uso_cambio(db, anterior, existing_reporte)
         db.commit()
         db.refresh(existing_reporte)
         return ReporteLaboralOut(
@@ -166,6 +210,7 @@ def delete_reporte_laboral(db: Session, reporte_id: int) -> bool:
     reporte = db.query(ReporteLaboral).filter(ReporteLaboral.id == reporte_id).first()
     if reporte:
         db.delete(reporte)
+        recalcular_uso(db, reporte.maquina_id, reporte.fecha_asignacion)
         db.commit()
         return True
     return False
@@ -181,14 +226,22 @@ def get_total_horas_mes_actual(db: Session) -> float:
     return float(total_horas) if total_horas else 0.0
 
 
-def get_all_reportes_laborales_paginated(db: Session, skip: int = 0, limit: int = 15) -> List[ReporteLaboralOut]:
-    reportes = db.query(ReporteLaboral).offset(skip).limit(limit).all()
-    return [ReporteLaboralOut(
-        id=r.id,
-        maquina_id=r.maquina_id,
-        usuario_id=r.usuario_id,
-        proyecto_id=r.proyecto_id,
-        fecha_asignacion=r.fecha_asignacion,
-        horas_turno=r.horas_turno,
-        horometro_inicial=r.horometro_inicial
-    ) for r in reportes]
\ No newline at end of file
+def get_all_reportes_laborales_paginated(db: Session, pagina: ParametrosPagina) -> PaginaOut[ReporteLaboralOut]:
+    """Reportes laborales paginados por keyset, los más recientes primero"""
+    return paginar(
+        db,
+        db.query(ReporteLaboral),
+        ReporteLaboral.id,
+        lambda r: ReporteLaboralOut(
+            id=r.id,
+            maquina_id=r.maquina_id,
+            usuario_id=r.usuario_id,
+            proyecto_id=r.proyecto_id,
+            fecha_asignacion=r.fecha_asignacion,
+            horas_turno=r.horas_turno,
+            horometro_inicial=r.horometro_inicial
+        ),
+        pagina,
+        columna_orden=ReporteLaboral.fecha_asignacion,
+        descendente=True
+    )
\ No newline at end of file
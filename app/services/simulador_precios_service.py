@@ -0,0 +1,287 @@
+"""
+Simulador de precios: cuánto se habría facturado en un período con otra lista
+de precios de áridos o de tarifas de máquinas, sin tocar los registros.
+
+- Las entregas y las horas del período se cargan una sola vez en arrays
+  columnares de NumPy: mes, tipo de árido / máquina, cantidad y precio actual.
+- El precio actual de cada fila es su precio_unitario / tarifa_hora o, si no
+  tiene, el del catálogo vigente ese día (como en create_reporte).
+- Cada escenario es una tabla de precios por tipo de árido y por máquina. Todos
+  los escenarios se evalúan juntos como una matriz escenarios × filas y se
+  totalizan por mes con un solo bincount.
+
+Solo lee (la réplica si está disponible): no modifica ni bloquea las filas como
+los endpoints actualizar-precio / actualizar-tarifa. Los proyectos en el
+archivo frío no se incluyen.
+"""
+
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+import time
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import EntregaArido, ReporteLaboral, Maquina
+from app.schemas.schemas import (
+    EscenarioPrecios,
+    SimulacionPreciosRequest,
+    SimulacionPreciosOut,
+    ResultadoEscenario,
+    ImporteMensualSimulado
+)
+from app.services.precio_catalogo_service import precio_arido, tarifa_maquina, CLAVE_DEFAULT
+
+logger = logging.getLogger(__name__)
+
+MAX_ESCENARIOS = 50
+MESES_POR_DEFECTO = 12
+
+# Celdas (escenarios × filas) evaluadas por bloque, para acotar la memoria
+_CELDAS_POR_BLOQUE = 2_000_000
+
+
+class _Columnas:
+    """Filas de áridos u horas en arrays columnares"""
+
+    __slots__ = ("claves", "clave", "mes", "cantidad", "precio", "informado")
+
+    def __init__(self, claves: np.ndarray, clave: np.ndarray, mes: np.ndarray,
+                 cantidad: np.ndarray, precio: np.ndarray, informado: np.ndarray):
+        self.claves = claves  # Tipo de árido o nombre de máquina de cada índice
+        self.clave = clave  # Índice en `claves` de cada fila
+        self.mes = mes  # Índice del mes de cada fila
+        self.cantidad = cantidad  # m³ u horas
+        self.precio = precio  # Precio actual: propio o del catálogo vigente ese día
+        self.informado = informado  # La fila tiene precio propio
+
+    def __len__(self) -> int:
+        return len(self.cantidad)
+
+
+class HistorialFacturable:
+    """Entregas y horas de un período, listas para evaluar escenarios"""
+
+    __slots__ = ("desde", "hasta", "meses", "aridos", "horas")
+
+    def __init__(self, desde: date, hasta: date, meses: List[str], aridos: _Columnas, horas: _Columnas):
+        self.desde = desde
+        self.hasta = hasta
+        self.meses = meses
+        self.aridos = aridos
+        self.horas = horas
+
+
+def _meses(desde: date, hasta: date) -> List[str]:
+    primero = desde.year * 12 + desde.month - 1
+    ultimo = hasta.year * 12 + hasta.month - 1
+    return [f"{m // 12}-{m % 12 + 1:02d}" for m in range(primero, ultimo + 1)]
+
+
+def _columnas(filas, desde: date, precio_lista: Callable[[str, date], float]) -> _Columnas:
+    """
+    Pasa filas (clave, fecha, cantidad, precio) a arrays. Las filas sin precio
+    propio se valorizan con el catálogo, una búsqueda por par (clave, día).
+    """
+    n = len(filas)
+    claves, clave = np.unique(np.array([f[0] or "" for f in filas], dtype=object), return_inverse=True)
+    clave = clave.astype(np.int64)
+    dias = np.fromiter((f[1].toordinal() for f in filas), np.int64, n)
+    mes = np.fromiter((f[1].year * 12 + f[1].month for f in filas), np.int64, n) - (desde.year * 12 + desde.month)
+    cantidad = np.fromiter((f[2] or 0.0 for f in filas), np.float64, n)
+    precio = np.fromiter((np.nan if f[3] is None else f[3] for f in filas), np.float64, n)
+    informado = ~np.isnan(precio)
+
+    sin_precio = ~informado
+    if sin_precio.any():
+        pares, inversa = np.unique((clave[sin_precio] << 32) | dias[sin_precio], return_inverse=True)
+        precios_lista = np.array([
+            precio_lista(claves[p >> 32], date.fromordinal(int(p & 0xFFFFFFFF))) for p in pares
+        ], dtype=np.float64)
+        precio[sin_precio] = precios_lista[inversa]
+
+    return _Columnas(claves, clave, mes, cantidad, precio, informado)
+
+
+def cargar_historial(
+    db: Session,
+    desde: date,
+    hasta: date,
+    proyectos_ids: Optional[List[int]] = None
+) -> HistorialFacturable:
+    """Carga las entregas y las horas de máquina de [desde, hasta] (días completos)"""
+    fin = hasta + timedelta(days=1)
+
+    query_aridos = select(
+        EntregaArido.tipo_arido, EntregaArido.fecha_entrega, EntregaArido.cantidad, EntregaArido.precio_unitario
+    ).where(EntregaArido.fecha_entrega >= desde, EntregaArido.fecha_entrega < fin)
+
+    # Las horas de máquinas que ya no existen no se facturan
+    query_horas = select(
+        Maquina.nombre, ReporteLaboral.fecha_asignacion, ReporteLaboral.horas_turno, ReporteLaboral.tarifa_hora
+    ).join(
+        Maquina, Maquina.id == ReporteLaboral.maquina_id
+    ).where(ReporteLaboral.fecha_asignacion >= desde, ReporteLaboral.fecha_asignacion < fin)
+
+    if proyectos_ids:
+        query_aridos = query_aridos.where(EntregaArido.proyecto_id.in_(proyectos_ids))
+        query_horas = query_horas.where(ReporteLaboral.proyecto_id.in_(proyectos_ids))
+
+    return HistorialFacturable(
+        desde, hasta, _meses(desde, hasta),
+        aridos=_columnas(db.execute(query_aridos).all(), desde, precio_arido),
+        horas=_columnas(db.execute(query_horas).all(), desde, tarifa_maquina)
+    )
+
+
+def _importes_por_mes(
+    columnas: _Columnas,
+    meses: int,
+    tablas: List[Dict[str, float]],
+    default: List[Optional[float]],
+    factores: List[float],
+    solo_sin_precio: List[bool]
+) -> np.ndarray:
+    """Importe por escenario y por mes (escenarios × meses)"""
+    cantidad_escenarios = len(tablas)
+    if len(columnas) == 0:
+        return np.zeros((cantidad_escenarios, meses))
+
+    # Precio propuesto por escenario y clave; NaN conserva el precio actual
+    propuestos = np.full((cantidad_escenarios, len(columnas.claves)), np.nan)
+    for s, tabla in enumerate(tablas):
+        for k, clave in enumerate(columnas.claves):
+            precio = tabla.get(clave, default[s])
+            if precio is not None:
+                propuestos[s, k] = precio
+    factores = np.asarray(factores, dtype=np.float64)[:, None]
+    respetar_informados = np.asarray(solo_sin_precio)[:, None]
+
+    importes = np.zeros(cantidad_escenarios * meses)
+    desplazamiento = (np.arange(cantidad_escenarios) * meses)[:, None]
+    bloque = max(1, _CELDAS_POR_BLOQUE // cantidad_escenarios)
+    for inicio in range(0, len(columnas), bloque):
+        fila = slice(inicio, inicio + bloque)
+        propuesto = propuestos[:, columnas.clave[fila]]
+        reemplazar = ~np.isnan(propuesto) & ~(respetar_informados & columnas.informado[fila])
+        precios = np.where(reemplazar, propuesto, columnas.precio[fila]) * factores
+        importes += np.bincount(
+            (desplazamiento + columnas.mes[fila]).ravel(),
+            weights=(precios * columnas.cantidad[fila]).ravel(),
+            minlength=cantidad_escenarios * meses
+        )
+    return importes.reshape(cantidad_escenarios, meses)
+
+
+def simular(
+    historial: HistorialFacturable,
+    escenarios: List[EscenarioPrecios]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Importes por mes de áridos y de horas: (actual_aridos, actual_horas,
+    escenarios_aridos, escenarios_horas); los actuales son vectores por mes y los
+    de escenarios, matrices escenarios × meses.
+    """
+    meses = len(historial.meses)
+    aridos, horas = historial.aridos, historial.horas
+    actual_aridos = np.bincount(aridos.mes, weights=aridos.precio * aridos.cantidad, minlength=meses)
+    actual_horas = np.bincount(horas.mes, weights=horas.precio * horas.cantidad, minlength=meses)
+
+    solo_sin_precio = [e.solo_sin_precio for e in escenarios]
+    escenarios_aridos = _importes_por_mes(
+        aridos, meses,
+        [e.precios_aridos for e in escenarios],
+        [None] * len(escenarios),
+        [e.factor_aridos for e in escenarios],
+        solo_sin_precio
+    )
+    escenarios_horas = _importes_por_mes(
+        horas, meses,
+        [e.tarifas_maquinas for e in escenarios],
+        [e.tarifas_maquinas.get(CLAVE_DEFAULT) for e in escenarios],
+        [e.factor_horas for e in escenarios],
+        solo_sin_precio
+    )
+    return actual_aridos, actual_horas, escenarios_aridos, escenarios_horas
+
+
+def _resultado(nombre: str, meses: List[str], aridos: np.ndarray, horas: np.ndarray, total_actual: float) -> ResultadoEscenario:
+    importe_aridos = float(aridos.sum())
+    importe_horas = float(horas.sum())
+    importe_total = importe_aridos + importe_horas
+    diferencia = importe_total - total_actual
+    return ResultadoEscenario(
+        nombre=nombre,
+        importe_aridos=round(importe_aridos, 2),
+        importe_horas=round(importe_horas, 2),
+        importe_total=round(importe_total, 2),
+        diferencia=round(diferencia, 2),
+        diferencia_porcentaje=round(diferencia / total_actual * 100, 2) if total_actual else None,
+        por_mes=[
+            ImporteMensualSimulado(
+                mes=mes,
+                importe_aridos=round(float(a), 2),
+                importe_horas=round(float(h), 2),
+                importe_total=round(float(a + h), 2)
+            )
+            for mes, a, h in zip(meses, aridos, horas)
+        ]
+    )
+
+
+def _validar(escenarios: List[EscenarioPrecios]):
+    if not escenarios:
+        raise ValueError("Debe indicar al menos un escenario")
+    if len(escenarios) > MAX_ESCENARIOS:
+        raise ValueError(f"Se pueden simular hasta {MAX_ESCENARIOS} escenarios por consulta")
+    for escenario in escenarios:
+        precios = list(escenario.precios_aridos.values()) + list(escenario.tarifas_maquinas.values())
+        if any(p <= 0 for p in precios):
+            raise ValueError(f"Escenario '{escenario.nombre}': los precios deben ser mayores a 0")
+        if escenario.factor_aridos <= 0 or escenario.factor_horas <= 0:
+            raise ValueError(f"Escenario '{escenario.nombre}': los factores deben ser mayores a 0")
+
+
+def simular_precios(db: Session, datos: SimulacionPreciosRequest) -> SimulacionPreciosOut:
+    """
+    Carga el período una vez y evalúa todos los escenarios. Por defecto, los
+    últimos 12 meses calendario hasta hoy. Lanza ValueError si los datos no son válidos.
+    """
+    _validar(datos.escenarios)
+    hasta = datos.hasta or date.today()
+    if datos.desde:
+        desde = datos.desde
+    else:
+        mes = hasta.year * 12 + hasta.month - MESES_POR_DEFECTO
+        desde = date(mes // 12, mes % 12 + 1, 1)
+    if desde > hasta:
+        raise ValueError("La fecha de inicio debe ser anterior a la fecha de fin")
+
+    inicio = time.perf_counter()
+    historial = cargar_historial(db, desde, hasta, datos.proyectos_ids)
+    carga = time.perf_counter() - inicio
+
+    actual_aridos, actual_horas, escenarios_aridos, escenarios_horas = simular(historial, datos.escenarios)
+    total_actual = float(actual_aridos.sum() + actual_horas.sum())
+    logger.info(
+        f"📈 Simulación de {len(datos.escenarios)} escenarios sobre {len(historial.aridos)} entregas y "
+        f"{len(historial.horas)} registros de horas ({desde} - {hasta}): carga {carga * 1000:.0f} ms, "
+        f"cálculo {(time.perf_counter() - inicio - carga) * 1000:.0f} ms"
+    )
+
+    return SimulacionPreciosOut(
+        desde=desde,
+        hasta=hasta,
+        proyectos_ids=datos.proyectos_ids,
+        total_aridos_m3=round(float(historial.aridos.cantidad.sum()), 2),
+        total_horas=round(float(historial.horas.cantidad.sum()), 2),
+        registros_aridos=len(historial.aridos),
+        registros_horas=len(historial.horas),
+        actual=_resultado("Precios actuales", historial.meses, actual_aridos, actual_horas, total_actual),
+        escenarios=[
+            _resultado(e.nombre, historial.meses, escenarios_aridos[s], escenarios_horas[s], total_actual)
+            for s, e in enumerate(datos.escenarios)
+        ]
+    )
@@ -0,0 +1,338 @@
+"""
+Subida de archivos de contrato de proyectos.
+
+Dos caminos, los dos sin I/O de disco en el event loop (app/core/subidas.py):
+
+- En el mismo request (campo `contrato` de POST/PUT /proyectos): el formulario
+  se lee de request.stream() y el archivo se escribe por bloques a un temporal,
+  con SHA-256 y límite de tamaño mientras llega.
+- Reanudable por partes, para conexiones inestables en obra:
+    POST   /proyectos/{id}/contrato/subidas            crea la subida (nombre, tipo, tamaño, sha256 opcional)
+    PATCH  /proyectos/{id}/contrato/subidas/{subida}   agrega el cuerpo del request en Upload-Offset
+    GET    /proyectos/{id}/contrato/subidas/{subida}   bytes recibidos, para reanudar
+    DELETE /proyectos/{id}/contrato/subidas/{subida}   cancela
+  Cada parte se recibe en su propio temporal, sin transacción abierta; después
+  se lockea la fila de subida_contrato (NOWAIT), se agrega la parte a
+  uploads/.tmp/{subida}.part si el offset sigue coincidiendo y se hace commit.
+  El estado está en la base, así que cualquier worker puede recibir la parte
+  siguiente.
+
+Al completarse, el contenido se deduplica por SHA-256 contra contrato_archivo:
+si ya hay un archivo idéntico en disco se reutiliza su ruta y el temporal se
+descarta; si no, se mueve con un rename atómico a uploads/contratos/{proyecto_id}/.
+El temporal se ubica recién después del commit (confirmar_contrato): si el
+commit falla no queda un archivo en uploads/contratos sin su fila.
+Si al crear la subida se informa el sha256 de un archivo que ya tiene el mismo
+proyecto, queda completa sin transferir nada (entre proyectos distintos hace
+falta enviar el contenido: conocer el hash no alcanza para reutilizar un archivo).
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+import logging
+import os
+import re
+import uuid
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core import subidas
+from app.core.config import settings
+from app.core.subidas import ArchivoDemasiadoGrande, ArchivoRecibido
+from app.db.models import ContratoArchivo, Proyecto, SubidaContrato
+from app.schemas.schemas import ContratoArchivoResponse, SubidaContratoCreate, SubidaContratoOut
+
+logger = logging.getLogger(__name__)
+
+DIRECTORIO_CONTRATOS = os.path.join("uploads", "contratos")
+
+TIPOS_PERMITIDOS = (
+    "application/pdf",
+    "application/msword",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "image/jpeg",
+    "image/png",
+    "image/jpg",
+)
+
+
+class ConflictoSubida(ValueError):
+    """Upload-Offset no coincide con lo recibido u otra parte se está recibiendo"""
+
+
+def _validar(tipo_archivo: Optional[str], tamaño: Optional[int] = None):
+    if tipo_archivo not in TIPOS_PERMITIDOS:
+        raise ValueError("Tipo de archivo no permitido")
+    if tamaño is not None and tamaño > settings.CONTRATO_MAX_BYTES:
+        raise ArchivoDemasiadoGrande(f"El archivo supera el máximo de {settings.CONTRATO_MAX_BYTES} bytes")
+
+
+def _extension(nombre_archivo: Optional[str]) -> str:
+    extension = os.path.splitext(nombre_archivo or "")[1].lower()
+    return extension if re.fullmatch(r"\.[a-z0-9]{1,8}", extension) else ""
+
+
+async def _archivo_identico(db: Session, sha256: str, proyecto_id: Optional[int] = None):
+    """(ruta, tamaño) de un contrato ya guardado con el mismo contenido, si sigue en disco"""
+    query = db.query(ContratoArchivo.ruta_archivo, ContratoArchivo.tamaño_archivo).filter(ContratoArchivo.sha256 == sha256)
+    if proyecto_id is not None:
+        query = query.filter(ContratoArchivo.proyecto_id == proyecto_id)
+    existente = query.order_by(ContratoArchivo.id.desc()).first()
+    if existente and await subidas.existe(existente.ruta_archivo):
+        return existente
+    return None
+
+
+def _nuevo_contrato(proyecto: Proyecto, nombre: str, tipo: str, ruta: str, sha256: str, tamaño: int) -> ContratoArchivo:
+    proyecto.contrato_file_path = ruta
+    return ContratoArchivo(
+        proyecto_id=proyecto.id,
+        nombre_archivo=nombre,
+        ruta_archivo=ruta,
+        tipo_archivo=tipo,
+        tamaño_archivo=tamaño,
+        sha256=sha256
+    )
+
+
+async def _registrar(
+    db: Session,
+    proyecto: Proyecto,
+    nombre: str,
+    tipo: str,
+    sha256: str,
+    tamaño: int
+) -> ContratoArchivo:
+    """
+    Agrega el ContratoArchivo a la sesión (sin commit), con la ruta de un archivo
+    idéntico ya guardado o la que va a tener el temporal en uploads/contratos.
+    """
+    existente = await _archivo_identico(db, sha256)
+    if existente:
+        ruta = existente.ruta_archivo
+    else:
+        ruta = os.path.join(DIRECTORIO_CONTRATOS, str(proyecto.id), f"contrato_{proyecto.id}_{sha256[:16]}{_extension(nombre)}")
+
+    contrato = _nuevo_contrato(proyecto, nombre, tipo, ruta, sha256, tamaño)
+    db.add(contrato)
+    return contrato
+
+
+async def _ubicar(temporal: str, ruta: str, proyecto_id: int):
+    """Después del commit: mueve el temporal a `ruta`, o lo descarta si ya hay un archivo idéntico ahí"""
+    if await subidas.existe(ruta):
+        await subidas.descartar(temporal)
+        logger.info(f"📎 Contrato del proyecto {proyecto_id} deduplicado: {ruta}")
+    else:
+        await subidas.mover_atomico(temporal, ruta)
+
+
+async def guardar_contrato(db: Session, proyecto: Proyecto, archivo: ArchivoRecibido) -> ContratoArchivo:
+    """
+    Agrega a la sesión el ContratoArchivo del contrato recibido en el mismo
+    request; el commit lo hace quien llama, junto con el proyecto, y después
+    llama a confirmar_contrato. Si algo falla, quien llama descarta el temporal.
+    """
+    _validar(archivo.tipo)
+    return await _registrar(db, proyecto, archivo.nombre, archivo.tipo, archivo.sha256, archivo.tamaño)
+
+
+async def confirmar_contrato(archivo: ArchivoRecibido, contrato: ContratoArchivo):
+    """Ubica el temporal del contrato en su ruta, una vez commiteado el ContratoArchivo"""
+    await _ubicar(archivo.temporal, contrato.ruta_archivo, contrato.proyecto_id)
+
+
+# ============= Subidas reanudables =============
+
+def _estado(subida: SubidaContrato, recibido: int) -> SubidaContratoOut:
+    return SubidaContratoOut(
+        id=subida.id,
+        proyecto_id=subida.proyecto_id,
+        nombre_archivo=subida.nombre_archivo,
+        tipo_archivo=subida.tipo_archivo,
+        tamaño_total=subida.tamaño_total,
+        recibido=recibido
+    )
+
+
+def _completa(contrato: ContratoArchivo, subida_id: Optional[str]) -> SubidaContratoOut:
+    return SubidaContratoOut(
+        id=subida_id,
+        proyecto_id=contrato.proyecto_id,
+        nombre_archivo=contrato.nombre_archivo,
+        tipo_archivo=contrato.tipo_archivo,
+        tamaño_total=contrato.tamaño_archivo,
+        recibido=contrato.tamaño_archivo,
+        completa=True,
+        contrato=ContratoArchivoResponse.model_validate(contrato)
+    )
+
+
+async def _purgar_vencidas(db: Session):
+    limite = datetime.now(timezone.utc) - timedelta(hours=settings.SUBIDA_VENCE_HORAS)
+    vencidas = db.query(SubidaContrato).filter(SubidaContrato.actualizado < limite).all()
+    for subida in vencidas:
+        await subidas.descartar(subidas.ruta_temporal(subida.id))
+        db.delete(subida)
+    if vencidas:
+        db.commit()
+        logger.info(f"🧹 {len(vencidas)} subidas de contratos vencidas descartadas")
+
+
+async def iniciar_subida(db: Session, proyecto_id: int, datos: SubidaContratoCreate) -> Optional[SubidaContratoOut]:
+    """Crea una subida reanudable; None si el proyecto no existe"""
+    proyecto = db.query(Proyecto).filter(Proyecto.id == proyecto_id).first()
+    if not proyecto:
+        return None
+    _validar(datos.tipo_archivo, datos.tamaño)
+    await _purgar_vencidas(db)
+
+    if datos.sha256:
+        existente = await _archivo_identico(db, datos.sha256, proyecto_id=proyecto_id)
+        if existente:
+            contrato = _nuevo_contrato(
+                proyecto, datos.nombre_archivo, datos.tipo_archivo,
+                existente.ruta_archivo, datos.sha256, existente.tamaño_archivo
+            )
+            db.add(contrato)
+            db.commit()
+            db.refresh(contrato)
+            logger.info(f"📎 Contrato del proyecto {proyecto_id} deduplicado sin transferir: {existente.ruta_archivo}")
+            return _completa(contrato, None)
+
+    subida = SubidaContrato(
+        id=uuid.uuid4().hex,
+        proyecto_id=proyecto_id,
+        nombre_archivo=datos.nombre_archivo,
+        tipo_archivo=datos.tipo_archivo,
+        tamaño_total=datos.tamaño,
+        recibido=0,
+        sha256_esperado=datos.sha256
+    )
+    db.add(subida)
+    db.commit()
+    await subidas.crear_vacio(subidas.ruta_temporal(subida.id))
+    return _estado(subida, 0)
+
+
+def _buscar(db: Session, proyecto_id: int, subida_id: str):
+    return db.query(SubidaContrato).filter(
+        SubidaContrato.id == subida_id,
+        SubidaContrato.proyecto_id == proyecto_id
+    )
+
+
+async def get_subida(db: Session, proyecto_id: int, subida_id: str) -> Optional[SubidaContratoOut]:
+    subida = _buscar(db, proyecto_id, subida_id).first()
+    if not subida:
+        return None
+    # Lo que hay en disco es la verdad: una parte cortada a mitad deja un prefijo válido
+    return _estado(subida, await subidas.tamaño_archivo(subidas.ruta_temporal(subida.id)))
+
+
+async def _agregar_parte(
+    db: Session,
+    proyecto_id: int,
+    subida_id: str,
+    offset: int,
+    parte: str
+) -> Optional[SubidaContrato]:
+    """
+    Lockea la subida y agrega el temporal `parte` a lo recibido si el offset
+    sigue coincidiendo. Deja la transacción abierta con el lock: commitea quien llama.
+    """
+    try:
+        subida = _buscar(db, proyecto_id, subida_id).with_for_update(nowait=True).first()
+    except OperationalError:
+        db.rollback()
+        raise ConflictoSubida("Otra parte de esta subida se está registrando")
+    if not subida:
+        db.rollback()
+        return None
+
+    temporal = subidas.ruta_temporal(subida.id)
+    recibido = await subidas.tamaño_archivo(temporal)
+    if offset != recibido:
+        db.rollback()
+        raise ConflictoSubida(f"Upload-Offset {offset} no coincide con los {recibido} bytes recibidos")
+    subida.recibido = recibido + await subidas.agregar_archivo(parte, temporal)
+    return subida
+
+
+async def recibir_parte(
+    db: Session,
+    proyecto_id: int,
+    subida_id: str,
+    offset: int,
+    bloques: AsyncIterator[bytes]
+) -> Optional[SubidaContratoOut]:
+    """
+    Agrega los bytes de `bloques` a la subida a partir de `offset`. Al completar
+    el tamaño declarado verifica el hash, deduplica y crea el ContratoArchivo.
+    None si la subida no existe.
+
+    La parte se recibe sin transacción abierta ni lock; la fila se lockea solo
+    para agregarla. Si otra parte con el mismo offset llegó antes, esta se
+    descarta con ConflictoSubida.
+    """
+    subida = _buscar(db, proyecto_id, subida_id).first()
+    if not subida:
+        return None
+    recibido = await subidas.tamaño_archivo(subidas.ruta_temporal(subida.id))
+    if offset != recibido:
+        raise ConflictoSubida(f"Upload-Offset {offset} no coincide con los {recibido} bytes recibidos")
+    maximo = min(subida.tamaño_total - recibido, settings.SUBIDA_PARTE_MAX_BYTES)
+    # No dejar la transacción abierta mientras llegan los bytes
+    db.rollback()
+
+    parte = subidas.ruta_temporal()
+    try:
+        try:
+            await subidas.escribir_bloques(bloques, parte, maximo)
+        except BaseException:
+            # Lo recibido es un prefijo válido: se agrega igual y el cliente reanuda desde GET
+            try:
+                if await _agregar_parte(db, proyecto_id, subida_id, offset, parte):
+                    db.commit()
+            except ConflictoSubida:
+                pass
+            raise
+        subida = await _agregar_parte(db, proyecto_id, subida_id, offset, parte)
+    finally:
+        await subidas.descartar(parte)
+    if subida is None:
+        return None
+
+    if subida.recibido < subida.tamaño_total:
+        db.commit()
+        return _estado(subida, subida.recibido)
+
+    # Completa: el lock se mantiene hasta el commit, así la completa un solo request
+    temporal = subidas.ruta_temporal(subida.id)
+    recibido = subida.recibido
+    sha256 = await subidas.sha256_archivo(temporal)
+    if subida.sha256_esperado and sha256 != subida.sha256_esperado:
+        db.delete(subida)
+        db.commit()
+        await subidas.descartar(temporal)
+        raise ValueError("El SHA-256 del archivo recibido no coincide con el informado; la subida se descartó")
+
+    proyecto = db.query(Proyecto).filter(Proyecto.id == proyecto_id).first()
+    contrato = await _registrar(db, proyecto, subida.nombre_archivo, subida.tipo_archivo, sha256, recibido)
+    db.delete(subida)
+    db.commit()
+    db.refresh(contrato)
+    await _ubicar(temporal, contrato.ruta_archivo, proyecto_id)
+    logger.info(f"📎 Contrato del proyecto {proyecto_id} recibido por partes ({recibido} bytes)")
+    return _completa(contrato, subida_id)
+
+
+async def cancelar_subida(db: Session, proyecto_id: int, subida_id: str) -> bool:
+    subida = _buscar(db, proyecto_id, subida_id).first()
+    if not subida:
+        return False
+    db.delete(subida)
+    db.commit()
+    await subidas.descartar(subidas.ruta_temporal(subida_id))
+    return True
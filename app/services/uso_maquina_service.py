@@ -0,0 +1,361 @@
+# app/services/uso_maquina_service.py
+"""
+Serie temporal de uso de máquinas.
+
+Mantiene los rollups diarios y semanales (uso_maquina_diario / uso_maquina_semanal)
+a partir de los reportes laborales:
+- Alta de reporte: incremento atómico con INSERT ... ON CONFLICT DO UPDATE
+- Modificación / baja: recálculo acotado al día y la semana afectados, que
+  suma también las horas de proyectos archivados (horas_archivadas)
+Ambos toman antes un advisory lock por máquina y semana: sin él, un recálculo
+concurrente con un alta todavía sin commit pisaría el incremento con una suma
+que no incluye el reporte nuevo.
+Los gráficos de uso consultan solo los rollups, sin recorrer reporte_laboral.
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, cast, literal, union_all, text, Date, DateTime
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import List, Optional, Tuple
+from datetime import date, datetime, timedelta
+import logging
+
+from app.db.models import ReporteLaboral, HorometroHistorial, UsoMaquinaDiario, UsoMaquinaSemanal, HorasArchivadas
+from app.schemas.schemas import UsoMaquinaPuntoOut, AnomaliaUsoMaquinaOut
+
+logger = logging.getLogger(__name__)
+
+GRANULARIDADES = ("dia", "semana")
+
+# Días sin actividad a partir de los cuales se informa un hueco en la serie
+DIAS_HUECO_POR_DEFECTO = 7
+
+# Horas máximas razonables para una máquina en un mismo día
+MAX_HORAS_DIA = 24
+
+# Primer entero de los advisory locks de los rollups; el segundo es hashtext(máquina:semana)
+ADVISORY_LOCK_USO_MAQUINA = 7_026_001
+
+
+def _a_fecha(valor) -> Optional[date]:
+    if valor is None:
+        return None
+    if isinstance(valor, datetime):
+        return valor.date()
+    return valor
+
+
+def _semana_inicio(fecha: date) -> date:
+    """Lunes de la semana a la que pertenece la fecha"""
+    return fecha - timedelta(days=fecha.weekday())
+
+
+def _bloquear_semana(db: Session, maquina_id: int, fecha: date) -> None:
+    """
+    Serializa hasta el commit las escrituras de los rollups de una máquina en la
+    semana de `fecha` (cubre también el día). Se toma antes de sumar o recalcular.
+    """
+    db.execute(
+        text("SELECT pg_advisory_xact_lock(:espacio, hashtext(:clave))"),
+        {"espacio": ADVISORY_LOCK_USO_MAQUINA, "clave": f"{maquina_id}:{_semana_inicio(fecha).isoformat()}"}
+    )
+
+
+def _upsert_incremental(db: Session, modelo, columna_fecha: str, constraint: str,
+                        maquina_id: int, fecha: date, horas: float, horometro: Optional[float]):
+    stmt = pg_insert(modelo).values(
+        maquina_id=maquina_id,
+        **{columna_fecha: fecha},
+        horas=horas,
+        registros=1,
+        horometro_min=horometro,
+        horometro_max=horometro
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint=constraint,
+        set_={
+            "horas": modelo.horas + stmt.excluded.horas,
+            "registros": modelo.registros + stmt.excluded.registros,
+            # LEAST/GREATEST ignoran NULL en PostgreSQL
+            "horometro_min": func.least(modelo.horometro_min, stmt.excluded.horometro_min),
+            "horometro_max": func.greatest(modelo.horometro_max, stmt.excluded.horometro_max),
+            "updated": func.now()
+        }
+    )
+    db.execute(stmt)
+
+
+def registrar_uso_reporte(db: Session, reporte: ReporteLaboral) -> None:
+    """
+    Suma un reporte laboral recién creado a los rollups diario y semanal.
+    No hace commit: se ejecuta dentro de la transacción del llamador.
+    """
+    fecha = _a_fecha(reporte.fecha_asignacion)
+    if reporte.maquina_id is None or fecha is None:
+        return
+
+    horas = float(reporte.horas_turno or 0)
+    _bloquear_semana(db, reporte.maquina_id, fecha)
+    _upsert_incremental(db, UsoMaquinaDiario, "fecha", "uq_uso_maquina_diario",
+                        reporte.maquina_id, fecha, horas, reporte.horometro_inicial)
+    _upsert_incremental(db, UsoMaquinaSemanal, "semana_inicio", "uq_uso_maquina_semanal",
+                        reporte.maquina_id, _semana_inicio(fecha), horas, reporte.horometro_inicial)
+
+
+def _recalcular_bucket(db: Session, modelo, columna_fecha: str, constraint: str,
+                       maquina_id: int, inicio: date, dias: int) -> None:
+    fin = inicio + timedelta(days=dias)
+    agregado = db.query(
+        func.coalesce(func.sum(ReporteLaboral.horas_turno), 0),
+        func.count(ReporteLaboral.id),
+        func.min(ReporteLaboral.horometro_inicial),
+        func.max(ReporteLaboral.horometro_inicial)
+    ).filter(
+        ReporteLaboral.maquina_id == maquina_id,
+        ReporteLaboral.fecha_asignacion >= inicio,
+        ReporteLaboral.fecha_asignacion < fin
+    ).one()
+    # Los rollups conservan las horas archivadas: recalcular sin ellas las perdería
+    archivado = db.query(
+        func.coalesce(func.sum(HorasArchivadas.horas), 0),
+        func.coalesce(func.sum(HorasArchivadas.registros), 0),
+        func.min(HorasArchivadas.horometro_min),
+        func.max(HorasArchivadas.horometro_max)
+    ).filter(
+        HorasArchivadas.maquina_id == maquina_id,
+        HorasArchivadas.fecha >= inicio,
+        HorasArchivadas.fecha < fin
+    ).one()
+    horas = float(agregado[0]) + float(archivado[0])
+    registros = int(agregado[1]) + int(archivado[1])
+    horometro_min = min((v for v in (agregado[2], archivado[2]) if v is not None), default=None)
+    horometro_max = max((v for v in (agregado[3], archivado[3]) if v is not None), default=None)
+
+    if not registros:
+        db.query(modelo).filter(
+            modelo.maquina_id == maquina_id,
+            getattr(modelo, columna_fecha) == inicio
+        ).delete(synchronize_session=False)
+        return
+
+    valores = {
+        "horas": horas,
+        "registros": registros,
+        "horometro_min": horometro_min,
+        "horometro_max": horometro_max
+    }
+    stmt = pg_insert(modelo).values(maquina_id=maquina_id, **{columna_fecha: inicio}, **valores)
+    stmt = stmt.on_conflict_do_update(constraint=constraint, set_={**valores, "updated": func.now()})
+    db.execute(stmt)
+
+
+def recalcular_uso(db: Session, maquina_id: Optional[int], fecha_asignacion) -> None:
+    """
+    Recalcula el día y la semana de una máquina desde reporte_laboral.
+    Se usa tras modificar o eliminar un reporte, cuando un decremento no alcanza
+    (por ejemplo, para el mínimo y máximo del horómetro). No hace commit.
+    """
+    fecha = _a_fecha(fecha_asignacion)
+    if maquina_id is None or fecha is None:
+        return
+
+    db.flush()
+    # El lock va antes de las sumas: así ven las altas que se confirmaron mientras esperaba
+    _bloquear_semana(db, maquina_id, fecha)
+    _recalcular_bucket(db, UsoMaquinaDiario, "fecha", "uq_uso_maquina_diario", maquina_id, fecha, 1)
+    _recalcular_bucket(db, UsoMaquinaSemanal, "semana_inicio", "uq_uso_maquina_semanal",
+                       maquina_id, _semana_inicio(fecha), 7)
+
+
+def recalcular_uso_cambio(db: Session, anterior: Tuple[Optional[int], object], reporte: ReporteLaboral) -> None:
+    """Recalcula el período anterior y el nuevo de un reporte modificado"""
+    # Las dos semanas se bloquean en orden fijo para no cruzarse con otra edición inversa
+    semanas = {
+        (maquina_id, _semana_inicio(fecha))
+        for maquina_id, fecha in ((anterior[0], _a_fecha(anterior[1])),
+                                  (reporte.maquina_id, _a_fecha(reporte.fecha_asignacion)))
+        if maquina_id is not None and fecha is not None
+    }
+    db.flush()
+    for maquina_id, semana in sorted(semanas):
+        _bloquear_semana(db, maquina_id, semana)
+    recalcular_uso(db, anterior[0], anterior[1])
+    if (reporte.maquina_id, _a_fecha(reporte.fecha_asignacion)) != (anterior[0], _a_fecha(anterior[1])):
+        recalcular_uso(db, reporte.maquina_id, reporte.fecha_asignacion)
+
+
+def get_uso_maquina(
+    db: Session,
+    maquina_id: int,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    granularidad: str = "dia"
+) -> List[UsoMaquinaPuntoOut]:
+    """
+    Serie de uso de una máquina en el rango pedido, leída solo de los rollups
+    """
+    if granularidad not in GRANULARIDADES:
+        raise ValueError(f"Granularidad inválida: {granularidad}. Valores permitidos: {', '.join(GRANULARIDADES)}")
+
+    if granularidad == "dia":
+        modelo, columna = UsoMaquinaDiario, UsoMaquinaDiario.fecha
+    else:
+        modelo, columna = UsoMaquinaSemanal, UsoMaquinaSemanal.semana_inicio
+        if fecha_desde:
+            fecha_desde = _semana_inicio(fecha_desde)
+
+    query = db.query(
+        columna, modelo.horas, modelo.registros, modelo.horometro_min, modelo.horometro_max
+    ).filter(modelo.maquina_id == maquina_id)
+    if fecha_desde:
+        query = query.filter(columna >= fecha_desde)
+    if fecha_hasta:
+        query = query.filter(columna <= fecha_hasta)
+
+    return [
+        UsoMaquinaPuntoOut(
+            fecha=fila[0],
+            horas=float(fila[1] or 0),
+            registros=int(fila[2] or 0),
+            horometro_min=fila[3],
+            horometro_max=fila[4]
+        )
+        for fila in query.order_by(columna).all()
+    ]
+
+
+def detectar_anomalias(
+    db: Session,
+    maquina_id: int,
+    fecha_desde: Optional[date] = None,
+    fecha_hasta: Optional[date] = None,
+    dias_hueco: int = DIAS_HUECO_POR_DEFECTO
+) -> List[AnomaliaUsoMaquinaOut]:
+    """
+    Detecta anomalías en la serie de uso de una máquina:
+    - horometro_retroceso: una lectura menor que la anterior (historial o entre días)
+    - hueco: más de `dias_hueco` días sin actividad entre dos días con uso
+    - exceso_horas: más de 24 horas reportadas en un mismo día
+    """
+    anomalias: List[AnomaliaUsoMaquinaOut] = []
+
+    # 1. Retrocesos registrados en el historial de horómetro (reportes y ajustes manuales)
+    query_historial = db.query(HorometroHistorial).filter(
+        HorometroHistorial.maquina_id == maquina_id,
+        HorometroHistorial.valor_nuevo < HorometroHistorial.valor_anterior
+    )
+    if fecha_desde:
+        query_historial = query_historial.filter(HorometroHistorial.created >= fecha_desde)
+    if fecha_hasta:
+        query_historial = query_historial.filter(HorometroHistorial.created < fecha_hasta + timedelta(days=1))
+
+    for h in query_historial.order_by(HorometroHistorial.created).all():
+        anomalias.append(AnomaliaUsoMaquinaOut(
+            tipo="horometro_retroceso",
+            fecha=_a_fecha(h.created),
+            detalle=f"Horómetro pasó de {h.valor_anterior} a {h.valor_nuevo} ({h.motivo})",
+            valor_anterior=h.valor_anterior,
+            valor_nuevo=h.valor_nuevo
+        ))
+
+    # 2. Recorrido de la serie diaria
+    serie = get_uso_maquina(db, maquina_id, fecha_desde, fecha_hasta, "dia")
+    previo = None
+    for punto in serie:
+        if punto.horas > MAX_HORAS_DIA:
+            anomalias.append(AnomaliaUsoMaquinaOut(
+                tipo="exceso_horas",
+                fecha=punto.fecha,
+                detalle=f"{punto.horas} horas reportadas en un mismo día",
+                valor_nuevo=punto.horas
+            ))
+
+        if previo is not None:
+            dias = (punto.fecha - previo.fecha).days
+            if dias > dias_hueco:
+                anomalias.append(AnomaliaUsoMaquinaOut(
+                    tipo="hueco",
+                    fecha=previo.fecha,
+                    detalle=f"{dias - 1} días sin actividad hasta {punto.fecha.isoformat()}",
+                    dias=dias - 1
+                ))
+            if (previo.horometro_max is not None and punto.horometro_min is not None
+                    and punto.horometro_min < previo.horometro_max):
+                anomalias.append(AnomaliaUsoMaquinaOut(
+                    tipo="horometro_retroceso",
+                    fecha=punto.fecha,
+                    detalle=f"Lectura {punto.horometro_min} menor a la del {previo.fecha.isoformat()} ({previo.horometro_max})",
+                    valor_anterior=previo.horometro_max,
+                    valor_nuevo=punto.horometro_min
+                ))
+        previo = punto
+
+    anomalias.sort(key=lambda a: a.fecha)
+    return anomalias
+
+
+def reconstruir_rollups(db: Session, maquina_id: Optional[int] = None) -> dict:
+    """
+    Reconstruye los rollups completos desde reporte_laboral y horas_archivadas
+    (backfill o reparación).
+    """
+    try:
+        for modelo in (UsoMaquinaDiario, UsoMaquinaSemanal):
+            query = db.query(modelo)
+            if maquina_id is not None:
+                query = query.filter(modelo.maquina_id == maquina_id)
+            query.delete(synchronize_session=False)
+
+        filas = [
+            select(
+                ReporteLaboral.maquina_id.label("maquina_id"),
+                cast(ReporteLaboral.fecha_asignacion, Date).label("fecha"),
+                func.coalesce(ReporteLaboral.horas_turno, 0).label("horas"),
+                literal(1).label("registros"),
+                ReporteLaboral.horometro_inicial.label("horometro_min"),
+                ReporteLaboral.horometro_inicial.label("horometro_max")
+            ).where(ReporteLaboral.maquina_id.isnot(None), ReporteLaboral.fecha_asignacion.isnot(None)),
+            # Horas de proyectos archivados, ya agregadas por día
+            select(
+                HorasArchivadas.maquina_id, HorasArchivadas.fecha, HorasArchivadas.horas,
+                HorasArchivadas.registros, HorasArchivadas.horometro_min, HorasArchivadas.horometro_max
+            ).where(HorasArchivadas.fecha.isnot(None))
+        ]
+        if maquina_id is not None:
+            filas[0] = filas[0].where(ReporteLaboral.maquina_id == maquina_id)
+            filas[1] = filas[1].where(HorasArchivadas.maquina_id == maquina_id)
+        fuente = union_all(*filas).subquery("uso")
+
+        dia = fuente.c.fecha
+        semana = func.date(func.date_trunc('week', cast(fuente.c.fecha, DateTime)))
+        totales = {}
+
+        for modelo, columna_fecha, bucket in (
+            (UsoMaquinaDiario, "fecha", dia),
+            (UsoMaquinaSemanal, "semana_inicio", semana)
+        ):
+            agregado = select(
+                fuente.c.maquina_id,
+                bucket,
+                func.sum(fuente.c.horas),
+                func.sum(fuente.c.registros),
+                func.min(fuente.c.horometro_min),
+                func.max(fuente.c.horometro_max)
+            ).group_by(fuente.c.maquina_id, bucket)
+
+            resultado = db.execute(
+                pg_insert(modelo).from_select(
+                    ["maquina_id", columna_fecha, "horas", "registros", "horometro_min", "horometro_max"],
+                    agregado
+                )
+            )
+            totales[modelo.__tablename__] = resultado.rowcount
+
+        db.commit()
+        logger.info(f"Rollups de uso reconstruidos: {totales}")
+        return {"maquina_id": maquina_id, "filas": totales}
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error reconstruyendo rollups de uso: {str(e)}")
+        raise e
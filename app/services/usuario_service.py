@@ -1,5 +1,6 @@
 from app.db.models import Usuario
-from app.schemas.schemas import UsuarioSchema, UsuarioOut, UsuarioCreate
+from app.schemas.schemas import UsuarioSchema, UsuarioOut, UsuarioCreate, PaginaOut
+from app.core.paginacion import ParametrosPagina, paginar
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from passlib.context import CryptContext
@@ -101,6 +102,5 @@ def get_usuario_by_email(db: Session, email: str) -> Optional[UsuarioOut]:
     print(f"Usuario con email {email} no encontrado.")
     return None
 
-def get_all_usuarios_paginated(db: Session, skip: int = 0, limit: int = 15) -> List[UsuarioOut]:
-    usuarios = db.query(Usuario).offset(skip).limit(limit).all()
-    return [UsuarioOut.model_validate(u) for u in usuarios]
\ No newline at end of file
+def get_all_usuarios_paginated(db: Session, pagina: ParametrosPagina) -> PaginaOut[UsuarioOut]:
+    return paginar(db, db.query(Usuario), Usuario.id, UsuarioOut.model_validate, pagina)
\ No newline at end of file
@@ -3,6 +3,9 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from app.db.dependencies import SessionLocal
 from app.services.jornada_laboral_service import JornadaLaboralService
+from app.db.database import engine
+from app.db.particiones import crear_particiones_futuras
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,6 +26,18 @@ def verificar_jornadas_activas():
     finally:
         db.close()
 
+def mantener_particiones():
+    """
+    ✅ Tarea diaria: crea las particiones mensuales de los próximos meses.
+    Si otro worker ya la está ejecutando, no hace nada (advisory lock).
+    """
+    try:
+        creadas = crear_particiones_futuras(engine)
+        if creadas:
+            logger.info(f"📅 Particiones creadas: {', '.join(creadas)}")
+    except Exception as e:
+        logger.error(f"❌ Error creando particiones: {str(e)}")
+
 def iniciar_scheduler():
     """✅ Inicia el scheduler de tareas programadas"""
     scheduler = BackgroundScheduler()
@@ -36,6 +51,16 @@ def iniciar_scheduler():
         replace_existing=True
     )
     
+    # Particiones de los próximos meses: al iniciar y todos los días a las 3
+    scheduler.add_job(
+        mantener_particiones,
+        'cron',
+        hour=3,
+        id='mantener_particiones',
+        replace_existing=True,
+        next_run_time=datetime.now()
+    )
+    
     scheduler.start()
     logger.info("✅ Scheduler de jornadas iniciado (cada 1 minuto)")
     
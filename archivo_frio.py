@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Archivo frío de proyectos cerrados (ver app/services/archivo_frio_service.py).
+
+Uso:
+    python archivo_frio.py --estado                    # proyectos archivados
+    python archivo_frio.py --proyecto 12               # archiva un proyecto cerrado y pagado
+    python archivo_frio.py --proyecto 12 --forzar      # aunque tenga reportes sin pagar
+    python archivo_frio.py --cerrados                  # archiva todos los cerrados y pagados
+    python archivo_frio.py --restaurar 12              # devuelve sus filas a las tablas
+"""
+
+import argparse
+import logging
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.database import SessionLocal
+from app.services.archivo_frio_service import (
+    estado_archivo,
+    archivar_proyecto,
+    archivar_cerrados,
+    get_archivo,
+    restaurar_proyecto
+)
+
+
+def mostrar_estado(db):
+    archivados = estado_archivo(db)
+    if not archivados:
+        print("📋 Ningún proyecto archivado")
+    for a in archivados:
+        tablas = ", ".join(f"{nombre}={filas}" for nombre, filas in a["tablas"].items() if filas)
+        print(f"🧊 Proyecto {a['proyecto_id']:<6} {a['filas']:>10,} filas  {a['bytes'] / 1024:>9.0f} KB  {a['archivado_en']:%Y-%m-%d}  {tablas}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    grupo = parser.add_mutually_exclusive_group(required=True)
+    grupo.add_argument("--estado", action="store_true", help="Listar proyectos archivados")
+    grupo.add_argument("--proyecto", type=int, metavar="ID", help="Archivar un proyecto cerrado")
+    grupo.add_argument("--cerrados", action="store_true", help="Archivar todos los proyectos cerrados y pagados")
+    grupo.add_argument("--restaurar", type=int, metavar="ID", help="Restaurar un proyecto archivado")
+    parser.add_argument("--forzar", action="store_true", help="Archivar aunque tenga reportes sin pagar")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    db = SessionLocal()
+    try:
+        if args.estado:
+            mostrar_estado(db)
+        elif args.proyecto:
+            archivo = archivar_proyecto(db, args.proyecto, forzar=args.forzar)
+            print(f"✅ Proyecto {args.proyecto} archivado en {archivo.ruta}")
+        elif args.cerrados:
+            archivados = archivar_cerrados(db)
+            print(f"✅ {len(archivados)} proyectos archivados")
+        else:
+            if not get_archivo(db, args.restaurar):
+                print(f"ℹ️  El proyecto {args.restaurar} no está archivado")
+            else:
+                filas = restaurar_proyecto(db, args.restaurar)
+                db.commit()
+                print(f"✅ Proyecto {args.restaurar}: {filas} filas restauradas")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error: {e}")
+        return False
+    finally:
+        db.close()
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
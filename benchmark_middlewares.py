@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark del overhead por request de la pila de middlewares.
+
+Compara, sobre una app FastAPI mínima sin base de datos:
+- sin middlewares
+- el ErrorHandler anterior (BaseHTTPMiddleware)
+- el pipeline ASGI actual (MIDDLEWARE_STACK)
+
+para tres tipos de respuesta: JSON chico, lista JSON grande y una descarga en
+StreamingResponse (como los exportes PDF/Excel). Las llamadas se hacen directo
+sobre la interfaz ASGI, sin red, para aislar el costo de los middlewares.
+
+Ejecutar: python benchmark_middlewares.py [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middlewares.pipeline import configurar_middlewares
+
+
+class ErrorHandlerBaseHTTP(BaseHTTPMiddleware):
+    """Implementación anterior del ErrorHandler, como referencia"""
+
+    async def dispatch(self, request: Request, call_next):
+        try:
+            return await call_next(request)
+        except Exception as e:
+            return JSONResponse(status_code=500, content={"message": str(e)})
+
+
+LISTA_GRANDE = [
+    {"id": i, "maquina_id": i % 40, "proyecto_id": i % 15, "horas_turno": 8, "fecha_asignacion": "2025-01-01T08:00:00"}
+    for i in range(2000)
+]
+CHUNK = b"x" * 64 * 1024
+
+
+def crear_app(variante: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/chico")
+    async def chico():
+        return {"status": "ok"}
+
+    @app.get("/lista")
+    async def lista():
+        return LISTA_GRANDE
+
+    @app.get("/descarga")
+    async def descarga():
+        async def chunks():
+            for _ in range(16):  # 1 MB
+                yield CHUNK
+        return StreamingResponse(chunks(), media_type="application/pdf")
+
+    if variante == "base_http":
+        app.add_middleware(ErrorHandlerBaseHTTP)
+    elif variante == "asgi":
+        configurar_middlewares(app)
+    return app
+
+
+async def llamar(app, path: str) -> int:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "client": ("127.0.0.1", 5000),
+        "server": ("testserver", 80),
+        "headers": [(b"host", b"testserver"), (b"accept-encoding", b"gzip")],
+    }
+    recibido = 0
+    body_enviado = False
+
+    async def receive():
+        nonlocal body_enviado
+        if not body_enviado:
+            body_enviado = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Cliente conectado hasta que termine la respuesta (StreamingResponse escucha el disconnect)
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal recibido
+        if message["type"] == "http.response.body":
+            recibido += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return recibido
+
+
+async def medir(app, path: str, n: int):
+    for _ in range(min(n, 50)):  # calentamiento
+        await llamar(app, path)
+    inicio = time.perf_counter()
+    for _ in range(n):
+        bytes_respuesta = await llamar(app, path)
+    return (time.perf_counter() - inicio) / n * 1e6, bytes_respuesta
+
+
+async def main(n: int):
+    variantes = {
+        "sin middlewares": crear_app("ninguno"),
+        "BaseHTTPMiddleware": crear_app("base_http"),
+        "pipeline ASGI": crear_app("asgi"),
+    }
+    rutas = [("/chico", n), ("/lista", max(n // 20, 20)), ("/descarga", max(n // 10, 50))]
+
+    print(f"{'variante':<22}{'ruta':<12}{'µs/request':>12}{'overhead µs':>14}{'bytes':>12}")
+    print("-" * 72)
+    for path, cantidad in rutas:
+        base = None
+        for nombre, app in variantes.items():
+            us, bytes_respuesta = await medir(app, path, cantidad)
+            base = us if base is None else base
+            print(f"{nombre:<22}{path:<12}{us:>12.1f}{us - base:>14.1f}{bytes_respuesta:>12}")
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests por medición de /chico")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialización de listados grandes (10.000 reportes laborales).
+
+Compara, sobre una base SQLite en memoria y llamando la app por ASGI:
+- camino anterior: objetos ORM -> ReporteLaboralOut por fila en el servicio ->
+  revalidación contra response_model en FastAPI -> JSONResponse
+- camino rápido: query de columnas -> dicts -> FilasJSONResponse (orjson si está)
+
+Se mide tiempo de CPU del proceso por request (time.process_time), que es lo que
+cada worker deja de gastar, además del tiempo de reloj.
+
+Ejecutar: python benchmark_serializacion.py [--filas 10000] [--requests 20]
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+from typing import List
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI, Depends
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.models import ReporteLaboral
+from app.schemas.schemas import ReporteLaboralOut
+from app.services.reporte_laboral_service import get_reportes_laborales, get_reportes_laborales_filas
+from app.core.serializacion import FilasJSONResponse, orjson
+from benchmark_middlewares import llamar
+
+
+def crear_sesiones(filas: int):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    ReporteLaboral.__table__.create(engine)
+    inicio = datetime(2025, 1, 1, 8, 0)
+    with engine.begin() as conn:
+        conn.execute(insert(ReporteLaboral), [
+            {
+                "maquina_id": i % 40 + 1,
+                "usuario_id": i % 25 + 1,
+                "proyecto_id": i % 15 + 1,
+                "fecha_asignacion": inicio + timedelta(hours=i),
+                "horas_turno": 8,
+                "tarifa_hora": 15000.0,
+                "horometro_inicial": 1000.0 + i * 8,
+                "pagado": i % 3 == 0
+            }
+            for i in range(filas)
+        ])
+    return sessionmaker(bind=engine)
+
+
+def crear_app(Sesion) -> FastAPI:
+    app = FastAPI()
+
+    def get_db():
+        db = Sesion()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @app.get("/anterior", response_model=List[ReporteLaboralOut])
+    def anterior(session=Depends(get_db)):
+        return get_reportes_laborales(session, filtros={})
+
+    @app.get("/rapido", response_model=List[ReporteLaboralOut], response_class=FilasJSONResponse)
+    def rapido(session=Depends(get_db)):
+        return FilasJSONResponse(get_reportes_laborales_filas(session, filtros={}))
+
+    return app
+
+
+async def medir(app, path: str, n: int):
+    await llamar(app, path)  # calentamiento
+    cpu_inicio, reloj_inicio = time.process_time(), time.perf_counter()
+    for _ in range(n):
+        bytes_respuesta = await llamar(app, path)
+    cpu_ms = (time.process_time() - cpu_inicio) / n * 1000
+    reloj_ms = (time.perf_counter() - reloj_inicio) / n * 1000
+    return cpu_ms, reloj_ms, bytes_respuesta
+
+
+async def main(filas: int, n: int):
+    app = crear_app(crear_sesiones(filas))
+    print(f"{filas} filas, {n} requests por variante, encoder: {'orjson' if orjson else 'json (stdlib)'}")
+    print(f"{'variante':<12}{'CPU ms/req':>12}{'reloj ms/req':>14}{'bytes':>12}")
+    print("-" * 50)
+    resultados = {}
+    for path in ("/anterior", "/rapido"):
+        cpu_ms, reloj_ms, bytes_respuesta = await medir(app, path, n)
+        resultados[path] = cpu_ms
+        print(f"{path:<12}{cpu_ms:>12.1f}{reloj_ms:>14.1f}{bytes_respuesta:>12}")
+    ahorro = resultados["/anterior"] - resultados["/rapido"]
+    print(f"\nCPU ahorrada por request: {ahorro:.1f} ms ({ahorro / resultados['/anterior'] * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=10000, help="Filas en la tabla de reportes")
+    parser.add_argument("--requests", type=int, default=20, help="Requests medidos por variante")
+    args = parser.parse_args()
+    asyncio.run(main(args.filas, args.requests))
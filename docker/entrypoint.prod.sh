@@ -2,4 +2,4 @@
 
 echo "Starting FastAPI application..."
 
-gunicorn -c gunicorn.conf.py main:app
\ No newline at end of file
+gunicorn -c gunicorn.config.py main:app
\ No newline at end of file
@@ -2,6 +2,9 @@
 
 cd ./src
 
+echo "Applying database migrations..."
+python migrate.py || exit 1
+
 echo "Starting FastAPI application..."
 
 uvicorn main:app --host ${HOST:-0.0.0.0} --port ${APP_PORT:-8000} --reload
\ No newline at end of file
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Facturación por lote de un período (ver app/services/facturacion_lote_service.py).
+
+Uso:
+    python facturar_periodo.py --mes 2025-05                     # todo el mes
+    python facturar_periodo.py --desde 2025-05-01 --hasta 2025-05-15
+    python facturar_periodo.py --mes 2025-05 --proyectos 3 7 12 --workers 2
+    python facturar_periodo.py --mes 2025-05 --pendientes        # solo lista qué se facturaría
+"""
+
+import argparse
+import calendar
+import logging
+import sys
+import os
+from datetime import date, datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.database import SessionLocal
+from app.services.facturacion_lote_service import facturar_periodo, proyectos_facturables
+
+
+def _periodo(args):
+    if args.mes:
+        anio, mes = map(int, args.mes.split("-"))
+        return date(anio, mes, 1), date(anio, mes, calendar.monthrange(anio, mes)[1])
+    return datetime.strptime(args.desde, "%Y-%m-%d").date(), datetime.strptime(args.hasta, "%Y-%m-%d").date()
+
+
+def mostrar_avance(lote):
+    print(f"   {lote.procesados}/{lote.total_proyectos}  creados={lote.reportes_creados} "
+          f"omitidos={lote.omitidos} errores={lote.errores}  ${lote.importe_total:,.2f}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mes", metavar="AAAA-MM", help="Facturar un mes completo")
+    parser.add_argument("--desde", metavar="AAAA-MM-DD")
+    parser.add_argument("--hasta", metavar="AAAA-MM-DD")
+    parser.add_argument("--proyectos", type=int, nargs="+", metavar="ID", help="Solo estos proyectos")
+    parser.add_argument("--workers", type=int, help="Reportes generados en paralelo")
+    parser.add_argument("--pendientes", action="store_true", help="Listar los proyectos a facturar sin generar nada")
+    args = parser.parse_args()
+    if not args.mes and not (args.desde and args.hasta):
+        parser.error("Indicar --mes o --desde y --hasta")
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    try:
+        inicio, fin = _periodo(args)
+        if args.pendientes:
+            db = SessionLocal()
+            try:
+                candidatos = proyectos_facturables(db, inicio, fin, args.proyectos)
+            finally:
+                db.close()
+            print(f"📋 {len(candidatos)} proyectos a facturar ({inicio} - {fin})")
+            for proyecto_id, nombre in candidatos:
+                print(f"   {proyecto_id:<6} {nombre}")
+            return True
+
+        lote = facturar_periodo(inicio, fin, args.proyectos, args.workers, al_avanzar=mostrar_avance)
+        print(f"\n🧾 Lote {lote.id} {lote.estado}: {lote.reportes_creados} reportes, "
+              f"{lote.omitidos} omitidos, {lote.errores} errores, total ${lote.importe_total:,.2f}")
+        for r in lote.resultados:
+            if r.estado != "creado":
+                print(f"   {'⚠️ ' if r.estado == 'omitido' else '❌'} {r.proyecto_id} {r.proyecto_nombre or ''}: {r.motivo}")
+        return lote.errores == 0
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
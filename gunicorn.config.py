@@ -28,4 +28,22 @@ timeout = 30
 preload_app = True
 
 # Enable keep-alive connections
-keepalive = 120
\ No newline at end of file
+keepalive = 120
+
+def on_starting(server):
+    """
+    Aplica las migraciones pendientes una sola vez en el master, antes de crear
+    los workers; los workers solo verifican la versión del esquema al arrancar.
+    """
+    from app.core.config import settings
+    if not settings.MIGRATE_ON_START:
+        return
+
+    from app.db.database import engine
+    from app.db.migraciones import aplicar_migraciones
+    try:
+        aplicadas = aplicar_migraciones(engine)
+        server.log.info(f"Migraciones aplicadas: {len(aplicadas)}")
+    finally:
+        # No heredar conexiones abiertas del master en los workers
+        engine.dispose()
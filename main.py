@@ -1,11 +1,13 @@
 # main.py - VERSIÓN ACTUALIZADA CON SCHEDULER
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from app.db.init_db import init_db
-from fastapi.staticfiles import StaticFiles
+from app.core.descargas import ArchivosEstaticos
 from fastapi.middleware.cors import CORSMiddleware
-from app.middlewares.error_handler import ErrorHandler
+from app.middlewares.pipeline import configurar_middlewares
+from app.core.metrics import registro_metricas
 from app.db.seed_db import create_admin_user
 import os
 import logging
@@ -30,6 +32,9 @@ from app.routers import (
     jornada_laboral_router,
     cuenta_corriente_router,
     cotizacion_router,
+    busqueda_router,
+    analitica_router,
+    dashboard_router,
     external_api,
     auth_external,
     client_api
@@ -52,7 +57,7 @@ scheduler = None
 async def lifespan(app: FastAPI):
     """
     ✅ Gestión del ciclo de vida de la aplicación
-    - Startup: Inicializar BD y scheduler
+    - Startup: Verificar versión del esquema e iniciar scheduler
     - Shutdown: Detener scheduler
     """
     global scheduler
@@ -60,9 +65,8 @@ async def lifespan(app: FastAPI):
     # ========== STARTUP ==========
     logger.info("🚀 Iniciando aplicación Kedikian...")
     
-    # Inicializar base de datos
+    # Verificar versión del esquema (las migraciones no se aplican desde los workers)
     await init_db()
-    logger.info("✅ Base de datos inicializada")
     
     # Crear usuario admin
     create_admin_user()
@@ -107,7 +111,8 @@ app = FastAPI(
     root_path="/api"
 )
 
-app.add_middleware(ErrorHandler)
+# ✅ Middlewares ASGI (request ID, métricas, gzip, errores) - configurable con MIDDLEWARE_STACK
+configurar_middlewares(app)
 
 # Configuración de CORS y middlewares
 app.add_middleware(
@@ -125,15 +130,15 @@ app.add_middleware(
     allow_headers=["*"],  # Headers permitidos
 )
 
-# Montar la carpeta static para servir archivos estáticos
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Montar la carpeta static para servir archivos estáticos (con Cache-Control; en producción los sirve nginx)
+app.mount("/static", ArchivosEstaticos(directory="static"), name="static")
 
 # Configurar directorio de uploads
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-# Middleware para servir archivos estáticos de uploads
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Archivos estáticos de uploads; contratos y comprobantes solo se descargan por sus endpoints con autorización
+app.mount("/uploads", ArchivosEstaticos(directory="uploads", excluir=("contratos", ".tmp", "derivados")), name="uploads")
 
 # Incluir todos los routers
 app.include_router(usuarios_router.router, prefix="/v1")
@@ -154,6 +159,9 @@ app.include_router(mantenimiento_router.router, prefix="/v1")
 app.include_router(jornada_laboral_router.router, prefix="/v1")
 app.include_router(cuenta_corriente_router.router, prefix="/v1")
 app.include_router(cotizacion_router.router, prefix="/v1")
+app.include_router(busqueda_router.router, prefix="/v1")
+app.include_router(analitica_router.router, prefix="/v1")
+app.include_router(dashboard_router.router, prefix="/v1")
 
 # ✅ Routers de API Externa y Clientes (después de CORS)
 app.include_router(auth_external.router)
@@ -192,6 +200,18 @@ def health_check():
         "scheduler_jobs": len(scheduler.get_jobs()) if scheduler else 0
     }
 
+# ✅ Métricas del worker, solo accesibles desde la propia máquina
+@app.get("/metrics")
+def metrics(request: Request, reset: bool = False):
+    """✅ Latencia, queries y tiempo de DB agregados por ruta (por worker)"""
+    if request.client is None or request.client.host not in ("127.0.0.1", "::1", "localhost"):
+        return JSONResponse(content={"error": "Solo disponible desde localhost"}, status_code=403)
+    snapshot = registro_metricas.snapshot()
+    snapshot["pid"] = os.getpid()
+    if reset:
+        registro_metricas.reset()
+    return snapshot
+
 @app.get("/debug-openapi")
 def debug_openapi():
     return app.openapi()
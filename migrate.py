@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Migraciones versionadas del esquema (ver app/db/migraciones.py).
+
+Uso:
+    python migrate.py                 # aplica las migraciones pendientes
+    python migrate.py --hasta 12      # aplica hasta la versión 12 inclusive
+    python migrate.py --estado        # lista migraciones aplicadas y pendientes
+    python migrate.py --marcar 15     # registra hasta la 15 como aplicadas sin ejecutarlas
+                                      # (bases migradas con los scripts sueltos anteriores)
+"""
+
+import argparse
+import logging
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.database import engine
+from app.db.migraciones import aplicar_migraciones, marcar_aplicadas, estado_migraciones
+
+
+def mostrar_estado():
+    pendientes = 0
+    for migracion in estado_migraciones(engine):
+        nombre = f"{migracion['version']:04d}_{migracion['nombre']}"
+        if migracion["aplicada_en"] is None:
+            pendientes += 1
+            print(f"   ⏳ {nombre}  (pendiente)")
+        else:
+            aviso = "  ⚠️  el archivo cambió después de aplicarse" if migracion["modificada"] else ""
+            print(f"   ✅ {nombre}  {migracion['aplicada_en']:%Y-%m-%d %H:%M}{aviso}")
+    print(f"\n📋 {pendientes} migraciones pendientes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument("--estado", action="store_true", help="Mostrar el estado de las migraciones")
+    grupo.add_argument("--marcar", type=int, metavar="VERSION", help="Registrar como aplicadas hasta VERSION sin ejecutarlas")
+    grupo.add_argument("--hasta", type=int, metavar="VERSION", help="Aplicar solo hasta VERSION inclusive")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.estado:
+        mostrar_estado()
+        return True
+
+    print("🚀 Iniciando migraciones...")
+    print("=" * 60)
+    try:
+        if args.marcar is not None:
+            marcadas = marcar_aplicadas(engine, args.marcar)
+            print(f"✅ {len(marcadas)} migraciones registradas como aplicadas")
+        else:
+            aplicadas = aplicar_migraciones(engine, hasta=args.hasta)
+            if aplicadas:
+                print(f"✅ {len(aplicadas)} migraciones aplicadas")
+            else:
+                print("✅ El esquema ya está al día")
+    except Exception as e:
+        print(f"❌ Error durante la migración: {e}")
+        return False
+    finally:
+        print("=" * 60)
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        print("💥 La migración falló!")
+        sys.exit(1)
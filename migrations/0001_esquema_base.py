@@ -0,0 +1,469 @@
+"""
+Esquema base: las tablas que creaba create_all en cada arranque desde
+app/db/init_db.py, con el DDL congelado de los modelos de ese momento, y las
+columnas que init_db aseguraba después. Las tablas y columnas posteriores
+vienen de sus propias migraciones.
+Idempotente, de modo que también puede aplicarse sobre bases existentes.
+"""
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS cliente (
+    id SERIAL NOT NULL,
+    nombre VARCHAR(255) NOT NULL,
+    email VARCHAR(255),
+    telefono VARCHAR(50),
+    direccion VARCHAR(500),
+    oculto BOOLEAN NOT NULL,
+    ocultar_al_aprobar BOOLEAN NOT NULL,
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id)
+);
+
+CREATE TABLE IF NOT EXISTS configuracion_tarifas (
+    id SERIAL NOT NULL,
+    hora_normal FLOAT NOT NULL,
+    hora_feriado FLOAT NOT NULL,
+    hora_extra FLOAT NOT NULL,
+    multiplicador_extra FLOAT NOT NULL,
+    fecha_actualizacion TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_configuracion_tarifas_id ON configuracion_tarifas (id);
+
+CREATE TABLE IF NOT EXISTS contrato (
+    id SERIAL NOT NULL,
+    detalle VARCHAR(350),
+    cliente VARCHAR(45),
+    importe_total INTEGER,
+    fecha_inicio TIMESTAMP WITHOUT TIME ZONE,
+    fecha_terminacion TIMESTAMP WITHOUT TIME ZONE,
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id)
+);
+
+CREATE TABLE IF NOT EXISTS maquina (
+    id SERIAL NOT NULL,
+    nombre VARCHAR(50),
+    estado INTEGER,
+    horas_uso INTEGER,
+    horas_maquina INTEGER,
+    horometro_inicial FLOAT,
+    proximo_mantenimiento FLOAT,
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id)
+);
+
+CREATE TABLE IF NOT EXISTS producto (
+    id SERIAL NOT NULL,
+    nombre VARCHAR(50),
+    codigo_producto VARCHAR(50),
+    inventario INTEGER,
+    url_imagen VARCHAR(50),
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id)
+);
+
+CREATE TABLE IF NOT EXISTS resumen_sueldo (
+    id SERIAL NOT NULL,
+    nombre VARCHAR(100) NOT NULL,
+    dni VARCHAR(20) NOT NULL,
+    periodo VARCHAR(20) NOT NULL,
+    total_horas_normales FLOAT,
+    total_horas_feriado FLOAT,
+    total_horas_extras FLOAT,
+    basico_remunerativo FLOAT,
+    asistencia_perfecta_remunerativo FLOAT,
+    feriado_remunerativo FLOAT,
+    extras_remunerativo FLOAT,
+    total_remunerativo FLOAT,
+    observaciones TEXT,
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_resumen_sueldo_id ON resumen_sueldo (id);
+
+CREATE TABLE IF NOT EXISTS usuario (
+    id SERIAL NOT NULL,
+    nombre VARCHAR(50),
+    email VARCHAR(70),
+    hash_contrasena VARCHAR(256),
+    estado BOOLEAN,
+    roles VARCHAR(100),
+    fecha_creacion TIMESTAMP WITHOUT TIME ZONE,
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    UNIQUE (email)
+);
+
+CREATE TABLE IF NOT EXISTS cotizacion (
+    id SERIAL NOT NULL,
+    cliente_id INTEGER NOT NULL,
+    fecha_creacion TIMESTAMP WITHOUT TIME ZONE DEFAULT now() NOT NULL,
+    fecha_validez DATE,
+    estado VARCHAR(20),
+    observaciones TEXT,
+    importe_total NUMERIC(12, 2),
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(cliente_id) REFERENCES cliente (id)
+);
+
+CREATE TABLE IF NOT EXISTS gasto (
+    id SERIAL NOT NULL,
+    usuario_id INTEGER,
+    maquina_id INTEGER,
+    tipo VARCHAR(15),
+    importe_total FLOAT,
+    fecha TIMESTAMP WITHOUT TIME ZONE,
+    descripcion VARCHAR(200),
+    imagen BYTEA,
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(usuario_id) REFERENCES usuario (id),
+    FOREIGN KEY(maquina_id) REFERENCES maquina (id)
+);
+
+CREATE TABLE IF NOT EXISTS jornada_laboral (
+    id SERIAL NOT NULL,
+    usuario_id INTEGER NOT NULL,
+    fecha DATE NOT NULL,
+    hora_inicio TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    hora_fin TIMESTAMP WITHOUT TIME ZONE,
+    tiempo_descanso INTEGER,
+    horas_regulares FLOAT,
+    horas_extras FLOAT,
+    total_horas FLOAT,
+    estado VARCHAR(20),
+    es_feriado BOOLEAN,
+    limite_regular_alcanzado BOOLEAN,
+    hora_limite_regular TIMESTAMP WITHOUT TIME ZONE,
+    overtime_solicitado BOOLEAN,
+    overtime_confirmado BOOLEAN,
+    overtime_iniciado TIMESTAMP WITHOUT TIME ZONE,
+    pausa_automatica BOOLEAN,
+    finalizacion_forzosa BOOLEAN,
+    notas_inicio TEXT,
+    notas_fin TEXT,
+    motivo_finalizacion VARCHAR(100),
+    ubicacion_inicio TEXT,
+    ubicacion_fin TEXT,
+    advertencia_8h_mostrada BOOLEAN,
+    advertencia_limite_mostrada BOOLEAN,
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(usuario_id) REFERENCES usuario (id)
+);
+
+CREATE TABLE IF NOT EXISTS mantenimiento (
+    id SERIAL NOT NULL,
+    maquina_id INTEGER NOT NULL,
+    tipo_mantenimiento VARCHAR(50) NOT NULL,
+    descripcion TEXT NOT NULL,
+    fecha_mantenimiento TIMESTAMP WITH TIME ZONE NOT NULL,
+    horas_maquina INTEGER NOT NULL,
+    costo FLOAT,
+    responsable VARCHAR(100),
+    observaciones TEXT,
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(maquina_id) REFERENCES maquina (id)
+);
+
+CREATE TABLE IF NOT EXISTS movimiento_inventario (
+    id SERIAL NOT NULL,
+    producto_id INTEGER,
+    usuario_id INTEGER,
+    cantidad INTEGER,
+    fecha TIMESTAMP WITHOUT TIME ZONE,
+    tipo_transaccion VARCHAR(15),
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(producto_id) REFERENCES producto (id),
+    FOREIGN KEY(usuario_id) REFERENCES usuario (id)
+);
+
+CREATE TABLE IF NOT EXISTS notas_maquinas (
+    id SERIAL NOT NULL,
+    maquina_id INTEGER NOT NULL,
+    texto TEXT NOT NULL,
+    usuario VARCHAR(100),
+    fecha TIMESTAMP WITH TIME ZONE NOT NULL,
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(maquina_id) REFERENCES maquina (id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_notas_fecha ON notas_maquinas (fecha);
+CREATE INDEX IF NOT EXISTS idx_notas_maquina_id ON notas_maquinas (maquina_id);
+
+CREATE TABLE IF NOT EXISTS proyecto (
+    id SERIAL NOT NULL,
+    nombre VARCHAR(75),
+    descripcion VARCHAR(500),
+    estado BOOLEAN,
+    fecha_creacion TIMESTAMP WITHOUT TIME ZONE,
+    fecha_inicio DATE,
+    fecha_fin DATE,
+    progreso INTEGER,
+    gerente VARCHAR(100),
+    contrato_id INTEGER,
+    ubicacion VARCHAR(50),
+    contrato_file_path VARCHAR(500),
+    contrato_url VARCHAR(500),
+    contrato_nombre VARCHAR(255),
+    contrato_tipo VARCHAR(100),
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    UNIQUE (contrato_id),
+    FOREIGN KEY(contrato_id) REFERENCES contrato (id)
+);
+
+CREATE TABLE IF NOT EXISTS registro_horas (
+    id SERIAL NOT NULL,
+    operario_id INTEGER NOT NULL,
+    periodo VARCHAR(20) NOT NULL,
+    horas_normales FLOAT,
+    horas_feriado FLOAT,
+    horas_extras FLOAT,
+    total_calculado FLOAT,
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(operario_id) REFERENCES usuario (id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_registro_horas_id ON registro_horas (id);
+
+CREATE TABLE IF NOT EXISTS arrendamiento (
+    id SERIAL NOT NULL,
+    proyecto_id INTEGER,
+    maquina_id INTEGER,
+    horas_uso INTEGER,
+    fecha_asignacion TIMESTAMP WITHOUT TIME ZONE,
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(proyecto_id) REFERENCES proyecto (id),
+    FOREIGN KEY(maquina_id) REFERENCES maquina (id)
+);
+
+CREATE TABLE IF NOT EXISTS contrato_archivo (
+    id SERIAL NOT NULL,
+    proyecto_id INTEGER NOT NULL,
+    nombre_archivo VARCHAR(255) NOT NULL,
+    ruta_archivo VARCHAR(500) NOT NULL,
+    tipo_archivo VARCHAR(100) NOT NULL,
+    "tamaño_archivo" BIGINT NOT NULL,
+    fecha_subida TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(proyecto_id) REFERENCES proyecto (id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS cotizacion_item (
+    id SERIAL NOT NULL,
+    cotizacion_id INTEGER NOT NULL,
+    nombre_servicio VARCHAR(255) NOT NULL,
+    unidad VARCHAR(50) NOT NULL,
+    cantidad FLOAT NOT NULL,
+    precio_unitario NUMERIC(12, 2) NOT NULL,
+    subtotal NUMERIC(12, 2) NOT NULL,
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(cotizacion_id) REFERENCES cotizacion (id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS entrega_arido (
+    id SERIAL NOT NULL,
+    proyecto_id INTEGER,
+    usuario_id INTEGER,
+    tipo_arido VARCHAR,
+    nombre VARCHAR,
+    cantidad FLOAT,
+    precio_unitario FLOAT,
+    fecha_entrega TIMESTAMP WITHOUT TIME ZONE,
+    observaciones VARCHAR,
+    pagado BOOLEAN NOT NULL,
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(proyecto_id) REFERENCES proyecto (id),
+    FOREIGN KEY(usuario_id) REFERENCES usuario (id)
+);
+
+CREATE TABLE IF NOT EXISTS pago (
+    id SERIAL NOT NULL,
+    proyecto_id INTEGER,
+    importe_total INTEGER,
+    fecha TIMESTAMP WITHOUT TIME ZONE,
+    descripcion VARCHAR(200),
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(proyecto_id) REFERENCES proyecto (id)
+);
+
+CREATE TABLE IF NOT EXISTS reporte_laboral (
+    id SERIAL NOT NULL,
+    maquina_id INTEGER,
+    usuario_id INTEGER,
+    proyecto_id INTEGER,
+    fecha_asignacion TIMESTAMP WITHOUT TIME ZONE,
+    horas_turno INTEGER,
+    tarifa_hora FLOAT,
+    horometro_inicial FLOAT,
+    pagado BOOLEAN NOT NULL,
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(maquina_id) REFERENCES maquina (id),
+    FOREIGN KEY(usuario_id) REFERENCES usuario (id),
+    FOREIGN KEY(proyecto_id) REFERENCES proyecto (id)
+);
+
+CREATE TABLE IF NOT EXISTS reportes_cuenta_corriente (
+    id SERIAL NOT NULL,
+    proyecto_id INTEGER NOT NULL,
+    periodo_inicio DATE NOT NULL,
+    periodo_fin DATE NOT NULL,
+    total_aridos FLOAT,
+    total_horas FLOAT,
+    importe_aridos NUMERIC(12, 2),
+    importe_horas NUMERIC(12, 2),
+    importe_total NUMERIC(12, 2),
+    estado VARCHAR(20),
+    fecha_generacion TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    observaciones TEXT,
+    numero_factura VARCHAR(50),
+    fecha_pago DATE,
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(proyecto_id) REFERENCES proyecto (id)
+);
+
+CREATE TABLE IF NOT EXISTS horometro_historial (
+    id SERIAL NOT NULL,
+    maquina_id INTEGER NOT NULL,
+    valor_anterior FLOAT NOT NULL,
+    valor_nuevo FLOAT NOT NULL,
+    usuario_id INTEGER,
+    motivo VARCHAR(255) NOT NULL,
+    reporte_laboral_id INTEGER,
+    created TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (id),
+    FOREIGN KEY(maquina_id) REFERENCES maquina (id),
+    FOREIGN KEY(usuario_id) REFERENCES usuario (id),
+    FOREIGN KEY(reporte_laboral_id) REFERENCES reporte_laboral (id)
+);
+
+CREATE TABLE IF NOT EXISTS pagos_reportes (
+    id SERIAL NOT NULL,
+    reporte_id INTEGER NOT NULL,
+    monto NUMERIC(12, 2) NOT NULL,
+    fecha DATE NOT NULL,
+    observaciones TEXT,
+    fecha_registro TIMESTAMP WITHOUT TIME ZONE DEFAULT now(),
+    PRIMARY KEY (id),
+    FOREIGN KEY(reporte_id) REFERENCES reportes_cuenta_corriente (id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS reporte_items_aridos (
+    id SERIAL NOT NULL,
+    reporte_id INTEGER NOT NULL,
+    entrega_arido_id INTEGER NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(reporte_id) REFERENCES reportes_cuenta_corriente (id) ON DELETE CASCADE,
+    FOREIGN KEY(entrega_arido_id) REFERENCES entrega_arido (id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS reporte_items_horas (
+    id SERIAL NOT NULL,
+    reporte_id INTEGER NOT NULL,
+    reporte_laboral_id INTEGER NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(reporte_id) REFERENCES reportes_cuenta_corriente (id) ON DELETE CASCADE,
+    FOREIGN KEY(reporte_laboral_id) REFERENCES reporte_laboral (id) ON DELETE CASCADE
+);
+"""
+
+# Columnas de jornada_laboral agregadas en distintas versiones del modelo
+COLUMNAS_JORNADA_LABORAL = [
+    # Control de tiempo
+    "hora_inicio TIMESTAMP NOT NULL",
+    "hora_fin TIMESTAMP NULL",
+    "tiempo_descanso INTEGER DEFAULT 0",
+    # Cálculos
+    "horas_regulares DOUBLE PRECISION DEFAULT 0.0",
+    "horas_extras DOUBLE PRECISION DEFAULT 0.0",
+    "total_horas DOUBLE PRECISION DEFAULT 0.0",
+    # Estado y control
+    "estado VARCHAR(20) DEFAULT 'activa'",
+    "es_feriado BOOLEAN DEFAULT FALSE",
+    # Control específico de horas extras
+    "limite_regular_alcanzado BOOLEAN DEFAULT FALSE",
+    "hora_limite_regular TIMESTAMP NULL",
+    "overtime_solicitado BOOLEAN DEFAULT FALSE",
+    "overtime_confirmado BOOLEAN DEFAULT FALSE",
+    "overtime_iniciado TIMESTAMP NULL",
+    "pausa_automatica BOOLEAN DEFAULT FALSE",
+    "finalizacion_forzosa BOOLEAN DEFAULT FALSE",
+    # Información adicional
+    "notas_inicio TEXT NULL",
+    "notas_fin TEXT NULL",
+    "motivo_finalizacion VARCHAR(100) NULL",
+    # Geolocalización
+    "ubicacion_inicio TEXT NULL",
+    "ubicacion_fin TEXT NULL",
+    # Control de advertencias
+    "advertencia_8h_mostrada BOOLEAN DEFAULT FALSE",
+    "advertencia_limite_mostrada BOOLEAN DEFAULT FALSE",
+    # Timestamps
+    "created TIMESTAMP NULL",
+    "updated TIMESTAMP NULL",
+]
+
+
+def upgrade(connection):
+    connection.exec_driver_sql(ESQUEMA)
+
+    # proyecto_id en reporte_laboral (bases anteriores a la asignación por proyecto)
+    connection.exec_driver_sql("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1
+                FROM information_schema.columns
+                WHERE table_name = 'reporte_laboral'
+                AND column_name = 'proyecto_id'
+            ) THEN
+                ALTER TABLE reporte_laboral ADD COLUMN proyecto_id INTEGER;
+                ALTER TABLE reporte_laboral
+                ADD CONSTRAINT fk_reporte_proyecto
+                FOREIGN KEY (proyecto_id) REFERENCES proyecto(id);
+            END IF;
+        END $$;
+    """)
+
+    connection.exec_driver_sql(
+        "ALTER TABLE jornada_laboral "
+        + ", ".join(f"ADD COLUMN IF NOT EXISTS {columna}" for columna in COLUMNAS_JORNADA_LABORAL)
+    )
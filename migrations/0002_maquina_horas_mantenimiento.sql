@@ -0,0 +1,22 @@
+-- Campo horas_maquina en maquina y tabla de mantenimientos
+-- (antes migrate_add_horas_maquina.py)
+
+ALTER TABLE maquina
+ADD COLUMN IF NOT EXISTS horas_maquina INTEGER DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS mantenimiento (
+    id SERIAL PRIMARY KEY,
+    maquina_id INTEGER NOT NULL REFERENCES maquina(id),
+    tipo_mantenimiento VARCHAR(50) NOT NULL,
+    descripcion TEXT NOT NULL,
+    fecha_mantenimiento TIMESTAMP WITH TIME ZONE NOT NULL,
+    horas_maquina INTEGER NOT NULL,
+    costo FLOAT,
+    responsable VARCHAR(100),
+    observaciones TEXT,
+    created TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_mantenimiento_maquina_id ON mantenimiento(maquina_id);
+CREATE INDEX IF NOT EXISTS idx_mantenimiento_fecha ON mantenimiento(fecha_mantenimiento);
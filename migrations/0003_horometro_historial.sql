@@ -0,0 +1,22 @@
+-- Próximo mantenimiento por máquina e historial de cambios del horómetro
+-- (antes migrate_add_horometro_tracking.py)
+
+ALTER TABLE maquina
+ADD COLUMN IF NOT EXISTS proximo_mantenimiento FLOAT DEFAULT NULL;
+
+CREATE TABLE IF NOT EXISTS horometro_historial (
+    id SERIAL PRIMARY KEY,
+    maquina_id INTEGER NOT NULL REFERENCES maquina(id) ON DELETE CASCADE,
+    valor_anterior FLOAT NOT NULL,
+    valor_nuevo FLOAT NOT NULL,
+    usuario_id INTEGER REFERENCES usuario(id),
+    motivo VARCHAR(255) NOT NULL,
+    reporte_laboral_id INTEGER REFERENCES reporte_laboral(id),
+    created TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_horometro_historial_maquina_id ON horometro_historial(maquina_id);
+CREATE INDEX IF NOT EXISTS idx_horometro_historial_usuario_id ON horometro_historial(usuario_id);
+CREATE INDEX IF NOT EXISTS idx_horometro_historial_reporte_id ON horometro_historial(reporte_laboral_id);
+CREATE INDEX IF NOT EXISTS idx_horometro_historial_created ON horometro_historial(created);
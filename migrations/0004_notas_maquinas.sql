@@ -0,0 +1,15 @@
+-- Notas asociadas a máquinas
+-- (antes migrate_add_notas_maquinas.py)
+
+CREATE TABLE IF NOT EXISTS notas_maquinas (
+    id SERIAL PRIMARY KEY,
+    maquina_id INTEGER NOT NULL REFERENCES maquina(id) ON DELETE CASCADE,
+    texto TEXT NOT NULL,
+    usuario VARCHAR(100) DEFAULT 'Usuario',
+    fecha TIMESTAMP WITH TIME ZONE NOT NULL,
+    created TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_notas_maquina_id ON notas_maquinas(maquina_id);
+CREATE INDEX IF NOT EXISTS idx_notas_fecha ON notas_maquinas(fecha);
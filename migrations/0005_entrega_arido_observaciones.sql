@@ -0,0 +1,5 @@
+-- Observaciones en entregas de áridos
+-- (antes migrate_add_observaciones_aridos.py)
+
+ALTER TABLE entrega_arido
+ADD COLUMN IF NOT EXISTS observaciones VARCHAR(255) NULL;
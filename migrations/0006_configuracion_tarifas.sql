@@ -0,0 +1,15 @@
+-- Columnas actuales de configuracion_tarifas y baja de las columnas en desuso
+-- (antes migrate_configuracion_tarifas.py, que usaba sintaxis de MySQL)
+
+ALTER TABLE configuracion_tarifas
+ADD COLUMN IF NOT EXISTS hora_extra DOUBLE PRECISION NOT NULL DEFAULT 9750;
+
+ALTER TABLE configuracion_tarifas
+ADD COLUMN IF NOT EXISTS multiplicador_extra DOUBLE PRECISION NOT NULL DEFAULT 1.5;
+
+ALTER TABLE configuracion_tarifas
+ADD COLUMN IF NOT EXISTS fecha_actualizacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+
+ALTER TABLE configuracion_tarifas DROP COLUMN IF EXISTS activo;
+ALTER TABLE configuracion_tarifas DROP COLUMN IF EXISTS created;
+ALTER TABLE configuracion_tarifas DROP COLUMN IF EXISTS updated;
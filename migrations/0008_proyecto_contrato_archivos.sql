@@ -0,0 +1,8 @@
+-- Archivo de contrato por proyecto y tabla de archivos adjuntos
+-- (antes migrate_proyecto_contrato_archivos.py, escrito para SQLite)
+-- La tabla contrato_archivo la crea el esquema base desde el modelo ContratoArchivo.
+
+ALTER TABLE proyecto
+ADD COLUMN IF NOT EXISTS contrato_file_path VARCHAR(500) NULL;
+
+CREATE INDEX IF NOT EXISTS idx_contrato_archivo_proyecto_id ON contrato_archivo(proyecto_id);
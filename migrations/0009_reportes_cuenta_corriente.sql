@@ -0,0 +1,32 @@
+-- Índices y trigger de updated para reportes_cuenta_corriente
+-- (antes migrate_reportes_cuenta_corriente.py y migrations/create_reportes_cuenta_corriente.sql)
+-- La tabla la crea el esquema base desde el modelo ReporteCuentaCorriente.
+
+CREATE INDEX IF NOT EXISTS idx_reportes_cc_proyecto_id
+    ON reportes_cuenta_corriente(proyecto_id);
+
+CREATE INDEX IF NOT EXISTS idx_reportes_cc_periodo
+    ON reportes_cuenta_corriente(periodo_inicio, periodo_fin);
+
+CREATE INDEX IF NOT EXISTS idx_reportes_cc_fecha_generacion
+    ON reportes_cuenta_corriente(fecha_generacion DESC);
+
+CREATE INDEX IF NOT EXISTS idx_reportes_cc_estado
+    ON reportes_cuenta_corriente(estado);
+
+CREATE OR REPLACE FUNCTION update_reportes_cuenta_corriente_updated_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated = CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS trigger_update_reportes_cuenta_corriente_updated ON reportes_cuenta_corriente;
+
+CREATE TRIGGER trigger_update_reportes_cuenta_corriente_updated
+    BEFORE UPDATE ON reportes_cuenta_corriente
+    FOR EACH ROW
+    EXECUTE FUNCTION update_reportes_cuenta_corriente_updated_column();
+
+COMMENT ON TABLE reportes_cuenta_corriente IS 'Reportes de cuenta corriente que agrupan áridos y horas de máquinas por proyecto y período';
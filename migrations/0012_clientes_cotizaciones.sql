@@ -0,0 +1,15 @@
+-- Índices del módulo de cotizaciones (cliente, cotizacion, cotizacion_item)
+-- (antes migrations/create_clientes_cotizaciones.sql y crear_tablas_cotizaciones.py)
+-- Las tablas las crea el esquema base desde los modelos.
+
+CREATE INDEX IF NOT EXISTS idx_cliente_nombre ON cliente(nombre);
+CREATE INDEX IF NOT EXISTS idx_cliente_email ON cliente(email);
+CREATE INDEX IF NOT EXISTS idx_cotizacion_cliente_id ON cotizacion(cliente_id);
+CREATE INDEX IF NOT EXISTS idx_cotizacion_fecha_creacion ON cotizacion(fecha_creacion);
+CREATE INDEX IF NOT EXISTS idx_cotizacion_estado ON cotizacion(estado);
+CREATE INDEX IF NOT EXISTS idx_cotizacion_item_cotizacion_id ON cotizacion_item(cotizacion_id);
+CREATE INDEX IF NOT EXISTS idx_cotizacion_item_nombre_servicio ON cotizacion_item(nombre_servicio);
+
+COMMENT ON TABLE cliente IS 'Clientes del sistema para cotizaciones';
+COMMENT ON TABLE cotizacion IS 'Cotizaciones generadas para clientes';
+COMMENT ON TABLE cotizacion_item IS 'Items/líneas de cada cotización';
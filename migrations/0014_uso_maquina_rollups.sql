@@ -0,0 +1,46 @@
+-- Rollups diarios y semanales de uso por máquina, poblados desde reporte_laboral
+-- (antes migrate_uso_maquina_rollups.py)
+
+CREATE TABLE IF NOT EXISTS uso_maquina_diario (
+    id SERIAL PRIMARY KEY,
+    maquina_id INTEGER NOT NULL REFERENCES maquina(id) ON DELETE CASCADE,
+    fecha DATE NOT NULL,
+    horas FLOAT NOT NULL DEFAULT 0,
+    registros INTEGER NOT NULL DEFAULT 0,
+    horometro_min FLOAT,
+    horometro_max FLOAT,
+    updated TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_uso_maquina_diario UNIQUE (maquina_id, fecha)
+);
+
+CREATE TABLE IF NOT EXISTS uso_maquina_semanal (
+    id SERIAL PRIMARY KEY,
+    maquina_id INTEGER NOT NULL REFERENCES maquina(id) ON DELETE CASCADE,
+    semana_inicio DATE NOT NULL,
+    horas FLOAT NOT NULL DEFAULT 0,
+    registros INTEGER NOT NULL DEFAULT 0,
+    horometro_min FLOAT,
+    horometro_max FLOAT,
+    updated TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_uso_maquina_semanal UNIQUE (maquina_id, semana_inicio)
+);
+
+CREATE INDEX IF NOT EXISTS idx_uso_maquina_diario_fecha ON uso_maquina_diario(fecha);
+CREATE INDEX IF NOT EXISTS idx_uso_maquina_semanal_semana ON uso_maquina_semanal(semana_inicio);
+CREATE INDEX IF NOT EXISTS idx_reporte_laboral_maquina_fecha ON reporte_laboral(maquina_id, fecha_asignacion);
+
+TRUNCATE uso_maquina_diario, uso_maquina_semanal;
+
+INSERT INTO uso_maquina_diario (maquina_id, fecha, horas, registros, horometro_min, horometro_max)
+SELECT maquina_id, DATE(fecha_asignacion), COALESCE(SUM(horas_turno), 0), COUNT(id),
+       MIN(horometro_inicial), MAX(horometro_inicial)
+FROM reporte_laboral
+WHERE maquina_id IS NOT NULL AND fecha_asignacion IS NOT NULL
+GROUP BY maquina_id, DATE(fecha_asignacion);
+
+INSERT INTO uso_maquina_semanal (maquina_id, semana_inicio, horas, registros, horometro_min, horometro_max)
+SELECT maquina_id, DATE(date_trunc('week', fecha_asignacion)), COALESCE(SUM(horas_turno), 0),
+       COUNT(id), MIN(horometro_inicial), MAX(horometro_inicial)
+FROM reporte_laboral
+WHERE maquina_id IS NOT NULL AND fecha_asignacion IS NOT NULL
+GROUP BY maquina_id, DATE(date_trunc('week', fecha_asignacion));
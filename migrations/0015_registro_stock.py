@@ -0,0 +1,74 @@
+"""
+Libro de stock por producto (registro_stock), con saldo de apertura y un asiento
+por cada movimiento existente, de modo que la suma del libro coincida con
+producto.inventario (antes migrate_registro_stock.py).
+"""
+
+from sqlalchemy import text
+
+
+def upgrade(connection):
+    connection.execute(text("""
+        CREATE TABLE IF NOT EXISTS registro_stock (
+            id SERIAL PRIMARY KEY,
+            producto_id INTEGER NOT NULL REFERENCES producto(id) ON DELETE CASCADE,
+            movimiento_id INTEGER REFERENCES movimiento_inventario(id) ON DELETE SET NULL,
+            delta INTEGER NOT NULL,
+            stock_resultante INTEGER NOT NULL,
+            motivo VARCHAR(30) NOT NULL,
+            fecha TIMESTAMP NOT NULL,
+            created TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+        )
+    """))
+    connection.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_registro_stock_producto_fecha
+        ON registro_stock(producto_id, fecha)
+    """))
+    connection.execute(text("""
+        CREATE INDEX IF NOT EXISTS idx_registro_stock_movimiento
+        ON registro_stock(movimiento_id)
+    """))
+
+    # Si el libro ya tiene asientos no se vuelve a cargar
+    if connection.execute(text("SELECT EXISTS (SELECT 1 FROM registro_stock)")).scalar():
+        return
+
+    # Saldo de apertura: inventario actual menos el efecto de los movimientos
+    connection.execute(text("""
+        INSERT INTO registro_stock (producto_id, delta, stock_resultante, motivo, fecha)
+        SELECT p.id,
+               COALESCE(p.inventario, 0) - COALESCE(m.neto, 0),
+               COALESCE(p.inventario, 0) - COALESCE(m.neto, 0),
+               'apertura',
+               COALESCE(m.primera_fecha, p.created::timestamp, NOW())
+        FROM producto p
+        LEFT JOIN (
+            SELECT producto_id,
+                   SUM(CASE tipo_transaccion
+                           WHEN 'entrada' THEN cantidad
+                           WHEN 'salida' THEN -cantidad
+                           ELSE 0 END) AS neto,
+                   MIN(fecha) AS primera_fecha
+            FROM movimiento_inventario
+            GROUP BY producto_id
+        ) m ON m.producto_id = p.id
+    """))
+
+    # Un asiento por movimiento existente, con stock acumulado
+    connection.execute(text("""
+        INSERT INTO registro_stock (producto_id, movimiento_id, delta, stock_resultante, motivo, fecha)
+        SELECT mv.producto_id, mv.id, mv.delta,
+               a.delta + SUM(mv.delta) OVER (PARTITION BY mv.producto_id ORDER BY mv.fecha, mv.id),
+               'movimiento', mv.fecha
+        FROM (
+            SELECT id, producto_id, COALESCE(fecha, created::timestamp) AS fecha,
+                   CASE tipo_transaccion
+                       WHEN 'entrada' THEN cantidad
+                       WHEN 'salida' THEN -cantidad
+                       ELSE 0 END AS delta
+            FROM movimiento_inventario
+            WHERE producto_id IS NOT NULL
+        ) mv
+        JOIN registro_stock a ON a.producto_id = mv.producto_id AND a.motivo = 'apertura'
+        WHERE mv.delta <> 0
+    """))
@@ -0,0 +1,41 @@
+-- Contador de cambios por proyecto para invalidar los snapshots del portal de clientes.
+-- Los triggers lo incrementan ante cualquier alta, baja o modificación de horas
+-- (reporte_laboral) o áridos (entrega_arido), incluido el cambio de proyecto.
+
+CREATE TABLE IF NOT EXISTS proyecto_version (
+    proyecto_id INTEGER PRIMARY KEY REFERENCES proyecto(id) ON DELETE CASCADE,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION incrementar_proyecto_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' AND OLD.proyecto_id IS NOT NULL THEN
+        INSERT INTO proyecto_version (proyecto_id, version, updated)
+        VALUES (OLD.proyecto_id, 1, NOW())
+        ON CONFLICT (proyecto_id) DO UPDATE
+        SET version = proyecto_version.version + 1, updated = NOW();
+    END IF;
+    IF TG_OP <> 'DELETE' AND NEW.proyecto_id IS NOT NULL
+       AND (TG_OP = 'INSERT' OR NEW.proyecto_id IS DISTINCT FROM OLD.proyecto_id) THEN
+        INSERT INTO proyecto_version (proyecto_id, version, updated)
+        VALUES (NEW.proyecto_id, 1, NOW())
+        ON CONFLICT (proyecto_id) DO UPDATE
+        SET version = proyecto_version.version + 1, updated = NOW();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_proyecto_version_reporte_laboral ON reporte_laboral;
+CREATE TRIGGER trigger_proyecto_version_reporte_laboral
+    AFTER INSERT OR DELETE OR UPDATE OF proyecto_id, maquina_id, horas_turno ON reporte_laboral
+    FOR EACH ROW
+    EXECUTE FUNCTION incrementar_proyecto_version();
+
+DROP TRIGGER IF EXISTS trigger_proyecto_version_entrega_arido ON entrega_arido;
+CREATE TRIGGER trigger_proyecto_version_entrega_arido
+    AFTER INSERT OR DELETE OR UPDATE OF proyecto_id, tipo_arido, cantidad ON entrega_arido
+    FOR EACH ROW
+    EXECUTE FUNCTION incrementar_proyecto_version();
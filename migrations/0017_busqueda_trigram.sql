@@ -0,0 +1,28 @@
+-- sin transaccion
+-- Índices trigram (pg_trgm) para la búsqueda unificada y los filtros ILIKE '%...%'.
+-- Se crean CONCURRENTLY para no bloquear escrituras en tablas con tráfico.
+-- Si un CREATE INDEX CONCURRENTLY se interrumpe deja un índice INVALID: borrarlo
+-- (DROP INDEX CONCURRENTLY) y volver a ejecutar la migración.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_maquina_nombre_trgm
+    ON maquina USING gin (nombre gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_proyecto_nombre_trgm
+    ON proyecto USING gin (nombre gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_proyecto_ubicacion_trgm
+    ON proyecto USING gin (ubicacion gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cliente_nombre_trgm
+    ON cliente USING gin (nombre gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cliente_email_trgm
+    ON cliente USING gin (email gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_producto_nombre_trgm
+    ON producto USING gin (nombre gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_producto_codigo_trgm
+    ON producto USING gin (codigo_producto gin_trgm_ops);
@@ -0,0 +1,16 @@
+"""
+Particionado mensual de entrega_arido, reporte_laboral y jornada_laboral
+(ver app/db/particiones.py). Los datos se copian por lotes con un trigger
+espejo, así que la migración puede correr con la aplicación levantada; cada
+tabla original queda como <tabla>_legacy hasta verificarla y borrarla a mano.
+"""
+
+from app.db.particiones import TABLAS_PARTICIONADAS, particionar_tabla
+
+# Cada lote y el reemplazo final usan su propia transacción
+TRANSACCIONAL = False
+
+
+def upgrade(connection):
+    for tabla in TABLAS_PARTICIONADAS:
+        particionar_tabla(connection.engine, tabla)
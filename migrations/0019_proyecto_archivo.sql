@@ -0,0 +1,18 @@
+-- Proyectos cerrados archivados en Parquet (app/services/archivo_frio_service.py)
+-- y el índice de sus reportes de cuenta corriente para las exportaciones.
+
+CREATE TABLE IF NOT EXISTS proyecto_archivo (
+    proyecto_id INTEGER PRIMARY KEY REFERENCES proyecto(id) ON DELETE CASCADE,
+    ruta VARCHAR(500) NOT NULL,
+    filas INTEGER NOT NULL DEFAULT 0,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    manifiesto TEXT,
+    archivado_en TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS reporte_archivado (
+    reporte_id INTEGER PRIMARY KEY,
+    proyecto_id INTEGER NOT NULL REFERENCES proyecto_archivo(proyecto_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_reporte_archivado_proyecto_id ON reporte_archivado(proyecto_id);
@@ -0,0 +1,23 @@
+-- Líneas con precio congeladas de cada reporte de cuenta corriente.
+-- Los reportes anteriores no tienen líneas y se siguen armando con los datos del período.
+
+CREATE TABLE IF NOT EXISTS reporte_linea (
+    id SERIAL PRIMARY KEY,
+    reporte_id INTEGER NOT NULL REFERENCES reportes_cuenta_corriente(id) ON DELETE CASCADE,
+    tipo VARCHAR(10) NOT NULL,
+    origen_id INTEGER NOT NULL,
+    maquina_id INTEGER,
+    etiqueta VARCHAR(255) NOT NULL,
+    fecha DATE NOT NULL,
+    cantidad DOUBLE PRECISION NOT NULL,
+    precio_unitario DOUBLE PRECISION NOT NULL,
+    precio_informado BOOLEAN NOT NULL,
+    importe DOUBLE PRECISION NOT NULL,
+    usuario_nombre VARCHAR(255),
+    pagado BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE INDEX IF NOT EXISTS idx_reporte_linea_reporte_id ON reporte_linea(reporte_id, tipo);
+CREATE INDEX IF NOT EXISTS idx_reporte_linea_origen ON reporte_linea(tipo, origen_id);
+
+COMMENT ON TABLE reporte_linea IS 'Líneas con precio congeladas al crear cada reporte de cuenta corriente';
@@ -0,0 +1,26 @@
+-- Corridas de facturación por lote (app/services/facturacion_lote_service.py)
+
+CREATE TABLE IF NOT EXISTS lote_facturacion (
+    id SERIAL PRIMARY KEY,
+    periodo_inicio DATE NOT NULL,
+    periodo_fin DATE NOT NULL,
+    estado VARCHAR(20) NOT NULL DEFAULT 'en_curso',
+    total_proyectos INTEGER NOT NULL DEFAULT 0,
+    procesados INTEGER NOT NULL DEFAULT 0,
+    reportes_creados INTEGER NOT NULL DEFAULT 0,
+    omitidos INTEGER NOT NULL DEFAULT 0,
+    errores INTEGER NOT NULL DEFAULT 0,
+    importe_total NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    resultados TEXT,
+    iniciado TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    actualizado TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    finalizado TIMESTAMP WITH TIME ZONE
+);
+
+-- Una sola corrida en curso por período
+CREATE UNIQUE INDEX IF NOT EXISTS uq_lote_facturacion_en_curso
+    ON lote_facturacion(periodo_inicio, periodo_fin) WHERE estado = 'en_curso';
+
+-- Reportes de un proyecto para un período (proyectos ya facturados)
+CREATE INDEX IF NOT EXISTS idx_reportes_cc_proyecto_periodo
+    ON reportes_cuenta_corriente(proyecto_id, periodo_inicio, periodo_fin);
@@ -0,0 +1,59 @@
+-- Catálogo de precios con vigencia (app/services/precio_catalogo_service.py).
+-- Reemplaza los diccionarios PRECIOS_ARIDOS y TARIFAS_MAQUINAS de
+-- cuenta_corriente_service; se cargan sus valores como vigentes desde siempre.
+
+CREATE TABLE IF NOT EXISTS precio_catalogo (
+    id SERIAL PRIMARY KEY,
+    categoria VARCHAR(20) NOT NULL,
+    clave VARCHAR(255) NOT NULL,
+    precio NUMERIC(14, 2) NOT NULL,
+    vigente_desde DATE NOT NULL,
+    vigente_hasta DATE,
+    created TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_precio_catalogo_vigencia UNIQUE (categoria, clave, vigente_desde),
+    CONSTRAINT ck_precio_catalogo_intervalo CHECK (vigente_hasta IS NULL OR vigente_hasta > vigente_desde)
+);
+
+-- Versión única del catálogo: cada worker la consulta para saber si recargar su copia
+CREATE TABLE IF NOT EXISTS precio_catalogo_version (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 0,
+    updated TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+INSERT INTO precio_catalogo_version (id, version) VALUES (1, 0)
+ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION incrementar_precio_catalogo_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE precio_catalogo_version SET version = version + 1, updated = NOW() WHERE id = 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_precio_catalogo_version ON precio_catalogo;
+CREATE TRIGGER trigger_precio_catalogo_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON precio_catalogo
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION incrementar_precio_catalogo_version();
+
+INSERT INTO precio_catalogo (categoria, clave, precio, vigente_desde) VALUES
+    ('arido', 'Arena Fina', 54000.0, DATE '2000-01-01'),
+    ('arido', 'Granza', 54000.0, DATE '2000-01-01'),
+    ('arido', 'Arena Común', 33680.0, DATE '2000-01-01'),
+    ('arido', 'Relleno', 16000.0, DATE '2000-01-01'),
+    ('arido', 'Tierra Negra', 16000.0, DATE '2000-01-01'),
+    ('arido', 'Piedra', 12000.0, DATE '2000-01-01'),
+    ('arido', '0.20', 8000.0, DATE '2000-01-01'),
+    ('arido', 'Blinder', 10000.0, DATE '2000-01-01'),
+    ('arido', 'Arena Lavada', 33680.0, DATE '2000-01-01'),
+    ('maquina', 'default', 15000.0, DATE '2000-01-01'),
+    ('maquina', 'BOBCAT 2018 S650.', 700000, DATE '2000-01-01'),
+    ('maquina', 'BOBCAT S530 2017', 700000, DATE '2000-01-01'),
+    ('maquina', 'EXCAVADORA 2020 SANY EU50.', 100000, DATE '2000-01-01'),
+    ('maquina', 'EXCAVADORA 2023 XCMG E60.', 100000, DATE '2000-01-01'),
+    ('maquina', 'EXCAVADORA 2022 LONKING 6150.', 150000, DATE '2000-01-01'),
+    ('maquina', 'EXCAVADORA 2015 LONKING 6150.', 150000, DATE '2000-01-01'),
+    ('maquina', 'PALA 2022 SINOMACH 933.', 100000, DATE '2000-01-01')
+ON CONFLICT (categoria, clave, vigente_desde) DO NOTHING;
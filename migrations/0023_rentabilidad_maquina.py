@@ -0,0 +1,238 @@
+"""
+Rollup mensual de rentabilidad por máquina (app/services/rentabilidad_maquina_service.py):
+horas facturables e importe de reporte_laboral, gastos (combustible y otros)
+y costo de mantenimientos. Los triggers lo mantienen ante cualquier alta, baja
+o modificación; la carga inicial incluye las horas de proyectos ya archivados.
+
+La carga está escrita acá y no importa el servicio, para que la migración no
+cambie cuando cambie el código de la aplicación.
+"""
+
+from collections import defaultdict
+from pathlib import Path
+
+from sqlalchemy import text
+
+SQL = """
+CREATE TABLE IF NOT EXISTS rentabilidad_maquina_mensual (
+    maquina_id INTEGER NOT NULL REFERENCES maquina(id) ON DELETE CASCADE,
+    mes DATE NOT NULL,
+    horas NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    horas_sin_tarifa NUMERIC(14, 2) NOT NULL DEFAULT 0,
+    importe_horas NUMERIC(16, 2) NOT NULL DEFAULT 0,
+    gasto_combustible NUMERIC(16, 2) NOT NULL DEFAULT 0,
+    gasto_otros NUMERIC(16, 2) NOT NULL DEFAULT 0,
+    costo_mantenimiento NUMERIC(16, 2) NOT NULL DEFAULT 0,
+    updated TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (maquina_id, mes)
+);
+
+CREATE INDEX IF NOT EXISTS idx_rentabilidad_maquina_mes ON rentabilidad_maquina_mensual(mes);
+
+CREATE OR REPLACE FUNCTION acumular_rentabilidad_maquina(
+    p_maquina_id INTEGER, p_fecha TIMESTAMP, p_horas NUMERIC, p_horas_sin_tarifa NUMERIC,
+    p_importe_horas NUMERIC, p_combustible NUMERIC, p_otros NUMERIC, p_mantenimiento NUMERIC
+) RETURNS VOID AS $$
+BEGIN
+    IF p_maquina_id IS NULL OR p_fecha IS NULL THEN
+        RETURN;
+    END IF;
+    INSERT INTO rentabilidad_maquina_mensual AS r (
+        maquina_id, mes, horas, horas_sin_tarifa, importe_horas,
+        gasto_combustible, gasto_otros, costo_mantenimiento
+    )
+    VALUES (
+        p_maquina_id, date_trunc('month', p_fecha)::date, p_horas, p_horas_sin_tarifa, p_importe_horas,
+        p_combustible, p_otros, p_mantenimiento
+    )
+    ON CONFLICT (maquina_id, mes) DO UPDATE SET
+        horas = r.horas + EXCLUDED.horas,
+        horas_sin_tarifa = r.horas_sin_tarifa + EXCLUDED.horas_sin_tarifa,
+        importe_horas = r.importe_horas + EXCLUDED.importe_horas,
+        gasto_combustible = r.gasto_combustible + EXCLUDED.gasto_combustible,
+        gasto_otros = r.gasto_otros + EXCLUDED.gasto_otros,
+        costo_mantenimiento = r.costo_mantenimiento + EXCLUDED.costo_mantenimiento,
+        updated = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- El archivo frío mueve filas de reporte_laboral sin que dejen de contar:
+-- con kedikian.conservar_rollups = 'on' (SET LOCAL) los triggers no las tocan
+CREATE OR REPLACE FUNCTION rentabilidad_reporte_laboral()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF current_setting('kedikian.conservar_rollups', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM acumular_rentabilidad_maquina(
+            OLD.maquina_id, OLD.fecha_asignacion,
+            -COALESCE(OLD.horas_turno, 0),
+            -CASE WHEN OLD.tarifa_hora IS NULL THEN COALESCE(OLD.horas_turno, 0) ELSE 0 END,
+            -COALESCE(ROUND((OLD.horas_turno * OLD.tarifa_hora)::numeric, 2), 0),
+            0, 0, 0
+        );
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM acumular_rentabilidad_maquina(
+            NEW.maquina_id, NEW.fecha_asignacion,
+            COALESCE(NEW.horas_turno, 0),
+            CASE WHEN NEW.tarifa_hora IS NULL THEN COALESCE(NEW.horas_turno, 0) ELSE 0 END,
+            COALESCE(ROUND((NEW.horas_turno * NEW.tarifa_hora)::numeric, 2), 0),
+            0, 0, 0
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION rentabilidad_gasto()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM acumular_rentabilidad_maquina(
+            OLD.maquina_id, OLD.fecha, 0, 0, 0,
+            -CASE WHEN OLD.tipo = 'Combustible' THEN ROUND(COALESCE(OLD.importe_total, 0)::numeric, 2) ELSE 0 END,
+            -CASE WHEN OLD.tipo = 'Combustible' THEN 0 ELSE ROUND(COALESCE(OLD.importe_total, 0)::numeric, 2) END,
+            0
+        );
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM acumular_rentabilidad_maquina(
+            NEW.maquina_id, NEW.fecha, 0, 0, 0,
+            CASE WHEN NEW.tipo = 'Combustible' THEN ROUND(COALESCE(NEW.importe_total, 0)::numeric, 2) ELSE 0 END,
+            CASE WHEN NEW.tipo = 'Combustible' THEN 0 ELSE ROUND(COALESCE(NEW.importe_total, 0)::numeric, 2) END,
+            0
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION rentabilidad_mantenimiento()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM acumular_rentabilidad_maquina(
+            OLD.maquina_id, OLD.fecha_mantenimiento::timestamp, 0, 0, 0, 0, 0,
+            -ROUND(COALESCE(OLD.costo, 0)::numeric, 2)
+        );
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM acumular_rentabilidad_maquina(
+            NEW.maquina_id, NEW.fecha_mantenimiento::timestamp, 0, 0, 0, 0, 0,
+            ROUND(COALESCE(NEW.costo, 0)::numeric, 2)
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_rentabilidad_reporte_laboral ON reporte_laboral;
+CREATE TRIGGER trigger_rentabilidad_reporte_laboral
+    AFTER INSERT OR DELETE OR UPDATE OF maquina_id, fecha_asignacion, horas_turno, tarifa_hora ON reporte_laboral
+    FOR EACH ROW
+    EXECUTE FUNCTION rentabilidad_reporte_laboral();
+
+DROP TRIGGER IF EXISTS trigger_rentabilidad_gasto ON gasto;
+CREATE TRIGGER trigger_rentabilidad_gasto
+    AFTER INSERT OR DELETE OR UPDATE OF maquina_id, fecha, tipo, importe_total ON gasto
+    FOR EACH ROW
+    EXECUTE FUNCTION rentabilidad_gasto();
+
+DROP TRIGGER IF EXISTS trigger_rentabilidad_mantenimiento ON mantenimiento;
+CREATE TRIGGER trigger_rentabilidad_mantenimiento
+    AFTER INSERT OR DELETE OR UPDATE OF maquina_id, fecha_mantenimiento, costo ON mantenimiento
+    FOR EACH ROW
+    EXECUTE FUNCTION rentabilidad_mantenimiento();
+"""
+
+# Mismas cuentas (y redondeo por fila) que los triggers
+SQL_CARGA = """
+DELETE FROM rentabilidad_maquina_mensual;
+
+INSERT INTO rentabilidad_maquina_mensual (
+    maquina_id, mes, horas, horas_sin_tarifa, importe_horas,
+    gasto_combustible, gasto_otros, costo_mantenimiento
+)
+SELECT maquina_id, mes, SUM(horas), SUM(horas_sin_tarifa), SUM(importe_horas),
+       SUM(gasto_combustible), SUM(gasto_otros), SUM(costo_mantenimiento)
+FROM (
+    SELECT maquina_id, date_trunc('month', fecha_asignacion)::date AS mes,
+           COALESCE(horas_turno, 0) AS horas,
+           CASE WHEN tarifa_hora IS NULL THEN COALESCE(horas_turno, 0) ELSE 0 END AS horas_sin_tarifa,
+           COALESCE(ROUND((horas_turno * tarifa_hora)::numeric, 2), 0) AS importe_horas,
+           0 AS gasto_combustible, 0 AS gasto_otros, 0 AS costo_mantenimiento
+    FROM reporte_laboral
+    WHERE maquina_id IS NOT NULL AND fecha_asignacion IS NOT NULL
+    UNION ALL
+    SELECT maquina_id, date_trunc('month', fecha)::date, 0, 0, 0,
+           CASE WHEN tipo = 'Combustible' THEN ROUND(COALESCE(importe_total, 0)::numeric, 2) ELSE 0 END,
+           CASE WHEN tipo = 'Combustible' THEN 0 ELSE ROUND(COALESCE(importe_total, 0)::numeric, 2) END,
+           0
+    FROM gasto
+    WHERE maquina_id IS NOT NULL AND fecha IS NOT NULL
+    UNION ALL
+    SELECT maquina_id, date_trunc('month', fecha_mantenimiento::timestamp)::date, 0, 0, 0, 0, 0,
+           ROUND(COALESCE(costo, 0)::numeric, 2)
+    FROM mantenimiento
+    WHERE maquina_id IS NOT NULL AND fecha_mantenimiento IS NOT NULL
+) movimientos
+WHERE maquina_id IN (SELECT id FROM maquina)
+GROUP BY maquina_id, mes;
+"""
+
+SQL_SUMAR_ARCHIVADAS = """
+INSERT INTO rentabilidad_maquina_mensual AS r (
+    maquina_id, mes, horas, horas_sin_tarifa, importe_horas,
+    gasto_combustible, gasto_otros, costo_mantenimiento
+)
+SELECT :maquina_id, :mes, :horas, :horas_sin_tarifa, :importe_horas, 0, 0, 0
+WHERE EXISTS (SELECT 1 FROM maquina WHERE id = :maquina_id)
+ON CONFLICT (maquina_id, mes) DO UPDATE SET
+    horas = r.horas + EXCLUDED.horas,
+    horas_sin_tarifa = r.horas_sin_tarifa + EXCLUDED.horas_sin_tarifa,
+    importe_horas = r.importe_horas + EXCLUDED.importe_horas
+"""
+
+
+def _horas_archivadas(ruta: Path):
+    """Horas del reporte_laboral.parquet de un proyecto archivado, por máquina y mes"""
+    import pyarrow.parquet as pq
+
+    columnas = ["maquina_id", "fecha_asignacion", "horas_turno", "tarifa_hora"]
+    meses = defaultdict(lambda: {"horas": 0, "horas_sin_tarifa": 0, "importe_horas": 0.0})
+    for fila in pq.read_table(ruta / "reporte_laboral.parquet", columns=columnas).to_pylist():
+        if fila["maquina_id"] is None or fila["fecha_asignacion"] is None:
+            continue
+        mes = meses[(fila["maquina_id"], fila["fecha_asignacion"].date().replace(day=1))]
+        horas = fila["horas_turno"] or 0
+        mes["horas"] += horas
+        if fila["tarifa_hora"] is None:
+            mes["horas_sin_tarifa"] += horas
+        elif fila["horas_turno"] is not None:
+            mes["importe_horas"] += round(fila["horas_turno"] * fila["tarifa_hora"], 2)
+    return [
+        {"maquina_id": maquina_id, "mes": mes, **{c: round(v, 2) for c, v in valores.items()}}
+        for (maquina_id, mes), valores in meses.items()
+    ]
+
+
+def upgrade(connection):
+    connection.exec_driver_sql(SQL)
+    connection.exec_driver_sql(SQL_CARGA)
+
+    # Las horas de proyectos ya archivados están en sus Parquet, no en reporte_laboral
+    archivados = connection.exec_driver_sql("SELECT ruta FROM proyecto_archivo ORDER BY proyecto_id").scalars().all()
+    if not archivados:
+        return
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise RuntimeError(
+            f"Hay {len(archivados)} proyectos en el archivo frío: la migración requiere pyarrow para sumar sus horas"
+        )
+    for ruta in archivados:
+        filas = _horas_archivadas(Path(ruta))
+        if filas:
+            connection.execute(text(SQL_SUMAR_ARCHIVADAS), filas)
@@ -0,0 +1,11 @@
+-- Resultados compartidos entre workers por la coalescencia de lecturas (app/core/coalescencia.py)
+-- UNLOGGED: son datos de vida corta que se pueden perder en un reinicio.
+
+CREATE UNLOGGED TABLE IF NOT EXISTS resultado_compartido (
+    clave TEXT PRIMARY KEY,
+    valor BYTEA NOT NULL,
+    creado TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT clock_timestamp(),
+    vence TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_resultado_compartido_vence ON resultado_compartido(vence);
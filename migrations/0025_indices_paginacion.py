@@ -0,0 +1,59 @@
+"""
+Índices con el orden de la paginación por keyset (app/core/paginacion.py):
+(fecha DESC NULLS LAST, id DESC), los más recientes primero.
+
+Se crean CONCURRENTLY para no bloquear escrituras en tablas con tráfico. En las
+tablas particionadas (app/db/particiones.py) no se puede usar CONCURRENTLY
+sobre la tabla: el índice se crea ON ONLY en la particionada (vacío, INVALID),
+se construye CONCURRENTLY en cada partición y se adjunta con ATTACH PARTITION;
+al adjuntar la última queda válido. Las particiones que se creen después
+heredan el índice.
+
+Si un CREATE INDEX CONCURRENTLY se interrumpe deja un índice INVALID: borrarlo
+(DROP INDEX CONCURRENTLY) y volver a ejecutar la migración.
+"""
+
+from sqlalchemy import text
+
+from app.db.particiones import es_particionada, listar_particiones
+
+# CREATE INDEX CONCURRENTLY no puede ir en una transacción
+TRANSACCIONAL = False
+
+# Tabla -> columna de fecha de la paginación
+INDICES = {
+    "reporte_laboral": "fecha_asignacion",
+    "entrega_arido": "fecha_entrega",
+    "gasto": "fecha",
+    "mantenimiento": "fecha_mantenimiento",
+}
+
+
+def _tiene_indice_adjunto(connection, particion: str, padre: str) -> bool:
+    """La partición ya tiene un índice adjuntado a `padre` (las creadas después lo heredan)"""
+    return connection.execute(text("""
+        SELECT EXISTS (
+            SELECT 1 FROM pg_inherits h
+            JOIN pg_index i ON i.indexrelid = h.inhrelid
+            WHERE h.inhparent = to_regclass(:padre) AND i.indrelid = to_regclass(:particion)
+        )
+    """), {"particion": f"public.{particion}", "padre": f"public.{padre}"}).scalar()
+
+
+def upgrade(connection):
+    for tabla, columna in INDICES.items():
+        indice = f"idx_{tabla}_paginacion"
+        columnas = f"({columna} DESC NULLS LAST, id DESC)"
+        if not es_particionada(connection, tabla):
+            connection.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {indice} ON {tabla} {columnas}"))
+            continue
+
+        connection.execute(text(f"CREATE INDEX IF NOT EXISTS {indice} ON ONLY {tabla} {columnas}"))
+        for particion in listar_particiones(connection, tabla):
+            if _tiene_indice_adjunto(connection, particion["nombre"], indice):
+                continue
+            indice_particion = f"{particion['nombre']}_paginacion"[:63]
+            connection.execute(text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {indice_particion} ON {particion['nombre']} {columnas}"
+            ))
+            connection.execute(text(f"ALTER INDEX {indice} ATTACH PARTITION {indice_particion}"))
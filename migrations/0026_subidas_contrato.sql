@@ -0,0 +1,20 @@
+-- Subidas de contratos por partes y deduplicación por contenido
+-- (app/services/subida_contrato_service.py)
+
+ALTER TABLE contrato_archivo
+ADD COLUMN IF NOT EXISTS sha256 VARCHAR(64) NULL;
+
+CREATE INDEX IF NOT EXISTS idx_contrato_archivo_sha256 ON contrato_archivo(sha256);
+
+-- Subidas reanudables en curso; los bytes están en uploads/.tmp/{id}.part
+CREATE TABLE IF NOT EXISTS subida_contrato (
+    id VARCHAR(32) PRIMARY KEY,
+    proyecto_id INTEGER NOT NULL REFERENCES proyecto(id) ON DELETE CASCADE,
+    nombre_archivo VARCHAR(255) NOT NULL,
+    tipo_archivo VARCHAR(100) NOT NULL,
+    tamaño_total BIGINT NOT NULL,
+    recibido BIGINT NOT NULL DEFAULT 0,
+    sha256_esperado VARCHAR(64) NULL,
+    creado TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    actualizado TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
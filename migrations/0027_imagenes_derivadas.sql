@@ -0,0 +1,13 @@
+-- Hash del contenido de las imágenes de productos y gastos: nombra sus derivados
+-- WebP en disco (app/core/imagenes.py)
+
+ALTER TABLE producto
+ADD COLUMN IF NOT EXISTS imagen_sha256 VARCHAR(64) NULL;
+
+ALTER TABLE gasto
+ADD COLUMN IF NOT EXISTS imagen_sha256 VARCHAR(64) NULL;
+
+-- Los comprobantes ya guardados; los productos existentes se completan al pedir su imagen
+UPDATE gasto
+SET imagen_sha256 = encode(sha256(imagen), 'hex')
+WHERE imagen IS NOT NULL AND imagen_sha256 IS NULL;
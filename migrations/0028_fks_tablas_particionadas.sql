@@ -0,0 +1,69 @@
+-- Reparación del particionado de 0018 en bases ya convertidas:
+-- 1. CREATE TABLE ... (LIKE ...) no copia FKs: las de entrega_arido, reporte_laboral
+--    y jornada_laboral hacia proyecto, usuario y maquina se perdieron al reemplazar
+--    la tabla. Se vuelven a crear en la particionada (si hay filas huérfanas
+--    de mientras tanto, la migración falla indicando cuáles).
+-- 2. Las copias <tabla>_legacy conservaban esas FKs: se quitan para que no frenen
+--    borrados en las tablas referidas.
+-- 3. Los triggers que reemplazan las FKs entrantes verificaban la fila sin
+--    lockearla: ahora toman FOR KEY SHARE, como una FK.
+
+DO $$
+DECLARE
+    fk RECORD;
+BEGIN
+    FOR fk IN
+        SELECT * FROM (VALUES
+            ('entrega_arido', 'entrega_arido_proyecto_id_fkey', 'FOREIGN KEY (proyecto_id) REFERENCES proyecto(id)'),
+            ('entrega_arido', 'entrega_arido_usuario_id_fkey', 'FOREIGN KEY (usuario_id) REFERENCES usuario(id)'),
+            ('reporte_laboral', 'reporte_laboral_maquina_id_fkey', 'FOREIGN KEY (maquina_id) REFERENCES maquina(id)'),
+            ('reporte_laboral', 'reporte_laboral_proyecto_id_fkey', 'FOREIGN KEY (proyecto_id) REFERENCES proyecto(id)'),
+            ('reporte_laboral', 'reporte_laboral_usuario_id_fkey', 'FOREIGN KEY (usuario_id) REFERENCES usuario(id)'),
+            ('jornada_laboral', 'jornada_laboral_usuario_id_fkey', 'FOREIGN KEY (usuario_id) REFERENCES usuario(id)')
+        ) AS f(tabla, nombre, definicion)
+    LOOP
+        IF to_regclass('public.' || fk.tabla || '_legacy') IS NOT NULL THEN
+            EXECUTE 'ALTER TABLE ' || quote_ident(fk.tabla || '_legacy')
+                || ' DROP CONSTRAINT IF EXISTS ' || quote_ident(fk.nombre);
+        END IF;
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_constraint
+            WHERE conrelid = to_regclass('public.' || fk.tabla) AND conname = fk.nombre
+        ) THEN
+            EXECUTE 'ALTER TABLE ' || quote_ident(fk.tabla)
+                || ' ADD CONSTRAINT ' || quote_ident(fk.nombre) || ' ' || fk.definicion;
+        END IF;
+    END LOOP;
+END $$;
+
+DO $$
+DECLARE
+    fk RECORD;
+BEGIN
+    FOR fk IN
+        SELECT * FROM (VALUES
+            ('reporte_laboral', 'horometro_historial', 'reporte_laboral_id', 'horometro_historial_reporte_laboral_id_fkey_chk'),
+            ('entrega_arido', 'reporte_items_aridos', 'entrega_arido_id', 'reporte_items_aridos_entrega_arido_id_fkey_chk'),
+            ('reporte_laboral', 'reporte_items_horas', 'reporte_laboral_id', 'reporte_items_horas_reporte_laboral_id_fkey_chk')
+        ) AS f(tabla, referente, columna, funcion)
+    LOOP
+        IF to_regproc('public.' || fk.funcion) IS NOT NULL THEN
+            EXECUTE 'CREATE OR REPLACE FUNCTION ' || quote_ident(fk.funcion) || '() RETURNS TRIGGER AS $b$
+                BEGIN
+                    IF NEW.' || quote_ident(fk.columna) || ' IS NULL THEN
+                        RETURN NEW;
+                    END IF;
+                    -- Como una FK: el lock impide que un borrado concurrente deje la fila huérfana
+                    PERFORM 1 FROM ' || quote_ident(fk.tabla) || ' WHERE id = NEW.' || quote_ident(fk.columna) || ' FOR KEY SHARE;
+                    IF NOT FOUND THEN
+                        RAISE EXCEPTION USING
+                            MESSAGE = ' || quote_literal(fk.referente || '.' || fk.columna || '=') || ' || NEW.' || quote_ident(fk.columna)
+                                || ' || ' || quote_literal(' no existe en ' || fk.tabla) || ',
+                            ERRCODE = ''foreign_key_violation'';
+                    END IF;
+                    RETURN NEW;
+                END;
+                $b$ LANGUAGE plpgsql';
+        END IF;
+    END LOOP;
+END $$;
@@ -0,0 +1,147 @@
+"""
+Cubo analítico: que un rango se lea de un rollup o de la tabla base no cambie
+el resultado (app/services/analitica_service.py).
+
+1. horas_archivadas: horas de los proyectos en el archivo frío agregadas por
+   proyecto, máquina, usuario y día. Los rollups (uso_maquina_*,
+   rentabilidad_maquina_mensual) conservan esas horas; con esta tabla la
+   consulta base también las ve. Se carga desde los Parquet de los proyectos
+   ya archivados.
+2. fecha_local(): día calendario de las columnas TIMESTAMP WITH TIME ZONE
+   (mantenimiento.fecha_mantenimiento) en la zona del negocio, fija. El
+   trigger de rentabilidad usaba la zona de la sesión que escribía y el cubo
+   la de la sesión que lee; ahora los dos usan esta función y se recalcula
+   costo_mantenimiento del rollup.
+"""
+
+from collections import defaultdict
+from pathlib import Path
+
+from sqlalchemy import text
+
+ZONA_HORARIA = "America/Argentina/Buenos_Aires"
+
+SQL = f"""
+CREATE OR REPLACE FUNCTION fecha_local(valor TIMESTAMP WITH TIME ZONE)
+RETURNS TIMESTAMP AS $$
+    SELECT valor AT TIME ZONE '{ZONA_HORARIA}'
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE TABLE IF NOT EXISTS horas_archivadas (
+    id SERIAL PRIMARY KEY,
+    proyecto_id INTEGER NOT NULL REFERENCES proyecto_archivo(proyecto_id) ON DELETE CASCADE,
+    maquina_id INTEGER NOT NULL,
+    usuario_id INTEGER,
+    fecha DATE,
+    registros INTEGER NOT NULL,
+    horas NUMERIC(14, 2) NOT NULL,
+    horas_sin_tarifa NUMERIC(14, 2) NOT NULL,
+    importe DOUBLE PRECISION NOT NULL,
+    importe_horas NUMERIC(16, 2) NOT NULL,
+    horometro_min DOUBLE PRECISION,
+    horometro_max DOUBLE PRECISION
+);
+
+CREATE INDEX IF NOT EXISTS idx_horas_archivadas_maquina_fecha ON horas_archivadas(maquina_id, fecha);
+CREATE INDEX IF NOT EXISTS idx_horas_archivadas_proyecto ON horas_archivadas(proyecto_id);
+
+CREATE OR REPLACE FUNCTION rentabilidad_mantenimiento()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM acumular_rentabilidad_maquina(
+            OLD.maquina_id, fecha_local(OLD.fecha_mantenimiento), 0, 0, 0, 0, 0,
+            -ROUND(COALESCE(OLD.costo, 0)::numeric, 2)
+        );
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        PERFORM acumular_rentabilidad_maquina(
+            NEW.maquina_id, fecha_local(NEW.fecha_mantenimiento), 0, 0, 0, 0, 0,
+            ROUND(COALESCE(NEW.costo, 0)::numeric, 2)
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Mantenimientos que caen cerca de la medianoche pueden cambiar de mes
+SQL_COSTO_MANTENIMIENTO = """
+UPDATE rentabilidad_maquina_mensual SET costo_mantenimiento = 0, updated = NOW()
+WHERE costo_mantenimiento <> 0;
+
+INSERT INTO rentabilidad_maquina_mensual AS r (
+    maquina_id, mes, horas, horas_sin_tarifa, importe_horas,
+    gasto_combustible, gasto_otros, costo_mantenimiento
+)
+SELECT maquina_id, date_trunc('month', fecha_local(fecha_mantenimiento))::date, 0, 0, 0, 0, 0,
+       SUM(ROUND(COALESCE(costo, 0)::numeric, 2))
+FROM mantenimiento
+WHERE maquina_id IN (SELECT id FROM maquina) AND fecha_mantenimiento IS NOT NULL
+GROUP BY 1, 2
+ON CONFLICT (maquina_id, mes) DO UPDATE SET
+    costo_mantenimiento = EXCLUDED.costo_mantenimiento,
+    updated = NOW();
+"""
+
+SQL_INSERTAR = """
+INSERT INTO horas_archivadas (
+    proyecto_id, maquina_id, usuario_id, fecha, registros, horas, horas_sin_tarifa,
+    importe, importe_horas, horometro_min, horometro_max
+) VALUES (
+    :proyecto_id, :maquina_id, :usuario_id, :fecha, :registros, :horas, :horas_sin_tarifa,
+    :importe, :importe_horas, :horometro_min, :horometro_max
+)
+"""
+
+
+def _horas_archivadas(proyecto_id: int, ruta: Path):
+    """Agrega el reporte_laboral.parquet de un proyecto archivado como lo hace archivar_proyecto"""
+    import pyarrow.parquet as pq
+
+    columnas = ["maquina_id", "usuario_id", "fecha_asignacion", "horas_turno", "tarifa_hora", "horometro_inicial"]
+    grupos = defaultdict(lambda: {
+        "registros": 0, "horas": 0, "horas_sin_tarifa": 0, "importe": 0.0, "importe_horas": 0.0,
+        "horometro_min": None, "horometro_max": None
+    })
+    for fila in pq.read_table(ruta / "reporte_laboral.parquet", columns=columnas).to_pylist():
+        if fila["maquina_id"] is None:
+            continue
+        fecha = fila["fecha_asignacion"].date() if fila["fecha_asignacion"] else None
+        grupo = grupos[(fila["maquina_id"], fila["usuario_id"], fecha)]
+        horas = fila["horas_turno"] or 0
+        grupo["registros"] += 1
+        grupo["horas"] += horas
+        if fila["tarifa_hora"] is None:
+            grupo["horas_sin_tarifa"] += horas
+        elif fila["horas_turno"] is not None:
+            grupo["importe"] += fila["horas_turno"] * fila["tarifa_hora"]
+            grupo["importe_horas"] += round(fila["horas_turno"] * fila["tarifa_hora"], 2)
+        if fila["horometro_inicial"] is not None:
+            grupo["horometro_min"] = min(x for x in (grupo["horometro_min"], fila["horometro_inicial"]) if x is not None)
+            grupo["horometro_max"] = max(x for x in (grupo["horometro_max"], fila["horometro_inicial"]) if x is not None)
+    return [
+        {"proyecto_id": proyecto_id, "maquina_id": maquina_id, "usuario_id": usuario_id, "fecha": fecha, **valores}
+        for (maquina_id, usuario_id, fecha), valores in grupos.items()
+    ]
+
+
+def upgrade(connection):
+    connection.exec_driver_sql(SQL)
+    connection.exec_driver_sql(SQL_COSTO_MANTENIMIENTO)
+
+    if connection.execute(text("SELECT EXISTS (SELECT 1 FROM horas_archivadas)")).scalar():
+        return
+    archivados = connection.execute(text("SELECT proyecto_id, ruta FROM proyecto_archivo ORDER BY proyecto_id")).all()
+    if not archivados:
+        return
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise RuntimeError(
+            f"Hay {len(archivados)} proyectos en el archivo frío: la migración requiere pyarrow para cargar sus horas"
+        )
+    for proyecto_id, ruta in archivados:
+        filas = _horas_archivadas(proyecto_id, Path(ruta))
+        if filas:
+            connection.execute(text(SQL_INSERTAR), filas)
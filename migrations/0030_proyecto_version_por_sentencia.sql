@@ -0,0 +1,125 @@
+-- proyecto_version (0016) se incrementaba con un trigger por fila: cada fila
+-- insertada hacía un upsert sobre la fila de su proyecto, así que una carga
+-- masiva actualizaba la misma fila miles de veces bajo el lock.
+-- Ahora son triggers por sentencia con tablas de transición: un solo upsert
+-- por proyecto tocado y por sentencia, en orden de proyecto_id.
+-- PostgreSQL no admite tablas de transición con varios eventos ni con UPDATE OF
+-- columnas, así que hay un trigger por evento y el filtro de columnas del
+-- UPDATE va en la función.
+-- Además, renombrar una máquina invalida los proyectos con horas de esa máquina
+-- (el portal muestra las horas por nombre de máquina).
+
+CREATE OR REPLACE FUNCTION incrementar_versiones_proyectos(proyectos INTEGER[])
+RETURNS VOID AS $$
+    INSERT INTO proyecto_version (proyecto_id, version, updated)
+    SELECT DISTINCT p, 1, NOW() FROM unnest(proyectos) AS p
+    WHERE p IS NOT NULL
+    ORDER BY 1
+    ON CONFLICT (proyecto_id) DO UPDATE
+    SET version = proyecto_version.version + 1, updated = NOW();
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION proyecto_version_alta()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM incrementar_versiones_proyectos(ARRAY(SELECT proyecto_id FROM nuevas));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION proyecto_version_baja()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM incrementar_versiones_proyectos(ARRAY(SELECT proyecto_id FROM viejas));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION proyecto_version_cambio_reporte_laboral()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM incrementar_versiones_proyectos(ARRAY(
+        SELECT unnest(ARRAY[v.proyecto_id, n.proyecto_id])
+        FROM viejas v
+        JOIN nuevas n ON n.id = v.id
+        WHERE (n.proyecto_id, n.maquina_id, n.horas_turno) IS DISTINCT FROM (v.proyecto_id, v.maquina_id, v.horas_turno)
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION proyecto_version_cambio_entrega_arido()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM incrementar_versiones_proyectos(ARRAY(
+        SELECT unnest(ARRAY[v.proyecto_id, n.proyecto_id])
+        FROM viejas v
+        JOIN nuevas n ON n.id = v.id
+        WHERE (n.proyecto_id, n.tipo_arido, n.cantidad) IS DISTINCT FROM (v.proyecto_id, v.tipo_arido, v.cantidad)
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION proyecto_version_cambio_maquina()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM incrementar_versiones_proyectos(ARRAY(
+        SELECT DISTINCT r.proyecto_id
+        FROM reporte_laboral r
+        WHERE r.maquina_id IN (
+            SELECT n.id FROM nuevas n
+            JOIN viejas v ON v.id = n.id
+            WHERE n.nombre IS DISTINCT FROM v.nombre
+        )
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- En las tablas particionadas, borrar el trigger de la tabla borra los de las particiones
+DROP TRIGGER IF EXISTS trigger_proyecto_version_reporte_laboral ON reporte_laboral;
+DROP TRIGGER IF EXISTS trigger_proyecto_version_entrega_arido ON entrega_arido;
+DROP FUNCTION IF EXISTS incrementar_proyecto_version();
+
+CREATE TRIGGER trigger_proyecto_version_reporte_laboral_alta
+    AFTER INSERT ON reporte_laboral
+    REFERENCING NEW TABLE AS nuevas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION proyecto_version_alta();
+
+CREATE TRIGGER trigger_proyecto_version_reporte_laboral_baja
+    AFTER DELETE ON reporte_laboral
+    REFERENCING OLD TABLE AS viejas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION proyecto_version_baja();
+
+CREATE TRIGGER trigger_proyecto_version_reporte_laboral_cambio
+    AFTER UPDATE ON reporte_laboral
+    REFERENCING OLD TABLE AS viejas NEW TABLE AS nuevas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION proyecto_version_cambio_reporte_laboral();
+
+CREATE TRIGGER trigger_proyecto_version_entrega_arido_alta
+    AFTER INSERT ON entrega_arido
+    REFERENCING NEW TABLE AS nuevas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION proyecto_version_alta();
+
+CREATE TRIGGER trigger_proyecto_version_entrega_arido_baja
+    AFTER DELETE ON entrega_arido
+    REFERENCING OLD TABLE AS viejas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION proyecto_version_baja();
+
+CREATE TRIGGER trigger_proyecto_version_entrega_arido_cambio
+    AFTER UPDATE ON entrega_arido
+    REFERENCING OLD TABLE AS viejas NEW TABLE AS nuevas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION proyecto_version_cambio_entrega_arido();
+
+CREATE TRIGGER trigger_proyecto_version_maquina_cambio
+    AFTER UPDATE ON maquina
+    REFERENCING OLD TABLE AS viejas NEW TABLE AS nuevas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION proyecto_version_cambio_maquina();
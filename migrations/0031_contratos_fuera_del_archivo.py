@@ -0,0 +1,46 @@
+"""
+Los registros de contrato_archivo ya no se mueven al archivo frío
+(app/services/archivo_frio_service.py): el archivo del contrato sigue en
+uploads/contratos y sin su fila la descarga salía como contrato_<id>.pdf con
+tipo application/pdf, y la lista de contratos del proyecto quedaba vacía.
+
+Se devuelven a la tabla las filas de los proyectos ya archivados, con sus ids
+originales. El contrato_archivo.parquet queda en el directorio del archivo;
+restaurar_proyecto ya no lo lee.
+"""
+
+from pathlib import Path
+
+from sqlalchemy import text
+
+
+def upgrade(connection):
+    archivados = [
+        (proyecto_id, Path(ruta) / "contrato_archivo.parquet")
+        for proyecto_id, ruta in connection.execute(
+            text("SELECT proyecto_id, ruta FROM proyecto_archivo ORDER BY proyecto_id")
+        ).all()
+    ]
+    archivados = [(proyecto_id, ruta) for proyecto_id, ruta in archivados if ruta.exists()]
+    if not archivados:
+        return
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError(
+            f"Hay {len(archivados)} proyectos con contratos en el archivo frío: "
+            "la migración requiere pyarrow para devolverlos a contrato_archivo"
+        )
+    for proyecto_id, ruta in archivados:
+        filas = pq.read_table(ruta).to_pylist()
+        if not filas:
+            continue
+        columnas = list(filas[0])
+        connection.execute(
+            text(
+                f"INSERT INTO contrato_archivo ({', '.join(columnas)}) "
+                f"VALUES ({', '.join(':' + c for c in columnas)}) "
+                "ON CONFLICT (id) DO NOTHING"
+            ),
+            filas
+        )
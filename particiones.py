@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Mantenimiento de las tablas particionadas por mes (ver app/db/particiones.py).
+
+Uso:
+    python particiones.py --estado                          # particiones y filas estimadas
+    python particiones.py --crear                           # crea las de los próximos meses
+    python particiones.py --archivar reporte_laboral 2023   # junta 2023 en una partición anual congelada
+    python particiones.py --desvincular reporte_laboral 2023  # la saca de la tabla (esquema archivo)
+    python particiones.py --revincular reporte_laboral 2023   # la vuelve a adjuntar
+"""
+
+import argparse
+import logging
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.database import engine
+from app.db.particiones import (
+    TABLAS_PARTICIONADAS,
+    estado_particiones,
+    crear_particiones_futuras,
+    archivar_anio,
+    desvincular_anio,
+    revincular_anio
+)
+
+
+def mostrar_estado():
+    estado = estado_particiones(engine)
+    if not estado:
+        print("📋 Ninguna tabla particionada todavía (python migrate.py)")
+    for tabla, particiones in estado.items():
+        print(f"\n📦 {tabla} ({len(particiones)} particiones)")
+        for p in particiones:
+            print(f"   {p['nombre']:<32} {p['filas_estimadas']:>12,} filas  {p['bytes'] / 1024 / 1024:>9.1f} MB  {p['limites']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    grupo = parser.add_mutually_exclusive_group(required=True)
+    grupo.add_argument("--estado", action="store_true", help="Listar particiones")
+    grupo.add_argument("--crear", action="store_true", help="Crear particiones de los próximos meses")
+    grupo.add_argument("--archivar", nargs=2, metavar=("TABLA", "ANIO"), help="Archivar un año cerrado")
+    grupo.add_argument("--desvincular", nargs=2, metavar=("TABLA", "ANIO"), help="Desvincular un año archivado")
+    grupo.add_argument("--revincular", nargs=2, metavar=("TABLA", "ANIO"), help="Revincular un año desvinculado")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    try:
+        if args.estado:
+            mostrar_estado()
+        elif args.crear:
+            creadas = crear_particiones_futuras(engine)
+            print(f"✅ {len(creadas)} particiones creadas")
+        else:
+            accion, (tabla, anio) = next(
+                (nombre, valor) for nombre, valor in
+                (("archivar", args.archivar), ("desvincular", args.desvincular), ("revincular", args.revincular))
+                if valor
+            )
+            if tabla not in TABLAS_PARTICIONADAS:
+                print(f"❌ Tablas disponibles: {', '.join(TABLAS_PARTICIONADAS)}")
+                return False
+            funcion = {"archivar": archivar_anio, "desvincular": desvincular_anio, "revincular": revincular_anio}[accion]
+            if funcion(engine, tabla, int(anio)):
+                print(f"✅ {tabla} {anio}: {accion} OK")
+            else:
+                print(f"ℹ️  {tabla} {anio}: nada que {accion}")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)